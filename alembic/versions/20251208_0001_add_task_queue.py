@@ -0,0 +1,49 @@
+"""Add task queue table for the PostgreSQL scheduler.
+
+Revision ID: 20251208_0001
+Revises: ef0d61440935
+Create Date: 2025-12-08 09:00:00.000000
+
+This migration creates the queue used by PostgresScheduler:
+- task_queue: Pending task operations claimed with FOR UPDATE SKIP LOCKED
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20251208_0001"
+down_revision: Union[str, None] = "ef0d61440935"  # pragma: allowlist secret
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema - create task queue table."""
+    op.create_table(
+        "task_queue",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("operation", sa.String(20), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("locked_by", sa.String(255), nullable=True),
+        sa.Column("locked_until", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "enqueued_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        comment="Pending task operations for the PostgreSQL scheduler",
+    )
+    op.create_index(
+        "idx_task_queue_locked_until", "task_queue", ["locked_until"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop task queue table."""
+    op.drop_index("idx_task_queue_locked_until", table_name="task_queue")
+    op.drop_table("task_queue")
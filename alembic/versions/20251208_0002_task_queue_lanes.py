@@ -0,0 +1,53 @@
+"""Add priority lanes and fairness keys to the task queue.
+
+Revision ID: 20251208_0002
+Revises: 20251208_0001
+Create Date: 2025-12-08 14:00:00.000000
+
+This migration lets PostgresScheduler claim rows by priority lane and
+round-robin across fairness keys:
+- priority: 0 control, 1 interactive, 2 batch
+- fairness_key: context or client the row is round-robined under
+- weight: rows the key may take per round-robin turn
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20251208_0002"
+down_revision: Union[str, None] = "20251208_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema - add lane columns to task_queue."""
+    op.add_column(
+        "task_queue",
+        sa.Column("priority", sa.SmallInteger(), nullable=False, server_default="1"),
+    )
+    op.add_column(
+        "task_queue",
+        sa.Column("fairness_key", sa.String(255), nullable=False, server_default=""),
+    )
+    op.add_column(
+        "task_queue",
+        sa.Column("weight", sa.SmallInteger(), nullable=False, server_default="1"),
+    )
+    op.create_index(
+        "idx_task_queue_lane",
+        "task_queue",
+        ["priority", "fairness_key", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop lane columns from task_queue."""
+    op.drop_index("idx_task_queue_lane", table_name="task_queue")
+    op.drop_column("task_queue", "weight")
+    op.drop_column("task_queue", "fairness_key")
+    op.drop_column("task_queue", "priority")
@@ -0,0 +1,96 @@
+"""Add push notification configs and the notification outbox.
+
+Revision ID: 20251208_0003
+Revises: 20251208_0002
+Create Date: 2025-12-08 18:00:00.000000
+
+This migration lets every pod deliver webhooks for every task:
+- task_push_configs: Push notification subscriber and sequence per task
+- notification_outbox: Lifecycle events pending delivery, claimed with leases
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20251208_0003"
+down_revision: Union[str, None] = "20251208_0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema - create push config and outbox tables."""
+    op.create_table(
+        "task_push_configs",
+        sa.Column(
+            "task_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("tasks.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("config", postgresql.JSONB(), nullable=False),
+        sa.Column("sequence", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        comment="Push notification subscribers per task",
+    )
+
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("event_id", sa.String(64), nullable=False, unique=True),
+        sa.Column("task_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("config", postgresql.JSONB(), nullable=False),
+        sa.Column("event", postgresql.JSONB(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "next_attempt_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        sa.Column("locked_until", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        comment="Lifecycle events pending webhook delivery",
+    )
+    op.create_index(
+        "idx_notification_outbox_task_id",
+        "notification_outbox",
+        ["task_id", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_notification_outbox_next_attempt_at",
+        "notification_outbox",
+        ["next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop push config and outbox tables."""
+    op.drop_index(
+        "idx_notification_outbox_next_attempt_at", table_name="notification_outbox"
+    )
+    op.drop_index("idx_notification_outbox_task_id", table_name="notification_outbox")
+    op.drop_table("notification_outbox")
+    op.drop_table("task_push_configs")
@@ -0,0 +1,34 @@
+"""Add the agent result checkpoint to tasks.
+
+Revision ID: 20251208_0004
+Revises: 20251208_0003
+Create Date: 2025-12-08 20:00:00.000000
+
+This migration keeps worker checkpoints out of the public task metadata:
+- checkpoint: Agent result of a working task until it is persisted
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20251208_0004"
+down_revision: Union[str, None] = "20251208_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema - add the checkpoint column to tasks."""
+    op.add_column(
+        "tasks",
+        sa.Column("checkpoint", postgresql.JSONB(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop the checkpoint column from tasks."""
+    op.drop_column("tasks", "checkpoint")
@@ -0,0 +1,35 @@
+"""Index the task queue by lane and age for bounded claims.
+
+Revision ID: 20251208_0005
+Revises: 20251208_0004
+Create Date: 2025-12-08 21:00:00.000000
+
+This migration lets PostgresScheduler read the oldest claimable rows of
+each priority lane with an index range scan:
+- idx_task_queue_claim: (priority, id)
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20251208_0005"
+down_revision: Union[str, None] = "20251208_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema - add the claim index to task_queue."""
+    op.create_index(
+        "idx_task_queue_claim",
+        "task_queue",
+        ["priority", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop the claim index from task_queue."""
+    op.drop_index("idx_task_queue_claim", table_name="task_queue")
@@ -16,7 +16,7 @@ configuration, and runtime behavior.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Callable, Literal
+from typing import TYPE_CHECKING, Any, Callable, Literal
 from uuid import UUID
 
 from bindu.extensions.did import DIDAgentExtension
@@ -28,6 +28,9 @@ from .protocol.types import (
     Skill,
 )
 
+if TYPE_CHECKING:
+    from bindu.utils.process_pool import ProcessPool
+
 
 @dataclass(frozen=True)
 class DeploymentConfig:
@@ -65,7 +68,7 @@ class SchedulerConfig:
     managing asynchronous tasks and workflows.
     """
 
-    type: Literal["redis", "memory"]
+    type: Literal["redis", "redis_streams", "postgres", "memory"]
     redis_url: str | None = None
     redis_host: str = "localhost"
     redis_port: int = 6379
@@ -183,6 +186,9 @@ class AgentManifest:
     enable_context_based_history: bool = False
     extra_data: dict[str, Any] = field(default_factory=dict)
 
+    # Seconds a task may take from submission to result (None: no limit)
+    task_timeout: float | None = None
+
     # Observability
     debug_mode: bool = False
     debug_level: Literal[1, 2] = 1
@@ -199,6 +205,10 @@ class AgentManifest:
 
     # Runtime Execution (injected by framework)
     run: Callable[..., Any] | None = field(default=None, init=False)
+    # Set for batch handlers: one call for several message histories
+    run_batch: Callable[..., Any] | None = field(default=None, init=False)
+    # Worker processes running the handler when execution_mode="process"
+    process_pool: ProcessPool | None = field(default=None, init=False)
 
     def to_agent_card(self) -> AgentCard:
         """Transform the manifest into a protocol-compliant agent card.
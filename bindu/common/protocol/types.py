@@ -565,6 +565,9 @@ class TaskSendParams(TypedDict):
     history_length: NotRequired[int]
     """The length of the history."""
 
+    deadline: NotRequired[float]
+    """Unix time by which execution must finish."""
+
     metadata: NotRequired[dict[str, Any]]
     """Additional metadata."""
 
@@ -632,6 +635,13 @@ class MessageSendConfiguration(TypedDict):
     push_notification_config: NotRequired[PushNotificationConfig]
     """The push notification configuration."""
 
+    timeout_seconds: NotRequired[float]
+    """Seconds the task may take from submission to result. <NotPartOfA2A>
+
+    Capped by the agent's own task timeout. Tasks that exceed it fail with
+    failure_reason "deadline_exceeded" in their metadata.
+    """
+
 
 @pydantic.with_config(ConfigDict(alias_generator=to_camel))
 class MessageSendParams(TypedDict):
@@ -1469,6 +1479,16 @@ SkillNotFoundError = JSONRPCError[
     ],
 ]
 
+# Scheduler errors (-32040 to -32049)
+# Bindu-specific admission control extensions
+TaskQueueFullError = JSONRPCError[
+    Literal[-32040],
+    Literal[
+        "The agent's task queue is full and cannot accept new tasks right now. "
+        "Retry after the number of seconds given in the Retry-After header."
+    ],
+]
+
 # -----------------------------------------------------------------------------
 # JSON-RPC Request & Response Types
 # -----------------------------------------------------------------------------
@@ -1479,7 +1499,10 @@ SendMessageResponse = JSONRPCResponse[
 ]
 
 StreamMessageRequest = JSONRPCRequest[Literal["message/stream"], MessageSendParams]
-StreamMessageResponse = JSONRPCResponse[Union[Task, Message], JSONRPCError[Any, Any]]
+StreamMessageResponse = JSONRPCResponse[
+    Union[Task, Message, TaskStatusUpdateEvent, TaskArtifactUpdateEvent],
+    JSONRPCError[Any, Any],
+]
 
 GetTaskRequest = JSONRPCRequest[Literal["tasks/get"], TaskQueryParams]
 GetTaskResponse = JSONRPCResponse[Task, TaskNotFoundError]
@@ -1523,7 +1546,8 @@ GetTaskPushNotificationResponse = JSONRPCResponse[
 
 ResubscribeTaskRequest = JSONRPCRequest[Literal["tasks/resubscribe"], TaskIdParams]
 ResubscribeTaskResponse = JSONRPCResponse[
-    Task, Union[TaskNotCancelableError, TaskNotFoundError]
+    Union[Task, TaskStatusUpdateEvent, TaskArtifactUpdateEvent],
+    Union[TaskNotCancelableError, TaskNotFoundError],
 ]
 
 ListTaskPushNotificationConfigRequest = JSONRPCRequest[
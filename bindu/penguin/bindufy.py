@@ -185,6 +185,7 @@ def bindufy(
             - monitoring: Enable monitoring/metrics (default: False)
             - telemetry: Enable telemetry collection (default: True)
             - num_history_sessions: Number of conversation histories to maintain (default: 10)
+            - task_timeout: Seconds a task may take from submission to result (default: no limit)
             - documentation_url: URL to agent documentation
             - extra_metadata: Additional metadata dictionary
             - deployment: Deployment configuration dict
@@ -364,6 +365,8 @@ def bindufy(
         negotiation=validated_config.get("negotiation"),
         documentation_url=validated_config["documentation_url"],
         extra_metadata=validated_config["extra_metadata"],
+        execution_mode=validated_config.get("execution_mode"),
+        task_timeout=validated_config.get("task_timeout"),
     )
 
     # Log manifest creation
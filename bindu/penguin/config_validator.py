@@ -156,10 +156,23 @@ class ConfigValidator:
                     "Field 'num_history_sessions' must be a non-negative integer"
                 )
 
+        if config.get("task_timeout") is not None:
+            timeout = config["task_timeout"]
+            if (
+                isinstance(timeout, bool)
+                or not isinstance(timeout, (int, float))
+                or timeout <= 0
+            ):
+                raise ValueError("Field 'task_timeout' must be a positive number")
+
         # Validate kind
         if config.get("kind") not in ["agent", "team", "workflow"]:
             raise ValueError("Field 'kind' must be one of: agent, team, workflow")
 
+        # Validate handler execution mode
+        if config.get("execution_mode") not in [None, "thread", "process"]:
+            raise ValueError("Field 'execution_mode' must be one of: thread, process")
+
     @classmethod
     def _validate_auth_config(cls, auth_config: Dict[str, Any]) -> None:
         """Validate authentication configuration.
@@ -27,7 +27,10 @@ from bindu.common.protocol.types import (
     AgentTrust,
     Skill,
 )
+from bindu.settings import app_settings
 from bindu.utils.logging import get_logger
+from bindu.utils.process_pool import ProcessPool
+from bindu.utils.sync_executor import get_sync_executor
 
 logger = get_logger("bindu.penguin.manifest")
 
@@ -52,6 +55,9 @@ def _create_default_agent_trust() -> AgentTrust:
 def validate_agent_function(agent_function: Callable) -> None:
     """Validate that the function has the correct signature for protocol compliance.
 
+    Handlers take a single ``messages`` parameter, or ``messages_batch`` to
+    receive the histories of several tasks at once (see create_manifest).
+
     Args:
         agent_function: The function to validate
 
@@ -69,11 +75,21 @@ def validate_agent_function(agent_function: Callable) -> None:
         )
 
     if len(params) > 1:
-        raise ValueError("Agent function must have only 'messages' parameter")
+        raise ValueError(
+            "Agent function must have only 'messages' (or 'messages_batch') parameter"
+        )
+
+    if params[0].name not in ("messages", "messages_batch"):
+        raise ValueError(
+            f"First parameter must be named 'messages' or 'messages_batch', got '{params[0].name}'"
+        )
 
-    if params[0].name != "messages":
+    if params[0].name == "messages_batch" and (
+        inspect.isgeneratorfunction(agent_function)
+        or inspect.isasyncgenfunction(agent_function)
+    ):
         raise ValueError(
-            f"First parameter must be named 'messages', got '{params[0].name}'"
+            "Batch agent functions must return a list of results, not stream"
         )
 
     logger.debug(f"Agent function '{func_name}' validated successfully")
@@ -104,6 +120,8 @@ def create_manifest(
     enable_context_based_history: bool = False,
     documentation_url: str | None = None,
     extra_metadata: dict[str, Any] | None = None,
+    execution_mode: Literal["thread", "process"] | None = None,
+    task_timeout: float | None = None,
 ) -> AgentManifest:
     """Create a protocol-compliant AgentManifest from any Python function.
 
@@ -115,6 +133,16 @@ def create_manifest(
     generator, or regular function) and creates appropriate wrapper classes that maintain
     protocol compliance while preserving the original function's behavior.
 
+    Synchronous functions and generators are executed in a bounded thread pool
+    (see ``bindu.utils.sync_executor``) so blocking agent calls never stall the
+    event loop; set ``WORKER__OFFLOAD_SYNC_HANDLERS=false`` to run them in-line.
+
+    Batch handlers take ``messages_batch: list[list[dict]]`` and return one
+    result per history, in order (an Exception instance fails just that task).
+    The manifest then gets a ``run_batch`` method that the worker uses to
+    execute concurrently queued tasks in one call; ``run`` still accepts a
+    single history by wrapping it in a batch of one.
+
     Args:
         agent_function: The user's agent function to wrap. Must have 'input' as first parameter.
                        Can optionally have 'context' or 'execution_state' parameters.
@@ -139,6 +167,10 @@ def create_manifest(
         enable_context_based_history: Enable context-based history in agent execution (default: False).
         documentation_url: URL to agent documentation (optional).
         extra_metadata: Additional metadata dictionary to attach to the agent manifest (default: {}).
+        execution_mode: 'thread' or 'process'. 'process' runs the handler in a pool of warm
+                        worker processes (default: app_settings.worker.execution_mode).
+        task_timeout: Seconds a task may take from submission to result; tasks that exceed
+                      it fail with reason "deadline_exceeded" (default: no limit).
 
     Returns:
         AgentManifest: A protocol-compliant agent manifest with proper execution methods.
@@ -153,6 +185,7 @@ def create_manifest(
     sig = inspect.signature(agent_function)
     param_names = list(sig.parameters.keys())
     has_context_param = "context" in param_names
+    is_batch_handler = param_names[:1] == ["messages_batch"]
 
     logger.debug(f"Function parameters: {param_names}, has_context={has_context_param}")
 
@@ -199,8 +232,70 @@ def create_manifest(
         oltp_service_name=oltp_service_name,
         documentation_url=documentation_url,
         negotiation=negotiation,
+        task_timeout=task_timeout,
     )
 
+    # Synchronous handlers run in a thread pool unless disabled in settings
+    offload_sync = app_settings.worker.offload_sync_handlers
+    _execution_mode = execution_mode or app_settings.worker.execution_mode
+
+    def _create_process_pool() -> ProcessPool:
+        """Create and warm the process pool for execution_mode='process'.
+
+        The pool is kept on ``manifest.process_pool`` so it can be shut down.
+        """
+        pool = ProcessPool(
+            agent_function,
+            max_workers=app_settings.worker.process_pool_size,
+            max_tasks_per_worker=app_settings.worker.process_max_tasks_per_worker,
+            start_method=app_settings.worker.process_start_method,
+        )
+        # Warm the workers now so the first tasks do not pay startup cost
+        pool.start()
+        manifest.process_pool = pool
+        return pool
+
+    def _create_batch_run_method():
+        """Create run_batch for a handler taking ``messages_batch``."""
+        if _execution_mode == "process":
+            logger.debug(f"Creating process pool batch method for '{manifest_name}'")
+            pool = _create_process_pool()
+
+            async def call(messages_batch: list) -> Any:
+                results = None
+                async for results in pool.stream(messages_batch):
+                    pass
+                return results
+
+        elif inspect.iscoroutinefunction(agent_function):
+            logger.debug(f"Creating coroutine batch method for '{manifest_name}'")
+
+            async def call(messages_batch: list) -> Any:
+                return await agent_function(messages_batch)
+
+        elif offload_sync:
+            logger.debug(f"Creating thread-pool batch method for '{manifest_name}'")
+
+            async def call(messages_batch: list) -> Any:
+                return await get_sync_executor().run(agent_function, messages_batch)
+
+        else:
+            logger.debug(f"Creating sync batch method for '{manifest_name}'")
+
+            async def call(messages_batch: list) -> Any:
+                return agent_function(messages_batch)
+
+        async def run_batch(messages_batch: list) -> list[Any]:
+            results = list(await call(messages_batch))
+            if len(results) != len(messages_batch):
+                raise ValueError(
+                    f"Batch agent function returned {len(results)} results "
+                    f"for {len(messages_batch)} inputs"
+                )
+            return results
+
+        return run_batch
+
     # Create execution method based on function type
     def _create_run_method():
         """Create the appropriate run method based on function type."""
@@ -224,8 +319,28 @@ def create_manifest(
             else:
                 return (input_msg,)
 
+        # Batch handler called with a single history: a batch of one
+        if manifest.run_batch is not None:
+            run_batch = manifest.run_batch
+
+            async def run(input_msg: str, **kwargs):
+                (result,) = await run_batch([input_msg])
+                if isinstance(result, BaseException):
+                    raise result
+                yield result
+
+        # Any function type, executed in a pool of worker processes
+        elif _execution_mode == "process":
+            logger.debug(f"Creating process pool run method for '{manifest_name}'")
+            pool = _create_process_pool()
+
+            async def run(input_msg: str, **kwargs):
+                params = _resolve_params(input_msg, **kwargs)
+                async for chunk in pool.stream(*params):
+                    yield chunk
+
         # Async generator function (streaming)
-        if inspect.isasyncgenfunction(agent_function):
+        elif inspect.isasyncgenfunction(agent_function):
             logger.debug(f"Creating async generator run method for '{manifest_name}'")
 
             async def run(input_msg: str, **kwargs):
@@ -258,6 +373,17 @@ def create_manifest(
                 else:
                     yield result
 
+        # Sync generator function, stepped through the thread pool
+        elif inspect.isgeneratorfunction(agent_function) and offload_sync:
+            logger.debug(
+                f"Creating thread-pool sync generator run method for '{manifest_name}'"
+            )
+
+            async def run(input_msg: str, **kwargs):
+                params = _resolve_params(input_msg, **kwargs)
+                async for chunk in get_sync_executor().iterate(agent_function, *params):
+                    yield chunk
+
         # Sync generator function
         elif inspect.isgeneratorfunction(agent_function):
             logger.debug(f"Creating sync generator run method for '{manifest_name}'")
@@ -266,6 +392,24 @@ def create_manifest(
                 params = _resolve_params(input_msg, **kwargs)
                 yield from agent_function(*params)
 
+        # Regular sync function, called in the thread pool
+        elif offload_sync:
+            logger.debug(
+                f"Creating thread-pool sync function run method for '{manifest_name}'"
+            )
+
+            async def run(input_msg: str, **kwargs):
+                params = _resolve_params(input_msg, **kwargs)
+                executor = get_sync_executor()
+                result = await executor.run(agent_function, *params)
+
+                # A plain function may still hand back a lazy generator
+                if inspect.isgenerator(result):
+                    async for chunk in executor.iterate_over(result):
+                        yield chunk
+                else:
+                    yield result
+
         # Regular sync function
         else:
             logger.debug(f"Creating sync function run method for '{manifest_name}'")
@@ -276,7 +420,9 @@ def create_manifest(
 
         return run
 
-    # Attach run method to manifest
+    # Attach run methods to manifest
+    if is_batch_handler:
+        manifest.run_batch = _create_batch_run_method()
     manifest.run = _create_run_method()
     logger.debug(f"Run method attached to manifest '{manifest_name}'")
 
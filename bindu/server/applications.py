@@ -137,6 +137,7 @@ class BinduApplication(Starlette):
         self._storage: Storage | None = None
         self._scheduler: Scheduler | None = None
         self._agent_card_json_schema: bytes | None = None
+        self._queue_stats: tuple[float, dict[str, Any]] | None = None
         self._x402_ext = x402_ext
         self._payment_session_manager = None
         self._payment_requirements = None
@@ -163,6 +164,7 @@ class BinduApplication(Starlette):
             agent_run_endpoint,
             did_resolve_endpoint,
             negotiation_endpoint,
+            push_notifications_debug_endpoint,
             skill_detail_endpoint,
             skill_documentation_endpoint,
             skills_list_endpoint,
@@ -207,6 +209,14 @@ class BinduApplication(Starlette):
         # Register health endpoint
         self._add_route("/health", health_endpoint, ["GET"], with_app=True)
 
+        # Webhook delivery state (queue, per-host circuit breakers)
+        self._add_route(
+            "/debug/push-notifications",
+            push_notifications_debug_endpoint,
+            ["GET"],
+            with_app=True,
+        )
+
         # Negotiation endpoint
         self._add_route(
             "/agent/negotiation",
@@ -359,6 +369,7 @@ class BinduApplication(Starlette):
             scheduler = await execute_with_retry(
                 create_scheduler,
                 self._scheduler_config,
+                storage=storage,
                 max_attempts=app_settings.retry.scheduler_max_attempts,
                 min_wait=app_settings.retry.scheduler_min_wait,
                 max_wait=app_settings.retry.scheduler_max_wait,
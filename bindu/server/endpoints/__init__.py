@@ -18,6 +18,7 @@ from .payment_sessions import (
     payment_status_endpoint,
     start_payment_session_endpoint,
 )
+from .push_notifications import push_notifications_debug_endpoint
 from .skills import (
     skill_detail_endpoint,
     skill_documentation_endpoint,
@@ -38,6 +39,8 @@ __all__ = [
     "start_payment_session_endpoint",
     "payment_capture_endpoint",
     "payment_status_endpoint",
+    # Push Notifications
+    "push_notifications_debug_endpoint",
     # Skills Endpoints
     "skills_list_endpoint",
     "skill_detail_endpoint",
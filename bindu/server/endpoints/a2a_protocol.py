@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import math
+from typing import Any, cast
+
 from starlette.requests import Request
 from starlette.responses import Response
 
@@ -9,10 +12,12 @@ from bindu.common.protocol.types import (
     InternalError,
     JSONParseError,
     MethodNotFoundError,
+    TaskQueueFullError,
     a2a_request_ta,
     a2a_response_ta,
 )
 from bindu.server.applications import BinduApplication
+from bindu.server.scheduler.base import SchedulerQueueFullError
 from bindu.settings import app_settings
 from bindu.utils.logging import get_logger
 from bindu.utils.request_utils import extract_error_fields, get_client_ip, jsonrpc_error
@@ -23,6 +28,9 @@ from bindu.extensions.x402.extension import (
 
 logger = get_logger("bindu.server.endpoints.a2a_protocol")
 
+# Methods that submit a message as a new task
+_MESSAGE_METHODS = ("message/send", "message/stream")
+
 
 async def agent_run_endpoint(app: BinduApplication, request: Request) -> Response:
     """Handle A2A protocol requests for agent-to-agent communication.
@@ -64,9 +72,31 @@ async def agent_run_endpoint(app: BinduApplication, request: Request) -> Respons
 
         handler = getattr(app.task_manager, handler_name)
 
+        # The scheduler round-robins work across authenticated clients; only
+        # the server may set the identity, so a client-supplied value is dropped
+        if method in _MESSAGE_METHODS:
+            message = a2a_request.get("params", {}).get("message")
+            if isinstance(message, dict):
+                message_metadata = message.get("metadata") or {}
+                message_metadata.pop("_client_id", None)
+                user = getattr(request.state, "user", None)
+                if isinstance(user, dict) and user.get("sub"):
+                    message_metadata["_client_id"] = user["sub"]
+                if message_metadata:
+                    message["metadata"] = message_metadata
+
+        # EventSource clients reconnect with the last event ID they received
+        last_event_id = request.headers.get("last-event-id")
+        if method == "tasks/resubscribe" and last_event_id:
+            params = cast(dict[str, Any], a2a_request["params"])
+            params["metadata"] = {
+                **(params.get("metadata") or {}),
+                "last_event_id": last_event_id,
+            }
+
         # Pass payment details from middleware to handler if available
         # Payment context is passed through the metadata field in params
-        if hasattr(request.state, "payment_payload") and method == "message/send":
+        if hasattr(request.state, "payment_payload") and method in _MESSAGE_METHODS:
             # Inject payment context into message metadata
             if "params" in a2a_request and "message" in a2a_request["params"]:
                 message = a2a_request["params"]["message"]
@@ -98,18 +128,30 @@ async def agent_run_endpoint(app: BinduApplication, request: Request) -> Respons
 
         logger.debug(f"A2A response to {client_ip}: method={method}, id={request_id}")
 
-        resp = Response(
-            content=a2a_response_ta.dump_json(
-                jsonrpc_response, by_alias=True, serialize_as_any=True
-            ),
-            media_type="application/json",
-        )
+        # Streaming handlers (message/stream, tasks/resubscribe) return
+        # their SSE response
+        if isinstance(jsonrpc_response, Response):
+            resp = jsonrpc_response
+        else:
+            resp = Response(
+                content=a2a_response_ta.dump_json(
+                    jsonrpc_response, by_alias=True, serialize_as_any=True
+                ),
+                media_type="application/json",
+            )
 
         if x402_is_requested(request):
             resp = x402_add_header(resp)
 
         return resp
 
+    except SchedulerQueueFullError as e:
+        logger.warning(f"Task queue full, rejecting request from {client_ip}: {e}")
+        code, message = extract_error_fields(TaskQueueFullError)
+        resp = jsonrpc_error(code, message, str(e), request_id, 429)
+        resp.headers["Retry-After"] = str(max(1, math.ceil(e.retry_after)))
+        return resp
+
     except Exception as e:
         logger.error(f"Error processing A2A request from {client_ip}", exc_info=True)
         code, message = extract_error_fields(InternalError)
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from time import time
+from time import monotonic, time
+from typing import Any
 
+import anyio
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
@@ -16,6 +18,26 @@ logger = get_logger("bindu.server.endpoints.health")
 
 _start_time = time()
 
+# Queue stats can be costly (e.g. counting the PostgreSQL queue table), so
+# frequent health probes reuse them for a few seconds and never wait long
+_QUEUE_STATS_TTL = 5.0
+_QUEUE_STATS_TIMEOUT = 1.0
+
+
+async def _queue_stats(app: BinduApplication, scheduler: Any) -> dict[str, Any] | None:
+    """Return recent queue stats, or None if the scheduler cannot provide them."""
+    now = monotonic()
+    if app._queue_stats is not None and now - app._queue_stats[0] < _QUEUE_STATS_TTL:
+        return app._queue_stats[1]
+    try:
+        with anyio.fail_after(_QUEUE_STATS_TIMEOUT):
+            stats = await scheduler.get_queue_stats()
+    except Exception as e:
+        logger.warning(f"Queue stats unavailable: {e}")
+        return None
+    app._queue_stats = (now, stats)
+    return stats
+
 
 @handle_endpoint_errors("health check")
 async def health_endpoint(app: BinduApplication, request: Request) -> JSONResponse:
@@ -33,4 +55,14 @@ async def health_endpoint(app: BinduApplication, request: Request) -> JSONRespon
         "version": __version__,
         "ready": True,
     }
+
+    # Expose queue occupancy so clients and load balancers can see back-pressure
+    scheduler = getattr(app.task_manager, "scheduler", None)
+    if scheduler is not None:
+        queue_stats = await _queue_stats(app, scheduler)
+        if queue_stats is None:
+            payload["queue"] = {"available": False}
+        elif queue_stats:
+            payload["queue"] = queue_stats
+
     return JSONResponse(payload)
@@ -0,0 +1,32 @@
+"""Debug endpoint for push notification delivery."""
+
+from __future__ import annotations
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from bindu.server.applications import BinduApplication
+from bindu.utils.logging import get_logger
+from bindu.utils.request_utils import get_client_ip, handle_endpoint_errors
+
+logger = get_logger("bindu.server.endpoints.push_notifications")
+
+
+@handle_endpoint_errors("push notification debug")
+async def push_notifications_debug_endpoint(
+    app: BinduApplication, request: Request
+) -> JSONResponse:
+    """Report webhook delivery state of this pod.
+
+    Returns the delivery mode, the local delivery queue (pending events,
+    overflow and drop counters, in-flight deliveries per host) and the
+    circuit breaker state of every webhook host contacted so far.
+    """
+    client_ip = get_client_ip(request)
+    logger.debug(f"Push notification debug request from {client_ip}")
+
+    if app.task_manager is None:
+        return JSONResponse(
+            content={"error": "Task manager not running"}, status_code=503
+        )
+    return JSONResponse(app.task_manager.delivery_stats())
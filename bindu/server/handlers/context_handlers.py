@@ -29,6 +29,7 @@ from bindu.common.protocol.types import (
 from bindu.utils.task_telemetry import trace_context_operation
 
 from bindu.server.storage import Storage
+from bindu.server.workers.helpers import ContextHistoryCache
 
 
 @dataclass
@@ -37,6 +38,7 @@ class ContextHandlers:
 
     storage: Storage[Any]
     error_response_creator: Any = None
+    history_cache: ContextHistoryCache | None = None
 
     @trace_context_operation("list_contexts")
     async def list_contexts(self, request: ListContextsRequest) -> ListContextsResponse:
@@ -70,6 +72,9 @@ class ContextHandlers:
                 ClearContextsResponse, request["id"], ContextNotFoundError, str(e)
             )
 
+        if self.history_cache is not None:
+            self.history_cache.invalidate(context_id)
+
         return ClearContextsResponse(
             jsonrpc="2.0",
             id=request["id"],
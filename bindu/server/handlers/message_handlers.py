@@ -10,30 +10,44 @@
 """Message handlers for Bindu server.
 
 This module handles message-related RPC requests including
-sending messages and streaming responses.
+sending messages, streaming responses and resuming streams.
 """
 
 from __future__ import annotations
 
-import inspect
-import json
-import uuid
+import time
+from collections.abc import AsyncIterator, Mapping
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from typing import Any
 
+from starlette.responses import StreamingResponse
+
 from bindu.common.protocol.types import (
+    ResubscribeTaskRequest,
+    ResubscribeTaskResponse,
     SendMessageRequest,
     SendMessageResponse,
     StreamMessageRequest,
+    StreamMessageResponse,
     Task,
+    TaskNotFoundError,
     TaskSendParams,
+    stream_message_response_ta,
 )
 
+from bindu.settings import app_settings
 from bindu.utils.task_telemetry import trace_task_operation, track_active_task
 
 from bindu.server.scheduler import Scheduler
+from bindu.server.scheduler.base import SchedulerQueueFullError
 from bindu.server.storage import Storage
+from bindu.server.streaming import (
+    STREAM_END_STATES,
+    TaskEventBus,
+    TaskEventSubscription,
+    artifact_update_event,
+    is_final_event,
+)
 
 
 @dataclass
@@ -45,6 +59,8 @@ class MessageHandlers:
     manifest: Any | None = None
     workers: list[Any] | None = None
     context_id_parser: Any = None
+    event_bus: TaskEventBus | None = None
+    error_response_creator: Any = None
 
     @trace_task_operation("send_message")
     @track_active_task
@@ -55,9 +71,21 @@ class MessageHandlers:
         If the request reaches here, payment has already been verified.
         Settlement will be handled by ManifestWorker when task completes.
         """
+        task, scheduler_params = await self._submit_task(request)
+        await self._schedule_task(task, scheduler_params)
+        return SendMessageResponse(jsonrpc="2.0", id=request["id"], result=task)
+
+    async def _submit_task(
+        self, request: SendMessageRequest | StreamMessageRequest
+    ) -> tuple[Task, TaskSendParams]:
+        """Store the task of a message and build its scheduler parameters."""
         message = request["params"]["message"]
         context_id = self.context_id_parser(message.get("context_id"))
 
+        # Authenticated client identity injected by the endpoint; the scheduler
+        # round-robins work across clients. Not stored with the message.
+        client_id = (message.get("metadata") or {}).pop("_client_id", None)
+
         # Submit task to storage
         task: Task = await self.storage.submit_task(context_id, message)
 
@@ -72,6 +100,8 @@ class MessageHandlers:
         config = request["params"].get("configuration", {})
         if history_length := config.get("history_length"):
             scheduler_params["history_length"] = history_length
+        if deadline := self._deadline(config):
+            scheduler_params["deadline"] = deadline
 
         # Pass payment context from message metadata to worker if available
         # This is injected by the endpoint when x402 middleware verifies payment
@@ -81,126 +111,201 @@ class MessageHandlers:
             # Remove from message metadata to keep it clean (internal use only)
             del message["metadata"]["_payment_context"]
 
-        await self.scheduler.run_task(scheduler_params)
-        return SendMessageResponse(jsonrpc="2.0", id=request["id"], result=task)
+        if client_id:
+            scheduler_params["metadata"] = {"client_id": client_id}
 
-    async def stream_message(self, request: StreamMessageRequest):
-        """Stream messages using Server-Sent Events.
+        return task, scheduler_params
 
-        This method returns a StreamingResponse directly to support SSE,
-        which will be handled at the application layer.
+    async def _schedule_task(
+        self, task: Task, scheduler_params: TaskSendParams
+    ) -> None:
+        """Queue a submitted task for execution."""
+        try:
+            await self.scheduler.run_task(scheduler_params)
+        except SchedulerQueueFullError:
+            # The task never entered the queue; don't leave it stuck in "submitted"
+            await self.storage.update_task(
+                task["id"], state="rejected", metadata={"failure_reason": "queue_full"}
+            )
+            raise
 
-        Note: Not fully implemented yet. #TODO
+    def _deadline(self, config: Mapping[str, Any]) -> float | None:
+        """Return the Unix time by which the task must finish, if limited.
+
+        The client's ``timeout_seconds`` applies, capped by the agent's
+        ``task_timeout``.
         """
-        from starlette.responses import StreamingResponse
+        timeouts = [
+            timeout
+            for timeout in (
+                config.get("timeout_seconds"),
+                self.manifest.task_timeout if self.manifest else None,
+            )
+            if timeout is not None and timeout > 0
+        ]
+        return time.time() + min(timeouts) if timeouts else None
 
-        message = request["params"]["message"]
-        context_id = self.context_id_parser(message.get("context_id"))
+    @trace_task_operation("stream_message")
+    async def stream_message(self, request: StreamMessageRequest) -> StreamingResponse:
+        """Stream a task's progress using Server-Sent Events.
 
-        # similar to the "messages/send flow submit the task to the configured storage"
-        task: Task = await self.storage.submit_task(context_id, message)
+        The task is executed by the scheduler and a worker exactly like
+        ``message/send``. Its events are subscribed to before it is
+        scheduled, so none are missed. The stream sends the submitted task,
+        then every status and artifact update, each as a JSON-RPC response
+        in an SSE ``data:`` line with the event's sequence number as its
+        ``id:``, and ends after the final status update.
+
+        Keep-alive comments are sent while the task is quiet. If its final
+        event was missed (the subscriber fell behind, or the bus dropped it),
+        the stored task completes the stream instead.
+        """
+        if self.event_bus is None:
+            raise RuntimeError("Streaming requires a task event bus")
+
+        task, scheduler_params = await self._submit_task(request)
+        scheduler_params["metadata"] = {
+            **scheduler_params.get("metadata", {}),
+            "stream": True,
+        }
+
+        try:
+            subscription = await self.event_bus.subscribe(task["id"])
+        except Exception:
+            # The task is stored but will never be scheduled
+            await self.storage.update_task(
+                task["id"],
+                state="rejected",
+                metadata={"failure_reason": "event_bus_unavailable"},
+            )
+            raise
+        try:
+            await self._schedule_task(task, scheduler_params)
+        except BaseException:
+            await subscription.close()
+            raise
+
+        return StreamingResponse(
+            self._relay_events(request["id"], task["id"], subscription, task),
+            media_type="text/event-stream",
+        )
 
-        async def stream_generator():
-            """Generate a consumable stream based on the function which was decorated using pebblify."""
-            try:
-                await self.storage.update_task(task["id"], state="working")
-                # yield the initial status update event to indicate processing of the task has started
-                status_event = {
-                    "kind": "status-update",
-                    "task_id": str(task["id"]),
-                    "context_id": str(context_id),
-                    "status": {
-                        "state": "working",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                    "final": False,
-                }
-                yield f"data: {json.dumps(status_event)}\n\n"
-
-                if self.workers and self.manifest:
-                    worker = self.workers[0]
-                    message_history = await worker._build_complete_message_history(task)
-                    manifest_result = self.manifest.run(message_history)
-
-                    if inspect.isasyncgen(manifest_result):
-                        async for chunk in manifest_result:
-                            if chunk:
-                                artifact_event = {
-                                    "kind": "artifact-update",
-                                    "task_id": str(task["id"]),
-                                    "context_id": str(context_id),
-                                    "artifact": {
-                                        "artifact_id": str(uuid.uuid4()),
-                                        "name": "streaming_response",
-                                        "parts": [{"kind": "text", "text": str(chunk)}],
-                                    },
-                                    "append": True,
-                                    "last_chunk": False,
-                                }
-                                yield f"data: {json.dumps(artifact_event)}\n\n"
-
-                    elif inspect.isgenerator(manifest_result):
-                        for chunk in manifest_result:
-                            if chunk:
-                                artifact_event = {
-                                    "kind": "artifact-update",
-                                    "task_id": str(task["id"]),
-                                    "context_id": str(context_id),
-                                    "artifact": {
-                                        "artifact_id": str(uuid.uuid4()),
-                                        "name": "streaming_response",
-                                        "parts": [{"kind": "text", "text": str(chunk)}],
-                                    },
-                                    "append": True,
-                                    "last_chunk": False,
-                                }
-                                yield f"data: {json.dumps(artifact_event)}\n\n"
-
-                    else:
-                        if manifest_result:
-                            artifact_event = {
-                                "kind": "artifact-update",
-                                "task_id": str(task["id"]),
-                                "context_id": str(context_id),
-                                "artifact": {
-                                    "artifact_id": str(uuid.uuid4()),
-                                    "name": "response",
-                                    "parts": [
-                                        {"kind": "text", "text": str(manifest_result)}
-                                    ],
-                                },
-                                "last_chunk": True,
-                            }
-                            yield f"data: {json.dumps(artifact_event)}\n\n"
-
-                # Send completion status
-                completion_event = {
-                    "kind": "status-update",
-                    "task_id": str(task["id"]),
-                    "context_id": str(context_id),
-                    "status": {
-                        "state": "completed",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                    "final": True,
-                }
-                yield f"data: {json.dumps(completion_event)}\n\n"
-
-                # Update task state in storage
-                await self.storage.update_task(task["id"], state="completed")
-            except Exception as e:
-                error_event = {
-                    "kind": "status-update",
-                    "task_id": str(task["id"]),
-                    "context_id": str(context_id),
-                    "status": {
-                        "state": "failed",
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    },
-                    "final": True,
-                    "error": str(e),
-                }
-                yield f"data: {json.dumps(error_event)}\n\n"
-                await self.storage.update_task(task["id"], state="failed")
-
-        return StreamingResponse(stream_generator(), media_type="text/event-stream")
+    @trace_task_operation("resubscribe_task")
+    async def resubscribe_task(
+        self, request: ResubscribeTaskRequest
+    ) -> ResubscribeTaskResponse | StreamingResponse:
+        """Resume the event stream of a task using Server-Sent Events.
+
+        With ``metadata["last_event_id"]`` (the SSE ``Last-Event-ID`` header,
+        injected by the endpoint), the task's logged events after that ID are
+        resent, then live events follow. Without it, or when some of those
+        events already left the log, the stream starts with the current task
+        instead; a task whose turn already ended is sent and the stream ends.
+        """
+        if self.event_bus is None:
+            raise RuntimeError("Streaming requires a task event bus")
+
+        task_id = request["params"]["task_id"]
+        after_seq = self._last_event_id(request["params"])
+
+        # Subscribe first: the task loaded next is at least as new as the
+        # first live event
+        subscription = await self.event_bus.subscribe(task_id, after_seq)
+        try:
+            task = await self.storage.load_task(task_id)
+        except BaseException:
+            await subscription.close()
+            raise
+        if task is None:
+            await subscription.close()
+            return self.error_response_creator(
+                ResubscribeTaskResponse,
+                request["id"],
+                TaskNotFoundError,
+                "Task not found",
+            )
+
+        replayed = after_seq is not None and not subscription.missed
+        return StreamingResponse(
+            self._relay_events(
+                request["id"], task_id, subscription, None if replayed else task
+            ),
+            media_type="text/event-stream",
+        )
+
+    @staticmethod
+    def _last_event_id(params: Mapping[str, Any]) -> int | None:
+        """Return the sequence number a resubscribing client last received."""
+        last_event_id = (params.get("metadata") or {}).get("last_event_id")
+        try:
+            return int(last_event_id) if last_event_id is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    async def _relay_events(
+        self,
+        request_id: Any,
+        task_id: Any,
+        subscription: TaskEventSubscription,
+        snapshot: Task | None = None,
+    ) -> AsyncIterator[str]:
+        """Yield a task's events as SSE until its final status update.
+
+        A snapshot of the task, if given, is sent first; the stream ends
+        right after it if the task's turn already ended.
+        """
+        heartbeat = app_settings.streaming.heartbeat_interval
+        try:
+            if snapshot is not None:
+                yield self._sse(request_id, snapshot)
+                if snapshot["status"]["state"] in STREAM_END_STATES:
+                    return
+            while True:
+                event = await subscription.get(timeout=heartbeat)
+                if event is None:
+                    final_events = await self._stored_final_events(task_id)
+                    if final_events is None:
+                        yield ": keep-alive\n\n"
+                        continue
+                    for final_event in final_events:
+                        yield self._sse(request_id, final_event)
+                    return
+
+                yield self._sse(request_id, event, subscription.last_seq)
+                if is_final_event(event):
+                    return
+        finally:
+            await subscription.close()
+
+    async def _stored_final_events(self, task_id: Any) -> list[dict[str, Any]] | None:
+        """Return the closing events of a stored task, or None if still running."""
+        stored = await self.storage.load_task(task_id)
+        if stored is None or stored["status"]["state"] not in STREAM_END_STATES:
+            return None
+        events: list[dict[str, Any]] = [
+            artifact_update_event(
+                stored["id"], stored["context_id"], artifact, last_chunk=True
+            )
+            for artifact in stored.get("artifacts") or []
+        ]
+        events.append(
+            {
+                "kind": "status-update",
+                "task_id": stored["id"],
+                "context_id": stored["context_id"],
+                "status": stored["status"],
+                "final": True,
+            }
+        )
+        return events
+
+    @staticmethod
+    def _sse(request_id: Any, result: Any, event_id: int | None = None) -> str:
+        """Format one stream result as an SSE event (``id:`` if sequenced)."""
+        payload = stream_message_response_ta.dump_json(
+            StreamMessageResponse(jsonrpc="2.0", id=request_id, result=result),
+            by_alias=True,
+            serialize_as_any=True,
+        )
+        event_id_line = f"id: {event_id}\n" if event_id is not None else ""
+        return f"{event_id_line}data: {payload.decode()}\n\n"
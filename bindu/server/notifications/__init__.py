@@ -4,6 +4,8 @@ This package handles all notification-related functionality including
 push notifications for task lifecycle events.
 """
 
+from .delivery_queue import NotificationDeliveryQueue
+from .outbox import OutboxDispatcher
 from .push_manager import PushNotificationManager
 
-__all__ = ["PushNotificationManager"]
+__all__ = ["NotificationDeliveryQueue", "OutboxDispatcher", "PushNotificationManager"]
@@ -0,0 +1,339 @@
+"""Bounded delivery queue for push notifications.
+
+Delivering a webhook can take seconds (connection timeouts, retries with
+backoff). Workers therefore only enqueue lifecycle events here; a pool of
+delivery tasks drains the queue in the background.
+
+Events of one task are delivered one at a time in the order they were
+enqueued, so subscribers see a task's sequence numbers in order. Events of
+different tasks are delivered concurrently, and a slow endpoint only holds
+up the tasks that notify it: with ``max_per_host`` set, at most that many
+delivery tasks post to one webhook host at a time, and events for a busy
+host wait aside while the delivery tasks serve other hosts.
+
+With ``batch_window`` set (and a ``deliver_many`` callable), a delivery
+task collects ready tasks for up to that many seconds, then hands all their
+queued events to ``deliver_many`` in one call per subscriber, so a burst of
+events to one webhook becomes one request. Events a task produces during
+the window (``working`` then ``completed`` of a fast task) join the same
+batch. A task's queued events for one subscriber are never split across
+batches, which keeps per-task ordering when a batch fails. Each batch
+request takes one of its host's ``max_per_host`` slots; tasks for a busy
+host wait aside as they do without batching.
+
+When ``max_pending`` events are waiting, new events are rejected and
+counted as overflow; events whose delivery fails after retries are counted
+as dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+from urllib.parse import urlparse
+from uuid import UUID
+
+from opentelemetry import metrics
+
+from bindu.common.protocol.types import PushNotificationConfig
+from bindu.utils.logging import get_logger
+
+logger = get_logger("bindu.server.notifications.delivery_queue")
+meter = metrics.get_meter("bindu.server.notifications")
+
+notifications_overflow = meter.create_counter(
+    "bindu_push_notifications_overflow_total",
+    description="Push notifications rejected because the delivery queue was full",
+    unit="1",
+)
+notifications_dropped = meter.create_counter(
+    "bindu_push_notifications_dropped_total",
+    description="Push notifications dropped after delivery failed",
+    unit="1",
+)
+
+Deliver = Callable[[PushNotificationConfig, dict[str, Any]], Awaitable[bool]]
+DeliverMany = Callable[[PushNotificationConfig, list[dict[str, Any]]], Awaitable[bool]]
+
+
+class NotificationDeliveryQueue:
+    """Per-task ordered, bounded queue drained by a pool of delivery tasks.
+
+    Use as an async context manager: entering starts the delivery tasks,
+    exiting waits up to ``shutdown_timeout`` seconds for queued events and
+    then cancels what is left.
+    """
+
+    def __init__(
+        self,
+        deliver: Deliver,
+        max_pending: int = 1000,
+        concurrency: int = 4,
+        shutdown_timeout: float = 5.0,
+        max_per_host: int = 0,
+        deliver_many: DeliverMany | None = None,
+        batch_window: float = 0.0,
+        batch_max_events: int = 100,
+    ):
+        """Initialize the queue.
+
+        Args:
+            deliver: Coroutine function delivering one event; returns False
+                (or raises) when the event could not be delivered
+            max_pending: Maximum events waiting for delivery
+            concurrency: Number of delivery tasks
+            shutdown_timeout: Seconds to keep delivering on exit
+            max_per_host: Deliveries (or batch requests) in flight to one
+                webhook host (0 for no limit beyond concurrency)
+            deliver_many: Coroutine function delivering events of one
+                subscriber together; required for batching
+            batch_window: Seconds to collect events into a batch (0 delivers
+                events one at a time)
+            batch_max_events: Events after which a batch stops collecting
+                further tasks
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.deliver = deliver
+        self.max_pending = max_pending
+        self.concurrency = max(1, concurrency)
+        self.shutdown_timeout = shutdown_timeout
+        self.max_per_host = max(0, max_per_host)
+        self.deliver_many = deliver_many
+        self.batch_window = batch_window if deliver_many is not None else 0.0
+        self.batch_max_events = max(1, batch_max_events)
+        self.overflow_count = 0
+        self.dropped_count = 0
+        self._mailboxes: dict[UUID, deque[tuple[PushNotificationConfig, dict]]] = {}
+        self._ready: asyncio.Queue[UUID] = asyncio.Queue()
+        self._host_in_flight: dict[str, int] = {}
+        self._host_waiting: dict[str, deque[UUID]] = {}
+        self._collecting = asyncio.Lock()
+        self._pending = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def pending(self) -> int:
+        """Events enqueued and not yet delivered (including in-flight ones)."""
+        return self._pending
+
+    @property
+    def running(self) -> bool:
+        """Whether delivery tasks are running."""
+        return bool(self._tasks)
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue occupancy and counters for diagnostics."""
+        return {
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "batch_window": self.batch_window,
+            "overflow": self.overflow_count,
+            "dropped": self.dropped_count,
+            "in_flight_by_host": dict(self._host_in_flight),
+            "waiting_by_host": {
+                host: len(tasks) for host, tasks in self._host_waiting.items()
+            },
+        }
+
+    async def __aenter__(self) -> NotificationDeliveryQueue:
+        """Start the delivery tasks."""
+        drain = self._drain_batches if self.batch_window > 0 else self._drain
+        self._tasks = [
+            asyncio.create_task(drain(), name=f"push-delivery-{i}")
+            for i in range(self.concurrency)
+        ]
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Deliver what is queued (within shutdown_timeout), then stop."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Stopping push delivery with events still queued",
+                pending=self._pending,
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def enqueue(
+        self, task_id: UUID, config: PushNotificationConfig, event: dict[str, Any]
+    ) -> bool:
+        """Queue an event for delivery without waiting.
+
+        Args:
+            task_id: Task the event belongs to (ordering key)
+            config: Push notification config of the subscriber
+            event: Event payload
+
+        Returns:
+            False if the queue was full and the event was rejected
+        """
+        if self._pending >= self.max_pending:
+            self.overflow_count += 1
+            notifications_overflow.add(1)
+            logger.warning(
+                "Push notification queue full; dropping event",
+                task_id=str(task_id),
+                event_id=event.get("event_id"),
+            )
+            return False
+
+        mailbox = self._mailboxes.get(task_id)
+        if mailbox is None:
+            # Not queued or in flight: hand the task to a delivery task
+            mailbox = self._mailboxes[task_id] = deque()
+            self._ready.put_nowait(task_id)
+        mailbox.append((config, event))
+        self._pending += 1
+        self._idle.clear()
+        return True
+
+    async def _drain(self) -> None:
+        """Deliver events of one task at a time until cancelled."""
+        while True:
+            task_id = await self._ready.get()
+            mailbox = self._mailboxes[task_id]
+            host = urlparse(mailbox[0][0].get("url", "")).netloc
+            in_flight = self._host_in_flight.get(host, 0)
+            if self.max_per_host and in_flight >= self.max_per_host:
+                # Set aside until a delivery to this host finishes
+                self._host_waiting.setdefault(host, deque()).append(task_id)
+                continue
+            self._host_in_flight[host] = in_flight + 1
+            config, event = mailbox.popleft()
+            try:
+                delivered = await self.deliver(config, event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    "Unexpected error delivering push notification",
+                    task_id=str(task_id),
+                    error=str(e),
+                )
+                delivered = False
+            if not delivered:
+                self.dropped_count += 1
+                notifications_dropped.add(1)
+
+            self._release_host(host)
+            self._pending -= 1
+            if mailbox:
+                # Requeue behind other tasks so one busy task cannot starve them
+                self._ready.put_nowait(task_id)
+            else:
+                del self._mailboxes[task_id]
+            if self._pending == 0:
+                self._idle.set()
+
+    async def _drain_batches(self) -> None:
+        """Deliver the events of several tasks per subscriber request."""
+        loop = asyncio.get_running_loop()
+        while True:
+            # One delivery task collects at a time, so a burst forms one
+            # batch; delivery of collected batches runs concurrently
+            async with self._collecting:
+                task_ids = await self._collect_batch(loop)
+
+            # Open one batch per subscriber, taking a slot of its host
+            batches: dict[tuple[str, str | None], list[Any]] = {}
+            admitted: list[UUID] = []
+            for task_id in task_ids:
+                config = self._mailboxes[task_id][0][0]
+                key = (config.get("url", ""), config.get("token"))
+                if key not in batches:
+                    host = urlparse(key[0]).netloc
+                    in_flight = self._host_in_flight.get(host, 0)
+                    if self.max_per_host and in_flight >= self.max_per_host:
+                        # Set aside until a delivery to this host finishes
+                        self._host_waiting.setdefault(host, deque()).append(task_id)
+                        continue
+                    self._host_in_flight[host] = in_flight + 1
+                    batches[key] = [config, []]
+                admitted.append(task_id)
+
+                # Take the task's events up to the first for another subscriber
+                mailbox = self._mailboxes[task_id]
+                while mailbox:
+                    config = mailbox[0][0]
+                    if (config.get("url", ""), config.get("token")) != key:
+                        break
+                    batches[key][1].append(mailbox.popleft()[1])
+
+            await asyncio.gather(
+                *(
+                    self._deliver_batch(config, events)
+                    for config, events in batches.values()
+                )
+            )
+
+            self._pending -= sum(len(events) for _, events in batches.values())
+            for task_id in admitted:
+                if self._mailboxes[task_id]:
+                    self._ready.put_nowait(task_id)
+                else:
+                    del self._mailboxes[task_id]
+            if self._pending == 0:
+                self._idle.set()
+
+    async def _collect_batch(self, loop: asyncio.AbstractEventLoop) -> list[UUID]:
+        """Wait for ready tasks until the window closes or the batch is full."""
+        task_ids = [await self._ready.get()]
+        deadline = loop.time() + self.batch_window
+        while (
+            sum(len(self._mailboxes[task_id]) for task_id in task_ids)
+            < self.batch_max_events
+        ):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                task_ids.append(await asyncio.wait_for(self._ready.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return task_ids
+
+    async def _deliver_batch(
+        self, config: PushNotificationConfig, events: list[dict[str, Any]]
+    ) -> None:
+        """Deliver one subscriber's batch, then free its host slot.
+
+        The events are counted as dropped if delivery fails.
+        """
+        assert self.deliver_many is not None
+        try:
+            delivered = await self.deliver_many(config, events)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Unexpected error delivering push notification batch",
+                events=len(events),
+                error=str(e),
+            )
+            delivered = False
+        self._release_host(urlparse(config.get("url", "")).netloc)
+        if not delivered:
+            self.dropped_count += len(events)
+            notifications_dropped.add(len(events))
+
+    def _release_host(self, host: str) -> None:
+        """Free a delivery slot of a host and wake a task waiting for it."""
+        in_flight = self._host_in_flight[host] - 1
+        if in_flight:
+            self._host_in_flight[host] = in_flight
+        else:
+            del self._host_in_flight[host]
+        waiting = self._host_waiting.get(host)
+        if waiting:
+            self._ready.put_nowait(waiting.popleft())
+            if not waiting:
+                del self._host_waiting[host]
@@ -0,0 +1,267 @@
+"""Durable notification outbox dispatcher.
+
+Lifecycle events are written to the storage outbox
+(``Storage.enqueue_notification``) by whichever pod changes the task's
+state. Every pod runs an OutboxDispatcher that claims due events with a
+lease and hands them to its local NotificationDeliveryQueue, so any pod can
+deliver any task's webhooks:
+
+    worker ──enqueue──▶ outbox (storage) ──claim (lease)──▶ delivery queue ──▶ webhook
+
+Delivery is at-least-once. A delivered event is acknowledged (deleted). A
+failed one is retried with exponential backoff until ``max_attempts``; an
+event held back by an open circuit breaker is rescheduled for the end of
+the cool-down without counting an attempt. An
+event whose pod dies mid-delivery is reclaimed when its lease expires.
+Subscribers deduplicate by ``event_id``. Only the oldest pending event of a
+task is claimable, so a task's events still arrive in sequence order.
+
+With a ``batch_window``, claimed events of one subscriber are posted
+together (``NotificationService.send_events``) and acknowledged or retried
+together.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from bindu.common.protocol.types import PushNotificationConfig
+from bindu.server.storage.base import Storage
+from bindu.utils.logging import get_logger
+from bindu.utils.notifications import (
+    NotificationCircuitOpenError,
+    NotificationDeliveryError,
+    NotificationService,
+)
+
+from .delivery_queue import NotificationDeliveryQueue
+
+logger = get_logger("bindu.server.notifications.outbox")
+
+
+class OutboxDispatcher:
+    """Claims events from the storage outbox and delivers them.
+
+    Use as an async context manager: entering starts the claim loop and the
+    delivery tasks; exiting stops claiming and flushes the local queue.
+    """
+
+    def __init__(
+        self,
+        storage: Storage[Any],
+        notification_service: NotificationService,
+        max_in_flight: int = 100,
+        concurrency: int = 4,
+        lease_timeout: float = 60.0,
+        poll_interval: float = 1.0,
+        max_attempts: int = 8,
+        base_backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        shutdown_timeout: float = 5.0,
+        max_per_host: int = 0,
+        batch_window: float = 0.0,
+        batch_max_events: int = 100,
+    ):
+        """Initialize the dispatcher.
+
+        Args:
+            storage: Storage holding the outbox
+            notification_service: Service posting events to webhooks
+            max_in_flight: Events claimed by this pod at once
+            concurrency: Delivery tasks on this pod
+            lease_timeout: Seconds a claim is exclusive; must exceed the
+                worst-case delivery time (timeouts and in-request retries)
+            poll_interval: Seconds between claims when idle (events
+                enqueued on this pod wake the loop immediately)
+            max_attempts: Deliveries before an event is abandoned
+            base_backoff: Seconds before the first retry, doubled per attempt
+            max_backoff: Upper bound on the retry delay
+            shutdown_timeout: Seconds to keep delivering on exit
+            max_per_host: Deliveries in flight to one webhook host
+                (0 for no limit beyond concurrency)
+            batch_window: Seconds to collect claimed events into one request
+                per subscriber (0 posts each event on its own)
+            batch_max_events: Events after which a batch stops collecting
+        """
+        self.storage = storage
+        self.notification_service = notification_service
+        self.max_in_flight = max(1, max_in_flight)
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        self.max_attempts = max(1, max_attempts)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._queue = NotificationDeliveryQueue(
+            self._deliver,
+            max_pending=self.max_in_flight,
+            concurrency=concurrency,
+            shutdown_timeout=shutdown_timeout,
+            max_per_host=max_per_host,
+            deliver_many=self._deliver_batch,
+            batch_window=batch_window,
+            batch_max_events=batch_max_events,
+        )
+        self._attempts: dict[str, int] = {}
+        self._wakeup = asyncio.Event()
+        self._claim_task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> OutboxDispatcher:
+        """Start delivering and claiming."""
+        await self._queue.__aenter__()
+        self._claim_task = asyncio.create_task(
+            self._claim_loop(), name="notification-outbox"
+        )
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Stop claiming, then flush claimed events (unfinished ones are reclaimed)."""
+        if self._claim_task is not None:
+            self._claim_task.cancel()
+            await asyncio.gather(self._claim_task, return_exceptions=True)
+            self._claim_task = None
+        await self._queue.__aexit__(exc_type, exc_value, traceback)
+
+    def wake(self) -> None:
+        """Claim immediately instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    @property
+    def queue(self) -> NotificationDeliveryQueue:
+        """The local queue delivering claimed events."""
+        return self._queue
+
+    def retry_delay(self, attempts: int) -> float:
+        """Return the backoff before the next attempt after `attempts` failures."""
+        return min(self.max_backoff, self.base_backoff * 2 ** max(0, attempts - 1))
+
+    async def _claim_loop(self) -> None:
+        """Claim due events while the local queue has room."""
+        while True:
+            self._wakeup.clear()
+            free = self.max_in_flight - self._queue.pending
+            claimed = 0
+            if free > 0:
+                try:
+                    entries = await self.storage.claim_notifications(
+                        free, self.lease_timeout
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to claim outbox notifications: {e}")
+                    entries = []
+                for entry in entries:
+                    event_id = entry["event_id"]
+                    if event_id in self._attempts:
+                        continue  # reclaimed while still in flight here
+                    self._attempts[event_id] = entry["attempts"]
+                    self._queue.enqueue(
+                        entry["task_id"], entry["config"], entry["event"]
+                    )
+                    claimed += 1
+
+            if claimed and claimed == free:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _deliver(
+        self, config: PushNotificationConfig, event: dict[str, Any]
+    ) -> bool:
+        """Deliver one claimed event and record the outcome in the outbox."""
+        return await self._send(
+            [event], lambda: self.notification_service.send_event(config, event)
+        )
+
+    async def _deliver_batch(
+        self, config: PushNotificationConfig, events: list[dict[str, Any]]
+    ) -> bool:
+        """Deliver claimed events of one subscriber in a single request."""
+        return await self._send(
+            events, lambda: self.notification_service.send_events(config, events)
+        )
+
+    async def _send(
+        self, events: list[dict[str, Any]], send: Callable[[], Awaitable[None]]
+    ) -> bool:
+        """Run a delivery and acknowledge, retry or abandon its events.
+
+        Returns:
+            False if any event was abandoned
+        """
+        try:
+            await send()
+        except NotificationCircuitOpenError as e:
+            # The webhook was never contacted: wait out the cool-down without
+            # using up an attempt, however long the host stays down. The floor
+            # keeps a zero hint (e.g. a half-open trial in flight) from
+            # re-claiming the event in a tight loop.
+            delay = max(e.retry_after, self.base_backoff)
+            for event in events:
+                event_id = str(event["event_id"])
+                logger.info(
+                    "Push notification host circuit open; deferring",
+                    event_id=event_id,
+                    task_id=event.get("task_id"),
+                    retry_in=delay,
+                )
+                await self._settle(event_id, delay, count_attempt=False)
+            return True
+        except Exception as e:
+            permanent = isinstance(e, ValueError) or (
+                isinstance(e, NotificationDeliveryError)
+                and e.status is not None
+                and 400 <= e.status < 500
+                and e.status != 429
+            )
+            abandoned = False
+            for event in events:
+                event_id = str(event["event_id"])
+                attempts = self._attempts.get(event_id, 0) + 1
+                if permanent or attempts >= self.max_attempts:
+                    logger.warning(
+                        "Abandoning push notification",
+                        event_id=event_id,
+                        task_id=event.get("task_id"),
+                        attempts=attempts,
+                        error=str(e),
+                    )
+                    await self._settle(event_id, None)
+                    abandoned = True
+                    continue
+
+                delay = self.retry_delay(attempts)
+                logger.info(
+                    "Push notification delivery failed; retrying",
+                    event_id=event_id,
+                    task_id=event.get("task_id"),
+                    attempts=attempts,
+                    retry_in=delay,
+                )
+                # Not a drop: the event stays in the outbox
+                await self._settle(event_id, delay)
+            return not abandoned
+
+        for event in events:
+            await self._settle(str(event["event_id"]), None)
+        return True
+
+    async def _settle(
+        self, event_id: str, retry_delay: float | None, count_attempt: bool = True
+    ) -> None:
+        """Acknowledge (retry_delay None) or reschedule an event."""
+        try:
+            if retry_delay is None:
+                await self.storage.ack_notification(event_id)
+            else:
+                await self.storage.retry_notification(
+                    event_id, retry_delay, count_attempt=count_attempt
+                )
+        except Exception as e:
+            # The lease expires and the event is delivered again
+            logger.warning(f"Could not update outbox event {event_id}: {e}")
+        finally:
+            self._attempts.pop(event_id, None)
+            self.wake()
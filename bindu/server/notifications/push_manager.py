@@ -35,8 +35,12 @@ from bindu.common.protocol.types import (
     TaskPushNotificationConfig,
 )
 
+from ...settings import app_settings
 from ...utils.logging import get_logger
 from ...utils.notifications import NotificationDeliveryError, NotificationService
+from ..storage import InMemoryStorage, Storage
+from .delivery_queue import NotificationDeliveryQueue
+from .outbox import OutboxDispatcher
 
 logger = get_logger("pebbling.server.notifications.push_manager")
 
@@ -48,18 +52,104 @@ PUSH_NOT_SUPPORTED_MESSAGE = (
 
 @dataclass
 class PushNotificationManager:
-    """Manages push notifications for task lifecycle events."""
+    """Manages push notifications for task lifecycle events.
+
+    Subscriber configs and per-task sequence numbers live in storage, so any
+    pod can notify about any task. While entered as an async context
+    manager, lifecycle events are written to the storage outbox and
+    delivered by this pod's OutboxDispatcher (or by any other pod's), so
+    callers never wait on a webhook. With ``notifications.outbox_enabled``
+    off, events go to a process-local NotificationDeliveryQueue instead, or
+    are delivered inline when ``notifications.delivery_queue_size`` is 0.
+    """
 
     manifest: Any | None = None
+    storage: Storage[Any] | None = None
     notification_service: NotificationService = field(
-        default_factory=NotificationService
-    )
-    _push_notification_configs: dict[uuid.UUID, PushNotificationConfig] = field(
-        default_factory=dict, init=False
-    )
-    _notification_sequences: dict[uuid.UUID, int] = field(
-        default_factory=dict, init=False
+        default_factory=NotificationService.from_settings
     )
+    _delivery_queue: NotificationDeliveryQueue | None = field(default=None, init=False)
+    _dispatcher: OutboxDispatcher | None = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        """Fall back to process-local storage for configs and the outbox."""
+        if self.storage is None:
+            self.storage = InMemoryStorage()
+
+    @property
+    def _storage(self) -> Storage[Any]:
+        assert self.storage is not None
+        return self.storage
+
+    async def __aenter__(self) -> PushNotificationManager:
+        """Start background delivery when push notifications are supported."""
+        if not self.is_push_supported():
+            return self
+        settings = app_settings.notifications
+        if settings.outbox_enabled:
+            self._dispatcher = OutboxDispatcher(
+                self._storage,
+                self.notification_service,
+                max_in_flight=max(1, settings.delivery_queue_size),
+                concurrency=settings.delivery_concurrency,
+                lease_timeout=settings.outbox_lease_timeout,
+                poll_interval=settings.outbox_poll_interval,
+                max_attempts=settings.outbox_max_attempts,
+                base_backoff=settings.outbox_base_backoff,
+                max_backoff=settings.outbox_max_backoff,
+                shutdown_timeout=settings.delivery_shutdown_timeout,
+                max_per_host=settings.delivery_concurrency_per_host,
+                batch_window=settings.batch_window,
+                batch_max_events=settings.batch_max_events,
+            )
+            await self._dispatcher.__aenter__()
+        elif settings.delivery_queue_size > 0:
+            self._delivery_queue = NotificationDeliveryQueue(
+                self.deliver_event,
+                max_pending=settings.delivery_queue_size,
+                concurrency=settings.delivery_concurrency,
+                shutdown_timeout=settings.delivery_shutdown_timeout,
+                max_per_host=settings.delivery_concurrency_per_host,
+                deliver_many=self.deliver_events,
+                batch_window=settings.batch_window,
+                batch_max_events=settings.batch_max_events,
+            )
+            await self._delivery_queue.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Flush queued events (bounded by the shutdown timeout) and stop."""
+        dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is not None:
+            await dispatcher.__aexit__(exc_type, exc_value, traceback)
+        queue, self._delivery_queue = self._delivery_queue, None
+        if queue is not None:
+            await queue.__aexit__(exc_type, exc_value, traceback)
+        await self.notification_service.aclose()
+
+    @property
+    def delivery_queue(self) -> NotificationDeliveryQueue | None:
+        """The process-local delivery queue, if running."""
+        return self._delivery_queue
+
+    @property
+    def dispatcher(self) -> OutboxDispatcher | None:
+        """The outbox dispatcher, if running."""
+        return self._dispatcher
+
+    def delivery_stats(self) -> dict[str, Any]:
+        """Return delivery mode, queue occupancy and per-host circuit states."""
+        if self._dispatcher is not None:
+            mode, queue = "outbox", self._dispatcher.queue
+        elif self._delivery_queue is not None:
+            mode, queue = "queue", self._delivery_queue
+        else:
+            mode, queue = "inline", None
+        return {
+            "mode": mode,
+            "queue": queue.stats() if queue is not None else None,
+            "circuits": self.notification_service.circuit_states(),
+        }
 
     def is_push_supported(self) -> bool:
         """Check if push notifications are supported by the manifest."""
@@ -85,48 +175,48 @@ class PushNotificationManager:
             sanitized["authentication"] = authentication
         return cast(PushNotificationConfig, sanitized)
 
-    def register_push_config(
+    async def register_push_config(
         self, task_id: uuid.UUID, config: PushNotificationConfig
     ) -> None:
         """Register a push notification configuration for a task."""
         config_copy = self._sanitize_push_config(config)
         self.notification_service.validate_config(config_copy)
-        self._push_notification_configs[task_id] = config_copy
-        self._notification_sequences.setdefault(task_id, 0)
+        await self._storage.save_push_config(task_id, config_copy)
 
-    def remove_push_config(self, task_id: uuid.UUID) -> PushNotificationConfig | None:
+    async def remove_push_config(
+        self, task_id: uuid.UUID
+    ) -> PushNotificationConfig | None:
         """Remove push notification configuration for a task."""
-        self._notification_sequences.pop(task_id, None)
-        return self._push_notification_configs.pop(task_id, None)
+        return await self._storage.delete_push_config(task_id)
 
-    def get_push_config(self, task_id: uuid.UUID) -> PushNotificationConfig | None:
+    async def get_push_config(
+        self, task_id: uuid.UUID
+    ) -> PushNotificationConfig | None:
         """Get push notification configuration for a task."""
-        return self._push_notification_configs.get(task_id)
+        return await self._storage.load_push_config(task_id)
 
-    def build_task_push_config(self, task_id: uuid.UUID) -> TaskPushNotificationConfig:
+    def build_task_push_config(
+        self, task_id: uuid.UUID, config: PushNotificationConfig
+    ) -> TaskPushNotificationConfig:
         """Build a TaskPushNotificationConfig response."""
-        config = self._push_notification_configs.get(task_id)
-        if config is None:
-            raise KeyError("No push notification configuration for task")
         return TaskPushNotificationConfig(
             id=task_id,
             push_notification_config=self._sanitize_push_config(config),
         )
 
-    def _next_sequence(self, task_id: uuid.UUID) -> int:
-        """Get the next sequence number for a task's notifications."""
-        current = self._notification_sequences.get(task_id, 0) + 1
-        self._notification_sequences[task_id] = current
-        return current
-
     def build_lifecycle_event(
-        self, task_id: uuid.UUID, context_id: uuid.UUID, state: str, final: bool
+        self,
+        task_id: uuid.UUID,
+        context_id: uuid.UUID,
+        state: str,
+        final: bool,
+        sequence: int,
     ) -> dict[str, Any]:
         """Build a lifecycle event payload for push notification."""
         timestamp = datetime.now(timezone.utc).isoformat()
         return {
             "event_id": str(uuid.uuid4()),
-            "sequence": self._next_sequence(task_id),
+            "sequence": sequence,
             "timestamp": timestamp,
             "kind": "status-update",
             "task_id": str(task_id),
@@ -138,32 +228,82 @@ class PushNotificationManager:
     async def notify_lifecycle(
         self, task_id: uuid.UUID, context_id: uuid.UUID, state: str, final: bool
     ) -> None:
-        """Send a lifecycle notification for a task."""
+        """Send a lifecycle notification for a task.
+
+        With background delivery running the event is only enqueued (in the
+        durable outbox, or the local queue).
+        """
         if not self.is_push_supported():
             return
-        config = self._push_notification_configs.get(task_id)
-        if not config:
+        claimed = await self._storage.next_push_sequence(task_id)
+        if claimed is None:
+            return
+        config, sequence = claimed
+        event = self.build_lifecycle_event(task_id, context_id, state, final, sequence)
+        if self._dispatcher is not None:
+            await self._storage.enqueue_notification(task_id, config, event)
+            self._dispatcher.wake()
+            return
+        if self._delivery_queue is not None:
+            self._delivery_queue.enqueue(task_id, config, event)
             return
-        event = self.build_lifecycle_event(task_id, context_id, state, final)
+        await self.deliver_event(config, event)
+
+    async def deliver_event(
+        self, config: PushNotificationConfig, event: dict[str, Any]
+    ) -> bool:
+        """Deliver one event, logging failures.
+
+        Returns:
+            True if the subscriber accepted the event
+        """
         try:
             await self.notification_service.send_event(config, event)
+            return True
         except NotificationDeliveryError as exc:
             logger.warning(
                 "Push notification delivery failed",
-                task_id=str(task_id),
-                context_id=str(context_id),
-                state=state,
+                task_id=event.get("task_id"),
+                context_id=event.get("context_id"),
+                state=event.get("status", {}).get("state"),
                 status=exc.status,
                 message=str(exc),
             )
         except Exception as exc:  # pragma: no cover - defensive logging
             logger.error(
                 "Unexpected error delivering push notification",
-                task_id=str(task_id),
-                context_id=str(context_id),
-                state=state,
+                task_id=event.get("task_id"),
+                context_id=event.get("context_id"),
+                state=event.get("status", {}).get("state"),
                 error=str(exc),
             )
+        return False
+
+    async def deliver_events(
+        self, config: PushNotificationConfig, events: list[dict[str, Any]]
+    ) -> bool:
+        """Deliver events of one subscriber in a single request, logging failures.
+
+        Returns:
+            True if the subscriber accepted the batch
+        """
+        try:
+            await self.notification_service.send_events(config, events)
+            return True
+        except NotificationDeliveryError as exc:
+            logger.warning(
+                "Push notification batch delivery failed",
+                events=len(events),
+                status=exc.status,
+                message=str(exc),
+            )
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.error(
+                "Unexpected error delivering push notification batch",
+                events=len(events),
+                error=str(exc),
+            )
+        return False
 
     def schedule_notification(
         self, task_id: uuid.UUID, context_id: uuid.UUID, state: str, final: bool
@@ -171,8 +311,6 @@ class PushNotificationManager:
         """Schedule a notification to be sent asynchronously."""
         if not self.is_push_supported():
             return
-        if task_id not in self._push_notification_configs:
-            return
         asyncio.create_task(self.notify_lifecycle(task_id, context_id, state, final))
 
     def _jsonrpc_error(
@@ -226,7 +364,7 @@ class PushNotificationManager:
             )
 
         try:
-            self.register_push_config(task_id, push_config)
+            await self.register_push_config(task_id, push_config)
         except ValueError as exc:
             return self._jsonrpc_error(
                 SetTaskPushNotificationResponse,
@@ -242,7 +380,9 @@ class PushNotificationManager:
         return SetTaskPushNotificationResponse(
             jsonrpc="2.0",
             id=request["id"],
-            result=self.build_task_push_config(task_id),
+            result=self.build_task_push_config(
+                task_id, self._sanitize_push_config(push_config)
+            ),
         )
 
     async def get_task_push_notification(
@@ -255,7 +395,8 @@ class PushNotificationManager:
             )
 
         task_id = request["params"]["task_id"]
-        if task_id not in self._push_notification_configs:
+        config = await self.get_push_config(task_id)
+        if config is None:
             return self._jsonrpc_error(
                 GetTaskPushNotificationResponse,
                 request["id"],
@@ -265,7 +406,7 @@ class PushNotificationManager:
         return GetTaskPushNotificationResponse(
             jsonrpc="2.0",
             id=request["id"],
-            result=self.build_task_push_config(task_id),
+            result=self.build_task_push_config(task_id, config),
         )
 
     async def list_task_push_notifications(
@@ -278,7 +419,8 @@ class PushNotificationManager:
             )
 
         task_id = request["params"]["id"]
-        if task_id not in self._push_notification_configs:
+        config = await self.get_push_config(task_id)
+        if config is None:
             return self._jsonrpc_error(
                 ListTaskPushNotificationConfigResponse,
                 request["id"],
@@ -288,7 +430,7 @@ class PushNotificationManager:
         return ListTaskPushNotificationConfigResponse(
             jsonrpc="2.0",
             id=request["id"],
-            result=self.build_task_push_config(task_id),
+            result=self.build_task_push_config(task_id, config),
         )
 
     async def delete_task_push_notification(
@@ -304,7 +446,7 @@ class PushNotificationManager:
         task_id = params["id"]
         config_id = params["push_notification_config_id"]
 
-        existing = self._push_notification_configs.get(task_id)
+        existing = await self.get_push_config(task_id)
         if existing is None:
             return self._jsonrpc_error(
                 DeleteTaskPushNotificationConfigResponse,
@@ -319,7 +461,7 @@ class PushNotificationManager:
                 "Push notification configuration identifier mismatch.",
             )
 
-        removed = self.remove_push_config(task_id)
+        removed = await self.remove_push_config(task_id)
         if removed is None:
             return self._jsonrpc_error(
                 DeleteTaskPushNotificationConfigResponse,
@@ -24,6 +24,10 @@ Think of this as the restaurant's order board system catalog:
 2. SCHEDULER IMPLEMENTATIONS:
    - InMemoryScheduler: Simple whiteboard system (development/testing)
    - RedisScheduler: Distributed cloud system (production/multi-process)
+   - RedisStreamScheduler: Cloud system with order receipts - an order stays on
+     the board until a cook confirms it is done (at-least-once delivery)
+   - PostgresScheduler: Orders kept in the same ledger as the receipts - no
+     extra cloud service, cooks grab the next unclaimed order (SKIP LOCKED)
 
 3. TASK OPERATIONS:
    - TaskOperation: Union type for all task operations (run, cancel, pause, resume)
@@ -37,6 +41,8 @@ Think of this as the restaurant's order board system catalog:
 AVAILABLE SCHEDULER OPTIONS:
 - InMemoryScheduler: Fast in-memory task queue for single-process deployments
 - RedisScheduler: Distributed task queue using Redis for multi-process systems
+- RedisStreamScheduler: Redis Streams consumer groups with acks, reclaim and dead-lettering
+- PostgresScheduler: PostgreSQL queue table with SKIP LOCKED claims, leases and LISTEN/NOTIFY
 """
 
 from __future__ import annotations as _annotations
@@ -47,6 +53,13 @@ from .base import Scheduler, TaskOperation
 # Export all scheduler implementations
 from .memory_scheduler import InMemoryScheduler
 from .redis_scheduler import RedisScheduler
+from .redis_stream_scheduler import RedisStreamScheduler
+
+# Conditional import of PostgresScheduler (requires SQLAlchemy)
+try:
+    from .postgres_scheduler import PostgresScheduler
+except ImportError:
+    PostgresScheduler = None  # type: ignore[assignment]  # SQLAlchemy not installed
 
 __all__ = [
     # Base interface
@@ -55,4 +68,6 @@ __all__ = [
     # Scheduler implementations
     "InMemoryScheduler",
     "RedisScheduler",
+    "RedisStreamScheduler",
+    "PostgresScheduler",
 ]
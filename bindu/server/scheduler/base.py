@@ -5,11 +5,12 @@ from __future__ import annotations as _annotations
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
-from typing import Annotated, Any, Generic, Literal, TypeVar
+from typing import Annotated, Any, Awaitable, Callable, Generic, Literal, TypeVar
+from uuid import UUID
 
 from opentelemetry.trace import Span, get_tracer
 from pydantic import Discriminator
-from typing_extensions import Self, TypedDict
+from typing_extensions import NotRequired, Self, TypedDict
 
 from bindu.common.protocol.types import TaskIdParams, TaskSendParams
 from bindu.utils.logging import get_logger
@@ -17,11 +18,48 @@ from bindu.utils.logging import get_logger
 tracer = get_tracer(__name__)
 logger = get_logger("bindu.server.scheduler.base")
 
+BatchSize = int | Callable[[], int]
+"""A fixed batch size, or a callable evaluated before each fetch."""
+
+Priority = Literal["control", "interactive", "batch"]
+"""Scheduling class of a task operation, highest first."""
+
+PRIORITIES: tuple[Priority, ...] = ("control", "interactive", "batch")
+"""Priority lanes in the order they are drained."""
+
+
+def resolve_batch_size(max_batch_size: BatchSize) -> int:
+    """Return the current batch size limit (never below 1)."""
+    size = max_batch_size if isinstance(max_batch_size, int) else max_batch_size()
+    return max(1, size)
+
+
+class SchedulerQueueFullError(Exception):
+    """Raised when a scheduler refuses a task because its queue is full.
+
+    Attributes:
+        retry_after: Suggested number of seconds before the client retries
+    """
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        """Initialize the error with a message and retry hint."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
 
 @dataclass
 class Scheduler(ABC):
     """The scheduler class is in charge of scheduling the tasks."""
 
+    on_task_dropped: Callable[[TaskSendParams, str], Awaitable[None]] | None = None
+    """Optional hook called with (params, reason) when a queued run is dropped unexecuted."""
+
+    default_priority: Priority = "interactive"
+    """Lane for run operations whose message metadata names no priority."""
+
+    fairness_weights: dict[str, int] | None = None
+    """Operations a fairness key may take per round-robin turn (default 1)."""
+
     @abstractmethod
     async def run_task(self, params: TaskSendParams) -> None:
         """Send a task to be executed by the worker."""
@@ -42,6 +80,15 @@ class Scheduler(ABC):
         """Resume a task."""
         raise NotImplementedError("send_resume_task is not implemented yet.")
 
+    async def run_tasks(self, params_list: list[TaskSendParams]) -> None:
+        """Send several tasks to be executed by the worker.
+
+        Backends that can enqueue in one round trip override this; the
+        default schedules the tasks one by one.
+        """
+        for params in params_list:
+            await self.run_task(params)
+
     @abstractmethod
     async def __aenter__(self) -> Self:
         """Enter async context manager."""
@@ -52,6 +99,98 @@ class Scheduler(ABC):
         """Exit async context manager."""
         ...
 
+    async def ack_task_operation(self, task_operation: TaskOperation) -> None:
+        """Acknowledge that a received task operation has been fully handled.
+
+        Workers call this once an operation finished (successfully or not).
+        At-least-once backends use it to stop redelivery; operations that are
+        never acknowledged (e.g. the worker crashed) are delivered again.
+        Backends without acknowledgements ignore it.
+        """
+        return None
+
+    async def get_queue_stats(self) -> dict[str, Any]:
+        """Return queue occupancy information for monitoring.
+
+        Backends without a bounded or inspectable queue return an empty dict.
+        """
+        return {}
+
+    # -------------------------------------------------------------------------
+    # Cancel Broadcast
+    # -------------------------------------------------------------------------
+    #
+    # A cancel operation reaches whichever worker dequeues it. Backends shared
+    # by several processes fan the task ID out to every worker so the one
+    # executing the task can abort it. In-process backends have a single
+    # worker, which already knows its running tasks.
+
+    async def broadcast_cancel(self, task_id: UUID) -> None:
+        """Ask every worker sharing this scheduler to abort ``task_id``."""
+        return None
+
+    async def receive_cancellations(self) -> AsyncIterator[UUID]:
+        """Yield task IDs whose cancellation another worker broadcast.
+
+        Backends without cross-process delivery yield nothing.
+        """
+        return
+        yield
+
+    # -------------------------------------------------------------------------
+    # Priority Lanes and Fairness
+    # -------------------------------------------------------------------------
+    #
+    # Every backend keeps one lane per priority and drains them strictly in
+    # PRIORITIES order, so a cancel never waits behind queued runs. Within a
+    # lane, operations are taken weighted round-robin across fairness keys:
+    # a client that queues thousands of tasks gets its weight's share of
+    # turns instead of the whole queue.
+
+    def priority_of(self, task_operation: TaskOperation) -> Priority:
+        """Return the lane of an operation.
+
+        Control operations (cancel, pause, resume) always use the control
+        lane. Run operations use ``message.metadata["priority"]`` when it is
+        "interactive" or "batch", else ``default_priority``.
+        """
+        if task_operation["operation"] != "run":
+            return "control"
+        message = task_operation["params"].get("message") or {}
+        priority = (message.get("metadata") or {}).get("priority")
+        if priority in ("interactive", "batch"):
+            return priority
+        return self.default_priority
+
+    def fairness_key_of(self, task_operation: TaskOperation) -> str:
+        """Return the key operations are round-robined across within a lane.
+
+        The authenticated client identity (``params.metadata["client_id"]``)
+        when the request carried one, otherwise the context ID.
+        """
+        params = task_operation["params"]
+        client_id = (params.get("metadata") or {}).get("client_id")
+        if client_id:
+            return f"client:{client_id}"
+        return f"context:{params.get('context_id', '')}"
+
+    def weight_of(self, fairness_key: str) -> int:
+        """Return the round-robin weight of a fairness key (at least 1)."""
+        if not self.fairness_weights:
+            return 1
+        return max(1, self.fairness_weights.get(fairness_key, 1))
+
+    async def _notify_task_dropped(self, params: TaskSendParams, reason: str) -> None:
+        """Invoke ``on_task_dropped`` for a run operation that will never execute."""
+        if self.on_task_dropped is None:
+            return
+        try:
+            await self.on_task_dropped(params, reason)
+        except Exception as e:
+            logger.warning(
+                f"on_task_dropped hook failed for {params.get('task_id')}: {e}"
+            )
+
     @abstractmethod
     def receive_task_operations(self) -> AsyncIterator[TaskOperation]:
         """Receive task operations from the broker.
@@ -60,6 +199,19 @@ class Scheduler(ABC):
         between the workers.
         """
 
+    async def receive_task_operation_batches(
+        self, max_batch_size: BatchSize
+    ) -> AsyncIterator[list[TaskOperation]]:
+        """Receive task operations in batches of at least one.
+
+        ``max_batch_size`` may be a callable; it is evaluated right before each
+        fetch, so a worker can size every batch to its free capacity. Backends
+        that can drain several operations per round trip override this; the
+        default yields one operation per batch.
+        """
+        async for task_operation in self.receive_task_operations():
+            yield [task_operation]
+
 
 OperationT = TypeVar("OperationT")
 ParamsT = TypeVar("ParamsT")
@@ -71,6 +223,11 @@ class _TaskOperation(TypedDict, Generic[OperationT, ParamsT]):
     operation: OperationT
     params: ParamsT
     _current_span: Span
+    """Producer span; after crossing an external queue, its remote context."""
+    _enqueued_at: NotRequired[float]
+    """Unix time the operation was enqueued (used to record queue wait)."""
+    _delivery_tag: NotRequired[str]
+    """Backend handle used by ``ack_task_operation`` (set by at-least-once schedulers)."""
 
 
 _RunTask = _TaskOperation[Literal["run"], TaskSendParams]
@@ -0,0 +1,237 @@
+"""Wire codecs for task operations sent through external queues.
+
+Redis-backed schedulers turn each ``TaskOperation`` into a string payload.
+Older releases used ``json.dumps`` after a recursive UUID-to-string pass,
+and decoded by calling ``UUID()`` on every string in the params tree. That
+cost one exception per ordinary string and turned user text that looked like
+a UUID into a ``UUID`` object.
+
+Codecs here restore UUIDs only at the fields the A2A schema declares as IDs
+(``_UUID_FIELDS``); everything else round-trips untouched.
+
+Payload framing:
+
+    v0 (codec "json")     {"operation": ...}            plain JSON, no prefix
+    v1 (codec "orjson")   <0x01>{"operation": ...}      version byte 0x01 + orjson
+
+Decoding dispatches on the first character, so consumers read both formats.
+
+Documents carry the producer's W3C trace context (``traceparent`` and
+``tracestate``, injected with the global OpenTelemetry propagator) and the
+enqueue time. Decoded operations carry the remote producer span context and
+``_enqueued_at``, so the worker continues the producer's trace and records
+how long the operation waited in the queue.
+For a rolling upgrade, deploy with ``SCHEDULER__CODEC=json`` until every
+consumer runs this version, then switch to ``orjson``. Payloads stay valid
+UTF-8 because Redis clients are created with ``decode_responses=True``.
+"""
+
+from __future__ import annotations as _annotations
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar, Literal
+from uuid import UUID
+
+import orjson
+from opentelemetry import propagate
+from opentelemetry.trace import get_current_span, set_span_in_context
+
+from .base import TaskOperation, _CancelTask, _PauseTask, _ResumeTask, _RunTask
+
+CodecName = Literal["json", "orjson"]
+
+# Params fields typed as UUID in bindu.common.protocol.types
+_UUID_FIELDS = frozenset({"task_id", "context_id"})
+_MESSAGE_UUID_FIELDS = frozenset({"message_id", "task_id", "context_id"})
+
+_OPERATIONS = {
+    "run": _RunTask,
+    "cancel": _CancelTask,
+    "pause": _PauseTask,
+    "resume": _ResumeTask,
+}
+
+
+def _as_uuid(value: Any) -> Any:
+    """Parse a UUID string, leaving anything else (e.g. test IDs) unchanged."""
+    if isinstance(value, str):
+        try:
+            return UUID(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _restore_uuids(params: dict[str, Any]) -> dict[str, Any]:
+    """Convert the schema's ID fields back to ``UUID`` in place."""
+    for field in _UUID_FIELDS.intersection(params):
+        params[field] = _as_uuid(params[field])
+
+    message = params.get("message")
+    if isinstance(message, dict):
+        for field in _MESSAGE_UUID_FIELDS.intersection(message):
+            message[field] = _as_uuid(message[field])
+        reference_task_ids = message.get("reference_task_ids")
+        if isinstance(reference_task_ids, list):
+            message["reference_task_ids"] = [
+                _as_uuid(task_id) for task_id in reference_task_ids
+            ]
+    return params
+
+
+def _span_ids(task_operation: TaskOperation) -> tuple[str | None, str | None]:
+    """Return the hex span and trace IDs of the operation's span, if any."""
+    span = task_operation.get("_current_span")
+    span_id = trace_id = None
+    try:
+        if hasattr(span, "get_span_context"):
+            span_context = span.get_span_context()
+        elif hasattr(span, "_context"):
+            span_context = span._context
+        else:
+            return None, None
+        span_id = span_context.span_id
+        trace_id = span_context.trace_id
+    except Exception:
+        return None, None
+    return (
+        format(span_id, "016x") if span_id else None,
+        format(trace_id, "032x") if trace_id else None,
+    )
+
+
+def _to_document(task_operation: TaskOperation) -> dict[str, Any]:
+    """Build the serializable document for a task operation."""
+    span_id, trace_id = _span_ids(task_operation)
+
+    trace_context: dict[str, str] = {}
+    span = task_operation.get("_current_span")
+    if span is not None:
+        propagate.inject(trace_context, context=set_span_in_context(span))
+
+    return {
+        "operation": task_operation["operation"],
+        "params": task_operation["params"],
+        "span_id": span_id,
+        "trace_id": trace_id,
+        "trace_context": trace_context,
+        "enqueued_at": task_operation.get("_enqueued_at", time.time()),
+    }
+
+
+def _from_document(document: dict[str, Any]) -> TaskOperation:
+    """Rebuild a task operation from a decoded document."""
+    operation_type = document["operation"]
+    operation_class = _OPERATIONS.get(operation_type)
+    if operation_class is None:
+        raise ValueError(f"Unknown operation type: {operation_type}")
+
+    # Payloads from releases without trace context fall back to the consumer's span
+    trace_context = document.get("trace_context")
+    if trace_context:
+        current_span = get_current_span(propagate.extract(trace_context))
+    else:
+        current_span = get_current_span()
+
+    task_operation = operation_class(
+        operation=operation_type,
+        params=_restore_uuids(document["params"]),
+        _current_span=current_span,
+    )
+    if document.get("enqueued_at") is not None:
+        task_operation["_enqueued_at"] = document["enqueued_at"]
+    return task_operation
+
+
+class TaskOperationCodec(ABC):
+    """Encodes task operations into versioned string payloads."""
+
+    name: ClassVar[str]
+    version: ClassVar[int]
+
+    @abstractmethod
+    def dumps(self, document: dict[str, Any]) -> str:
+        """Serialize a document, including any version prefix."""
+
+    @abstractmethod
+    def loads(self, payload: str) -> dict[str, Any]:
+        """Parse a payload produced by ``dumps``."""
+
+    def encode(self, task_operation: TaskOperation) -> str:
+        """Serialize a task operation for the queue."""
+        return self.dumps(_to_document(task_operation))
+
+    def decode(self, payload: str | bytes) -> TaskOperation:
+        """Deserialize a payload written by any registered codec version."""
+        return _from_document(decode_document(payload))
+
+
+class JsonCodec(TaskOperationCodec):
+    """Version 0: unprefixed JSON, readable by releases that predate codecs."""
+
+    name = "json"
+    version = 0
+
+    def dumps(self, document: dict[str, Any]) -> str:
+        """Serialize to plain JSON."""
+        return orjson.dumps(document, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, payload: str) -> dict[str, Any]:
+        """Parse plain JSON."""
+        return orjson.loads(payload)
+
+
+class OrjsonCodec(TaskOperationCodec):
+    """Version 1: a version byte followed by orjson output."""
+
+    name = "orjson"
+    version = 1
+    _prefix = chr(version)
+
+    def dumps(self, document: dict[str, Any]) -> str:
+        """Serialize to a version-prefixed JSON payload."""
+        return (
+            self._prefix
+            + orjson.dumps(document, option=orjson.OPT_NON_STR_KEYS).decode()
+        )
+
+    def loads(self, payload: str) -> dict[str, Any]:
+        """Parse a version-prefixed payload."""
+        return orjson.loads(payload[1:])
+
+
+_CODECS: dict[str, TaskOperationCodec] = {
+    codec.name: codec for codec in (JsonCodec(), OrjsonCodec())
+}
+_CODECS_BY_PREFIX: dict[str, TaskOperationCodec] = {
+    chr(codec.version): codec for codec in _CODECS.values() if codec.version
+}
+
+
+def get_codec(codec: CodecName | TaskOperationCodec) -> TaskOperationCodec:
+    """Resolve a codec name (or pass through a codec instance)."""
+    if isinstance(codec, TaskOperationCodec):
+        return codec
+    try:
+        return _CODECS[codec]
+    except KeyError:
+        raise ValueError(
+            f"Unknown task operation codec: {codec}. "
+            f"Supported: {', '.join(sorted(_CODECS))}"
+        ) from None
+
+
+def decode_document(payload: str | bytes) -> dict[str, Any]:
+    """Parse a payload of any supported version into its raw document."""
+    if isinstance(payload, bytes):
+        payload = payload.decode()
+    if not payload:
+        raise ValueError("Empty task operation payload")
+
+    codec = _CODECS_BY_PREFIX.get(payload[0])
+    if codec is not None:
+        return codec.loads(payload)
+    if payload[0] in "{ \t\r\n":
+        return _CODECS["json"].loads(payload)
+    raise ValueError(f"Unsupported task operation payload version: {ord(payload[0])}")
@@ -16,25 +16,43 @@ Usage:
 
 from __future__ import annotations as _annotations
 
+from typing import TYPE_CHECKING
+
 from bindu.common.models import SchedulerConfig
 from bindu.utils.logging import get_logger
 
 from .base import Scheduler
 from .memory_scheduler import InMemoryScheduler
 
+if TYPE_CHECKING:
+    from bindu.server.storage.base import Storage
+
 # Import RedisScheduler conditionally
 try:
     from .redis_scheduler import RedisScheduler
+    from .redis_stream_scheduler import RedisStreamScheduler
 
     REDIS_AVAILABLE = True
 except ImportError:
     RedisScheduler = None  # type: ignore[assignment]  # redis not installed
+    RedisStreamScheduler = None  # type: ignore[assignment]
     REDIS_AVAILABLE = False
 
+# Import PostgresScheduler conditionally
+try:
+    from .postgres_scheduler import PostgresScheduler
+
+    POSTGRES_AVAILABLE = True
+except ImportError:
+    PostgresScheduler = None  # type: ignore[assignment]  # SQLAlchemy not installed
+    POSTGRES_AVAILABLE = False
+
 logger = get_logger("bindu.server.scheduler.factory")
 
 
-async def create_scheduler(config: SchedulerConfig | None = None) -> Scheduler:
+async def create_scheduler(
+    config: SchedulerConfig | None = None, storage: Storage | None = None
+) -> Scheduler:
     """Create scheduler backend based on configuration.
 
     Reads the scheduler type from config and creates the appropriate scheduler instance.
@@ -43,15 +61,20 @@ async def create_scheduler(config: SchedulerConfig | None = None) -> Scheduler:
     Supported backends:
     - "memory": InMemoryScheduler (default, single-process)
     - "redis": RedisScheduler (distributed, multi-process)
+    - "redis_streams": RedisStreamScheduler (distributed, at-least-once delivery)
+    - "postgres": PostgresScheduler (queue table in the PostgresStorage database)
 
     Args:
         config: Scheduler configuration. If None, uses app_settings.scheduler.
+        storage: Storage backend; the postgres scheduler shares its engine.
 
     Returns:
         Scheduler instance ready to use
 
     Raises:
-        ValueError: If unknown scheduler backend is specified or Redis is not available
+        ValueError: If unknown scheduler backend is specified or Redis is not
+            available
+        TypeError: If the postgres scheduler is used without PostgresStorage
         ConnectionError: If unable to connect to Redis
 
     Example:
@@ -68,11 +91,13 @@ async def create_scheduler(config: SchedulerConfig | None = None) -> Scheduler:
         logger.info(f"No scheduler config provided, using settings: {backend}")
 
         if backend == "memory":
-            return InMemoryScheduler()
-        elif backend == "redis":
+            return _create_memory_scheduler()
+        elif backend == "postgres":
+            config = SchedulerConfig(type="postgres")
+        elif backend in ("redis", "redis_streams"):
             # Build config from settings
             config = SchedulerConfig(
-                type="redis",
+                type=backend,
                 redis_url=scheduler_settings.redis_url,
                 redis_host=scheduler_settings.redis_host,
                 redis_port=scheduler_settings.redis_port,
@@ -91,17 +116,22 @@ async def create_scheduler(config: SchedulerConfig | None = None) -> Scheduler:
 
     if backend == "memory":
         logger.info("Using in-memory scheduler (single-process)")
-        return InMemoryScheduler()
+        return _create_memory_scheduler()
+
+    elif backend == "postgres":
+        return _create_postgres_scheduler(storage)
 
-    elif backend == "redis":
-        if not REDIS_AVAILABLE or RedisScheduler is None:
+    elif backend in ("redis", "redis_streams"):
+        if (
+            not REDIS_AVAILABLE
+            or RedisScheduler is None
+            or RedisStreamScheduler is None
+        ):
             raise ValueError(
                 "Redis scheduler requires redis package. "
                 "Install with: pip install redis[hiredis]"
             )
 
-        logger.info("Using Redis scheduler (distributed, multi-process)")
-
         # Build Redis URL if not provided
         redis_url = config.redis_url
         if not redis_url:
@@ -109,21 +139,91 @@ async def create_scheduler(config: SchedulerConfig | None = None) -> Scheduler:
             auth = f":{config.redis_password}@" if config.redis_password else ""
             redis_url = f"redis://{auth}{config.redis_host}:{config.redis_port}/{config.redis_db}"
 
+        if backend == "redis_streams":
+            logger.info("Using Redis Streams scheduler (distributed, at-least-once)")
+            scheduler_settings = app_settings.scheduler
+            return RedisStreamScheduler(
+                redis_url=redis_url,
+                queue_name=config.queue_name,
+                max_connections=config.max_connections,
+                retry_on_timeout=config.retry_on_timeout,
+                codec=scheduler_settings.codec,
+                consumer_group=scheduler_settings.stream_consumer_group,
+                visibility_timeout=scheduler_settings.stream_visibility_timeout,
+                max_deliveries=scheduler_settings.stream_max_deliveries,
+                claim_interval=scheduler_settings.stream_claim_interval,
+                default_priority=scheduler_settings.default_priority,
+                fairness_weights=scheduler_settings.fairness_weights,
+            )
+
+        logger.info("Using Redis scheduler (distributed, multi-process)")
+
         scheduler = RedisScheduler(
             redis_url=redis_url,
             queue_name=config.queue_name,
             max_connections=config.max_connections,
             retry_on_timeout=config.retry_on_timeout,
+            codec=app_settings.scheduler.codec,
+            default_priority=app_settings.scheduler.default_priority,
+            fairness_weights=app_settings.scheduler.fairness_weights,
         )
 
         return scheduler
 
     else:
         raise ValueError(
-            f"Unknown scheduler backend: {backend}. Supported backends: memory, redis"
+            f"Unknown scheduler backend: {backend}. "
+            "Supported backends: memory, redis, redis_streams, postgres"
         )
 
 
+def _create_memory_scheduler() -> InMemoryScheduler:
+    """Create an InMemoryScheduler sized by app_settings.scheduler."""
+    from bindu.settings import app_settings
+
+    scheduler_settings = app_settings.scheduler
+    return InMemoryScheduler(
+        queue_capacity=scheduler_settings.queue_capacity,
+        overflow_policy=scheduler_settings.overflow_policy,
+        block_timeout=scheduler_settings.block_timeout,
+        retry_after=scheduler_settings.retry_after,
+        default_priority=scheduler_settings.default_priority,
+        fairness_weights=scheduler_settings.fairness_weights,
+    )
+
+
+def _create_postgres_scheduler(storage: Storage | None) -> Scheduler:
+    """Create a PostgresScheduler on the engine of the given PostgresStorage."""
+    from bindu.server.storage.postgres_storage import PostgresStorage
+    from bindu.settings import app_settings
+
+    if not POSTGRES_AVAILABLE or PostgresScheduler is None:
+        raise ValueError(
+            "PostgreSQL scheduler requires SQLAlchemy. "
+            "Install with: pip install sqlalchemy[asyncio] asyncpg"
+        )
+    if not isinstance(storage, PostgresStorage):
+        raise TypeError(
+            "PostgreSQL scheduler shares the PostgresStorage connection pool. "
+            "Set STORAGE__BACKEND=postgres to use it."
+        )
+
+    logger.info("Using PostgreSQL scheduler (shared engine, at-least-once)")
+    scheduler_settings = app_settings.scheduler
+    return PostgresScheduler(
+        engine=storage.engine,
+        notify_channel=scheduler_settings.postgres_notify_channel,
+        lease_timeout=scheduler_settings.postgres_lease_timeout,
+        heartbeat_interval=scheduler_settings.postgres_heartbeat_interval,
+        poll_interval=scheduler_settings.postgres_poll_interval,
+        max_deliveries=scheduler_settings.postgres_max_deliveries,
+        codec=scheduler_settings.codec,
+        default_priority=scheduler_settings.default_priority,
+        fairness_weights=scheduler_settings.fairness_weights,
+        fairness_window=scheduler_settings.postgres_fairness_window,
+    )
+
+
 async def close_scheduler(scheduler: Scheduler) -> None:
     """Close scheduler connection gracefully.
 
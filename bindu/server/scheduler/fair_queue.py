@@ -0,0 +1,117 @@
+"""Priority lanes with weighted round-robin across fairness keys.
+
+Used by ``InMemoryScheduler`` (and by stream consumers to order a fetched
+batch). Lanes are drained strictly in ``PRIORITIES`` order. Within a lane,
+each fairness key holds its own FIFO; keys take turns, and a key may take up
+to its weight in consecutive items per turn:
+
+    interactive:  ctx-a [a1 a2 a3 ...]  ─┐
+                  ctx-b [b1]            ─┼─▶ a1, b1, c1, a2, c2, a3, ...
+                  ctx-c [c1 c2]         ─┘
+"""
+
+from __future__ import annotations as _annotations
+
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from itertools import count
+from typing import Generic, TypeVar
+
+from .base import PRIORITIES, Priority
+
+T = TypeVar("T")
+
+
+class _Lane(Generic[T]):
+    """One priority lane: a rotation of per-key FIFOs."""
+
+    def __init__(self) -> None:
+        self.keys: OrderedDict[str, deque[tuple[int, T]]] = OrderedDict()
+        self.weights: dict[str, int] = {}
+        self.credit = 0  # items the head key may still take this turn
+        self.size = 0
+
+    def push(self, seq: int, item: T, key: str, weight: int) -> None:
+        queue = self.keys.get(key)
+        if queue is None:
+            queue = self.keys[key] = deque()
+        queue.append((seq, item))
+        self.weights[key] = weight
+        self.size += 1
+
+    def pop(self) -> T:
+        key, queue = next(iter(self.keys.items()))
+        if self.credit <= 0:
+            self.credit = self.weights[key]
+        _, item = queue.popleft()
+        self.size -= 1
+        self.credit -= 1
+        if not queue:
+            self._drop_key(key)
+        elif self.credit <= 0:
+            self.keys.move_to_end(key)
+        return item
+
+    def remove_oldest(self) -> T:
+        key = min(self.keys, key=lambda k: self.keys[k][0][0])
+        queue = self.keys[key]
+        is_head = key == next(iter(self.keys))
+        _, item = queue.popleft()
+        self.size -= 1
+        if not queue:
+            self._drop_key(key, reset_credit=is_head)
+        return item
+
+    def _drop_key(self, key: str, reset_credit: bool = True) -> None:
+        del self.keys[key]
+        del self.weights[key]
+        if reset_credit:
+            self.credit = 0
+
+
+class FairQueue(Generic[T]):
+    """Strict-priority lanes, each weighted round-robin across fairness keys."""
+
+    def __init__(self) -> None:
+        """Create empty lanes for every priority."""
+        self._lanes: dict[Priority, _Lane[T]] = {p: _Lane() for p in PRIORITIES}
+        self._seq = count()
+
+    def __len__(self) -> int:
+        """Return the number of queued items across all lanes."""
+        return sum(lane.size for lane in self._lanes.values())
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate queued items lane by lane (not in dequeue order)."""
+        for lane in self._lanes.values():
+            for queue in lane.keys.values():
+                for _, item in queue:
+                    yield item
+
+    def push(self, item: T, priority: Priority, key: str, weight: int = 1) -> None:
+        """Append an item to the key's FIFO in the given lane."""
+        self._lanes[priority].push(next(self._seq), item, key, max(1, weight))
+
+    def pop(self) -> T:
+        """Remove and return the next item; raises IndexError when empty."""
+        for lane in self._lanes.values():
+            if lane.size:
+                return lane.pop()
+        raise IndexError("pop from an empty FairQueue")
+
+    def remove_oldest(self, priorities: tuple[Priority, ...]) -> T | None:
+        """Remove the oldest item of the first non-empty lane among ``priorities``."""
+        for priority in priorities:
+            lane = self._lanes[priority]
+            if lane.size:
+                return lane.remove_oldest()
+        return None
+
+    def depths(self) -> dict[str, int]:
+        """Return the number of queued items per lane."""
+        return {priority: lane.size for priority, lane in self._lanes.items()}
+
+    def clear(self) -> None:
+        """Drop every queued item."""
+        for priority in PRIORITIES:
+            self._lanes[priority] = _Lane()
@@ -1,54 +1,212 @@
-"""In-memory scheduler implementation."""
+"""In-memory scheduler implementation.
+
+Task operations are buffered in a bounded in-process queue so that
+``message/send`` returns as soon as the task is queued instead of waiting for
+a worker to become free.
+
+Only ``run`` operations count towards the queue capacity. Control operations
+(cancel, pause, resume) are always accepted so that a full queue can never
+prevent a client from cancelling work.
+
+Overflow policies (applied when ``queue_capacity`` run operations are queued):
+- block: wait up to ``block_timeout`` seconds for space, then reject
+- reject: fail immediately with ``SchedulerQueueFullError``
+- shed_oldest: drop the oldest queued run operation of the lowest non-empty
+  priority lane to make room; the ``on_task_dropped`` hook is told so the
+  task can be marked failed
+
+Operations are dequeued by priority lane (control, interactive, batch) and,
+within a lane, weighted round-robin across fairness keys (see ``FairQueue``).
+"""
 
 from __future__ import annotations as _annotations
 
-from collections.abc import AsyncIterator
-from contextlib import AsyncExitStack
-from typing import Any
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any, Literal
 
 import anyio
+from opentelemetry import metrics
 from opentelemetry.trace import get_current_span
 
 from bindu.common.protocol.types import TaskIdParams, TaskSendParams
 from bindu.server.scheduler.base import (
+    BatchSize,
+    Priority,
     Scheduler,
+    SchedulerQueueFullError,
     TaskOperation,
     _CancelTask,
     _PauseTask,
     _ResumeTask,
     _RunTask,
+    resolve_batch_size,
 )
+from bindu.server.scheduler.fair_queue import FairQueue
 from bindu.utils.logging import get_logger
 from bindu.utils.retry import retry_scheduler_operation
 
 logger = get_logger("bindu.server.scheduler.memory_scheduler")
+meter = metrics.get_meter("bindu.server.scheduler")
+
+queue_depth = meter.create_up_down_counter(
+    "bindu_scheduler_queue_depth",
+    description="Task operations waiting in the in-memory queue",
+    unit="1",
+)
+
+overflow_counter = meter.create_counter(
+    "bindu_scheduler_overflow_total",
+    description="Run operations rejected or shed because the queue was full",
+    unit="1",
+)
+
+OverflowPolicy = Literal["block", "reject", "shed_oldest"]
 
 
 class InMemoryScheduler(Scheduler):
-    """A scheduler that schedules tasks in memory."""
+    """A scheduler that schedules tasks in a bounded in-memory queue."""
 
-    async def __aenter__(self):
-        """Enter async context manager."""
-        self.aexit_stack = AsyncExitStack()
-        await self.aexit_stack.__aenter__()
+    def __init__(
+        self,
+        queue_capacity: int = 1000,
+        overflow_policy: OverflowPolicy = "block",
+        block_timeout: float = 5.0,
+        retry_after: float = 1.0,
+        default_priority: Priority = "interactive",
+        fairness_weights: dict[str, int] | None = None,
+    ):
+        """Initialize the in-memory scheduler.
 
-        self._write_stream, self._read_stream = anyio.create_memory_object_stream[
-            TaskOperation
-        ]()
-        await self.aexit_stack.enter_async_context(self._read_stream)
-        await self.aexit_stack.enter_async_context(self._write_stream)
+        Args:
+            queue_capacity: Maximum number of queued run operations
+            overflow_policy: What to do when the queue is full (block, reject, shed_oldest)
+            block_timeout: Seconds to wait for space under the block policy
+            retry_after: Retry-After hint (seconds) carried by rejections
+            default_priority: Lane for runs without a metadata priority
+            fairness_weights: Round-robin weight per fairness key
+        """
+        if queue_capacity < 1:
+            raise ValueError("queue_capacity must be at least 1")
+        self.queue_capacity = queue_capacity
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.retry_after = retry_after
+        self.default_priority = default_priority
+        self.fairness_weights = fairness_weights
 
+        self._queue: FairQueue[TaskOperation] = FairQueue()
+        self._pending_runs = 0
+        self._changed: anyio.Condition | None = None
+        self._closed = False
+        self._rejected = 0
+        self._shed = 0
+
+    async def __aenter__(self):
+        """Enter async context manager."""
+        self._changed = anyio.Condition()
+        self._closed = False
         return self
 
     async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any):
         """Exit async context manager."""
-        await self.aexit_stack.__aexit__(exc_type, exc_value, traceback)
+        self._closed = True
+        if self._changed is not None:
+            async with self._changed:
+                self._changed.notify_all()
+        queue_depth.add(-len(self._queue))
+        self._queue.clear()
+        self._pending_runs = 0
+
+    # -------------------------------------------------------------------------
+    # Queue Management
+    # -------------------------------------------------------------------------
+
+    @property
+    def _condition(self) -> anyio.Condition:
+        if self._changed is None:
+            raise RuntimeError("InMemoryScheduler must be entered before use")
+        return self._changed
+
+    def _reject(self, reason: str) -> SchedulerQueueFullError:
+        self._rejected += 1
+        overflow_counter.add(1, {"policy": self.overflow_policy, "outcome": "rejected"})
+        return SchedulerQueueFullError(
+            f"Task queue is full ({self.queue_capacity} queued): {reason}",
+            retry_after=self.retry_after,
+        )
+
+    def _shed_oldest_run(self) -> _RunTask:
+        """Remove and return the oldest run operation of the lowest busy lane."""
+        task_operation = self._queue.remove_oldest(("batch", "interactive"))
+        if task_operation is None or task_operation["operation"] != "run":
+            raise RuntimeError("Queue is full but holds no run operations")
+        self._pending_runs -= 1
+        queue_depth.add(-1)
+        self._shed += 1
+        overflow_counter.add(1, {"policy": self.overflow_policy, "outcome": "shed"})
+        return task_operation
+
+    async def _enqueue(self, task_operation: TaskOperation) -> None:
+        """Append an operation, applying the overflow policy to run operations."""
+        shed: _RunTask | None = None
+        is_run = task_operation["operation"] == "run"
+        task_operation["_enqueued_at"] = time.time()
+
+        async with self._condition:
+            if is_run and self._pending_runs >= self.queue_capacity:
+                if self.overflow_policy == "reject":
+                    raise self._reject("rejected")
+                elif self.overflow_policy == "shed_oldest":
+                    shed = self._shed_oldest_run()
+                else:
+                    with anyio.move_on_after(self.block_timeout):
+                        while self._pending_runs >= self.queue_capacity:
+                            await self._condition.wait()
+                    if self._pending_runs >= self.queue_capacity:
+                        raise self._reject(
+                            f"no space after waiting {self.block_timeout}s"
+                        )
+
+            fairness_key = self.fairness_key_of(task_operation)
+            self._queue.push(
+                task_operation,
+                self.priority_of(task_operation),
+                fairness_key,
+                self.weight_of(fairness_key),
+            )
+            if is_run:
+                self._pending_runs += 1
+            queue_depth.add(1)
+            self._condition.notify_all()
+
+        if shed is not None:
+            logger.warning(f"Shed oldest queued task {shed['params'].get('task_id')}")
+            await self._notify_task_dropped(shed["params"], "queue_overflow")
+
+    async def get_queue_stats(self) -> dict[str, Any]:
+        """Return queue occupancy, capacity and overflow counts."""
+        return {
+            "backend": "memory",
+            "queued": len(self._queue),
+            "queued_runs": self._pending_runs,
+            "lanes": self._queue.depths(),
+            "capacity": self.queue_capacity,
+            "utilization": round(self._pending_runs / self.queue_capacity, 4),
+            "overflow_policy": self.overflow_policy,
+            "rejected_total": self._rejected,
+            "shed_total": self._shed,
+        }
+
+    # -------------------------------------------------------------------------
+    # Task Operations
+    # -------------------------------------------------------------------------
 
     @retry_scheduler_operation(max_attempts=3, min_wait=0.1, max_wait=1)
     async def run_task(self, params: TaskSendParams) -> None:
         """Schedule a task for execution."""
         logger.debug(f"Running task: {params}")
-        await self._write_stream.send(
+        await self._enqueue(
             _RunTask(operation="run", params=params, _current_span=get_current_span())
         )
 
@@ -56,7 +214,7 @@ class InMemoryScheduler(Scheduler):
     async def cancel_task(self, params: TaskIdParams) -> None:
         """Cancel a scheduled task."""
         logger.debug(f"Canceling task: {params}")
-        await self._write_stream.send(
+        await self._enqueue(
             _CancelTask(
                 operation="cancel", params=params, _current_span=get_current_span()
             )
@@ -66,7 +224,7 @@ class InMemoryScheduler(Scheduler):
     async def pause_task(self, params: TaskIdParams) -> None:
         """Pause a running task."""
         logger.debug(f"Pausing task: {params}")
-        await self._write_stream.send(
+        await self._enqueue(
             _PauseTask(
                 operation="pause", params=params, _current_span=get_current_span()
             )
@@ -76,13 +234,36 @@ class InMemoryScheduler(Scheduler):
     async def resume_task(self, params: TaskIdParams) -> None:
         """Resume a paused task."""
         logger.debug(f"Resuming task: {params}")
-        await self._write_stream.send(
+        await self._enqueue(
             _ResumeTask(
                 operation="resume", params=params, _current_span=get_current_span()
             )
         )
 
+    async def _take(self, limit: int) -> list[TaskOperation]:
+        """Wait for queued operations and pop up to ``limit``; empty once closed."""
+        async with self._condition:
+            while not self._queue and not self._closed:
+                await self._condition.wait()
+            batch: list[TaskOperation] = []
+            while self._queue and len(batch) < limit:
+                task_operation = self._queue.pop()
+                if task_operation["operation"] == "run":
+                    self._pending_runs -= 1
+                batch.append(task_operation)
+            if batch:
+                queue_depth.add(-len(batch))
+                self._condition.notify_all()
+            return batch
+
     async def receive_task_operations(self) -> AsyncIterator[TaskOperation]:
         """Receive task operations from the scheduler."""
-        async for task_operation in self._read_stream:
-            yield task_operation
+        while batch := await self._take(1):
+            yield batch[0]
+
+    async def receive_task_operation_batches(
+        self, max_batch_size: BatchSize
+    ) -> AsyncGenerator[list[TaskOperation], None]:
+        """Receive every queued operation up to the batch size at once."""
+        while batch := await self._take(resolve_batch_size(max_batch_size)):
+            yield batch
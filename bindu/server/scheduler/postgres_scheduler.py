@@ -0,0 +1,508 @@
+"""PostgreSQL scheduler using SELECT ... FOR UPDATE SKIP LOCKED.
+
+Deployments that already run ``PostgresStorage`` can queue task operations
+in the same database instead of operating Redis:
+
+    producer ──INSERT + NOTIFY──▶ task_queue ──claim (SKIP LOCKED)──▶ worker
+                                      ▲                                 │
+                                      └─────── lease expires ───────────┤
+                                                                        ▼
+                                                             DELETE (acknowledged)
+
+- Workers claim rows with ``FOR UPDATE SKIP LOCKED``, so concurrent workers
+  never block on or double-claim the same row.
+- A claimed row carries a lease (``locked_until``). A heartbeat extends the
+  leases of this worker's in-flight rows; rows whose worker died become
+  claimable again once the lease expires.
+- Rows are deleted when the worker acknowledges them. Rows claimed more than
+  ``max_deliveries`` times are dropped and their task is failed through
+  ``on_task_dropped``.
+- Rows are claimed by priority lane (control, interactive, batch) and, within
+  a lane, weighted round-robin across fairness keys: a row's turn is its
+  position among the claimable rows of its key divided by the key's weight.
+  Turns are ranked over the oldest ``fairness_window`` claimable rows of each
+  lane only, so a claim reads a bounded slice of the queue however long it is.
+- Idle workers sleep on ``LISTEN``; producers ``NOTIFY`` in the enqueue
+  transaction. A slow poll remains as a fallback (lost listener connection,
+  expired leases).
+- Cancellations are broadcast on ``<notify_channel>_cancel`` so the worker
+  executing a task aborts it, whichever worker claimed the cancel row.
+
+The scheduler borrows the engine and connection pool owned by
+``PostgresStorage`` and never disposes it. The listener holds one pooled
+connection for as long as the scheduler is entered.
+
+The ``task_queue`` table is created by the Alembic migrations
+``20251208_0001``, ``20251208_0002`` and ``20251208_0005``.
+"""
+
+from __future__ import annotations as _annotations
+
+import math
+import os
+import socket
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+import anyio
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from opentelemetry.trace import get_current_span
+from sqlalchemy import delete, func, insert, or_, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from bindu.common.protocol.types import TaskIdParams, TaskSendParams
+from bindu.server.storage.schema import task_queue_table
+from bindu.utils.logging import get_logger
+from bindu.utils.retry import retry_scheduler_operation
+
+from .base import (
+    PRIORITIES,
+    BatchSize,
+    Priority,
+    Scheduler,
+    TaskOperation,
+    _CancelTask,
+    _PauseTask,
+    _ResumeTask,
+    _RunTask,
+    resolve_batch_size,
+)
+from .codec import CodecName, TaskOperationCodec, get_codec
+
+logger = get_logger("bindu.server.scheduler.postgres_scheduler")
+
+_queue = task_queue_table.c
+
+# Rows that are not leased, or whose lease expired (the worker died)
+_claimable = or_(_queue.locked_until.is_(None), _queue.locked_until < func.now())
+
+
+class PostgresScheduler(Scheduler):
+    """A PostgreSQL-backed scheduler with leases and at-least-once delivery."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        notify_channel: str = "bindu_task_queue",
+        consumer_name: str | None = None,
+        lease_timeout: float = 300.0,
+        heartbeat_interval: float = 30.0,
+        poll_interval: float = 5.0,
+        max_deliveries: int = 5,
+        codec: CodecName | TaskOperationCodec = "orjson",
+        default_priority: Priority = "interactive",
+        fairness_weights: dict[str, int] | None = None,
+        fairness_window: int = 1000,
+    ):
+        """Initialize PostgreSQL scheduler.
+
+        Args:
+            engine: Async engine shared with PostgresStorage (not disposed here)
+            notify_channel: LISTEN/NOTIFY channel used to wake idle workers
+            consumer_name: Unique worker name (defaults to host-pid-random)
+            lease_timeout: Seconds a claimed row stays invisible without a heartbeat
+            heartbeat_interval: Seconds between lease extensions
+            poll_interval: Seconds an idle worker waits without a notification
+            max_deliveries: Claims after which an operation is dropped
+            codec: Payload codec name ("json", "orjson") or codec instance
+            default_priority: Lane for runs without a metadata priority
+            fairness_weights: Round-robin weight per fairness key
+            fairness_window: Oldest claimable rows per lane that take part in
+                the round-robin of a claim
+        """
+        self.engine = engine
+        self.notify_channel = notify_channel
+        self.cancel_channel = f"{notify_channel}_cancel"
+        self.consumer_name = consumer_name or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.max_deliveries = max_deliveries
+        self.codec = get_codec(codec)
+        self.default_priority = default_priority
+        self.fairness_weights = fairness_weights
+        self.fairness_window = fairness_window
+
+        self._in_flight: set[int] = set()
+        self._wakeup: anyio.Event | None = None
+        self._listen_conn: AsyncConnection | None = None
+        self._listener: Any = None
+        self._exit_stack: AsyncExitStack | None = None
+        self._cancellations: (
+            tuple[MemoryObjectSendStream[UUID], MemoryObjectReceiveStream[UUID]] | None
+        ) = None
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    async def __aenter__(self):
+        """Start listening for notifications and the lease heartbeat."""
+        await self._start_listener()
+
+        self._exit_stack = AsyncExitStack()
+        await self._exit_stack.__aenter__()
+        task_group = await self._exit_stack.enter_async_context(
+            anyio.create_task_group()
+        )
+        self._exit_stack.callback(task_group.cancel_scope.cancel)
+        task_group.start_soon(self._heartbeat_loop)
+
+        logger.info(
+            f"PostgreSQL scheduler consuming task_queue as {self.consumer_name}"
+        )
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any):
+        """Stop the heartbeat and release the listener connection.
+
+        In-flight rows keep their lease and become claimable when it expires.
+        """
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+        await self._stop_listener()
+        self._in_flight.clear()
+
+    async def _start_listener(self) -> None:
+        """LISTEN on the notify channel using a dedicated pooled connection."""
+        self._listen_conn = await self.engine.connect()
+        raw_connection = await self._listen_conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        if not hasattr(driver_connection, "add_listener"):
+            logger.warning(
+                "Database driver does not support LISTEN; "
+                f"polling task_queue every {self.poll_interval}s"
+            )
+            await self._listen_conn.close()
+            self._listen_conn = None
+            return
+
+        self._cancellations = anyio.create_memory_object_stream[UUID](math.inf)
+        await driver_connection.add_listener(self.notify_channel, self._on_notify)
+        await driver_connection.add_listener(self.cancel_channel, self._on_cancel)
+        self._listener = driver_connection
+
+    async def _stop_listener(self) -> None:
+        if self._listener is not None:
+            try:
+                await self._listener.remove_listener(
+                    self.notify_channel, self._on_notify
+                )
+                await self._listener.remove_listener(
+                    self.cancel_channel, self._on_cancel
+                )
+            except Exception as e:
+                logger.debug(f"Failed to remove task queue listener: {e}")
+            self._listener = None
+        if self._cancellations is not None:
+            send_stream, _ = self._cancellations
+            send_stream.close()
+            self._cancellations = None
+        if self._listen_conn is not None:
+            await self._listen_conn.close()
+            self._listen_conn = None
+
+    def _on_notify(self, *args: Any) -> None:
+        """Wake the receiver (called by the driver with connection, pid, channel, payload)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _on_cancel(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """Forward a broadcast cancellation to ``receive_cancellations``."""
+        if self._cancellations is None:
+            return
+        try:
+            task_id = UUID(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed cancellation: {payload!r}")
+            return
+        send_stream, _ = self._cancellations
+        send_stream.send_nowait(task_id)
+
+    # -------------------------------------------------------------------------
+    # Producing
+    # -------------------------------------------------------------------------
+
+    @retry_scheduler_operation()
+    async def run_task(self, params: TaskSendParams) -> None:
+        """Insert a run task operation into the queue."""
+        logger.debug(f"Scheduling run task: {params}")
+        await self._push_task_operations(
+            [_RunTask(operation="run", params=params, _current_span=get_current_span())]
+        )
+
+    @retry_scheduler_operation()
+    async def run_tasks(self, params_list: list[TaskSendParams]) -> None:
+        """Insert several run task operations in one statement."""
+        if not params_list:
+            return
+        current_span = get_current_span()
+        await self._push_task_operations(
+            [
+                _RunTask(operation="run", params=params, _current_span=current_span)
+                for params in params_list
+            ]
+        )
+
+    @retry_scheduler_operation()
+    async def cancel_task(self, params: TaskIdParams) -> None:
+        """Insert a cancel task operation into the queue."""
+        logger.debug(f"Scheduling cancel task: {params}")
+        await self._push_task_operations(
+            [
+                _CancelTask(
+                    operation="cancel", params=params, _current_span=get_current_span()
+                )
+            ]
+        )
+
+    @retry_scheduler_operation()
+    async def pause_task(self, params: TaskIdParams) -> None:
+        """Insert a pause task operation into the queue."""
+        logger.debug(f"Scheduling pause task: {params}")
+        await self._push_task_operations(
+            [
+                _PauseTask(
+                    operation="pause", params=params, _current_span=get_current_span()
+                )
+            ]
+        )
+
+    @retry_scheduler_operation()
+    async def resume_task(self, params: TaskIdParams) -> None:
+        """Insert a resume task operation into the queue."""
+        logger.debug(f"Scheduling resume task: {params}")
+        await self._push_task_operations(
+            [
+                _ResumeTask(
+                    operation="resume", params=params, _current_span=get_current_span()
+                )
+            ]
+        )
+
+    async def _push_task_operations(self, task_operations: list[TaskOperation]) -> None:
+        """Insert operations and notify listeners in a single transaction."""
+        rows = []
+        for task_operation in task_operations:
+            fairness_key = self.fairness_key_of(task_operation)
+            rows.append(
+                {
+                    "operation": task_operation["operation"],
+                    "payload": self.codec.encode(task_operation),
+                    "priority": PRIORITIES.index(self.priority_of(task_operation)),
+                    "fairness_key": fairness_key[:255],
+                    "weight": self.weight_of(fairness_key),
+                }
+            )
+        async with self.engine.begin() as conn:
+            await conn.execute(insert(task_queue_table), rows)
+            # Delivered to listeners when the transaction commits
+            await conn.execute(select(func.pg_notify(self.notify_channel, "")))
+
+    async def broadcast_cancel(self, task_id: UUID) -> None:
+        """Notify every listening worker of a cancellation."""
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                select(func.pg_notify(self.cancel_channel, str(task_id)))
+            )
+
+    async def receive_cancellations(self) -> AsyncIterator[UUID]:
+        """Yield task IDs notified on the cancel channel.
+
+        Nothing is yielded when the driver cannot LISTEN; the worker then
+        relies on the stored task state before its final write.
+        """
+        if self._cancellations is None:
+            return
+        _, receive_stream = self._cancellations
+        async for task_id in receive_stream:
+            yield task_id
+
+    # -------------------------------------------------------------------------
+    # Consuming
+    # -------------------------------------------------------------------------
+
+    async def receive_task_operations(self) -> AsyncIterator[TaskOperation]:
+        """Receive task operations one at a time."""
+        async for batch in self.receive_task_operation_batches(1):
+            for task_operation in batch:
+                yield task_operation
+
+    async def receive_task_operation_batches(
+        self, max_batch_size: BatchSize
+    ) -> AsyncGenerator[list[TaskOperation], None]:
+        """Claim up to a batch of rows per query, sleeping on LISTEN when idle."""
+        while True:
+            # Reset before claiming so a NOTIFY racing the claim is not lost
+            self._wakeup = wakeup = anyio.Event()
+            try:
+                batch = await self._claim(resolve_batch_size(max_batch_size))
+            except Exception as e:
+                logger.error(f"Failed to claim task operations: {e}")
+                await anyio.sleep(1)
+                continue
+
+            if batch:
+                yield batch
+                continue
+
+            with anyio.move_on_after(self.poll_interval):
+                await wakeup.wait()
+
+    async def _claim(self, limit: int) -> list[TaskOperation]:
+        """Lease the next claimable rows (by lane and fair turn) to this consumer.
+
+        Only the oldest ``fairness_window`` claimable rows of each lane are
+        ranked (an index range scan per lane), instead of the whole queue.
+        """
+        lanes = [
+            select(_queue.id, _queue.priority, _queue.fairness_key, _queue.weight)
+            .where(_queue.priority == priority, _claimable)
+            .order_by(_queue.id)
+            .limit(max(self.fairness_window, limit))
+            .subquery()
+            for priority in range(len(PRIORITIES))
+        ]
+        candidates = union_all(*(select(lane) for lane in lanes)).subquery("candidates")
+        turn = func.row_number().over(
+            partition_by=(candidates.c.priority, candidates.c.fairness_key),
+            order_by=candidates.c.id,
+        )
+        ranked = select(
+            candidates.c.id,
+            candidates.c.priority,
+            ((turn - 1) // candidates.c.weight).label("turn"),
+        ).subquery()
+        picked = (
+            select(_queue.id, ranked.c.priority, ranked.c.turn)
+            .join(ranked, ranked.c.id == _queue.id)
+            .where(_claimable)
+            .order_by(ranked.c.priority, ranked.c.turn, ranked.c.id)
+            .limit(limit)
+            .with_for_update(of=task_queue_table, skip_locked=True)
+            .cte("picked")
+        )
+        claim = (
+            update(task_queue_table)
+            .where(_queue.id == picked.c.id)
+            .values(
+                locked_by=self.consumer_name,
+                locked_until=func.now() + timedelta(seconds=self.lease_timeout),
+                attempts=_queue.attempts + 1,
+            )
+            .returning(
+                _queue.id,
+                _queue.payload,
+                _queue.attempts,
+                picked.c.priority,
+                picked.c.turn,
+            )
+        )
+        async with self.engine.begin() as conn:
+            rows = sorted(
+                (await conn.execute(claim)).all(),
+                key=lambda row: (row.priority, row.turn, row.id),
+            )
+
+        batch: list[TaskOperation] = []
+        for row in rows:
+            task_operation = await self._accept(row.id, row.payload, row.attempts)
+            if task_operation is not None:
+                batch.append(task_operation)
+        return batch
+
+    async def _accept(
+        self, row_id: int, payload: str, attempts: int
+    ) -> TaskOperation | None:
+        """Decode a claimed row, dropping it if it is unreadable or poisoned."""
+        try:
+            task_operation = self.codec.decode(payload)
+        except Exception as e:
+            logger.error(f"Dropping undecodable task_queue row {row_id}: {e}")
+            await self._delete(row_id)
+            return None
+
+        if attempts > self.max_deliveries:
+            logger.error(
+                f"Dropping task_queue row {row_id} after {attempts - 1} deliveries"
+            )
+            await self._delete(row_id)
+            if task_operation["operation"] == "run":
+                await self._notify_task_dropped(
+                    task_operation["params"], "max_deliveries_exceeded"
+                )
+            return None
+
+        if attempts > 1:
+            logger.warning(f"Reclaimed task_queue row {row_id} (delivery {attempts})")
+        task_operation["_delivery_tag"] = str(row_id)
+        self._in_flight.add(row_id)
+        return task_operation
+
+    async def _delete(self, row_id: int) -> None:
+        async with self.engine.begin() as conn:
+            await conn.execute(delete(task_queue_table).where(_queue.id == row_id))
+
+    async def ack_task_operation(self, task_operation: TaskOperation) -> None:
+        """Delete a handled row, provided this consumer still holds its lease."""
+        delivery_tag = task_operation.get("_delivery_tag")
+        if delivery_tag is None:
+            return
+        row_id = int(delivery_tag)
+        self._in_flight.discard(row_id)
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                delete(task_queue_table).where(
+                    _queue.id == row_id,
+                    _queue.locked_by == self.consumer_name,
+                )
+            )
+
+    async def _heartbeat_loop(self) -> None:
+        """Periodically extend the leases of this consumer's in-flight rows."""
+        while True:
+            await anyio.sleep(self.heartbeat_interval)
+            if not self._in_flight:
+                continue
+            try:
+                async with self.engine.begin() as conn:
+                    await conn.execute(
+                        update(task_queue_table)
+                        .where(
+                            _queue.id.in_(list(self._in_flight)),
+                            _queue.locked_by == self.consumer_name,
+                        )
+                        .values(
+                            locked_until=func.now()
+                            + timedelta(seconds=self.lease_timeout)
+                        )
+                    )
+            except Exception as e:
+                logger.warning(f"Task queue lease heartbeat failed: {e}")
+
+    # -------------------------------------------------------------------------
+    # Monitoring
+    # -------------------------------------------------------------------------
+
+    async def get_queue_stats(self) -> dict[str, Any]:
+        """Return queued and leased row counts."""
+        query = select(
+            func.count().filter(_claimable),
+            func.count().filter(~_claimable),
+        )
+        async with self.engine.connect() as conn:
+            queued, in_flight = (await conn.execute(query)).one()
+        return {
+            "backend": "postgres",
+            "queued": queued,
+            "in_flight": in_flight,
+            "in_flight_local": len(self._in_flight),
+        }
@@ -1,29 +1,150 @@
-"""Redis scheduler implementation for distributed task scheduling."""
+"""Redis scheduler implementation for distributed task scheduling.
+
+Operations are kept in priority lanes, each a rotation of per-fairness-key
+lists, so that one client's backlog cannot starve another's:
+
+    {<queue>}:lane:<priority>              ring of fairness keys with work
+    {<queue>}:lane:<priority>:key:<key>    FIFO of operations for one key
+    {<queue>}:lane:<priority>:credit       turns left for the key at the ring head
+    {<queue>}:wakeup                       tokens that wake blocked consumers
+
+Pushing and popping run as Lua scripts, so a pop is a single atomic round
+trip that drains the control lane first, then interactive, then batch,
+taking each key's weight in operations per turn. Operations pushed onto the
+plain ``<queue>`` list by releases without lanes are still drained, right
+after the control lane.
+
+The scripts receive every fixed key (rings, credits, wake-up and legacy
+lists) through ``KEYS``. Per-key FIFOs are named after their ring, and the
+``{<queue>}`` hash tag keeps all of them in the legacy list's cluster slot,
+so the scripts also run on Redis Cluster. A queue name that already
+contains a hash tag is used as is.
+
+Cancellations are also published on the ``<queue>:cancel`` pub/sub channel,
+so the pod executing a task aborts it whichever pod dequeued the cancel.
+"""
 
 from __future__ import annotations as _annotations
 
-import json
-from collections.abc import AsyncIterator
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import aclosing
 from typing import Any
+from uuid import UUID
 
+import anyio
+import orjson
 import redis.asyncio as redis
 from opentelemetry.trace import get_current_span
+from redis.commands.core import AsyncScript
 
 from bindu.common.protocol.types import TaskIdParams, TaskSendParams
 from bindu.utils.logging import get_logger
 from bindu.utils.retry import retry_scheduler_operation
 
 from .base import (
+    PRIORITIES,
+    BatchSize,
+    Priority,
     Scheduler,
     TaskOperation,
     _CancelTask,
     _PauseTask,
     _ResumeTask,
     _RunTask,
+    resolve_batch_size,
 )
+from .codec import CodecName, TaskOperationCodec, get_codec
 
 logger = get_logger("bindu.server.scheduler.redis_scheduler")
 
+# KEYS (every script): legacy list, wake-up list, then the ring and credit
+# hash of each lane in PRIORITIES order: lane i (from 1) uses KEYS[2i + 1]
+# and KEYS[2i + 2].
+# Per-key FIFOs are ``<ring>:key:<fairness key>`` and share the ring's slot.
+
+# ARGV: (lane index, fairness key, payload)...
+# Keeps at most 64 wake-up tokens; a surplus token only costs an empty pop.
+_PUSH_SCRIPT = """
+for i = 1, #ARGV, 3 do
+  local ring = KEYS[2 * tonumber(ARGV[i]) + 1]
+  if redis.call('RPUSH', ring .. ':key:' .. ARGV[i + 1], ARGV[i + 2]) == 1 then
+    redis.call('RPUSH', ring, ARGV[i + 1])
+  end
+  redis.call('RPUSH', KEYS[2], 1)
+end
+redis.call('LTRIM', KEYS[2], -64, -1)
+"""
+
+# ARGV: limit, weights (JSON object of fairness key -> weight)
+_POP_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local weights = cjson.decode(ARGV[2])
+local out = {}
+
+local function drain(lane)
+  local ring = KEYS[2 * lane + 1]
+  local credits = KEYS[2 * lane + 2]
+  while #out < limit do
+    local key = redis.call('LPOP', ring)
+    if not key then return end
+    local list = ring .. ':key:' .. key
+    local payload = redis.call('LPOP', list)
+    local credit = tonumber(redis.call('HGET', credits, key)) or tonumber(weights[key]) or 1
+    if payload then
+      table.insert(out, payload)
+      credit = credit - 1
+    end
+    if payload and redis.call('LLEN', list) > 0 then
+      if credit > 0 then
+        redis.call('HSET', credits, key, credit)
+        redis.call('LPUSH', ring, key)
+      else
+        redis.call('HDEL', credits, key)
+        redis.call('RPUSH', ring, key)
+      end
+    else
+      redis.call('HDEL', credits, key)
+    end
+  end
+end
+
+drain(1)
+while #out < limit do
+  local payload = redis.call('LPOP', KEYS[1])
+  if not payload then break end
+  table.insert(out, payload)
+end
+drain(2)
+drain(3)
+return out
+"""
+
+# ARGV: delete (0 or 1). Returns per-lane lengths, then the legacy list.
+_LENGTHS_SCRIPT = """
+local out = {}
+for lane = 1, 3 do
+  local ring = KEYS[2 * lane + 1]
+  local total = 0
+  for _, key in ipairs(redis.call('LRANGE', ring, 0, -1)) do
+    total = total + redis.call('LLEN', ring .. ':key:' .. key)
+    if ARGV[1] == '1' then redis.call('DEL', ring .. ':key:' .. key) end
+  end
+  if ARGV[1] == '1' then redis.call('DEL', ring, KEYS[2 * lane + 2]) end
+  table.insert(out, total)
+end
+table.insert(out, redis.call('LLEN', KEYS[1]))
+if ARGV[1] == '1' then redis.call('DEL', KEYS[1], KEYS[2]) end
+return out
+"""
+
+
+def _slot_prefix(queue_name: str) -> str:
+    """Return a key prefix hashing to the same cluster slot as ``queue_name``."""
+    start = queue_name.find("{")
+    if start != -1 and queue_name.find("}", start + 1) > start + 1:
+        return queue_name
+    return f"{{{queue_name}}}"
+
 
 class RedisScheduler(Scheduler):
     """A Redis-based scheduler for distributed task operations.
@@ -38,23 +159,43 @@ class RedisScheduler(Scheduler):
         queue_name: str = "bindu:tasks",
         max_connections: int = 10,
         retry_on_timeout: bool = True,
+        codec: CodecName | TaskOperationCodec = "orjson",
+        default_priority: Priority = "interactive",
+        fairness_weights: dict[str, int] | None = None,
     ):
         """Initialize Redis scheduler.
 
         Args:
             redis_url: Redis URL (redis://[password@]host:port/db)
-            queue_name: Redis queue name for task operations
+            queue_name: Key prefix for the priority lanes
             max_connections: Maximum Redis connection pool size
             retry_on_timeout: Whether to retry on Redis timeout
+            codec: Payload codec name ("json", "orjson") or codec instance
+            default_priority: Lane for runs without a metadata priority
+            fairness_weights: Round-robin weight per fairness key
         """
         self.redis_url = redis_url
         self.queue_name = queue_name
         self.max_connections = max_connections
         self.retry_on_timeout = retry_on_timeout
+        self.codec = get_codec(codec)
+        self.default_priority = default_priority
+        self.fairness_weights = fairness_weights
+        prefix = _slot_prefix(queue_name)
+        self.wakeup_key = f"{prefix}:wakeup"
+        self.cancel_channel = f"{queue_name}:cancel"
+        self._script_keys = [queue_name, self.wakeup_key]
+        for priority in PRIORITIES:
+            self._script_keys += [
+                f"{prefix}:lane:{priority}",
+                f"{prefix}:lane:{priority}:credit",
+            ]
         self._redis_client: redis.Redis | None = None
+        self._scripts: dict[str, AsyncScript] = {}
 
     async def __aenter__(self):
         """Initialize Redis connection pool."""
+        self._scripts.clear()
         self._redis_client = redis.from_url(
             self.redis_url,
             encoding="utf-8",
@@ -91,6 +232,20 @@ class RedisScheduler(Scheduler):
         )
         await self._push_task_operation(task_operation)
 
+    @retry_scheduler_operation()
+    async def run_tasks(self, params_list: list[TaskSendParams]) -> None:
+        """Send several run task operations to Redis queue in one RPUSH."""
+        if not params_list:
+            return
+        logger.debug(f"Scheduling {len(params_list)} run tasks")
+        current_span = get_current_span()
+        await self._push_task_operations(
+            [
+                _RunTask(operation="run", params=params, _current_span=current_span)
+                for params in params_list
+            ]
+        )
+
     @retry_scheduler_operation()
     async def cancel_task(self, params: TaskIdParams) -> None:
         """Send a cancel task operation to Redis queue."""
@@ -119,11 +274,26 @@ class RedisScheduler(Scheduler):
         await self._push_task_operation(task_operation)
 
     async def receive_task_operations(self) -> AsyncIterator[TaskOperation]:
-        """Receive task operations from Redis queue using blocking pop."""
+        """Receive task operations one at a time."""
+        async with aclosing(self.receive_task_operation_batches(1)) as batches:
+            async for batch in batches:
+                for task_operation in batch:
+                    yield task_operation
+
+    async def receive_task_operation_batches(
+        self, max_batch_size: BatchSize
+    ) -> AsyncGenerator[list[TaskOperation], None]:
+        """Receive task operations by priority, draining up to a batch per round trip.
+
+        When every lane is empty the receiver blocks on the wake-up list (and
+        on the legacy queue list) until a producer pushes.
+        """
         if not self._redis_client:
             raise RuntimeError(
                 "Redis client not initialized. Use async context manager."
             )
+        client = self._redis_client
+        weights = orjson.dumps(self.fairness_weights or {}).decode()
 
         logger.info(
             f"Starting to receive task operations from queue: {self.queue_name}"
@@ -131,167 +301,144 @@ class RedisScheduler(Scheduler):
 
         while True:
             try:
-                # Blocking pop with 1 second timeout
-                result = await self._redis_client.blpop(self.queue_name, timeout=1)
-
-                if result:
-                    _, task_data = result
-                    task_operation = self._deserialize_task_operation(task_data)
-                    logger.debug(
-                        f"Received task operation: {task_operation['operation']}"
+                limit = resolve_batch_size(max_batch_size)
+                payloads = await self._script(_POP_SCRIPT)(
+                    keys=self._script_keys, args=[limit, weights]
+                )
+                if not payloads:
+                    result = await client.blpop(
+                        [self.wakeup_key, self.queue_name], timeout=1
                     )
-                    yield task_operation
-
+                    if not result or result[0] != self.queue_name:
+                        continue
+                    payloads = [result[1]]
             except redis.RedisError as e:
-                # Log error and continue (Redis connection issues)
-                logger.error(f"Redis error in receive_task_operations: {e}")
-                # Could add exponential backoff here for production
-                continue
-            except json.JSONDecodeError as e:
-                # Log deserialization errors but continue
-                logger.error(f"Failed to deserialize task operation: {e}")
-                continue
-            except Exception as e:
-                # Log unexpected errors
-                logger.error(f"Unexpected error in receive_task_operations: {e}")
+                logger.error(f"Redis error in receive_task_operation_batches: {e}")
                 continue
 
-    async def _push_task_operation(self, task_operation: TaskOperation) -> None:
-        """Push a task operation to Redis queue."""
+            batch: list[TaskOperation] = []
+            for task_data in payloads:
+                try:
+                    batch.append(self._deserialize_task_operation(task_data))
+                except (ValueError, KeyError) as e:
+                    logger.error(f"Failed to deserialize task operation: {e}")
+            if batch:
+                logger.debug(f"Received batch of {len(batch)} task operations")
+                yield batch
+
+    async def broadcast_cancel(self, task_id: UUID) -> None:
+        """Publish a cancellation to every subscribed pod."""
         if not self._redis_client:
             raise RuntimeError(
                 "Redis client not initialized. Use async context manager."
             )
+        await self._redis_client.publish(self.cancel_channel, str(task_id))
 
-        try:
-            serialized_task = self._serialize_task_operation(task_operation)
-            await self._redis_client.rpush(self.queue_name, serialized_task)
-            logger.debug(
-                f"Pushed task operation to queue: {task_operation['operation']}"
+    async def receive_cancellations(self) -> AsyncIterator[UUID]:
+        """Yield task IDs published on the cancel channel.
+
+        Pub/sub is fire-and-forget: cancellations published while this pod is
+        disconnected are missed, and the worker falls back to checking the
+        stored task state before its final write.
+        """
+        if not self._redis_client:
+            raise RuntimeError(
+                "Redis client not initialized. Use async context manager."
             )
-        except redis.RedisError as e:
-            logger.error(f"Failed to push task operation to Redis: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Failed to serialize task operation: {e}")
-            raise
 
-    def _serialize_task_operation(self, task_operation: TaskOperation) -> str:
-        """Serialize task operation to JSON string for Redis storage."""
-        from uuid import UUID
+        while True:
+            pubsub = self._redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.cancel_channel)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        task_id = UUID(message["data"])
+                    except ValueError:
+                        logger.warning(
+                            f"Ignoring malformed cancellation: {message['data']!r}"
+                        )
+                        continue
+                    yield task_id
+            except redis.RedisError as e:
+                logger.error(f"Redis error on {self.cancel_channel}: {e}")
+                await anyio.sleep(1)
+            finally:
+                with anyio.CancelScope(shield=True):
+                    await pubsub.aclose()
+
+    def _script(self, source: str) -> AsyncScript:
+        """Return the registered Lua script (loaded by SHA after first use)."""
+        script = self._scripts.get(source)
+        if script is None:
+            if not self._redis_client:
+                raise RuntimeError(
+                    "Redis client not initialized. Use async context manager."
+                )
+            script = self._scripts[source] = self._redis_client.register_script(source)
+        return script
 
-        # Convert span to string representation (spans are not JSON serializable)
-        span = task_operation["_current_span"]
+    async def _push_task_operation(self, task_operation: TaskOperation) -> None:
+        """Push a task operation onto its priority lane."""
+        await self._push_task_operations([task_operation])
 
-        # Try to get span context - handle both real spans and mocks
-        span_id = None
-        trace_id = None
+    async def _push_task_operations(self, task_operations: list[TaskOperation]) -> None:
+        """Push task operations onto their lanes in one atomic round trip."""
+        if not self._redis_client:
+            raise RuntimeError(
+                "Redis client not initialized. Use async context manager."
+            )
 
+        args: list[Any] = []
+        for task_operation in task_operations:
+            args += [
+                PRIORITIES.index(self.priority_of(task_operation)) + 1,
+                self.fairness_key_of(task_operation),
+                self._serialize_task_operation(task_operation),
+            ]
         try:
-            if hasattr(span, "get_span_context"):
-                # Mock span with get_span_context method
-                span_context = span.get_span_context()
-                span_id = span_context.span_id
-                trace_id = span_context.trace_id
-            elif hasattr(span, "_context"):
-                # Real OpenTelemetry _Span object
-                span_context = span._context
-                span_id = span_context.span_id
-                trace_id = span_context.trace_id
-        except Exception:
-            # If we can't get span context, just use None values
-            pass
-
-        # Convert UUIDs to strings in params
-        def convert_uuids(obj):
-            """Recursively convert UUIDs to strings in nested structures."""
-            if isinstance(obj, UUID):
-                return str(obj)
-            elif isinstance(obj, dict):
-                return {k: convert_uuids(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_uuids(item) for item in obj]
-            return obj
-
-        serializable_task = {
-            "operation": task_operation["operation"],
-            "params": convert_uuids(task_operation["params"]),
-            "span_id": format(span_id, "016x") if span_id else None,
-            "trace_id": format(trace_id, "032x") if trace_id else None,
-        }
-        return json.dumps(serializable_task)
-
-    def _deserialize_task_operation(self, task_data: str) -> TaskOperation:
-        """Deserialize task operation from JSON string."""
-        from uuid import UUID
-
-        data = json.loads(task_data)
+            await self._script(_PUSH_SCRIPT)(keys=self._script_keys, args=args)
+            logger.debug(f"Pushed {len(task_operations)} task operations to queue")
+        except redis.RedisError as e:
+            logger.error(f"Failed to push task operations to Redis: {e}")
+            raise
 
-        # Convert string UUIDs back to UUID objects in params
-        def convert_strings_to_uuids(obj):
-            """Recursively convert UUID strings back to UUID objects."""
-            if isinstance(obj, str):
-                # Try to parse as UUID
-                try:
-                    return UUID(obj)
-                except (ValueError, AttributeError):
-                    return obj
-            elif isinstance(obj, dict):
-                return {k: convert_strings_to_uuids(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_strings_to_uuids(item) for item in obj]
-            return obj
-
-        # Reconstruct the task operation (span will be recreated by the worker)
-        # TODO: Properly propagate span context using trace_id/span_id
-        operation_type = data["operation"]
-        params = convert_strings_to_uuids(data["params"])
-        current_span = get_current_span()
+    def _serialize_task_operation(self, task_operation: TaskOperation) -> str:
+        """Serialize a task operation with the configured codec."""
+        return self.codec.encode(task_operation)
 
-        if operation_type == "run":
-            return _RunTask(
-                operation="run",
-                params=params,
-                _current_span=current_span,
-            )
-        elif operation_type == "cancel":
-            return _CancelTask(
-                operation="cancel",
-                params=params,
-                _current_span=current_span,
-            )
-        elif operation_type == "pause":
-            return _PauseTask(
-                operation="pause",
-                params=params,
-                _current_span=current_span,
-            )
-        elif operation_type == "resume":
-            return _ResumeTask(
-                operation="resume",
-                params=params,
-                _current_span=current_span,
-            )
-        else:
-            raise ValueError(f"Unknown operation type: {operation_type}")
+    def _deserialize_task_operation(self, task_data: str | bytes) -> TaskOperation:
+        """Deserialize a task operation written by any codec version."""
+        return self.codec.decode(task_data)
 
-    async def get_queue_length(self) -> int:
-        """Get the current length of the task queue."""
+    async def _lane_lengths(self, delete: bool = False) -> dict[str, int]:
         if not self._redis_client:
             raise RuntimeError(
                 "Redis client not initialized. Use async context manager."
             )
+        lengths = await self._script(_LENGTHS_SCRIPT)(
+            keys=self._script_keys, args=[int(delete)]
+        )
+        return dict(zip((*PRIORITIES, "legacy"), map(int, lengths)))
 
-        return await self._redis_client.llen(self.queue_name)
+    async def get_queue_length(self) -> int:
+        """Get the number of queued task operations across all lanes."""
+        return sum((await self._lane_lengths()).values())
+
+    async def get_queue_stats(self) -> dict[str, Any]:
+        """Return queued operations per lane for monitoring."""
+        lanes = await self._lane_lengths()
+        return {
+            "backend": "redis",
+            "queue_name": self.queue_name,
+            "queued": sum(lanes.values()),
+            "lanes": lanes,
+        }
 
     async def clear_queue(self) -> int:
         """Clear all tasks from the queue. Returns number of tasks removed."""
-        if not self._redis_client:
-            raise RuntimeError(
-                "Redis client not initialized. Use async context manager."
-            )
-
-        return await self._redis_client.delete(self.queue_name)
+        return sum((await self._lane_lengths(delete=True)).values())
 
     async def health_check(self) -> bool:
         """Check if Redis connection is healthy."""
@@ -0,0 +1,494 @@
+"""Redis Streams scheduler with consumer groups and acknowledgements.
+
+``RedisScheduler`` pops operations off a list with BLPOP, so an operation
+popped by a pod that then crashes is lost. This backend keeps every operation
+in a Redis Stream until a worker acknowledges it:
+
+    producer ──XADD──▶ stream ──XREADGROUP──▶ consumer (pod) ──XACK+XDEL──▶ done
+                         ▲                         │
+                         └──────XAUTOCLAIM─────────┘  (idle > visibility timeout)
+
+- All pods of a deployment share one consumer group; each pod is a consumer,
+  so operations are spread across pods while Redis tracks what is in flight.
+- A heartbeat keeps the pod's in-flight entries fresh (XCLAIM JUSTID), so
+  long-running tasks are not reclaimed while their worker is alive.
+- Entries whose consumer stopped heartbeating for ``visibility_timeout``
+  seconds are reclaimed with XAUTOCLAIM by another pod.
+- Entries delivered more than ``max_deliveries`` times (poison messages) or
+  that cannot be decoded are moved to a dead-letter stream.
+- Each priority lane has its own stream (``<queue>:stream:control``,
+  ``<queue>:stream`` for interactive, ``<queue>:stream:batch``); consumers
+  read the lanes in priority order. A stream delivers a lane's entries in
+  arrival order, so fairness across contexts and clients only reorders the
+  entries within each fetched batch.
+
+Requires Redis >= 6.2 (XAUTOCLAIM).
+"""
+
+from __future__ import annotations as _annotations
+
+import os
+import socket
+import time
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import AsyncExitStack, aclosing
+from typing import Any, cast
+
+import anyio
+import redis.asyncio as redis
+from redis.typing import StreamIdT
+
+from bindu.utils.logging import get_logger
+
+from .base import PRIORITIES, BatchSize, Priority, TaskOperation, resolve_batch_size
+from .codec import CodecName, TaskOperationCodec
+from .fair_queue import FairQueue
+from .redis_scheduler import RedisScheduler
+
+logger = get_logger("bindu.server.scheduler.redis_stream_scheduler")
+
+_PAYLOAD_FIELD = "payload"
+
+StreamEntry = tuple[Priority, str, dict[str, str]]
+"""Lane, entry ID and fields of a stream entry."""
+
+
+def _delivery_tag(lane: Priority, entry_id: str) -> str:
+    return f"{lane}/{entry_id}"
+
+
+def _parse_delivery_tag(delivery_tag: str) -> tuple[Priority, str]:
+    lane, _, entry_id = delivery_tag.rpartition("/")
+    return cast(Priority, lane or "interactive"), entry_id
+
+
+class RedisStreamScheduler(RedisScheduler):
+    """A Redis Streams scheduler with at-least-once delivery.
+
+    Operations are acknowledged through ``ack_task_operation`` once the
+    worker has finished with them; unacknowledged operations are redelivered.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        queue_name: str = "bindu:tasks",
+        max_connections: int = 10,
+        retry_on_timeout: bool = True,
+        codec: CodecName | TaskOperationCodec = "orjson",
+        consumer_group: str = "bindu-workers",
+        consumer_name: str | None = None,
+        visibility_timeout: float = 300.0,
+        max_deliveries: int = 5,
+        claim_interval: float = 30.0,
+        block_ms: int = 1000,
+        dead_letter_max_length: int = 10000,
+        default_priority: Priority = "interactive",
+        fairness_weights: dict[str, int] | None = None,
+    ):
+        """Initialize Redis Streams scheduler.
+
+        Args:
+            redis_url: Redis URL (redis://[password@]host:port/db)
+            queue_name: Base name; the stream is ``<queue_name>:stream``
+            max_connections: Maximum Redis connection pool size
+            retry_on_timeout: Whether to retry on Redis timeout
+            codec: Payload codec name ("json", "orjson") or codec instance
+            consumer_group: Consumer group shared by all pods of a deployment
+            consumer_name: Unique consumer name (defaults to host-pid-random)
+            visibility_timeout: Seconds without heartbeat before an entry is reclaimed
+            max_deliveries: Deliveries after which an entry is dead-lettered
+            claim_interval: Seconds between reclaim sweeps and heartbeats
+            block_ms: XREADGROUP block time in milliseconds
+            dead_letter_max_length: Approximate cap on the dead-letter stream
+            default_priority: Lane for runs without a metadata priority
+            fairness_weights: Round-robin weight per fairness key
+        """
+        super().__init__(
+            redis_url=redis_url,
+            queue_name=queue_name,
+            max_connections=max_connections,
+            retry_on_timeout=retry_on_timeout,
+            codec=codec,
+            default_priority=default_priority,
+            fairness_weights=fairness_weights,
+        )
+        self.stream_name = f"{queue_name}:stream"
+        self.lane_streams: dict[Priority, str] = {
+            "control": f"{self.stream_name}:control",
+            "interactive": self.stream_name,
+            "batch": f"{self.stream_name}:batch",
+        }
+        self.dead_letter_stream = f"{queue_name}:dead"
+        self.consumer_group = consumer_group
+        self.consumer_name = consumer_name or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        self.visibility_timeout = visibility_timeout
+        self.max_deliveries = max_deliveries
+        self.claim_interval = claim_interval
+        self.block_ms = block_ms
+        self.dead_letter_max_length = dead_letter_max_length
+
+        self._in_flight: set[str] = set()
+        self._exit_stack: AsyncExitStack | None = None
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    async def __aenter__(self):
+        """Connect, ensure the consumer group exists and start the heartbeat."""
+        await super().__aenter__()
+        await self._ensure_consumer_group()
+
+        self._exit_stack = AsyncExitStack()
+        await self._exit_stack.__aenter__()
+        task_group = await self._exit_stack.enter_async_context(
+            anyio.create_task_group()
+        )
+        self._exit_stack.callback(task_group.cancel_scope.cancel)
+        task_group.start_soon(self._heartbeat_loop)
+
+        logger.info(
+            f"Redis stream scheduler consuming {self.stream_name} as "
+            f"{self.consumer_group}/{self.consumer_name}"
+        )
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any):
+        """Stop the heartbeat and close the connection pool.
+
+        In-flight entries are left pending; another consumer reclaims them
+        after the visibility timeout.
+        """
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+        self._in_flight.clear()
+        await super().__aexit__(exc_type, exc_value, traceback)
+
+    async def _ensure_consumer_group(self) -> None:
+        """Create the consumer group (and streams) if it does not exist yet."""
+        for stream in self.lane_streams.values():
+            try:
+                await self._client.xgroup_create(
+                    stream, self.consumer_group, id="0", mkstream=True
+                )
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    @property
+    def _client(self) -> redis.Redis:
+        if not self._redis_client:
+            raise RuntimeError(
+                "Redis client not initialized. Use async context manager."
+            )
+        return self._redis_client
+
+    # -------------------------------------------------------------------------
+    # Producing
+    # -------------------------------------------------------------------------
+
+    async def _push_task_operation(self, task_operation: TaskOperation) -> None:
+        """Append a task operation to its lane's stream."""
+        try:
+            serialized_task = self._serialize_task_operation(task_operation)
+            await self._client.xadd(
+                self.lane_streams[self.priority_of(task_operation)],
+                {_PAYLOAD_FIELD: serialized_task},
+            )
+            logger.debug(
+                f"Added task operation to stream: {task_operation['operation']}"
+            )
+        except redis.RedisError as e:
+            logger.error(f"Failed to add task operation to Redis stream: {e}")
+            raise
+
+    async def _push_task_operations(self, task_operations: list[TaskOperation]) -> None:
+        """Append several task operations to their streams in one pipeline."""
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for task_operation in task_operations:
+                    pipe.xadd(
+                        self.lane_streams[self.priority_of(task_operation)],
+                        {
+                            _PAYLOAD_FIELD: self._serialize_task_operation(
+                                task_operation
+                            )
+                        },
+                    )
+                await pipe.execute()
+            logger.debug(f"Added {len(task_operations)} task operations to stream")
+        except redis.RedisError as e:
+            logger.error(f"Failed to add task operations to Redis stream: {e}")
+            raise
+
+    # -------------------------------------------------------------------------
+    # Consuming
+    # -------------------------------------------------------------------------
+
+    async def receive_task_operations(self) -> AsyncIterator[TaskOperation]:
+        """Receive task operations one at a time."""
+        async with aclosing(self.receive_task_operation_batches(1)) as batches:
+            async for batch in batches:
+                for task_operation in batch:
+                    yield task_operation
+
+    async def receive_task_operation_batches(
+        self, max_batch_size: BatchSize
+    ) -> AsyncGenerator[list[TaskOperation], None]:
+        """Receive up to a batch of entries, highest lane first, reclaiming stalled ones."""
+        logger.info(
+            "Starting to receive task operations from "
+            f"{', '.join(self.lane_streams.values())}"
+        )
+
+        next_claim = 0.0
+        while True:
+            try:
+                limit = resolve_batch_size(max_batch_size)
+                entries: list[StreamEntry] = []
+
+                if time.monotonic() >= next_claim:
+                    entries = await self._reclaim_stalled(count=limit)
+                    next_claim = time.monotonic() + self.claim_interval
+
+                if not entries:
+                    entries = await self._read_lanes(limit)
+
+                batch: list[TaskOperation] = []
+                for lane, entry_id, fields in entries:
+                    task_operation = await self._decode_entry(lane, entry_id, fields)
+                    if task_operation is None:
+                        continue
+                    self._in_flight.add(task_operation["_delivery_tag"])
+                    batch.append(task_operation)
+
+            except redis.ResponseError as e:
+                if "NOGROUP" in str(e):
+                    # Stream or group was deleted underneath us; recreate it
+                    logger.warning(f"Consumer group missing, recreating: {e}")
+                    await self._ensure_consumer_group()
+                else:
+                    logger.error(f"Redis error in receive_task_operations: {e}")
+                    await anyio.sleep(1)
+                continue
+            except redis.RedisError as e:
+                logger.error(f"Redis error in receive_task_operations: {e}")
+                await anyio.sleep(1)
+                continue
+
+            if batch:
+                yield self._fair_order(batch)
+
+    async def _read_lanes(self, limit: int) -> list[StreamEntry]:
+        """Read new entries lane by lane, blocking on every lane when all are empty."""
+        client = self._client
+        entries: list[StreamEntry] = []
+        for lane in PRIORITIES:
+            # decode_responses=True: [[stream, [(entry_id, fields), ...]], ...]
+            response: Any = await client.xreadgroup(
+                self.consumer_group,
+                self.consumer_name,
+                {self.lane_streams[lane]: ">"},
+                count=limit - len(entries),
+            )
+            for _, stream_entries in response or []:
+                entries.extend((lane, *entry) for entry in stream_entries)
+            if len(entries) >= limit:
+                return entries
+        if entries:
+            return entries
+
+        # A blocking read returns up to one entry from each lane that woke up
+        lanes = {stream: lane for lane, stream in self.lane_streams.items()}
+        response: Any = await client.xreadgroup(
+            self.consumer_group,
+            self.consumer_name,
+            {stream: ">" for stream in lanes},
+            count=1,
+            block=self.block_ms,
+        )
+        for stream, stream_entries in response or []:
+            entries.extend((lanes[stream], *entry) for entry in stream_entries)
+        return entries
+
+    def _fair_order(self, batch: list[TaskOperation]) -> list[TaskOperation]:
+        """Order a fetched batch by lane, round-robin across fairness keys."""
+        if len(batch) < 2:
+            return batch
+        queue: FairQueue[TaskOperation] = FairQueue()
+        for task_operation in batch:
+            fairness_key = self.fairness_key_of(task_operation)
+            queue.push(
+                task_operation,
+                self.priority_of(task_operation),
+                fairness_key,
+                self.weight_of(fairness_key),
+            )
+        return [queue.pop() for _ in batch]
+
+    async def _decode_entry(
+        self, lane: Priority, entry_id: str, fields: dict[str, str]
+    ) -> TaskOperation | None:
+        """Deserialize a stream entry, dead-lettering it if it is unreadable."""
+        try:
+            task_operation = self._deserialize_task_operation(fields[_PAYLOAD_FIELD])
+        except Exception as e:
+            logger.error(f"Failed to deserialize stream entry {entry_id}: {e}")
+            await self._dead_letter(lane, entry_id, fields, f"undecodable: {e}")
+            return None
+
+        task_operation["_delivery_tag"] = _delivery_tag(lane, entry_id)
+        return task_operation
+
+    async def _reclaim_stalled(self, count: int = 10) -> list[StreamEntry]:
+        """Claim entries idle past the visibility timeout; dead-letter poison ones."""
+        client = self._client
+        ready: list[StreamEntry] = []
+        for lane in PRIORITIES:
+            stream = self.lane_streams[lane]
+            _, claimed, _ = await client.xautoclaim(
+                stream,
+                self.consumer_group,
+                self.consumer_name,
+                min_idle_time=int(self.visibility_timeout * 1000),
+                start_id="0-0",
+                count=count - len(ready),
+            )
+
+            for entry_id, fields in claimed:
+                if fields is None:
+                    # Entry was deleted from the stream while pending
+                    await client.xack(stream, self.consumer_group, entry_id)
+                    continue
+
+                pending = await client.xpending_range(
+                    stream, self.consumer_group, entry_id, entry_id, 1
+                )
+                deliveries = int(pending[0]["times_delivered"]) if pending else 1
+                if deliveries > self.max_deliveries:
+                    await self._dead_letter(
+                        lane,
+                        entry_id,
+                        fields,
+                        f"exceeded {self.max_deliveries} deliveries",
+                    )
+                    continue
+
+                logger.warning(
+                    f"Reclaimed stalled {lane} stream entry {entry_id} "
+                    f"(delivery {deliveries})"
+                )
+                ready.append((lane, entry_id, fields))
+            if len(ready) >= count:
+                break
+        return ready
+
+    async def _dead_letter(
+        self, lane: Priority, entry_id: str, fields: dict[str, str], reason: str
+    ) -> None:
+        """Move an entry to the dead-letter stream and notify the drop hook."""
+        client = self._client
+        stream = self.lane_streams[lane]
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                self.dead_letter_stream,
+                {
+                    **fields,
+                    "original_id": entry_id,
+                    "original_stream": stream,
+                    "reason": reason,
+                    "consumer": self.consumer_name,
+                },
+                maxlen=self.dead_letter_max_length,
+                approximate=True,
+            )
+            pipe.xack(stream, self.consumer_group, entry_id)
+            pipe.xdel(stream, entry_id)
+            await pipe.execute()
+        logger.error(f"Dead-lettered stream entry {entry_id}: {reason}")
+
+        try:
+            task_operation = self._deserialize_task_operation(fields[_PAYLOAD_FIELD])
+        except Exception:
+            return
+        if task_operation["operation"] == "run":
+            await self._notify_task_dropped(task_operation["params"], "dead_lettered")
+
+    async def ack_task_operation(self, task_operation: TaskOperation) -> None:
+        """Acknowledge and delete a handled stream entry."""
+        delivery_tag = task_operation.get("_delivery_tag")
+        if delivery_tag is None:
+            return
+        self._in_flight.discard(delivery_tag)
+        lane, entry_id = _parse_delivery_tag(delivery_tag)
+        stream = self.lane_streams[lane]
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.xack(stream, self.consumer_group, entry_id)
+            pipe.xdel(stream, entry_id)
+            await pipe.execute()
+
+    async def _heartbeat_loop(self) -> None:
+        """Periodically reset the idle time of this consumer's in-flight entries."""
+        while True:
+            await anyio.sleep(self.claim_interval)
+            if not self._in_flight or not self._redis_client:
+                continue
+            by_lane: dict[Priority, list[StreamIdT]] = {}
+            for delivery_tag in self._in_flight:
+                lane, entry_id = _parse_delivery_tag(delivery_tag)
+                by_lane.setdefault(lane, []).append(entry_id)
+            try:
+                for lane, entry_ids in by_lane.items():
+                    await self._redis_client.xclaim(
+                        self.lane_streams[lane],
+                        self.consumer_group,
+                        self.consumer_name,
+                        min_idle_time=0,
+                        message_ids=entry_ids,
+                        justid=True,
+                    )
+            except redis.RedisError as e:
+                logger.warning(f"Stream heartbeat failed: {e}")
+
+    # -------------------------------------------------------------------------
+    # Monitoring
+    # -------------------------------------------------------------------------
+
+    async def get_queue_length(self) -> int:
+        """Get the number of entries in the lane streams (queued and in flight)."""
+        return sum((await self._stream_lengths()).values())
+
+    async def _stream_lengths(self) -> dict[str, int]:
+        async with self._client.pipeline(transaction=False) as pipe:
+            for stream in self.lane_streams.values():
+                pipe.xlen(stream)
+            lengths = await pipe.execute()
+        return dict(zip(PRIORITIES, lengths))
+
+    async def get_queue_stats(self) -> dict[str, Any]:
+        """Return stream lengths, in-flight and dead-letter counts."""
+        client = self._client
+        lanes = await self._stream_lengths()
+        in_flight = 0
+        for stream in self.lane_streams.values():
+            in_flight += (await client.xpending(stream, self.consumer_group))["pending"]
+        return {
+            "backend": "redis_streams",
+            "stream": self.stream_name,
+            "consumer_group": self.consumer_group,
+            "queued": sum(lanes.values()),
+            "lanes": lanes,
+            "in_flight": in_flight,
+            "in_flight_local": len(self._in_flight),
+            "dead_lettered": await client.xlen(self.dead_letter_stream),
+        }
+
+    async def clear_queue(self) -> int:
+        """Delete the lane streams (and their consumer groups). Returns keys removed."""
+        self._in_flight.clear()
+        return await self._client.delete(*self.lane_streams.values())
@@ -38,7 +38,7 @@ AVAILABLE STORAGE OPTIONS:
 from __future__ import annotations as _annotations
 
 # Export the base storage interface
-from .base import Storage
+from .base import OutboxEntry, Storage
 
 # Export all storage implementations
 from .memory_storage import InMemoryStorage
@@ -58,6 +58,7 @@ except ImportError:
 __all__ = [
     # Base interface
     "Storage",
+    "OutboxEntry",
     # Storage implementations
     "InMemoryStorage",
     "PostgresStorage",
@@ -3,16 +3,34 @@
 from __future__ import annotations as _annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Generic
+from collections.abc import Collection, Sequence
+from typing import Any, Generic, TypedDict, cast
 from uuid import UUID
 
 from typing_extensions import TypeVar
 
-from bindu.common.protocol.types import Artifact, Message, Task, TaskState
+from bindu.common.protocol.types import (
+    Artifact,
+    Message,
+    PushNotificationConfig,
+    Task,
+    TaskState,
+)
 
 ContextT = TypeVar("ContextT", default=Any)
 
 
+class OutboxEntry(TypedDict):
+    """A lifecycle event waiting in the notification outbox."""
+
+    event_id: str
+    task_id: UUID
+    config: PushNotificationConfig
+    event: dict[str, Any]
+    attempts: int
+    """Failed delivery attempts so far."""
+
+
 class Storage(ABC, Generic[ContextT]):
     """Abstract storage interface for A2A protocol task and context management.
 
@@ -49,6 +67,35 @@ class Storage(ABC, Generic[ContextT]):
             Task object if found, None otherwise
         """
 
+    async def load_tasks(
+        self, task_ids: Sequence[UUID], fields: Sequence[str] | None = None
+    ) -> list[Task]:
+        """Load several tasks at once, in the order requested.
+
+        The default implementation calls load_task() per ID; backends override
+        it with a single lookup.
+
+        Args:
+            task_ids: Tasks to load
+            fields: Optional Task keys to include ("id" is always included);
+                None loads full tasks
+
+        Returns:
+            Found tasks in the order of task_ids; missing IDs are skipped
+        """
+        tasks: list[Task] = []
+        for task_id in task_ids:
+            task = await self.load_task(task_id)
+            if task is None:
+                continue
+            if fields is not None:
+                task = cast(
+                    Task,
+                    {k: v for k, v in task.items() if k == "id" or k in fields},
+                )
+            tasks.append(task)
+        return tasks
+
     @abstractmethod
     async def submit_task(self, context_id: UUID, message: Message) -> Task:
         """Create and store a new task.
@@ -69,7 +116,8 @@ class Storage(ABC, Generic[ContextT]):
         new_artifacts: list[Artifact] | None = None,
         new_messages: list[Message] | None = None,
         metadata: dict[str, Any] | None = None,
-    ) -> Task:
+        expected_states: Collection[str] | None = None,
+    ) -> Task | None:
         """Update task state and append new content.
 
         Args:
@@ -77,10 +125,42 @@ class Storage(ABC, Generic[ContextT]):
             state: New task state (working, completed, failed, etc.)
             new_artifacts: Optional artifacts to append
             new_messages: Optional messages to append to history
-            metadata: Optional metadata to update/merge with task metadata
+            metadata: Optional metadata to update/merge with task metadata;
+                keys set to None are removed
+            expected_states: Optional states the task must be in; the check
+                and the write are atomic, so e.g. a result never replaces a
+                cancel that landed first
+
+        Any state other than "working" also drops the task's checkpoint.
 
         Returns:
-            Updated task object
+            Updated task object, or None if the task was not in expected_states
+        """
+
+    @abstractmethod
+    async def save_checkpoint(self, task_id: UUID, checkpoint: dict[str, Any]) -> bool:
+        """Record the agent result of a working task until it is persisted.
+
+        Checkpoints are stored apart from the task, so they never reach API
+        responses, and last until the task leaves the working state.
+
+        Args:
+            task_id: Task the result belongs to
+            checkpoint: JSON-serializable result record
+
+        Returns:
+            Whether the task was working and the checkpoint was stored
+        """
+
+    @abstractmethod
+    async def load_checkpoint(self, task_id: UUID) -> dict[str, Any] | None:
+        """Load the checkpoint of a task.
+
+        Args:
+            task_id: Task to look up
+
+        Returns:
+            Checkpoint recorded while the task is working, None otherwise
         """
 
     @abstractmethod
@@ -96,16 +176,20 @@ class Storage(ABC, Generic[ContextT]):
 
     @abstractmethod
     async def list_tasks_by_context(
-        self, context_id: UUID, length: int | None = None
+        self,
+        context_id: UUID,
+        length: int | None = None,
+        history_length: int | None = None,
     ) -> list[Task]:
         """List tasks belonging to a specific context.
 
         Args:
             context_id: Context to filter tasks by
             length: Optional limit on number of tasks to return (most recent)
+            history_length: Optional limit on each task's history (last N messages)
 
         Returns:
-            List of tasks in the context
+            List of tasks in the context, oldest first
         """
 
     # -------------------------------------------------------------------------
@@ -136,6 +220,23 @@ class Storage(ABC, Generic[ContextT]):
             messages: Messages to append to history
         """
 
+    async def load_context_history(
+        self, context_id: UUID, history_length: int | None = None
+    ) -> list[Message] | None:
+        """Load the message history persisted by append_to_contexts().
+
+        Backends that persist context history override this so a cold
+        history cache can be filled with a single read.
+
+        Args:
+            context_id: Context to load history for
+            history_length: Optional limit on messages returned (last N)
+
+        Returns:
+            Persisted messages, or None if this backend does not persist them
+        """
+        return None
+
     @abstractmethod
     async def update_context(self, context_id: UUID, context: ContextT) -> None:
         """Store or update context.
@@ -207,3 +308,117 @@ class Storage(ABC, Generic[ContextT]):
         """
         # Optional - override in subclass if feedback retrieval is needed
         return None
+
+    # -------------------------------------------------------------------------
+    # Push Notification Operations
+    # -------------------------------------------------------------------------
+
+    @abstractmethod
+    async def save_push_config(
+        self, task_id: UUID, config: PushNotificationConfig
+    ) -> None:
+        """Store (or replace) the push notification config of a task.
+
+        Configs live in storage rather than on the pod that registered them,
+        so whichever pod runs the task can notify the subscriber.
+
+        Args:
+            task_id: Task to notify about
+            config: Subscriber webhook configuration
+        """
+
+    @abstractmethod
+    async def load_push_config(self, task_id: UUID) -> PushNotificationConfig | None:
+        """Load the push notification config of a task.
+
+        Args:
+            task_id: Task to look up
+
+        Returns:
+            The config, or None if none is registered
+        """
+
+    @abstractmethod
+    async def delete_push_config(self, task_id: UUID) -> PushNotificationConfig | None:
+        """Remove the push notification config of a task.
+
+        Args:
+            task_id: Task to stop notifying about
+
+        Returns:
+            The removed config, or None if none was registered
+        """
+
+    @abstractmethod
+    async def next_push_sequence(
+        self, task_id: UUID
+    ) -> tuple[PushNotificationConfig, int] | None:
+        """Atomically advance the notification sequence number of a task.
+
+        Args:
+            task_id: Task an event is being emitted for
+
+        Returns:
+            The task's config and its next sequence number (starting at 1),
+            or None if no config is registered
+        """
+
+    # -------------------------------------------------------------------------
+    # Notification Outbox Operations
+    # -------------------------------------------------------------------------
+
+    @abstractmethod
+    async def enqueue_notification(
+        self, task_id: UUID, config: PushNotificationConfig, event: dict[str, Any]
+    ) -> None:
+        """Add a lifecycle event to the durable notification outbox.
+
+        Events are deduplicated by ``event["event_id"]``: enqueueing an event
+        that is still pending is a no-op.
+
+        Args:
+            task_id: Task the event belongs to (events of a task are
+                delivered in enqueue order)
+            config: Subscriber webhook configuration
+            event: Event payload, including its event_id
+        """
+
+    @abstractmethod
+    async def claim_notifications(
+        self, limit: int, lease_timeout: float
+    ) -> list[OutboxEntry]:
+        """Lease events that are due for delivery.
+
+        Only the oldest pending event of each task is claimable, and only
+        when it is due and not leased, so a task's events are delivered one
+        at a time in order across every pod. A leased event becomes
+        claimable again after lease_timeout seconds (at-least-once delivery).
+
+        Args:
+            limit: Maximum number of events to claim
+            lease_timeout: Seconds the claim is exclusive
+
+        Returns:
+            Claimed events, oldest first
+        """
+
+    @abstractmethod
+    async def ack_notification(self, event_id: str) -> None:
+        """Remove a delivered (or abandoned) event from the outbox.
+
+        Args:
+            event_id: Event to remove
+        """
+
+    @abstractmethod
+    async def retry_notification(
+        self, event_id: str, delay: float, count_attempt: bool = True
+    ) -> None:
+        """Release a claimed event for another attempt after a delay.
+
+        Args:
+            event_id: Event whose delivery failed
+            delay: Seconds before the event is due again
+            count_attempt: Whether the delivery counts as a failed attempt
+                (False when the webhook was never contacted)
+        """
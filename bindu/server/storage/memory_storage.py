@@ -17,18 +17,27 @@ Note: All data is lost when the application stops. Use persistent storage for pr
 from __future__ import annotations as _annotations
 
 import copy
+import time
+from collections.abc import Collection, Sequence
 from datetime import datetime, timezone
 from typing import Any, cast
 from uuid import UUID
 
 from typing_extensions import TypeVar
 
-from bindu.common.protocol.types import Artifact, Message, Task, TaskState, TaskStatus
+from bindu.common.protocol.types import (
+    Artifact,
+    Message,
+    PushNotificationConfig,
+    Task,
+    TaskState,
+    TaskStatus,
+)
 from bindu.settings import app_settings
 from bindu.utils.logging import get_logger
 from bindu.utils.retry import retry_storage_operation
 
-from .base import Storage
+from .base import OutboxEntry, Storage
 
 logger = get_logger("bindu.server.storage.memory_storage")
 
@@ -42,6 +51,9 @@ class InMemoryStorage(Storage[ContextT]):
     - tasks: Dict[UUID, Task] - All tasks indexed by task_id
     - contexts: Dict[UUID, list[UUID]] - Task IDs grouped by context_id
     - task_feedback: Dict[UUID, List[dict]] - Optional feedback storage
+    - push_configs: Dict[UUID, (config, sequence)] - Push notification subscribers
+    - outbox: Dict[str, dict] - Pending lifecycle events by event_id (insertion order)
+    - checkpoints: Dict[UUID, dict] - Worker checkpoints of working tasks
     """
 
     def __init__(self):
@@ -52,6 +64,9 @@ class InMemoryStorage(Storage[ContextT]):
         self.tasks: dict[UUID, Task] = {}
         self.contexts: dict[UUID, list[UUID]] = {}
         self.task_feedback: dict[UUID, list[dict[str, Any]]] = {}
+        self.push_configs: dict[UUID, tuple[PushNotificationConfig, int]] = {}
+        self.outbox: dict[str, dict[str, Any]] = {}
+        self.checkpoints: dict[UUID, dict[str, Any]] = {}
 
     @retry_storage_operation(max_attempts=3, min_wait=0.1, max_wait=1)
     async def load_task(
@@ -82,6 +97,40 @@ class InMemoryStorage(Storage[ContextT]):
 
         return task_copy
 
+    async def load_tasks(
+        self, task_ids: Sequence[UUID], fields: Sequence[str] | None = None
+    ) -> list[Task]:
+        """Load several tasks from memory, in the order requested.
+
+        Args:
+            task_ids: Tasks to load
+            fields: Optional Task keys to include ("id" is always included);
+                None loads full tasks
+
+        Returns:
+            Deep copies of the found tasks in the order of task_ids;
+            missing IDs are skipped
+
+        Raises:
+            TypeError: If any task_id is not UUID
+        """
+        tasks: list[Task] = []
+        for task_id in task_ids:
+            if not isinstance(task_id, UUID):
+                raise TypeError(f"task_id must be UUID, got {type(task_id).__name__}")
+
+            task = self.tasks.get(task_id)
+            if task is None:
+                continue
+            if fields is not None:
+                task = cast(
+                    Task,
+                    {k: v for k, v in task.items() if k == "id" or k in fields},
+                )
+            tasks.append(copy.deepcopy(task))
+
+        return tasks
+
     @retry_storage_operation(max_attempts=3, min_wait=0.1, max_wait=1)
     async def submit_task(self, context_id: UUID, message: Message) -> Task:
         """Create a new task or continue an existing non-terminal task.
@@ -174,6 +223,7 @@ class InMemoryStorage(Storage[ContextT]):
             existing_task["status"] = TaskStatus(
                 state="submitted", timestamp=datetime.now(timezone.utc).isoformat()
             )
+            self.checkpoints.pop(task_id, None)
 
             return existing_task
 
@@ -205,7 +255,8 @@ class InMemoryStorage(Storage[ContextT]):
         new_artifacts: list[Artifact] | None = None,
         new_messages: list[Message] | None = None,
         metadata: dict[str, Any] | None = None,
-    ) -> Task:
+        expected_states: Collection[str] | None = None,
+    ) -> Task | None:
         """Update task state and append new content.
 
         Hybrid Pattern Support:
@@ -217,10 +268,12 @@ class InMemoryStorage(Storage[ContextT]):
             state: New task state (working, completed, failed, etc.)
             new_artifacts: Optional artifacts to append (for completion)
             new_messages: Optional messages to append to history
-            metadata: Optional metadata to update/merge with task metadata
+            metadata: Optional metadata to update/merge with task metadata;
+                keys set to None are removed
+            expected_states: Optional states the task must be in to update it
 
         Returns:
-            Updated task object
+            Updated task object, or None if the task was not in expected_states
 
         Raises:
             TypeError: If task_id is not UUID
@@ -233,14 +286,20 @@ class InMemoryStorage(Storage[ContextT]):
             raise KeyError(f"Task {task_id} not found")
 
         task = self.tasks[task_id]
+        if expected_states is not None and (
+            task["status"]["state"] not in expected_states
+        ):
+            return None
+
         task["status"] = TaskStatus(
             state=state, timestamp=datetime.now(timezone.utc).isoformat()
         )
+        if state != "working":
+            self.checkpoints.pop(task_id, None)
 
         if metadata:
-            if "metadata" not in task:
-                task["metadata"] = {}
-            task["metadata"].update(metadata)
+            merged = {**task.get("metadata", {}), **metadata}
+            task["metadata"] = {k: v for k, v in merged.items() if v is not None}
 
         if new_artifacts:
             if "artifacts" not in task:
@@ -262,6 +321,40 @@ class InMemoryStorage(Storage[ContextT]):
 
         return task
 
+    async def save_checkpoint(self, task_id: UUID, checkpoint: dict[str, Any]) -> bool:
+        """Record the agent result of a working task until it is persisted.
+
+        Args:
+            task_id: Task the result belongs to
+            checkpoint: Result record
+
+        Returns:
+            Whether the task was working and the checkpoint was stored
+
+        Raises:
+            TypeError: If task_id is not UUID
+        """
+        if not isinstance(task_id, UUID):
+            raise TypeError(f"task_id must be UUID, got {type(task_id).__name__}")
+
+        task = self.tasks.get(task_id)
+        if task is None or task["status"]["state"] != "working":
+            return False
+        self.checkpoints[task_id] = checkpoint
+        return True
+
+    async def load_checkpoint(self, task_id: UUID) -> dict[str, Any] | None:
+        """Load the checkpoint of a working task.
+
+        Args:
+            task_id: Task to look up
+
+        Returns:
+            Copy of the checkpoint, or None if there is none
+        """
+        checkpoint = self.checkpoints.get(task_id)
+        return copy.deepcopy(checkpoint) if checkpoint is not None else None
+
     async def update_context(self, context_id: UUID, context: ContextT) -> None:
         """Store or update context metadata.
 
@@ -340,7 +433,10 @@ class InMemoryStorage(Storage[ContextT]):
         return all_tasks[-length:] if length < len(all_tasks) else all_tasks
 
     async def list_tasks_by_context(
-        self, context_id: UUID, length: int | None = None
+        self,
+        context_id: UUID,
+        length: int | None = None,
+        history_length: int | None = None,
     ) -> list[Task]:
         """List tasks belonging to a specific context.
 
@@ -349,9 +445,10 @@ class InMemoryStorage(Storage[ContextT]):
         Args:
             context_id: Context to filter tasks by
             length: Optional limit on number of tasks to return (most recent)
+            history_length: Optional limit on each task's history (last N messages)
 
         Returns:
-            List of tasks in the context
+            List of tasks in the context, oldest first
 
         Raises:
             TypeError: If context_id is not UUID
@@ -366,7 +463,14 @@ class InMemoryStorage(Storage[ContextT]):
         ]
 
         if length is not None and length > 0 and length < len(tasks):
-            return tasks[-length:]
+            tasks = tasks[-length:]
+
+        # Slice into copies so the stored histories stay intact
+        if history_length is not None and history_length > 0:
+            tasks = [
+                {**task, "history": task.get("history", [])[-history_length:]}
+                for task in tasks
+            ]
         return tasks
 
     async def list_contexts(self, length: int | None = None) -> list[dict[str, Any]]:
@@ -416,6 +520,7 @@ class InMemoryStorage(Storage[ContextT]):
             # Also clear feedback for these tasks
             if task_id in self.task_feedback:
                 del self.task_feedback[task_id]
+            self.checkpoints.pop(task_id, None)
 
         # Remove the context itself
         del self.contexts[context_id]
@@ -430,6 +535,9 @@ class InMemoryStorage(Storage[ContextT]):
         self.tasks.clear()
         self.contexts.clear()
         self.task_feedback.clear()
+        self.push_configs.clear()
+        self.outbox.clear()
+        self.checkpoints.clear()
 
     async def store_task_feedback(
         self, task_id: UUID, feedback_data: dict[str, Any]
@@ -471,3 +579,99 @@ class InMemoryStorage(Storage[ContextT]):
             raise TypeError(f"task_id must be UUID, got {type(task_id).__name__}")
 
         return self.task_feedback.get(task_id)
+
+    # -------------------------------------------------------------------------
+    # Push Notification Operations
+    # -------------------------------------------------------------------------
+
+    async def save_push_config(
+        self, task_id: UUID, config: PushNotificationConfig
+    ) -> None:
+        """Store the push notification config of a task, keeping its sequence."""
+        _, sequence = self.push_configs.get(task_id, (None, 0))
+        self.push_configs[task_id] = (copy.deepcopy(config), sequence)
+
+    async def load_push_config(self, task_id: UUID) -> PushNotificationConfig | None:
+        """Load the push notification config of a task."""
+        entry = self.push_configs.get(task_id)
+        return copy.deepcopy(entry[0]) if entry else None
+
+    async def delete_push_config(self, task_id: UUID) -> PushNotificationConfig | None:
+        """Remove the push notification config of a task."""
+        entry = self.push_configs.pop(task_id, None)
+        return entry[0] if entry else None
+
+    async def next_push_sequence(
+        self, task_id: UUID
+    ) -> tuple[PushNotificationConfig, int] | None:
+        """Advance and return the notification sequence number of a task."""
+        entry = self.push_configs.get(task_id)
+        if entry is None:
+            return None
+        config, sequence = entry[0], entry[1] + 1
+        self.push_configs[task_id] = (config, sequence)
+        return copy.deepcopy(config), sequence
+
+    # -------------------------------------------------------------------------
+    # Notification Outbox Operations
+    # -------------------------------------------------------------------------
+
+    async def enqueue_notification(
+        self, task_id: UUID, config: PushNotificationConfig, event: dict[str, Any]
+    ) -> None:
+        """Add an event to the outbox unless one with its event_id is pending."""
+        event_id = str(event["event_id"])
+        if event_id in self.outbox:
+            return
+        self.outbox[event_id] = {
+            "task_id": task_id,
+            "config": copy.deepcopy(config),
+            "event": copy.deepcopy(event),
+            "attempts": 0,
+            "due_at": 0.0,
+            "locked_until": 0.0,
+        }
+
+    async def claim_notifications(
+        self, limit: int, lease_timeout: float
+    ) -> list[OutboxEntry]:
+        """Lease the oldest due event of each task (see Storage)."""
+        now = time.monotonic()
+        seen: set[UUID] = set()
+        claimed: list[OutboxEntry] = []
+        for event_id, entry in self.outbox.items():
+            if len(claimed) >= limit:
+                break
+            task_id = entry["task_id"]
+            if task_id in seen:
+                continue
+            seen.add(task_id)  # later events of the task wait for this one
+            if entry["due_at"] > now or entry["locked_until"] > now:
+                continue
+            entry["locked_until"] = now + lease_timeout
+            claimed.append(
+                OutboxEntry(
+                    event_id=event_id,
+                    task_id=task_id,
+                    config=copy.deepcopy(entry["config"]),
+                    event=copy.deepcopy(entry["event"]),
+                    attempts=entry["attempts"],
+                )
+            )
+        return claimed
+
+    async def ack_notification(self, event_id: str) -> None:
+        """Remove an event from the outbox."""
+        self.outbox.pop(event_id, None)
+
+    async def retry_notification(
+        self, event_id: str, delay: float, count_attempt: bool = True
+    ) -> None:
+        """Release a claimed event and make it due again after delay seconds."""
+        entry = self.outbox.get(event_id)
+        if entry is None:
+            return
+        if count_attempt:
+            entry["attempts"] += 1
+        entry["due_at"] = time.monotonic() + delay
+        entry["locked_until"] = 0.0
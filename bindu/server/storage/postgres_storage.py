@@ -25,26 +25,94 @@ Features:
 
 from __future__ import annotations as _annotations
 
-from datetime import datetime, timezone
+from collections.abc import Collection, Sequence
+from datetime import datetime, timedelta, timezone
+import typing
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import delete, func, select, update, cast
-from sqlalchemy.dialects.postgresql import insert, JSONB, JSON
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import Text, any_, delete, func, literal, select, update, cast
+from sqlalchemy.dialects.postgresql import ARRAY, insert, JSONB, JSON, JSONPATH
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from typing_extensions import TypeVar
 
-from bindu.common.protocol.types import Artifact, Message, Task, TaskState, TaskStatus
+from bindu.common.protocol.types import (
+    Artifact,
+    Message,
+    PushNotificationConfig,
+    Task,
+    TaskState,
+    TaskStatus,
+)
 from bindu.settings import app_settings
 from bindu.utils.logging import get_logger
 
-from .base import Storage
-from .schema import tasks_table, contexts_table, task_feedback_table
+from .base import OutboxEntry, Storage
+from .schema import (
+    contexts_table,
+    notification_outbox_table,
+    task_feedback_table,
+    task_push_configs_table,
+    tasks_table,
+)
 
 logger = get_logger("bindu.server.storage.postgres_storage")
 
 ContextT = TypeVar("ContextT", default=Any)
 
+# Columns backing each Task key, for partial loads in load_tasks()
+_TASK_FIELD_COLUMNS: dict[str, tuple[str, ...]] = {
+    "id": ("id",),
+    "context_id": ("context_id",),
+    "kind": ("kind",),
+    "status": ("state", "state_timestamp"),
+    "history": ("history",),
+    "artifacts": ("artifacts",),
+    "metadata": ("metadata",),
+}
+
+
+def _history_tail(column: Any, history_length: int | None) -> Any:
+    """Slice a JSONB message array to its last history_length items in SQL.
+
+    Only the tail crosses the wire. Lax-mode jsonpath clamps the range, so
+    shorter arrays are returned whole.
+
+    Args:
+        column: JSONB array column (task history or context message history)
+        history_length: Messages to keep; None or below 1 keeps everything
+
+    Returns:
+        Column expression to select
+    """
+    if history_length is None or history_length <= 0:
+        return column
+    return func.jsonb_path_query_array(
+        column,
+        cast("$[last - $n + 1 to last]", JSONPATH),
+        func.jsonb_build_object("n", history_length),
+    )
+
+
+def _task_columns(history_length: int | None = None) -> list[Any]:
+    """Return the Task columns, with history sliced to history_length.
+
+    The worker checkpoint is left out; it is only read by load_checkpoint().
+    """
+    return [
+        _history_tail(column, history_length).label("history")
+        if column.name == "history"
+        else column
+        for column in tasks_table.c
+        if column.name != "checkpoint"
+    ]
+
 
 def _serialize_for_jsonb(obj: Any) -> Any:
     """Recursively convert UUID objects to strings for JSONB serialization.
@@ -113,8 +181,8 @@ class PostgresStorage(Storage[ContextT]):
             command_timeout or app_settings.storage.postgres_command_timeout
         )
 
-        self._engine = None
-        self._session_factory = None
+        self._engine: AsyncEngine | None = None
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
 
     @staticmethod
     def _mask_password(url: str) -> str:
@@ -188,6 +256,17 @@ class PostgresStorage(Storage[ContextT]):
             self._engine = None
             self._session_factory = None
 
+    @property
+    def engine(self) -> AsyncEngine:
+        """The connected async engine, shared with components such as PostgresScheduler.
+
+        Raises:
+            RuntimeError: If engine is not initialized
+        """
+        self._ensure_connected()
+        assert self._engine is not None
+        return self._engine
+
     def _ensure_connected(self) -> None:
         """Ensure engine is initialized.
 
@@ -199,6 +278,16 @@ class PostgresStorage(Storage[ContextT]):
                 "PostgreSQL engine not initialized. Call connect() first."
             )
 
+    def _session(self) -> AsyncSession:
+        """Open a session on the connected engine.
+
+        Raises:
+            RuntimeError: If engine is not initialized
+        """
+        self._ensure_connected()
+        assert self._session_factory is not None
+        return self._session_factory()
+
     async def _retry_on_connection_error(self, func, *args, **kwargs):
         """Retry function on connection errors using Tenacity.
 
@@ -249,6 +338,32 @@ class PostgresStorage(Storage[ContextT]):
             metadata=row.metadata or {},
         )
 
+    def _row_to_partial_task(self, row, fields: set[str]) -> Task:
+        """Convert a row selected for some Task fields to a partial Task.
+
+        Args:
+            row: SQLAlchemy Row holding the columns of _TASK_FIELD_COLUMNS
+            fields: Task keys that were selected
+
+        Returns:
+            Task TypedDict containing only the requested keys
+        """
+        task: dict[str, Any] = {"id": row.id}
+        if "context_id" in fields:
+            task["context_id"] = row.context_id
+        if "kind" in fields:
+            task["kind"] = row.kind
+        if "status" in fields:
+            task["status"] = TaskStatus(
+                state=row.state, timestamp=row.state_timestamp.isoformat()
+            )
+        for key in ("history", "artifacts"):
+            if key in fields:
+                task[key] = getattr(row, key) or []
+        if "metadata" in fields:
+            task["metadata"] = row.metadata or {}
+        return typing.cast(Task, task)
+
     # -------------------------------------------------------------------------
     # Task Operations
     # -------------------------------------------------------------------------
@@ -274,21 +389,74 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _load():
-            async with self._session_factory() as session:
-                stmt = select(tasks_table).where(tasks_table.c.id == task_id)
+            async with self._session() as session:
+                # History is limited in the query when requested
+                stmt = select(*_task_columns(history_length)).where(
+                    tasks_table.c.id == task_id
+                )
                 result = await session.execute(stmt)
                 row = result.first()
 
-                if row is None:
-                    return None
+                return None if row is None else self._row_to_task(row)
+
+        return await self._retry_on_connection_error(_load)
 
-                task = self._row_to_task(row)
+    async def load_tasks(
+        self, task_ids: Sequence[UUID], fields: Sequence[str] | None = None
+    ) -> list[Task]:
+        """Load several tasks in one query (WHERE id = ANY(:ids)).
+
+        Only the columns backing the requested fields are selected, so
+        callers that need just the history skip artifacts and metadata.
+
+        Args:
+            task_ids: Tasks to load
+            fields: Optional Task keys to include ("id" is always included);
+                None loads full tasks
 
-                # Limit history if requested
-                if history_length is not None and history_length > 0:
-                    task["history"] = task["history"][-history_length:]
+        Returns:
+            Found tasks in the order of task_ids; missing IDs are skipped
+
+        Raises:
+            TypeError: If any task_id is not UUID
+        """
+        for task_id in task_ids:
+            if not isinstance(task_id, UUID):
+                raise TypeError(f"task_id must be UUID, got {type(task_id).__name__}")
+
+        if not task_ids:
+            return []
+
+        self._ensure_connected()
+
+        unique_ids = list(dict.fromkeys(task_ids))
+        wanted = None if fields is None else {"id", *fields}
+        if wanted is None:
+            columns = list(tasks_table.c)
+        else:
+            columns = [
+                tasks_table.c[column]
+                for key, names in _TASK_FIELD_COLUMNS.items()
+                if key in wanted
+                for column in names
+            ]
+
+        async def _load():
+            async with self._session() as session:
+                stmt = select(*columns).where(
+                    tasks_table.c.id
+                    == any_(literal(unique_ids, ARRAY(PG_UUID(as_uuid=True))))
+                )
+                result = await session.execute(stmt)
+                rows = {row.id: row for row in result}
 
-                return task
+                return [
+                    self._row_to_task(rows[task_id])
+                    if wanted is None
+                    else self._row_to_partial_task(rows[task_id], wanted)
+                    for task_id in task_ids
+                    if task_id in rows
+                ]
 
         return await self._retry_on_connection_error(_load)
 
@@ -359,7 +527,7 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _submit():
-            async with self._session_factory() as session:
+            async with self._session() as session:
                 async with session.begin():
                     # Check if task exists
                     stmt = select(tasks_table).where(tasks_table.c.id == task_id)
@@ -395,6 +563,7 @@ class PostgresStorage(Storage[ContextT]):
                                 state="submitted",
                                 state_timestamp=datetime.now(timezone.utc),
                                 updated_at=datetime.now(timezone.utc),
+                                checkpoint=None,
                             )
                             .returning(tasks_table)
                         )
@@ -444,7 +613,8 @@ class PostgresStorage(Storage[ContextT]):
         new_artifacts: list[Artifact] | None = None,
         new_messages: list[Message] | None = None,
         metadata: dict[str, Any] | None = None,
-    ) -> Task:
+        expected_states: Collection[str] | None = None,
+    ) -> Task | None:
         """Update task state and append new content using SQLAlchemy.
 
         Args:
@@ -452,10 +622,13 @@ class PostgresStorage(Storage[ContextT]):
             state: New task state
             new_artifacts: Optional artifacts to append
             new_messages: Optional messages to append to history
-            metadata: Optional metadata to update/merge
+            metadata: Optional metadata to update/merge; keys set to None
+                are removed
+            expected_states: Optional states the task must be in, checked by
+                the UPDATE itself
 
         Returns:
-            Updated task object
+            Updated task object, or None if the task was not in expected_states
 
         Raises:
             TypeError: If task_id is not UUID
@@ -467,7 +640,7 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _update():
-            async with self._session_factory() as session:
+            async with self._session() as session:
                 async with session.begin():
                     # Check if task exists
                     stmt = select(tasks_table).where(tasks_table.c.id == task_id)
@@ -484,13 +657,21 @@ class PostgresStorage(Storage[ContextT]):
                         "state_timestamp": now,
                         "updated_at": now,
                     }
+                    if state != "working":
+                        update_values["checkpoint"] = None
 
                     # Update metadata (merge with existing)
                     if metadata:
-                        serialized_metadata = _serialize_for_jsonb(metadata)
-                        update_values["metadata"] = func.jsonb_concat(
+                        serialized_metadata = _serialize_for_jsonb(
+                            {k: v for k, v in metadata.items() if v is not None}
+                        )
+                        merged = func.jsonb_concat(
                             tasks_table.c.metadata, cast(serialized_metadata, JSONB)
                         )
+                        removed = [k for k, v in metadata.items() if v is None]
+                        if removed:
+                            merged = merged.op("-")(cast(removed, ARRAY(Text)))
+                        update_values["metadata"] = merged
 
                     # Append artifacts
                     if new_artifacts:
@@ -520,15 +701,67 @@ class PostgresStorage(Storage[ContextT]):
                         update(tasks_table)
                         .where(tasks_table.c.id == task_id)
                         .values(**update_values)
-                        .returning(tasks_table)
+                        .returning(*_task_columns())
                     )
+                    if expected_states is not None:
+                        stmt = stmt.where(tasks_table.c.state.in_(expected_states))
                     result = await session.execute(stmt)
                     updated_row = result.first()
 
-                    return self._row_to_task(updated_row)
+                    return self._row_to_task(updated_row) if updated_row else None
 
         return await self._retry_on_connection_error(_update)
 
+    async def save_checkpoint(self, task_id: UUID, checkpoint: dict[str, Any]) -> bool:
+        """Record the agent result of a working task until it is persisted.
+
+        Args:
+            task_id: Task the result belongs to
+            checkpoint: JSON-serializable result record
+
+        Returns:
+            Whether the task was working and the checkpoint was stored
+        """
+        self._ensure_connected()
+        serialized = _serialize_for_jsonb(checkpoint)
+
+        async def _save():
+            async with self._session() as session:
+                async with session.begin():
+                    stmt = (
+                        update(tasks_table)
+                        .where(
+                            tasks_table.c.id == task_id,
+                            tasks_table.c.state == "working",
+                        )
+                        .values(checkpoint=cast(serialized, JSONB))
+                        .returning(tasks_table.c.id)
+                    )
+                    result = await session.execute(stmt)
+                    return result.first() is not None
+
+        return await self._retry_on_connection_error(_save)
+
+    async def load_checkpoint(self, task_id: UUID) -> dict[str, Any] | None:
+        """Load the checkpoint of a working task.
+
+        Args:
+            task_id: Task to look up
+
+        Returns:
+            The checkpoint, or None if there is none
+        """
+        self._ensure_connected()
+
+        async def _load():
+            async with self._session() as session:
+                stmt = select(tasks_table.c.checkpoint).where(
+                    tasks_table.c.id == task_id
+                )
+                return (await session.execute(stmt)).scalar_one_or_none()
+
+        return await self._retry_on_connection_error(_load)
+
     async def list_tasks(self, length: int | None = None) -> list[Task]:
         """List all tasks using SQLAlchemy.
 
@@ -541,8 +774,10 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _list():
-            async with self._session_factory() as session:
-                stmt = select(tasks_table).order_by(tasks_table.c.created_at.desc())
+            async with self._session() as session:
+                stmt = select(*_task_columns()).order_by(
+                    tasks_table.c.created_at.desc()
+                )
 
                 if length is not None:
                     stmt = stmt.limit(length)
@@ -555,16 +790,23 @@ class PostgresStorage(Storage[ContextT]):
         return await self._retry_on_connection_error(_list)
 
     async def list_tasks_by_context(
-        self, context_id: UUID, length: int | None = None
+        self,
+        context_id: UUID,
+        length: int | None = None,
+        history_length: int | None = None,
     ) -> list[Task]:
         """List tasks belonging to a specific context.
 
+        Both limits are applied in the query (ORDER BY created_at DESC LIMIT
+        and a JSONB slice of each history).
+
         Args:
             context_id: Context to filter tasks by
-            length: Optional limit on number of tasks to return
+            length: Optional limit on number of tasks to return (most recent)
+            history_length: Optional limit on each task's history (last N messages)
 
         Returns:
-            List of tasks in the context
+            List of tasks in the context, oldest first
 
         Raises:
             TypeError: If context_id is not UUID
@@ -575,18 +817,20 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _list():
-            async with self._session_factory() as session:
-                stmt = (
-                    select(tasks_table)
-                    .where(tasks_table.c.context_id == context_id)
-                    .order_by(tasks_table.c.created_at.asc())
+            async with self._session() as session:
+                stmt = select(*_task_columns(history_length)).where(
+                    tasks_table.c.context_id == context_id
                 )
 
-                if length is not None:
-                    stmt = stmt.limit(length)
+                if length is not None and length > 0:
+                    stmt = stmt.order_by(tasks_table.c.created_at.desc()).limit(length)
+                else:
+                    stmt = stmt.order_by(tasks_table.c.created_at.asc())
 
                 result = await session.execute(stmt)
                 rows = result.fetchall()
+                if length is not None and length > 0:
+                    rows = rows[::-1]
 
                 return [self._row_to_task(row) for row in rows]
 
@@ -614,7 +858,7 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _load():
-            async with self._session_factory() as session:
+            async with self._session() as session:
                 stmt = select(contexts_table).where(contexts_table.c.id == context_id)
                 result = await session.execute(stmt)
                 row = result.first()
@@ -623,6 +867,40 @@ class PostgresStorage(Storage[ContextT]):
 
         return await self._retry_on_connection_error(_load)
 
+    async def load_context_history(
+        self, context_id: UUID, history_length: int | None = None
+    ) -> list[Message] | None:
+        """Load the persisted message history of a context using SQLAlchemy.
+
+        Args:
+            context_id: Context to load history for
+            history_length: Optional limit on messages returned (last N,
+                sliced in the query)
+
+        Returns:
+            Messages stored in contexts.message_history ([] if the context
+            does not exist yet)
+
+        Raises:
+            TypeError: If context_id is not UUID
+        """
+        if not isinstance(context_id, UUID):
+            raise TypeError(f"context_id must be UUID, got {type(context_id).__name__}")
+
+        self._ensure_connected()
+
+        async def _load():
+            async with self._session() as session:
+                stmt = select(
+                    _history_tail(contexts_table.c.message_history, history_length)
+                ).where(contexts_table.c.id == context_id)
+                result = await session.execute(stmt)
+                history = result.scalar_one_or_none()
+
+                return list(history or [])
+
+        return await self._retry_on_connection_error(_load)
+
     async def update_context(self, context_id: UUID, context: ContextT) -> None:
         """Store or update context using SQLAlchemy.
 
@@ -639,7 +917,7 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _update():
-            async with self._session_factory() as session:
+            async with self._session() as session:
                 async with session.begin():
                     # Upsert context
                     # Serialize context data to convert UUIDs to strings
@@ -683,7 +961,7 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _append():
-            async with self._session_factory() as session:
+            async with self._session() as session:
                 async with session.begin():
                     # Ensure context exists
                     stmt = insert(contexts_table).values(
@@ -724,7 +1002,7 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _list():
-            async with self._session_factory() as session:
+            async with self._session() as session:
                 # Query contexts with task counts
                 stmt = (
                     select(
@@ -783,7 +1061,7 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _clear():
-            async with self._session_factory() as session:
+            async with self._session() as session:
                 async with session.begin():
                     # Check if context exists
                     stmt = select(contexts_table).where(
@@ -822,9 +1100,11 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _clear():
-            async with self._session_factory() as session:
+            async with self._session() as session:
                 async with session.begin():
                     await session.execute(delete(task_feedback_table))
+                    await session.execute(delete(task_push_configs_table))
+                    await session.execute(delete(notification_outbox_table))
                     await session.execute(delete(tasks_table))
                     await session.execute(delete(contexts_table))
                     logger.info("Cleared all tasks, contexts, and feedback")
@@ -858,7 +1138,7 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _store():
-            async with self._session_factory() as session:
+            async with self._session() as session:
                 async with session.begin():
                     # Serialize feedback data to convert UUIDs to strings
                     serialized_feedback = _serialize_for_jsonb(feedback_data)
@@ -887,7 +1167,7 @@ class PostgresStorage(Storage[ContextT]):
         self._ensure_connected()
 
         async def _get():
-            async with self._session_factory() as session:
+            async with self._session() as session:
                 stmt = (
                     select(task_feedback_table)
                     .where(task_feedback_table.c.task_id == task_id)
@@ -902,3 +1182,248 @@ class PostgresStorage(Storage[ContextT]):
                 return [row.feedback_data for row in rows]
 
         return await self._retry_on_connection_error(_get)
+
+    # -------------------------------------------------------------------------
+    # Push Notification Operations
+    # -------------------------------------------------------------------------
+
+    async def save_push_config(
+        self, task_id: UUID, config: PushNotificationConfig
+    ) -> None:
+        """Upsert the push notification config of a task, keeping its sequence.
+
+        Args:
+            task_id: Task to notify about
+            config: Subscriber webhook configuration
+        """
+        self._ensure_connected()
+        serialized = _serialize_for_jsonb(config)
+
+        async def _save():
+            async with self._session() as session:
+                async with session.begin():
+                    stmt = insert(task_push_configs_table).values(
+                        task_id=task_id, config=serialized
+                    )
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[task_push_configs_table.c.task_id],
+                        set_={"config": stmt.excluded.config, "updated_at": func.now()},
+                    )
+                    await session.execute(stmt)
+
+        await self._retry_on_connection_error(_save)
+
+    async def load_push_config(self, task_id: UUID) -> PushNotificationConfig | None:
+        """Load the push notification config of a task.
+
+        Args:
+            task_id: Task to look up
+
+        Returns:
+            The config, or None if none is registered
+        """
+        self._ensure_connected()
+
+        async def _load():
+            async with self._session() as session:
+                stmt = select(task_push_configs_table.c.config).where(
+                    task_push_configs_table.c.task_id == task_id
+                )
+                return (await session.execute(stmt)).scalar_one_or_none()
+
+        return await self._retry_on_connection_error(_load)
+
+    async def delete_push_config(self, task_id: UUID) -> PushNotificationConfig | None:
+        """Remove the push notification config of a task.
+
+        Args:
+            task_id: Task to stop notifying about
+
+        Returns:
+            The removed config, or None if none was registered
+        """
+        self._ensure_connected()
+
+        async def _delete():
+            async with self._session() as session:
+                async with session.begin():
+                    stmt = (
+                        delete(task_push_configs_table)
+                        .where(task_push_configs_table.c.task_id == task_id)
+                        .returning(task_push_configs_table.c.config)
+                    )
+                    return (await session.execute(stmt)).scalar_one_or_none()
+
+        return await self._retry_on_connection_error(_delete)
+
+    async def next_push_sequence(
+        self, task_id: UUID
+    ) -> tuple[PushNotificationConfig, int] | None:
+        """Increment the notification sequence of a task in one statement.
+
+        Args:
+            task_id: Task an event is being emitted for
+
+        Returns:
+            The task's config and next sequence number, or None without a config
+        """
+        self._ensure_connected()
+        _configs = task_push_configs_table.c
+
+        async def _next():
+            async with self._session() as session:
+                async with session.begin():
+                    stmt = (
+                        update(task_push_configs_table)
+                        .where(_configs.task_id == task_id)
+                        .values(sequence=_configs.sequence + 1)
+                        .returning(_configs.config, _configs.sequence)
+                    )
+                    row = (await session.execute(stmt)).first()
+                    return (row.config, row.sequence) if row else None
+
+        return await self._retry_on_connection_error(_next)
+
+    # -------------------------------------------------------------------------
+    # Notification Outbox Operations
+    # -------------------------------------------------------------------------
+
+    async def enqueue_notification(
+        self, task_id: UUID, config: PushNotificationConfig, event: dict[str, Any]
+    ) -> None:
+        """Insert an event into the outbox, ignoring duplicate event_ids.
+
+        Args:
+            task_id: Task the event belongs to
+            config: Subscriber webhook configuration
+            event: Event payload, including its event_id
+        """
+        self._ensure_connected()
+        values = {
+            "event_id": str(event["event_id"]),
+            "task_id": task_id,
+            "config": _serialize_for_jsonb(config),
+            "event": _serialize_for_jsonb(event),
+        }
+
+        async def _enqueue():
+            async with self._session() as session:
+                async with session.begin():
+                    stmt = (
+                        insert(notification_outbox_table)
+                        .values(**values)
+                        .on_conflict_do_nothing(
+                            index_elements=[notification_outbox_table.c.event_id]
+                        )
+                    )
+                    await session.execute(stmt)
+
+        await self._retry_on_connection_error(_enqueue)
+
+    async def claim_notifications(
+        self, limit: int, lease_timeout: float
+    ) -> list[OutboxEntry]:
+        """Lease the oldest due event of each task with FOR UPDATE SKIP LOCKED.
+
+        Args:
+            limit: Maximum number of events to claim
+            lease_timeout: Seconds the claim is exclusive
+
+        Returns:
+            Claimed events, oldest first
+        """
+        self._ensure_connected()
+        _outbox = notification_outbox_table.c
+        earlier = notification_outbox_table.alias("earlier")
+
+        picked = (
+            select(_outbox.id)
+            .where(
+                ~select(earlier.c.id)
+                .where(earlier.c.task_id == _outbox.task_id, earlier.c.id < _outbox.id)
+                .exists(),
+                _outbox.next_attempt_at <= func.now(),
+                (_outbox.locked_until.is_(None)) | (_outbox.locked_until < func.now()),
+            )
+            .order_by(_outbox.id)
+            .limit(limit)
+            .with_for_update(of=notification_outbox_table, skip_locked=True)
+            .cte("picked")
+        )
+        claim = (
+            update(notification_outbox_table)
+            .where(_outbox.id == picked.c.id)
+            .values(locked_until=func.now() + timedelta(seconds=lease_timeout))
+            .returning(
+                _outbox.id,
+                _outbox.event_id,
+                _outbox.task_id,
+                _outbox.config,
+                _outbox.event,
+                _outbox.attempts,
+            )
+        )
+
+        async def _claim():
+            async with self._session() as session:
+                async with session.begin():
+                    rows = (await session.execute(claim)).all()
+            return [
+                OutboxEntry(
+                    event_id=row.event_id,
+                    task_id=row.task_id,
+                    config=row.config,
+                    event=row.event,
+                    attempts=row.attempts,
+                )
+                for row in sorted(rows, key=lambda row: row.id)
+            ]
+
+        return await self._retry_on_connection_error(_claim)
+
+    async def ack_notification(self, event_id: str) -> None:
+        """Delete an event from the outbox.
+
+        Args:
+            event_id: Event to remove
+        """
+        self._ensure_connected()
+
+        async def _ack():
+            async with self._session() as session:
+                async with session.begin():
+                    await session.execute(
+                        delete(notification_outbox_table).where(
+                            notification_outbox_table.c.event_id == event_id
+                        )
+                    )
+
+        await self._retry_on_connection_error(_ack)
+
+    async def retry_notification(
+        self, event_id: str, delay: float, count_attempt: bool = True
+    ) -> None:
+        """Release an event's lease and schedule its next attempt.
+
+        Args:
+            event_id: Event whose delivery failed
+            delay: Seconds before the event is due again
+            count_attempt: Whether the delivery counts as a failed attempt
+        """
+        self._ensure_connected()
+        _outbox = notification_outbox_table.c
+
+        async def _retry():
+            async with self._session() as session:
+                async with session.begin():
+                    await session.execute(
+                        update(notification_outbox_table)
+                        .where(_outbox.event_id == event_id)
+                        .values(
+                            attempts=_outbox.attempts + int(count_attempt),
+                            next_attempt_at=func.now() + timedelta(seconds=delay),
+                            locked_until=None,
+                        )
+                    )
+
+        await self._retry_on_connection_error(_retry)
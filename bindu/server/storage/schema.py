@@ -19,13 +19,16 @@ from __future__ import annotations as _annotations
 
 from sqlalchemy import (
     TIMESTAMP,
+    BigInteger,
     Column,
     ForeignKey,
     Index,
     Integer,
     MetaData,
+    SmallInteger,
     String,
     Table,
+    Text,
     func,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
@@ -57,6 +60,8 @@ tasks_table = Table(
     Column("history", JSONB, nullable=False, server_default="[]"),
     Column("artifacts", JSONB, nullable=True, server_default="[]"),
     Column("metadata", JSONB, nullable=True, server_default="{}"),
+    # Worker checkpoint of a working task (never returned with the task)
+    Column("checkpoint", JSONB, nullable=True),
     # Timestamps
     Column(
         "created_at",
@@ -150,6 +155,116 @@ task_feedback_table = Table(
     comment="User feedback for tasks",
 )
 
+# -----------------------------------------------------------------------------
+# Task Queue Table
+# -----------------------------------------------------------------------------
+
+task_queue_table = Table(
+    "task_queue",
+    metadata,
+    # Primary key (monotonic, gives FIFO order)
+    Column("id", BigInteger, primary_key=True, autoincrement=True, nullable=False),
+    # Encoded task operation (see bindu.server.scheduler.codec)
+    Column("operation", String(20), nullable=False),
+    Column("payload", Text, nullable=False),
+    # Scheduling: lane (0 control, 1 interactive, 2 batch) and round-robin key
+    Column("priority", SmallInteger, nullable=False, server_default="1"),
+    Column("fairness_key", String(255), nullable=False, server_default=""),
+    Column("weight", SmallInteger, nullable=False, server_default="1"),
+    # Lease: a claimed row is invisible to other workers until locked_until
+    Column("locked_by", String(255), nullable=True),
+    Column("locked_until", TIMESTAMP(timezone=True), nullable=True),
+    Column("attempts", Integer, nullable=False, server_default="0"),
+    # Timestamps
+    Column(
+        "enqueued_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    # Indexes
+    Index("idx_task_queue_locked_until", "locked_until"),
+    Index("idx_task_queue_lane", "priority", "fairness_key", "id"),
+    Index("idx_task_queue_claim", "priority", "id"),
+    # Table comment
+    comment="Pending task operations for the PostgreSQL scheduler",
+)
+
+# -----------------------------------------------------------------------------
+# Push Notification Configs Table
+# -----------------------------------------------------------------------------
+
+task_push_configs_table = Table(
+    "task_push_configs",
+    metadata,
+    # Primary key (one subscriber per task)
+    Column(
+        "task_id",
+        PG_UUID(as_uuid=True),
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    ),
+    # Sanitized PushNotificationConfig
+    Column("config", JSONB, nullable=False),
+    # Last sequence number emitted for the task
+    Column("sequence", Integer, nullable=False, server_default="0"),
+    # Timestamps
+    Column(
+        "created_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    Column(
+        "updated_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    ),
+    # Table comment
+    comment="Push notification subscribers per task",
+)
+
+# -----------------------------------------------------------------------------
+# Notification Outbox Table
+# -----------------------------------------------------------------------------
+
+notification_outbox_table = Table(
+    "notification_outbox",
+    metadata,
+    # Primary key (monotonic, gives per-task delivery order)
+    Column("id", BigInteger, primary_key=True, autoincrement=True, nullable=False),
+    # Deduplication key
+    Column("event_id", String(64), nullable=False, unique=True),
+    Column("task_id", PG_UUID(as_uuid=True), nullable=False),
+    # Delivery target and payload
+    Column("config", JSONB, nullable=False),
+    Column("event", JSONB, nullable=False),
+    # Retry schedule and lease
+    Column("attempts", Integer, nullable=False, server_default="0"),
+    Column(
+        "next_attempt_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    Column("locked_until", TIMESTAMP(timezone=True), nullable=True),
+    # Timestamps
+    Column(
+        "created_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    # Indexes
+    Index("idx_notification_outbox_task_id", "task_id", "id"),
+    Index("idx_notification_outbox_next_attempt_at", "next_attempt_at"),
+    # Table comment
+    comment="Lifecycle events pending webhook delivery",
+)
+
 # -----------------------------------------------------------------------------
 # Helper Functions
 # -----------------------------------------------------------------------------
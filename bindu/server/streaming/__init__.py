@@ -0,0 +1,35 @@
+"""Task event streaming for Bindu server.
+
+Workers publish task status and artifact events to a per-task event bus;
+``message/stream`` relays them to clients as Server-Sent Events.
+"""
+
+from .event_bus import (
+    InMemoryTaskEventBus,
+    RedisTaskEventBus,
+    TaskEventBus,
+    TaskEventSubscription,
+    create_event_bus,
+)
+from .events import (
+    STREAM_END_STATES,
+    artifact_update_event,
+    chunk_part,
+    decode_event,
+    is_final_event,
+    status_update_event,
+)
+
+__all__ = [
+    "TaskEventBus",
+    "TaskEventSubscription",
+    "InMemoryTaskEventBus",
+    "RedisTaskEventBus",
+    "create_event_bus",
+    "STREAM_END_STATES",
+    "artifact_update_event",
+    "chunk_part",
+    "decode_event",
+    "is_final_event",
+    "status_update_event",
+]
@@ -0,0 +1,614 @@
+"""Per-task event bus between workers and streaming endpoints.
+
+Workers publish a task's status and artifact events; ``message/stream``
+subscribes to the task before scheduling it and relays the events as SSE.
+The worker may run on another pod than the endpoint, so the bus has two
+backends:
+
+- InMemoryTaskEventBus: in-process fan-out (memory scheduler, single pod)
+- RedisTaskEventBus: Redis pub/sub on ``<prefix>:<task_id>``; one shared
+  pub/sub connection per pod fans messages out to local subscribers
+
+Every event is numbered (1, 2, ... per task) and recorded in a bounded
+per-task event log: a ring buffer in memory, a Redis stream at
+``<prefix>:log:<task_id>`` for the Redis bus. A subscriber that passes the
+last sequence number it saw (the SSE ``Last-Event-ID``) first receives the
+logged events after it, then live events, without gaps or repeats. Logs are
+dropped ``log_ttl`` seconds after a final event, or ``log_max_age`` seconds
+after the last event of a task that never finishes.
+
+Live delivery is best effort, like the scheduler's cancel channel: a
+subscriber that falls ``subscriber_queue_size`` events behind stops
+receiving. Streaming endpoints therefore fall back to the stored task when
+a stream goes quiet.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+import orjson
+
+from bindu.utils.logging import get_logger
+
+from .events import decode_event, is_final_event
+
+try:
+    import redis.asyncio as redis
+
+    REDIS_AVAILABLE = True
+except ImportError:  # redis not installed
+    REDIS_AVAILABLE = False
+
+logger = get_logger("bindu.server.streaming.event_bus")
+
+# A logged event: (sequence number, event)
+TaskEventRecord = tuple[int, dict[str, Any]]
+
+
+class TaskEventSubscription:
+    """Events of one task, in sequence order, for one subscriber.
+
+    Use as an async context manager, or call ``close()`` when done.
+    """
+
+    def __init__(
+        self,
+        task_id: UUID,
+        max_queued: int,
+        on_close: Callable[[TaskEventSubscription], Any],
+        after_seq: int | None = None,
+    ):
+        """Initialize the subscription.
+
+        Args:
+            task_id: Task whose events are received
+            max_queued: Events buffered before the subscriber counts as lagged
+            on_close: Called once when the subscription is closed
+            after_seq: Last sequence number the subscriber already has
+        """
+        self.task_id = task_id
+        self.lagged = False
+        self.missed = False
+        """Whether events after ``after_seq`` were no longer in the log."""
+        self.last_seq = after_seq
+        """Sequence number of the last event returned by ``get()``."""
+        self._queue: asyncio.Queue[TaskEventRecord] = asyncio.Queue(max(1, max_queued))
+        self._replay: deque[TaskEventRecord] = deque()
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aenter__(self) -> TaskEventSubscription:
+        """Return the subscription."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Close the subscription."""
+        await self.close()
+
+    def deliver(self, seq: int, event: dict[str, Any]) -> None:
+        """Queue a live event for the subscriber (called by the bus)."""
+        if self.lagged:
+            return
+        try:
+            self._queue.put_nowait((seq, event))
+        except asyncio.QueueFull:
+            self.lagged = True
+            logger.warning(
+                "Stream subscriber fell behind; dropping its events",
+                task_id=str(self.task_id),
+            )
+
+    def replay(self, records: list[TaskEventRecord] | None) -> None:
+        """Queue logged events ahead of live ones (called by the bus).
+
+        Args:
+            records: Logged events after ``after_seq``, or None if some of
+                them are no longer in the log
+        """
+        if records is None:
+            self.missed = True
+            return
+        self._replay.extend(records)
+
+    async def get(self, timeout: float | None = None) -> dict[str, Any] | None:
+        """Return the next event, or None if none arrived within timeout."""
+        if self._replay:
+            self.last_seq, event = self._replay.popleft()
+            return event
+        while True:
+            try:
+                seq, event = await asyncio.wait_for(self._queue.get(), timeout)
+            except TimeoutError:
+                return None
+            # Live events that were also replayed
+            if self.last_seq is not None and seq <= self.last_seq:
+                continue
+            self.last_seq = seq
+            return event
+
+    async def close(self) -> None:
+        """Stop receiving events."""
+        if self._closed:
+            return
+        self._closed = True
+        result = self._on_close(self)
+        if asyncio.iscoroutine(result):
+            await result
+
+
+class TaskEventBus(ABC):
+    """Abstract per-task event bus.
+
+    Implementations are async context managers; TaskManager enters the bus
+    for the lifetime of the server.
+    """
+
+    async def __aenter__(self) -> TaskEventBus:
+        """Open backend resources."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Release backend resources."""
+
+    @abstractmethod
+    async def publish(self, task_id: UUID, event: dict[str, Any]) -> int:
+        """Log an event of a task and send it to its current subscribers.
+
+        Returns:
+            The event's sequence number
+        """
+
+    @abstractmethod
+    async def subscribe(
+        self, task_id: UUID, after_seq: int | None = None
+    ) -> TaskEventSubscription:
+        """Subscribe to a task's events.
+
+        Events published after this returns are received. With
+        ``after_seq``, the logged events after that sequence number are
+        received first; if some were already dropped from the log, the
+        subscription is marked ``missed`` and only live events follow.
+        """
+
+
+@dataclass
+class _TaskEventLog:
+    """Bounded event log of one task."""
+
+    events: deque[TaskEventRecord]
+    seq: int = 0
+    expires_at: float = 0.0
+    closed: bool = False
+
+
+class InMemoryTaskEventBus(TaskEventBus):
+    """In-process event bus with in-memory event logs."""
+
+    def __init__(
+        self,
+        subscriber_queue_size: int = 1000,
+        on_idle: Callable[[UUID], Any] | None = None,
+        log_size: int = 200,
+        log_ttl: float = 300.0,
+        log_max_age: float = 86400.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the bus.
+
+        Args:
+            subscriber_queue_size: Events buffered per subscriber
+            on_idle: Called with a task ID when its last subscriber leaves
+            log_size: Events kept per task for replay
+            log_ttl: Seconds a task's log is kept after a final event
+            log_max_age: Seconds a task's log is kept after its last event
+                when no final event arrives
+            clock: Monotonic clock (overridable for tests)
+        """
+        self.subscriber_queue_size = subscriber_queue_size
+        self.log_size = log_size
+        self.log_ttl = log_ttl
+        self.log_max_age = log_max_age
+        self._on_idle = on_idle
+        self._clock = clock
+        self._subscribers: dict[UUID, set[TaskEventSubscription]] = {}
+        self._logs: dict[UUID, _TaskEventLog] = {}
+        # (expiry, task_id) candidates; a log's own expires_at is authoritative
+        self._expiry: list[tuple[float, UUID]] = []
+
+    def subscriber_count(self, task_id: UUID) -> int:
+        """Return the number of subscribers of a task."""
+        return len(self._subscribers.get(task_id, ()))
+
+    async def publish(self, task_id: UUID, event: dict[str, Any]) -> int:
+        """Log an event and deliver it to every subscriber of the task."""
+        seq = self._record(task_id, event)
+        self.dispatch(task_id, seq, event)
+        return seq
+
+    def dispatch(self, task_id: UUID, seq: int, event: dict[str, Any]) -> None:
+        """Deliver a sequenced event without waiting or logging it.
+
+        After a final event the subscribers are detached; they keep the
+        events already queued.
+        """
+        subscribers = self._subscribers.get(task_id)
+        if not subscribers:
+            return
+        for subscription in list(subscribers):
+            subscription.deliver(seq, event)
+        if is_final_event(event):
+            del self._subscribers[task_id]
+            self._idle(task_id)
+
+    async def subscribe(
+        self, task_id: UUID, after_seq: int | None = None
+    ) -> TaskEventSubscription:
+        """Subscribe to a task's events, replaying those after after_seq."""
+        subscription = self.attach(task_id, after_seq)
+        if after_seq is not None:
+            subscription.replay(self.replay(task_id, after_seq))
+        return subscription
+
+    def attach(
+        self, task_id: UUID, after_seq: int | None = None
+    ) -> TaskEventSubscription:
+        """Register a subscription to live events without replaying the log."""
+        subscription = TaskEventSubscription(
+            task_id, self.subscriber_queue_size, self._unsubscribe, after_seq
+        )
+        self._subscribers.setdefault(task_id, set()).add(subscription)
+        return subscription
+
+    def replay(self, task_id: UUID, after_seq: int) -> list[TaskEventRecord] | None:
+        """Return the logged events after a sequence number.
+
+        Returns:
+            The events, or None if some of them are no longer logged
+        """
+        self._purge_expired()
+        log = self._logs.get(task_id)
+        if log is None or after_seq > log.seq:
+            return None
+        records = [record for record in log.events if record[0] > after_seq]
+        first = records[0][0] if records else log.seq + 1
+        return records if first == after_seq + 1 else None
+
+    def _record(self, task_id: UUID, event: dict[str, Any]) -> int:
+        """Append an event to its task's log and return its sequence number."""
+        self._purge_expired()
+        now = self._clock()
+        log = self._logs.get(task_id)
+        if log is None:
+            log = self._logs[task_id] = _TaskEventLog(deque(maxlen=self.log_size))
+            heapq.heappush(self._expiry, (now + self.log_max_age, task_id))
+
+        log.seq += 1
+        log.events.append((log.seq, event))
+        if is_final_event(event):
+            log.closed = True
+            log.expires_at = now + self.log_ttl
+            heapq.heappush(self._expiry, (log.expires_at, task_id))
+        else:
+            if log.closed:
+                # Resumed after a final event: the max-age entry may be gone
+                log.closed = False
+                heapq.heappush(self._expiry, (now + self.log_max_age, task_id))
+            log.expires_at = now + self.log_max_age
+        return log.seq
+
+    def _purge_expired(self) -> None:
+        """Drop logs whose expiry passed."""
+        now = self._clock()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, task_id = heapq.heappop(self._expiry)
+            log = self._logs.get(task_id)
+            if log is None:
+                continue
+            if log.expires_at <= now:
+                del self._logs[task_id]
+            elif not log.closed:
+                # Extended by later events
+                heapq.heappush(self._expiry, (log.expires_at, task_id))
+
+    def _unsubscribe(self, subscription: TaskEventSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.task_id)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.task_id]
+            self._idle(subscription.task_id)
+
+    def _idle(self, task_id: UUID) -> None:
+        if self._on_idle is not None:
+            self._on_idle(task_id)
+
+
+# Numbers, logs and publishes an event atomically, so the log order is the
+# delivery order. KEYS: log stream, sequence counter. ARGV: event JSON, log
+# size, expiry seconds, channel.
+_PUBLISH_SCRIPT = """
+local seq = redis.call('INCR', KEYS[2])
+if tonumber(ARGV[2]) > 0 then
+    redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[2], seq .. '-0', 'event', ARGV[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+redis.call('PUBLISH', ARGV[4], '{"seq":' .. seq .. ',"event":' .. ARGV[1] .. '}')
+return seq
+"""
+
+
+class RedisTaskEventBus(TaskEventBus):
+    """Event bus shared by every pod through Redis pub/sub and streams.
+
+    Each pod keeps one pub/sub connection, subscribed to the channels of
+    the tasks its clients are streaming, and fans messages out locally.
+    Event logs are Redis streams whose entry IDs are the sequence numbers.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        prefix: str = "bindu:task_events",
+        subscriber_queue_size: int = 1000,
+        max_connections: int = 10,
+        log_size: int = 200,
+        log_ttl: float = 300.0,
+        log_max_age: float = 86400.0,
+    ):
+        """Initialize the bus.
+
+        Args:
+            redis_url: Redis URL (redis://[password@]host:port/db)
+            prefix: Key prefix; a task's channel is ``<prefix>:<task_id>``
+            subscriber_queue_size: Events buffered per subscriber
+            max_connections: Maximum Redis connection pool size
+            log_size: Events kept per task for replay (approximate)
+            log_ttl: Seconds a task's log is kept after a final event
+            log_max_age: Seconds a task's log is kept after its last event
+                when no final event arrives
+        """
+        if not REDIS_AVAILABLE:
+            raise ValueError(
+                "Redis event bus requires redis package. "
+                "Install with: pip install redis[hiredis]"
+            )
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self.max_connections = max_connections
+        self.log_size = log_size
+        self.log_ttl = log_ttl
+        self.log_max_age = log_max_age
+        self._local = InMemoryTaskEventBus(subscriber_queue_size, self._release)
+        self._redis_client: Any = None
+        self._publish_script: Any = None
+        self._pubsub: Any = None
+        self._reader: asyncio.Task[None] | None = None
+        self._confirmed: dict[str, asyncio.Event] = {}
+        self._unsubscribing: set[asyncio.Future[None]] = set()
+
+    def _channel(self, task_id: UUID) -> str:
+        return f"{self.prefix}:{task_id}"
+
+    def _log_key(self, task_id: UUID) -> str:
+        return f"{self.prefix}:log:{task_id}"
+
+    def _seq_key(self, task_id: UUID) -> str:
+        return f"{self.prefix}:seq:{task_id}"
+
+    async def __aenter__(self) -> RedisTaskEventBus:
+        """Connect and start the pub/sub reader."""
+        self._redis_client = redis.from_url(
+            self.redis_url,
+            max_connections=self.max_connections,
+            decode_responses=True,
+        )
+        try:
+            await self._redis_client.ping()
+        except redis.RedisError as e:
+            raise ConnectionError(
+                f"Unable to connect to Redis at {self.redis_url}: {e}"
+            ) from e
+        self._publish_script = self._redis_client.register_script(_PUBLISH_SCRIPT)
+        self._pubsub = self._redis_client.pubsub()
+        # Keeps the connection subscribed while no task is streamed
+        await self._pubsub.subscribe(f"{self.prefix}:_")
+        self._reader = asyncio.create_task(self._read(), name="task-event-bus")
+        logger.info(f"Redis task event bus connected to {self.redis_url}")
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Stop the reader and close connections."""
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._redis_client is not None:
+            await self._redis_client.aclose()
+            self._redis_client = None
+
+    async def publish(self, task_id: UUID, event: dict[str, Any]) -> int:
+        """Log an event and publish it on the task's channel."""
+        if self._redis_client is None:
+            raise RuntimeError("RedisTaskEventBus used outside its context")
+        expiry = self.log_ttl if is_final_event(event) else self.log_max_age
+        seq = await self._publish_script(
+            keys=[self._log_key(task_id), self._seq_key(task_id)],
+            args=[
+                orjson.dumps(event).decode(),
+                self.log_size,
+                max(1, int(expiry)),
+                self._channel(task_id),
+            ],
+        )
+        return int(seq)
+
+    async def subscribe(
+        self, task_id: UUID, after_seq: int | None = None
+    ) -> TaskEventSubscription:
+        """Subscribe to a task's events, waiting until Redis confirms.
+
+        The log is read after the live subscription is confirmed, so no
+        event falls between the replay and the live events.
+        """
+        if self._pubsub is None:
+            raise RuntimeError("RedisTaskEventBus used outside its context")
+        first = self._local.subscriber_count(task_id) == 0
+        subscription = self._local.attach(task_id, after_seq)
+        try:
+            if first:
+                channel = self._channel(task_id)
+                confirmed = self._confirmed.setdefault(channel, asyncio.Event())
+                await self._pubsub.subscribe(channel)
+                await asyncio.wait_for(confirmed.wait(), 5.0)
+            if after_seq is not None:
+                subscription.replay(await self.replay(task_id, after_seq))
+        except BaseException:
+            await subscription.close()
+            raise
+        return subscription
+
+    async def replay(
+        self, task_id: UUID, after_seq: int
+    ) -> list[TaskEventRecord] | None:
+        """Return the logged events after a sequence number.
+
+        Returns:
+            The events, or None if some of them are no longer logged
+        """
+        async with self._redis_client.pipeline(transaction=True) as pipe:
+            pipe.xrange(self._log_key(task_id), min=f"{after_seq + 1}-0", max="+")
+            pipe.get(self._seq_key(task_id))
+            entries, current = await pipe.execute()
+
+        if current is None or after_seq > int(current):
+            return None
+        records = [
+            (
+                int(entry_id.split("-", 1)[0]),
+                decode_event(orjson.loads(fields["event"])),
+            )
+            for entry_id, fields in entries
+        ]
+        first = records[0][0] if records else int(current) + 1
+        return records if first == after_seq + 1 else None
+
+    def _release(self, task_id: UUID) -> None:
+        """Unsubscribe from a task's channel once no local subscriber is left."""
+        self._confirmed.pop(self._channel(task_id), None)
+        if self._pubsub is not None:
+            unsubscribe = asyncio.ensure_future(self._unsubscribe(task_id))
+            self._unsubscribing.add(unsubscribe)
+            unsubscribe.add_done_callback(self._unsubscribing.discard)
+
+    async def _unsubscribe(self, task_id: UUID) -> None:
+        # A client may have subscribed again in the meantime
+        if self._pubsub is None or self._local.subscriber_count(task_id):
+            return
+        try:
+            await self._pubsub.unsubscribe(self._channel(task_id))
+        except redis.RedisError as e:
+            logger.warning(f"Could not unsubscribe from task events: {e}")
+
+    async def _read(self) -> None:
+        """Fan pub/sub messages out to local subscribers."""
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    channel = message.get("channel")
+                    if message["type"] == "subscribe":
+                        confirmed = self._confirmed.get(channel)
+                        if confirmed is not None:
+                            confirmed.set()
+                        continue
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        task_id = UUID(channel.rsplit(":", 1)[1])
+                        payload = orjson.loads(message["data"])
+                        seq = int(payload["seq"])
+                        event = decode_event(payload["event"])
+                    except (ValueError, IndexError, KeyError, TypeError) as e:
+                        logger.warning(f"Ignoring malformed task event: {e}")
+                        continue
+                    self._local.dispatch(task_id, seq, event)
+            except redis.RedisError as e:
+                logger.error(f"Redis error on task event bus: {e}")
+                await asyncio.sleep(1)
+
+
+def create_event_bus() -> TaskEventBus:
+    """Create the task event bus configured in app_settings.streaming.
+
+    The "auto" backend uses Redis when the scheduler is Redis-backed (its
+    workers may run on other pods). The postgres scheduler is multi-pod too:
+    it gets the Redis bus when a Redis URL is configured, and the in-process
+    bus with a warning otherwise. Other schedulers use the in-process bus.
+
+    Returns:
+        A task event bus
+
+    Raises:
+        ValueError: If the Redis backend is selected without redis installed
+    """
+    from bindu.settings import app_settings
+
+    settings = app_settings.streaming
+    scheduler_settings = app_settings.scheduler
+    backend = settings.event_bus_backend
+    if backend == "auto":
+        redis_scheduler = scheduler_settings.backend in ("redis", "redis_streams")
+        backend = "redis" if redis_scheduler else "memory"
+        if scheduler_settings.backend == "postgres":
+            if settings.event_bus_redis_url or scheduler_settings.redis_url:
+                backend = "redis"
+            else:
+                logger.warning(
+                    "The postgres scheduler runs tasks on any pod, but no Redis "
+                    "URL is configured for the task event bus: message/stream "
+                    "and tasks/resubscribe only see live events of tasks run "
+                    "on this pod. Set STREAMING__EVENT_BUS_REDIS_URL."
+                )
+
+    if backend == "memory":
+        logger.info("Using in-memory task event bus")
+        return InMemoryTaskEventBus(
+            settings.subscriber_queue_size,
+            log_size=settings.event_log_size,
+            log_ttl=settings.event_log_ttl,
+            log_max_age=settings.event_log_max_age,
+        )
+
+    redis_url = settings.event_bus_redis_url or scheduler_settings.redis_url
+    if not redis_url:
+        auth = (
+            f":{scheduler_settings.redis_password}@"
+            if scheduler_settings.redis_password
+            else ""
+        )
+        redis_url = (
+            f"redis://{auth}{scheduler_settings.redis_host}:"
+            f"{scheduler_settings.redis_port}/{scheduler_settings.redis_db}"
+        )
+    logger.info("Using Redis task event bus")
+    return RedisTaskEventBus(
+        redis_url=redis_url,
+        prefix=settings.event_bus_prefix,
+        subscriber_queue_size=settings.subscriber_queue_size,
+        log_size=settings.event_log_size,
+        log_ttl=settings.event_log_ttl,
+        log_max_age=settings.event_log_max_age,
+    )
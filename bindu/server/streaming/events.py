@@ -0,0 +1,101 @@
+"""Task events relayed to streaming clients.
+
+Events are plain dicts shaped like the A2A TaskStatusUpdateEvent and
+TaskArtifactUpdateEvent, so the endpoint serializes them with the protocol
+type adapters. Buses that leave the process encode them as JSON and restore
+the UUID fields with ``decode_event``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from bindu.common.protocol.types import Artifact
+
+# States after which a stream has nothing more to relay for this turn
+STREAM_END_STATES = frozenset(
+    {"completed", "failed", "canceled", "rejected", "input-required", "auth-required"}
+)
+
+
+def status_update_event(
+    task_id: UUID, context_id: UUID, state: str, final: bool | None = None
+) -> dict[str, Any]:
+    """Build a status-update event.
+
+    Args:
+        task_id: Task identifier
+        context_id: Context identifier
+        state: New task state
+        final: Whether the stream ends with this event (defaults to whether
+            the state ends the turn, including input-required)
+
+    Returns:
+        Event dict
+    """
+    return {
+        "kind": "status-update",
+        "task_id": task_id,
+        "context_id": context_id,
+        "status": {
+            "state": state,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "final": state in STREAM_END_STATES if final is None else final,
+    }
+
+
+def artifact_update_event(
+    task_id: UUID,
+    context_id: UUID,
+    artifact: Artifact | dict[str, Any],
+    append: bool = False,
+    last_chunk: bool = False,
+) -> dict[str, Any]:
+    """Build an artifact-update event.
+
+    Args:
+        task_id: Task identifier
+        context_id: Context identifier
+        artifact: Artifact (or chunk of it) to send
+        append: Whether the parts extend the artifact sent so far
+        last_chunk: Whether this is the artifact's final content
+
+    Returns:
+        Event dict
+    """
+    return {
+        "kind": "artifact-update",
+        "task_id": task_id,
+        "context_id": context_id,
+        "artifact": artifact,
+        "append": append,
+        "last_chunk": last_chunk,
+    }
+
+
+def chunk_part(chunk: Any) -> dict[str, Any]:
+    """Convert one streamed handler chunk into an artifact part."""
+    if isinstance(chunk, (dict, list)):
+        return {"kind": "data", "data": {"result": chunk}}
+    return {"kind": "text", "text": str(chunk)}
+
+
+def is_final_event(event: dict[str, Any]) -> bool:
+    """Whether an event ends the stream of its task."""
+    return event.get("kind") == "status-update" and bool(event.get("final"))
+
+
+def decode_event(payload: dict[str, Any]) -> dict[str, Any]:
+    """Restore the UUID fields of an event decoded from JSON."""
+    event = {
+        **payload,
+        "task_id": UUID(payload["task_id"]),
+        "context_id": UUID(payload["context_id"]),
+    }
+    if "artifact" in payload:
+        artifact = payload["artifact"]
+        event["artifact"] = {**artifact, "artifact_id": UUID(artifact["artifact_id"])}
+    return event
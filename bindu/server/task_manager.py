@@ -69,12 +69,16 @@ from dataclasses import dataclass, field
 from typing import Any
 
 
+from ..common.protocol.types import TaskSendParams
+from ..settings import app_settings
 from ..utils.logging import get_logger
 from .handlers import ContextHandlers, MessageHandlers, TaskHandlers
 from .notifications import PushNotificationManager
-from .scheduler import Scheduler
+from .scheduler import InMemoryScheduler, Scheduler
 from .storage import Storage
+from .streaming import TaskEventBus, create_event_bus, status_update_event
 from .workers import ManifestWorker
+from .workers.helpers import ContextHistoryCache, create_response_cache
 
 logger = get_logger("pebbling.server.task_manager")
 
@@ -89,27 +93,51 @@ class TaskManager:
 
     _aexit_stack: AsyncExitStack | None = field(default=None, init=False)
     _workers: list[ManifestWorker] = field(default_factory=list, init=False)
+    _history_cache: ContextHistoryCache | None = field(default=None, init=False)
     _push_manager: PushNotificationManager = field(init=False)
+    _event_bus: TaskEventBus | None = field(default=None, init=False)
     _message_handlers: MessageHandlers = field(init=False)
     _task_handlers: TaskHandlers = field(init=False)
     _context_handlers: ContextHandlers = field(init=False)
 
     def __post_init__(self) -> None:
         """Initialize push notification manager after dataclass initialization."""
-        self._push_manager = PushNotificationManager(manifest=self.manifest)
+        self._push_manager = PushNotificationManager(
+            manifest=self.manifest, storage=self.storage
+        )
+        # The cache is process-local: with a shared scheduler, turns run on
+        # other pods would never reach it and clearing a context would only
+        # invalidate this pod's copy
+        if app_settings.worker.history_cache_size > 0 and isinstance(
+            self.scheduler, InMemoryScheduler
+        ):
+            self._history_cache = ContextHistoryCache(
+                app_settings.worker.history_cache_size
+            )
 
     async def __aenter__(self) -> TaskManager:
         """Initialize the task manager and start all components."""
         self._aexit_stack = AsyncExitStack()
         await self._aexit_stack.__aenter__()
+        self.scheduler.on_task_dropped = self._handle_dropped_task
         await self._aexit_stack.enter_async_context(self.scheduler)
+        await self._aexit_stack.enter_async_context(self._push_manager)
+        self._event_bus = await self._aexit_stack.enter_async_context(
+            create_event_bus()
+        )
 
         if self.manifest:
+            response_cache = create_response_cache()
+            if response_cache is not None:
+                await self._aexit_stack.enter_async_context(response_cache)
             worker = ManifestWorker(
                 scheduler=self.scheduler,
                 storage=self.storage,
                 manifest=self.manifest,
                 lifecycle_notifier=self._push_manager.notify_lifecycle,
+                history_cache=self._history_cache,
+                response_cache=response_cache,
+                event_bus=self._event_bus,
             )
             self._workers.append(worker)
             await self._aexit_stack.enter_async_context(worker.run())
@@ -121,6 +149,8 @@ class TaskManager:
             manifest=self.manifest,
             workers=self._workers,
             context_id_parser=self._parse_context_id,
+            event_bus=self._event_bus,
+            error_response_creator=self._create_error_response,
         )
         self._task_handlers = TaskHandlers(
             scheduler=self.scheduler,
@@ -130,6 +160,7 @@ class TaskManager:
         self._context_handlers = ContextHandlers(
             storage=self.storage,
             error_response_creator=self._create_error_response,
+            history_cache=self._history_cache,
         )
 
         return self
@@ -146,6 +177,27 @@ class TaskManager:
         await self._aexit_stack.__aexit__(exc_type, exc_value, traceback)
         self._aexit_stack = None
 
+    async def _handle_dropped_task(self, params: TaskSendParams, reason: str) -> None:
+        """Fail a queued task that the scheduler dropped before it could run."""
+        task_id = params["task_id"]
+        logger.warning(f"Task {task_id} dropped by scheduler: {reason}")
+        # A task canceled or finished meanwhile keeps its state
+        updated = await self.storage.update_task(
+            task_id,
+            state="failed",
+            metadata={"failure_reason": reason},
+            expected_states=app_settings.agent.non_terminal_states,
+        )
+        if updated is None:
+            return
+        await self._push_manager.notify_lifecycle(
+            task_id, params["context_id"], "failed", True
+        )
+        if self._event_bus is not None:
+            await self._event_bus.publish(
+                task_id, status_update_event(task_id, params["context_id"], "failed")
+            )
+
     def _create_error_response(
         self, response_class: type, request_id: str, error_class: type, message: str
     ) -> Any:
@@ -179,7 +231,7 @@ class TaskManager:
         This DRY approach routes method calls to the correct handler based on method name.
         """
         # Message handler methods
-        if name in ("send_message", "stream_message"):
+        if name in ("send_message", "stream_message", "resubscribe_task"):
             return getattr(self._message_handlers, name)
 
         # Task handler methods
@@ -205,6 +257,7 @@ class TaskManager:
             "get_task_push_notification",
             "list_task_push_notifications",
             "delete_task_push_notification",
+            "delivery_stats",
         ):
             return getattr(self._push_manager, name)
 
@@ -22,19 +22,77 @@ from __future__ import annotations as _annotations
 
 from abc import ABC, abstractmethod
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
-from typing import Any, AsyncIterator
+from dataclasses import dataclass, field
+import time
+from typing import Any, AsyncGenerator, AsyncIterator
+from uuid import UUID
 
 import anyio
-from opentelemetry.trace import get_tracer, use_span
+from anyio.abc import TaskGroup
+from opentelemetry import metrics
+from opentelemetry.trace import Link, Span, get_tracer, use_span
 
 from bindu.common.protocol.types import Artifact, Message, TaskIdParams, TaskSendParams
-from bindu.server.scheduler.base import Scheduler
+from bindu.server.scheduler.base import Scheduler, TaskOperation
 from bindu.server.storage.base import Storage
+from bindu.settings import app_settings
+from bindu.utils.cancellation import (
+    CancellationToken,
+    reset_cancellation_token,
+    set_cancellation_token,
+)
 from bindu.utils.logging import get_logger
 
 tracer = get_tracer(__name__)
 logger = get_logger(__name__)
+meter = metrics.get_meter("bindu.server.workers")
+
+queue_wait = meter.create_histogram(
+    "bindu_task_queue_wait_seconds",
+    description="Time from enqueue to the start of execution",
+    unit="s",
+)
+
+
+def _producer_links(span: Span | None) -> list[Link]:
+    """Link to the producer span when it arrived from another process."""
+    if span is None:
+        return []
+    span_context = span.get_span_context()
+    if not span_context.is_valid or not span_context.is_remote:
+        return []
+    return [Link(span_context, {"bindu.link": "producer"})]
+
+
+@dataclass
+class RunningTask:
+    """A task executing on this worker, and the handles needed to abort it."""
+
+    task_id: UUID
+    scope: anyio.CancelScope = field(default_factory=anyio.CancelScope)
+    token: CancellationToken = field(default_factory=CancellationToken)
+    results: Any = None
+    """The handler's (async) generator, closed when execution ends."""
+
+    cancelled: bool = False
+    """Whether the task was cancelled while executing (not just timed out)."""
+
+    def cancel(self) -> None:
+        """Flag threaded handlers and abort the execution scope."""
+        self.cancelled = True
+        self.token.cancel()
+        self.scope.cancel()
+
+    async def close_results(self) -> None:
+        """Close the handler's generator so its ``finally`` blocks run."""
+        results, self.results = self.results, None
+        try:
+            if hasattr(results, "aclose"):
+                await results.aclose()
+            elif hasattr(results, "close"):
+                results.close()
+        except Exception as e:
+            logger.warning(f"Failed to close handler of task {self.task_id}: {e}")
 
 
 @dataclass
@@ -67,6 +125,11 @@ class Worker(ABC):
     storage: Storage[Any]
     """Storage backend for task and context persistence."""
 
+    _running: dict[UUID, RunningTask] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    """Tasks currently executing on this worker, by task ID."""
+
     # -------------------------------------------------------------------------
     # Worker Lifecycle
     # -------------------------------------------------------------------------
@@ -87,7 +150,9 @@ class Worker(ABC):
             # Worker stopped
         """
         async with anyio.create_task_group() as tg:
+            self._start_services(tg)
             tg.start_soon(self._loop)
+            tg.start_soon(self._listen_for_cancellations)
             yield
             tg.cancel_scope.cancel()
 
@@ -96,11 +161,85 @@ class Worker(ABC):
 
         Receives task operations from scheduler and dispatches them to handlers.
         Runs until cancelled by the task group.
+
+        With a concurrency limit above 1, operations run in a nested task group
+        bounded by a CapacityLimiter. A slot is acquired *before* the next
+        batch is received, and each batch is capped at the number of free
+        slots, so a saturated worker stops pulling work from the scheduler
+        instead of buffering it in memory. Cancelling the outer task group
+        (on ``run()`` exit) cancels in-flight operations too.
         """
-        async for task_operation in self.scheduler.receive_task_operations():
+        limit = self._concurrency_limit()
+        if limit <= 1:
+            async for task_operation in self.scheduler.receive_task_operations():
+                await self._handle_task_operation(task_operation)
+            return
+
+        limiter = anyio.CapacityLimiter(limit)
+        batch_limit = self._receive_batch_size()
+
+        def next_batch_size() -> int:
+            # One slot is already held for the batch; the rest must be free
+            return min(batch_limit, 1 + int(limiter.available_tokens))
+
+        batches = self.scheduler.receive_task_operation_batches(
+            next_batch_size
+        ).__aiter__()
+
+        async with anyio.create_task_group() as tg:
+            while True:
+                slot = object()
+                await limiter.acquire_on_behalf_of(slot)
+                try:
+                    batch = await batches.__anext__()
+                except StopAsyncIteration:
+                    limiter.release_on_behalf_of(slot)
+                    break
+                except BaseException:
+                    limiter.release_on_behalf_of(slot)
+                    raise
+                for index, task_operation in enumerate(batch):
+                    if index:
+                        slot = object()
+                        await limiter.acquire_on_behalf_of(slot)
+                    tg.start_soon(self._run_in_slot, task_operation, limiter, slot)
+
+    async def _run_in_slot(
+        self,
+        task_operation: TaskOperation,
+        limiter: anyio.CapacityLimiter,
+        slot: object,
+    ) -> None:
+        """Handle one task operation and release its concurrency slot."""
+        try:
             await self._handle_task_operation(task_operation)
+        finally:
+            limiter.release_on_behalf_of(slot)
+
+    def _start_services(self, tg: TaskGroup) -> None:
+        """Start helpers that live as long as the worker (none by default).
+
+        Subclasses override this hook to run background tasks in the
+        worker's task group, so they stop with ``run()``.
+        """
+
+    def _concurrency_limit(self) -> int:
+        """Return how many task operations may execute at once.
 
-    async def _handle_task_operation(self, task_operation: dict[str, Any]) -> None:
+        The base worker processes operations sequentially. Subclasses opt
+        into bounded concurrency by overriding this hook.
+        """
+        return 1
+
+    def _receive_batch_size(self) -> int:
+        """Return how many task operations to fetch per scheduler round trip.
+
+        Only used with a concurrency limit above 1; batches never exceed the
+        number of free execution slots.
+        """
+        return 1
+
+    async def _handle_task_operation(self, task_operation: TaskOperation) -> None:
         """Dispatch task operation to appropriate handler.
 
         Args:
@@ -123,12 +262,21 @@ class Worker(ABC):
             "resume": self._handle_resume,
         }
 
+        producer_span = task_operation["_current_span"]
+        attributes: dict[str, Any] = {"logfire.tags": ["bindu"]}
+        enqueued_at = task_operation.get("_enqueued_at")
+        if enqueued_at is not None:
+            waited = max(0.0, time.time() - enqueued_at)
+            attributes["bindu.queue.wait_ms"] = round(waited * 1000, 3)
+            queue_wait.record(waited, {"operation": task_operation["operation"]})
+
         try:
-            # Preserve trace context from scheduler
-            with use_span(task_operation["_current_span"]):
+            # Continue the producer's trace (remote after crossing Redis)
+            with use_span(producer_span):
                 with tracer.start_as_current_span(
                     f"{task_operation['operation']} task",
-                    attributes={"logfire.tags": ["bindu"]},
+                    attributes=attributes,
+                    links=_producer_links(producer_span),
                 ):
                     handler = operation_handlers.get(task_operation["operation"])
                     if handler:
@@ -144,7 +292,86 @@ class Worker(ABC):
             task_id_raw = task_operation["params"]["task_id"]
             task_id = UUID(task_id_raw) if isinstance(task_id_raw, str) else task_id_raw
             logger.error(f"Task {task_id} failed: {e}", exc_info=True)
-            await self.storage.update_task(task_id, state="failed")
+            # Leave terminal states (e.g. a cancel) in place. A failing write
+            # (transient storage error, task deleted while queued) must not
+            # escape into the task group and take down concurrent tasks.
+            try:
+                await self.storage.update_task(
+                    task_id,
+                    state="failed",
+                    expected_states=app_settings.agent.non_terminal_states,
+                )
+            except Exception as update_error:
+                logger.error(f"Failed to mark task {task_id} as failed: {update_error}")
+
+        # The operation reached a final outcome; stop the scheduler redelivering it.
+        # Cancellation (worker shutdown) skips this so another worker can pick it up.
+        try:
+            await self.scheduler.ack_task_operation(task_operation)
+        except Exception as e:
+            logger.warning(f"Failed to acknowledge {task_operation['operation']}: {e}")
+
+    # -------------------------------------------------------------------------
+    # Cancellation
+    # -------------------------------------------------------------------------
+    #
+    # A cancel operation is delivered to one worker, which may not be the one
+    # executing the task. The receiving worker aborts the task if it runs
+    # locally; otherwise it broadcasts the cancellation through the scheduler
+    # and the owning worker aborts it from its listener. Aborting needs a
+    # free slot to process the cancel, so it requires a concurrency limit
+    # above 1.
+
+    @asynccontextmanager
+    async def _cancellable(
+        self, task_id: UUID, timeout: float | None = None
+    ) -> AsyncGenerator[RunningTask, None]:
+        """Register a task as running for the duration of its execution.
+
+        The body runs inside the task's cancel scope; an abort ends the block
+        early with ``running.cancelled`` set instead of raising. The handler's
+        generator (``running.results``) is closed on the way out, and the
+        cancellation token is visible to handler code through
+        ``bindu.utils.cancellation.current_cancellation_token``. With a
+        ``timeout``, the token also reports cancelled once it elapses; the
+        caller enforces the timeout itself.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        running = RunningTask(task_id, token=CancellationToken(deadline))
+        self._running[task_id] = running
+        reset = set_cancellation_token(running.token)
+        try:
+            with running.scope:
+                yield running
+        finally:
+            reset_cancellation_token(reset)
+            if self._running.get(task_id) is running:
+                del self._running[task_id]
+            with anyio.CancelScope(shield=True):
+                await running.close_results()
+
+    async def _abort_task(self, task_id: UUID) -> None:
+        """Abort a task here if it is running locally, else on its owning worker."""
+        running = self._running.get(task_id)
+        if running is not None:
+            logger.info(f"Aborting running task {task_id}")
+            running.cancel()
+            return
+        try:
+            await self.scheduler.broadcast_cancel(task_id)
+        except Exception as e:
+            logger.warning(f"Failed to broadcast cancellation of {task_id}: {e}")
+
+    async def _listen_for_cancellations(self) -> None:
+        """Abort local tasks whose cancellation another worker broadcast."""
+        try:
+            async for task_id in self.scheduler.receive_cancellations():
+                running = self._running.get(task_id)
+                if running is not None:
+                    logger.info(f"Aborting task {task_id} on broadcast cancellation")
+                    running.cancel()
+        except Exception as e:
+            logger.error(f"Cancellation listener stopped: {e}")
 
     # -------------------------------------------------------------------------
     # Abstract Methods (Must Implement)
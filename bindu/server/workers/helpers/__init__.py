@@ -4,8 +4,29 @@ This module contains extracted helper classes to keep ManifestWorker clean and f
 Each helper class handles a specific aspect of task execution.
 """
 
+from .history_cache import ContextHistory, ContextHistoryCache
+from .micro_batcher import MicroBatcher
 from .payment_handler import PaymentHandler
+from .response_cache import (
+    InMemoryResponseCache,
+    RedisResponseCache,
+    ResponseCache,
+    create_response_cache,
+    response_cache_key,
+)
 from .response_detector import ResponseDetector
 from .result_processor import ResultProcessor
 
-__all__ = ["ResultProcessor", "ResponseDetector", "PaymentHandler"]
+__all__ = [
+    "ResultProcessor",
+    "ResponseDetector",
+    "PaymentHandler",
+    "ContextHistory",
+    "ContextHistoryCache",
+    "MicroBatcher",
+    "ResponseCache",
+    "InMemoryResponseCache",
+    "RedisResponseCache",
+    "create_response_cache",
+    "response_cache_key",
+]
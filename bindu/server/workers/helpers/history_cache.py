@@ -0,0 +1,119 @@
+"""Per-context conversation history cache for ManifestWorker.
+
+Building context-based history from storage means loading every prior task
+in the context and converting every message to chat format on every turn,
+which grows quadratically with conversation length. This cache keeps the
+already converted history of finished tasks per context, so a turn only
+converts its own messages.
+
+Entries are appended when a task reaches a terminal state and evicted in
+least-recently-used order once ``max_contexts`` is exceeded.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from bindu.utils.logging import get_logger
+
+logger = get_logger("bindu.server.workers.helpers.history_cache")
+
+
+@dataclass
+class ContextHistory:
+    """Chat-formatted history of the finished tasks in one context."""
+
+    messages: list[dict[str, Any]] = field(default_factory=list)
+    """Chat messages ({"role", "content"}) in the order tasks finished."""
+
+    task_ids: set[str] = field(default_factory=set)
+    """IDs (as strings) of the tasks whose messages are included."""
+
+    task_starts: list[int] = field(default_factory=list)
+    """Index in messages where each included task begins."""
+
+    def add(self, task_id: Any, messages: list[dict[str, Any]]) -> None:
+        """Append one task's chat messages."""
+        self.task_starts.append(len(self.messages))
+        self.messages.extend(messages)
+        self.task_ids.add(str(task_id))
+
+    def tail(self, max_tasks: int | None = None) -> list[dict[str, Any]]:
+        """Return the messages of the most recent max_tasks tasks (all if None)."""
+        if max_tasks is None or max_tasks >= len(self.task_starts):
+            return list(self.messages)
+        if max_tasks < 1:
+            return []
+        return self.messages[self.task_starts[-max_tasks] :]
+
+
+class ContextHistoryCache:
+    """LRU cache of chat history keyed by context ID.
+
+    The cache is process-local, so TaskManager only enables it with the
+    in-memory scheduler, where every turn of a context runs in this process.
+    Backends that persist history (``Storage.load_context_history``) remain
+    the source of truth when an entry is missing.
+    """
+
+    def __init__(self, max_contexts: int = 1000):
+        """Initialize the cache.
+
+        Args:
+            max_contexts: Maximum number of contexts kept in memory
+        """
+        if max_contexts < 1:
+            raise ValueError("max_contexts must be at least 1")
+        self.max_contexts = max_contexts
+        self._entries: OrderedDict[UUID, ContextHistory] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached contexts."""
+        return len(self._entries)
+
+    def get(self, context_id: UUID) -> ContextHistory | None:
+        """Return the cached history for a context and mark it recently used."""
+        entry = self._entries.get(context_id)
+        if entry is not None:
+            self._entries.move_to_end(context_id)
+        return entry
+
+    def put(self, context_id: UUID, entry: ContextHistory) -> ContextHistory:
+        """Store the full history of a context, evicting the least recent ones."""
+        self._entries[context_id] = entry
+        self._entries.move_to_end(context_id)
+        while len(self._entries) > self.max_contexts:
+            evicted, _ = self._entries.popitem(last=False)
+            logger.debug(f"Evicted history of context {evicted}")
+        return entry
+
+    def append(
+        self, context_id: UUID, task_id: UUID, messages: list[dict[str, Any]]
+    ) -> bool:
+        """Append a finished task's chat messages to a cached context.
+
+        Args:
+            context_id: Context the task belongs to
+            task_id: Task that reached a terminal state
+            messages: The task's messages in chat format
+
+        Returns:
+            True if appended, False if the context is not cached or the task
+            is already included
+        """
+        entry = self.get(context_id)
+        if entry is None or str(task_id) in entry.task_ids:
+            return False
+        entry.add(task_id, messages)
+        return True
+
+    def invalidate(self, context_id: UUID) -> None:
+        """Drop the cached history of a context."""
+        self._entries.pop(context_id, None)
+
+    def clear(self) -> None:
+        """Drop every cached context."""
+        self._entries.clear()
@@ -0,0 +1,157 @@
+"""Micro-batching of agent executions for batch-capable handlers.
+
+Batched inference backends are far more efficient with many prompts per
+call. The worker runs queued tasks concurrently, so their executions arrive
+here within moments of each other; MicroBatcher holds each one until either
+``max_batch_size`` inputs are waiting or ``max_wait`` seconds have passed
+since the first, calls the batch handler once and hands every task its own
+result.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import anyio
+from opentelemetry import metrics
+
+from bindu.utils.logging import get_logger
+
+logger = get_logger("bindu.server.workers.helpers.micro_batcher")
+meter = metrics.get_meter("bindu.server.workers")
+
+batch_size_histogram = meter.create_histogram(
+    "bindu_agent_batch_size",
+    description="Task executions combined into one batch handler call",
+    unit="1",
+)
+
+
+@dataclass
+class _Submission:
+    """One input waiting for its share of a batch result."""
+
+    item: Any
+    done: anyio.Event = field(default_factory=anyio.Event)
+    result: Any = None
+    error: BaseException | None = None
+    abandoned: bool = False
+
+
+class MicroBatcher:
+    """Collects concurrent submissions into batched handler calls.
+
+    ``run()`` must be running (in the worker's task group) for submissions
+    to be served: it owns the flush timer and the handler calls.
+
+    Results are matched to submissions by position. A result that is an
+    exception instance is raised for that submission only; an exception
+    raised by the handler fails the whole batch. Submissions cancelled
+    while waiting are left out of the call.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[Any]], Awaitable[list[Any]]],
+        max_batch_size: int = 16,
+        max_wait: float = 0.01,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            run_batch: Coroutine function taking a list of inputs and
+                returning one result per input
+            max_batch_size: Inputs that trigger an immediate call
+            max_wait: Seconds to wait for more inputs after the first
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.running = False
+        self._pending: list[_Submission] = []
+        self._arrived = anyio.Event()
+        self._full = anyio.Event()
+
+    async def run(self) -> None:
+        """Flush waiting inputs into handler calls until cancelled."""
+        self.running = True
+        try:
+            async with anyio.create_task_group() as tg:
+                while True:
+                    await self._arrived.wait()
+                    if len(self._pending) < self.max_batch_size:
+                        with anyio.move_on_after(self.max_wait):
+                            await self._full.wait()
+
+                    batch = self._pending[: self.max_batch_size]
+                    self._pending = self._pending[self.max_batch_size :]
+                    self._arrived = anyio.Event()
+                    self._full = anyio.Event()
+                    if self._pending:
+                        self._signal()
+
+                    batch = [s for s in batch if not s.abandoned]
+                    if batch:
+                        tg.start_soon(self._call, batch)
+        finally:
+            self.running = False
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an input for the next batch and wait for its result.
+
+        Args:
+            item: One handler input (a task's message history)
+
+        Returns:
+            The handler's result for this input
+
+        Raises:
+            RuntimeError: If run() is not running
+            Exception: Raised by the handler, or returned for this input
+        """
+        if not self.running:
+            raise RuntimeError("MicroBatcher is not running")
+
+        submission = _Submission(item)
+        self._pending.append(submission)
+        self._signal()
+        try:
+            await submission.done.wait()
+        except BaseException:
+            submission.abandoned = True
+            raise
+
+        if submission.error is not None:
+            raise submission.error
+        return submission.result
+
+    def _signal(self) -> None:
+        """Wake run() for the waiting inputs (immediately if a batch is full)."""
+        self._arrived.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+
+    async def _call(self, batch: list[_Submission]) -> None:
+        """Run one batch and hand every submission its result."""
+        batch_size_histogram.record(len(batch))
+        logger.debug(f"Running batch of {len(batch)} agent executions")
+        try:
+            results = await self.run_batch([submission.item for submission in batch])
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"Batch handler returned {len(results)} results for {len(batch)} inputs"
+                )
+        except Exception as e:
+            for submission in batch:
+                submission.error = e
+                submission.done.set()
+            return
+
+        for submission, result in zip(batch, results):
+            if isinstance(result, BaseException):
+                submission.error = result
+            else:
+                submission.result = result
+            submission.done.set()
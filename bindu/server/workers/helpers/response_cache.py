@@ -0,0 +1,323 @@
+"""Exact-match response cache for deterministic agents.
+
+Agents whose skills are deterministic (lookups, classifiers, templated
+transformations) answer the same conversation the same way every time.
+With the cache enabled, ManifestWorker looks up the normalized chat history
+before calling the handler; a hit completes the task with the stored result
+and still goes through artifact building, so the response is DID-signed as
+usual.
+
+Keys are a SHA-256 of the canonical JSON of the chat history plus the agent
+DID and version, so agents sharing a Redis cache never see each other's
+answers and deploying a new version never serves those of the previous one.
+Only completed results are stored.
+
+Backends:
+- InMemoryResponseCache: process-local LRU with a per-entry TTL
+- RedisResponseCache: shared by every pod; LRU over a sorted-set index
+
+The cache is opt-in: ``WORKER__RESPONSE_CACHE_BACKEND`` defaults to "none".
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+import orjson
+from opentelemetry import metrics
+
+from bindu.utils.logging import get_logger
+
+try:
+    import redis.asyncio as redis
+
+    REDIS_AVAILABLE = True
+except ImportError:  # redis not installed
+    REDIS_AVAILABLE = False
+
+logger = get_logger("bindu.server.workers.helpers.response_cache")
+meter = metrics.get_meter("bindu.server.workers")
+
+response_cache_lookups = meter.create_counter(
+    "bindu_response_cache_lookups_total",
+    description="Response cache lookups by result (hit or miss)",
+    unit="1",
+)
+
+
+def response_cache_key(
+    messages: list[dict[str, Any]], agent_version: str, agent_did: str
+) -> str:
+    """Build the cache key of a chat history for one agent version.
+
+    Messages are reduced to role and content (content stripped of
+    surrounding whitespace) and serialized with sorted keys, so keys are
+    stable across processes and Python versions.
+
+    Args:
+        messages: Chat messages ({"role", "content"}), oldest first
+        agent_version: Version of the agent answering
+        agent_did: DID of the agent answering
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    normalized = [
+        {
+            "role": str(message.get("role", "")),
+            "content": str(message.get("content") or "").strip(),
+        }
+        for message in messages
+    ]
+    canonical = json.dumps(
+        {"agent": agent_did, "version": agent_version, "messages": normalized},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(ABC):
+    """Abstract response cache.
+
+    Implementations are async context managers; TaskManager enters the
+    cache for the lifetime of the server.
+    """
+
+    async def __aenter__(self) -> ResponseCache:
+        """Open backend resources."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Release backend resources."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """Return the cached result for a key, or None on a miss."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """Store a result under a key."""
+
+
+class InMemoryResponseCache(ResponseCache):
+    """Process-local LRU response cache with a per-entry TTL."""
+
+    def __init__(self, max_entries: int = 1000, ttl: float | None = 300.0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            ttl: Seconds a result stays valid (None for no expiry)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached results (including expired ones)."""
+        return len(self._entries)
+
+    async def get(self, key: str) -> Any | None:
+        """Return a copy of a live cached result and mark it recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a result, evicting the least recently used ones."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# KEYS: value key, index key. ARGV: value, ttl ms (0 = none), now ms, max entries.
+# Index scores are last-use times; entries past their TTL are dropped first,
+# then the least recently used beyond max entries. The script only touches
+# its declared keys: it returns the evicted value keys for the caller to
+# delete, so it stays safe under Redis Cluster and script replication.
+_SET_SCRIPT = """
+if tonumber(ARGV[2]) > 0 then
+  redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+  redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', tonumber(ARGV[3]) - tonumber(ARGV[2]))
+else
+  redis.call('SET', KEYS[1], ARGV[1])
+end
+redis.call('ZADD', KEYS[2], ARGV[3], KEYS[1])
+local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[4])
+if excess <= 0 then
+  return {}
+end
+local evicted = redis.call('ZRANGE', KEYS[2], 0, excess - 1)
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, excess - 1)
+return evicted
+"""
+
+
+class RedisResponseCache(ResponseCache):
+    """Response cache shared across pods through Redis.
+
+    Results are stored as JSON under ``<prefix>:<key>`` with a Redis TTL.
+    A sorted set ``<prefix>:lru`` tracks last use so the number of entries
+    stays within max_entries regardless of the server's maxmemory policy.
+    Results that are not JSON-serializable are not cached.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        max_entries: int = 1000,
+        ttl: float | None = 300.0,
+        prefix: str = "bindu:response_cache",
+        max_connections: int = 10,
+    ):
+        """Initialize the cache.
+
+        Args:
+            redis_url: Redis URL (redis://[password@]host:port/db)
+            max_entries: Maximum number of cached results
+            ttl: Seconds a result stays valid (None for no expiry)
+            prefix: Key prefix for values and the LRU index
+            max_connections: Maximum Redis connection pool size
+        """
+        if not REDIS_AVAILABLE:
+            raise ValueError(
+                "Redis response cache requires redis package. "
+                "Install with: pip install redis[hiredis]"
+            )
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.redis_url = redis_url
+        self.max_entries = max_entries
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.prefix = prefix
+        self.max_connections = max_connections
+        self.index_key = f"{prefix}:lru"
+        self._redis_client: Any = None
+        self._set_script: Any = None
+
+    async def __aenter__(self) -> RedisResponseCache:
+        """Initialize the Redis connection pool."""
+        self._redis_client = redis.from_url(
+            self.redis_url, max_connections=self.max_connections
+        )
+        self._set_script = self._redis_client.register_script(_SET_SCRIPT)
+        try:
+            await self._redis_client.ping()
+        except redis.RedisError as e:
+            raise ConnectionError(
+                f"Unable to connect to Redis at {self.redis_url}: {e}"
+            ) from e
+        logger.info(f"Redis response cache connected to {self.redis_url}")
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """Close the Redis connection pool."""
+        if self._redis_client is not None:
+            await self._redis_client.aclose()
+            self._redis_client = None
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def get(self, key: str) -> Any | None:
+        """Return a cached result and mark it recently used."""
+        if self._redis_client is None:
+            raise RuntimeError("RedisResponseCache used outside its context")
+        value_key = self._key(key)
+        raw = await self._redis_client.get(value_key)
+        if raw is None:
+            return None
+        await self._redis_client.zadd(
+            self.index_key, {value_key: int(time.time() * 1000)}, xx=True
+        )
+        return orjson.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable result and evict beyond max_entries."""
+        if self._redis_client is None:
+            raise RuntimeError("RedisResponseCache used outside its context")
+        try:
+            payload = orjson.dumps(value)
+        except TypeError:
+            logger.debug("Result is not JSON-serializable; not caching it")
+            return
+        value_key = self._key(key)
+        ttl_ms = int(self.ttl * 1000) if self.ttl is not None else 0
+        evicted = await self._set_script(
+            keys=[value_key, self.index_key],
+            args=[payload, ttl_ms, int(time.time() * 1000), self.max_entries],
+        )
+        if not evicted:
+            return
+        # One key per command: evicted keys may live on different slots
+        async with self._redis_client.pipeline(transaction=False) as pipe:
+            for evicted_key in evicted:
+                if isinstance(evicted_key, bytes):
+                    evicted_key = evicted_key.decode()
+                if evicted_key != value_key:
+                    pipe.delete(evicted_key)
+            await pipe.execute()
+
+
+def create_response_cache() -> ResponseCache | None:
+    """Create the response cache configured in app_settings.worker.
+
+    The Redis backend uses ``response_cache_redis_url``, falling back to
+    the scheduler's Redis settings.
+
+    Returns:
+        A response cache, or None when the cache is disabled
+
+    Raises:
+        ValueError: If the Redis backend is selected without redis installed
+    """
+    from bindu.settings import app_settings
+
+    worker_settings = app_settings.worker
+    backend = worker_settings.response_cache_backend
+    ttl = worker_settings.response_cache_ttl
+    max_entries = worker_settings.response_cache_max_entries
+
+    if backend == "none":
+        return None
+    if backend == "memory":
+        logger.info("Using in-memory response cache")
+        return InMemoryResponseCache(max_entries=max_entries, ttl=ttl)
+
+    scheduler_settings = app_settings.scheduler
+    redis_url = worker_settings.response_cache_redis_url or scheduler_settings.redis_url
+    if not redis_url:
+        auth = (
+            f":{scheduler_settings.redis_password}@"
+            if scheduler_settings.redis_password
+            else ""
+        )
+        redis_url = (
+            f"redis://{auth}{scheduler_settings.redis_host}:"
+            f"{scheduler_settings.redis_port}/{scheduler_settings.redis_db}"
+        )
+    logger.info("Using Redis response cache")
+    return RedisResponseCache(
+        redis_url=redis_url,
+        max_entries=max_entries,
+        ttl=ttl,
+        prefix=worker_settings.response_cache_prefix,
+    )
@@ -7,7 +7,7 @@ different data structures.
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from bindu.utils.logging import get_logger
 
@@ -26,7 +26,10 @@ class ResultProcessor:
     """
 
     @staticmethod
-    async def collect_results(raw_results: Any) -> Any:
+    async def collect_results(
+        raw_results: Any,
+        on_chunk: Callable[[Any], Awaitable[None]] | None = None,
+    ) -> Any:
         """Collect results from manifest execution.
 
         Handles different result types:
@@ -36,6 +39,8 @@ class ResultProcessor:
 
         Args:
             raw_results: Raw result from manifest.run()
+            on_chunk: Optional callback awaited with each yielded value as it
+                arrives (used to stream chunks to subscribers)
 
         Returns:
             Collected result (single value or last yielded value)
@@ -46,6 +51,8 @@ class ResultProcessor:
             try:
                 async for chunk in raw_results:
                     collected.append(chunk)
+                    if on_chunk is not None:
+                        await on_chunk(chunk)
             except StopAsyncIteration:
                 pass
             # Return last chunk or all chunks if multiple
@@ -57,6 +64,8 @@ class ResultProcessor:
             try:
                 for chunk in raw_results:
                     collected.append(chunk)
+                    if on_chunk is not None:
+                        await on_chunk(chunk)
             except StopIteration:
                 pass
             # Return last chunk or all chunks if multiple
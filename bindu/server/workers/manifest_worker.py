@@ -28,10 +28,14 @@ Hybrid Agent Architecture (A2A Protocol):
 from __future__ import annotations
 
 import time
+from itertools import groupby
 from dataclasses import dataclass, field
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Collection, Optional
 from uuid import UUID
 
+import anyio
+from anyio.abc import TaskGroup
+from opentelemetry import metrics
 from opentelemetry.trace import Status, StatusCode, get_tracer
 
 from bindu.settings import app_settings
@@ -45,14 +49,39 @@ from bindu.common.protocol.types import (
     TaskState,
 )
 from bindu.penguin.manifest import AgentManifest
-from bindu.server.workers.base import Worker
-from bindu.server.workers.helpers import ResponseDetector, ResultProcessor
+from bindu.server.streaming import (
+    TaskEventBus,
+    artifact_update_event,
+    chunk_part,
+    status_update_event,
+)
+from bindu.server.workers.base import RunningTask, Worker
+from bindu.server.workers.helpers import (
+    ContextHistory,
+    ContextHistoryCache,
+    MicroBatcher,
+    ResponseCache,
+    ResponseDetector,
+    ResultProcessor,
+)
+from bindu.server.workers.helpers.response_cache import (
+    response_cache_key,
+    response_cache_lookups,
+)
+from bindu.utils.history_budget import HistoryBudget
 from bindu.utils.logging import get_logger
-from bindu.utils.retry import retry_worker_operation
+from bindu.utils.retry import retry_storage_operation, retry_worker_operation
 from bindu.utils.worker_utils import ArtifactBuilder, MessageConverter, TaskStateManager
 
 tracer = get_tracer("bindu.server.workers.manifest_worker")
 logger = get_logger("bindu.server.workers.manifest_worker")
+meter = metrics.get_meter("bindu.server.workers")
+
+deadline_exceeded = meter.create_counter(
+    "bindu_task_deadline_exceeded_total",
+    description="Tasks failed because their deadline passed (queued or running)",
+    unit="1",
+)
 
 
 @dataclass
@@ -86,7 +115,45 @@ class ManifestWorker(Worker):
     )
     """Optional callback for task lifecycle notifications (task_id, context_id, state, final)."""
 
-    @retry_worker_operation()
+    max_concurrent_tasks: Optional[int] = None
+    """Maximum tasks executed at once. Defaults to ``app_settings.worker.max_concurrent_tasks``."""
+
+    history_cache: Optional[ContextHistoryCache] = None
+    """Optional cache of converted context history; without it history is rebuilt every turn."""
+
+    response_cache: Optional[ResponseCache] = None
+    """Optional exact-match cache of completed results (opt-in for deterministic agents)."""
+
+    event_bus: Optional[TaskEventBus] = None
+    """Optional bus receiving status and artifact events for streaming clients."""
+
+    _batcher: Optional[MicroBatcher] = field(default=None, init=False, repr=False)
+    """Groups concurrent executions for batch handlers (started by run())."""
+
+    def _start_services(self, tg: TaskGroup) -> None:
+        """Start the micro-batcher of a batch handler in the worker's task group."""
+        run_batch = getattr(self.manifest, "run_batch", None)
+        if run_batch is None:
+            return
+        self._batcher = MicroBatcher(
+            run_batch,
+            max_batch_size=min(
+                app_settings.worker.batch_max_size, self._concurrency_limit()
+            ),
+            max_wait=app_settings.worker.batch_max_wait,
+        )
+        tg.start_soon(self._batcher.run)
+
+    def _concurrency_limit(self) -> int:
+        """Return the configured concurrency limit for this worker."""
+        if self.max_concurrent_tasks is not None:
+            return self.max_concurrent_tasks
+        return app_settings.worker.max_concurrent_tasks
+
+    def _receive_batch_size(self) -> int:
+        """Return the configured scheduler batch size for this worker."""
+        return app_settings.worker.receive_batch_size
+
     async def run_task(self, params: TaskSendParams) -> None:
         """Execute a task using the AgentManifest.
 
@@ -98,8 +165,37 @@ class ManifestWorker(Worker):
            - input-required → Message only, task stays open
            - auth-required → Message only, task stays open
            - normal → Message + Artifact, task completes
-        5. Update storage with appropriate state and content
+        5. Checkpoint the result in storage
         6. Settle payment if task completes successfully (x402 flow)
+        7. Update storage with appropriate state and content, then notify
+
+        Checkpointed Phases:
+            Storage phases are retried on their own, so a transient error
+            never re-executes the agent. The result is recorded with
+            ``storage.save_checkpoint`` before it is persisted, and so is
+            the settlement receipt; the final write, which moves the task
+            out of working, drops it. A redelivered run that finds a
+            checkpoint on a working task resumes from it instead of calling
+            the agent (and the facilitator) again.
+
+        Response Cache:
+            With a response_cache, a conversation identical to one already
+            completed by this agent version reuses the stored result instead
+            of calling the agent. The hit still builds (and signs) artifacts,
+            settles payment and notifies like a fresh result.
+
+        Streaming:
+            With an event_bus, every state change is published as a
+            status-update event. Tasks scheduled with ``metadata["stream"]``
+            (message/stream) also publish each chunk their handler yields as
+            an artifact-update of the result artifact; the final artifact,
+            with the same ID, follows with ``last_chunk`` set.
+
+        Deadlines:
+            Execution runs under ``anyio.fail_after`` until ``params["deadline"]``
+            (or for ``manifest.task_timeout`` when no deadline was stamped).
+            Tasks whose deadline passed in the queue fail without running.
+            Either way the task fails with failure_reason "deadline_exceeded".
 
         Args:
             params: Task execution parameters containing task_id, context_id, message,
@@ -110,15 +206,39 @@ class ManifestWorker(Worker):
             Exception: Re-raised after marking task as failed
         """
         # Step 1: Load and validate task
-        task = await self.storage.load_task(params["task_id"])
+        task = await self._load_task(params["task_id"])
         if task is None:
             raise ValueError(f"Task {params['task_id']} not found")
 
+        # Canceled while queued: leave the canceled state in place
+        if task["status"]["state"] == "canceled":
+            logger.info(f"Skipping task {task['id']}: canceled before it started")
+            return
+
         # Extract payment context if available (from x402 middleware)
         payment_context = params.get("payment_context")
 
+        # Redelivered after the agent already ran: persist the recorded result
+        if task["status"]["state"] == "working":
+            checkpoint = await self._load_checkpoint(task["id"])
+            if checkpoint:
+                logger.info(f"Resuming task {task['id']} from its checkpoint")
+                await self._finish_task(task, checkpoint, payment_context)
+                return
+
         await TaskStateManager.validate_task_state(task)
 
+        timeout = self._execution_timeout(params)
+        if timeout is not None and timeout <= 0:
+            logger.warning(f"Dropping task {task['id']}: deadline passed while queued")
+            deadline_exceeded.add(1, {"stage": "queued"})
+            await self._handle_task_failure(
+                task,
+                "Task deadline passed before execution started",
+                reason="deadline_exceeded",
+            )
+            return
+
         # Add span event for state transition
         from opentelemetry.trace import get_current_span
 
@@ -128,13 +248,16 @@ class ManifestWorker(Worker):
                 "task.state_changed", attributes={"to_state": "working"}
             )
 
-        # Transition to working
-        await self.storage.update_task(task["id"], state="working")
-        await self._notify_lifecycle(task["id"], task["context_id"], "working", False)
+        # Transition to working (unless a cancel landed since the load)
+        if not await self._start_working(task):
+            logger.info(f"Skipping task {task['id']}: canceled before it started")
+            return
 
         # Step 2: Build conversation history (A2A Protocol)
         message_history = await self._build_complete_message_history(task)
 
+        running: RunningTask | None = None
+        deadline_scope: anyio.CancelScope | None = None
         try:
             # Step 3: Execute manifest with system prompt (if enabled)
             if (
@@ -149,51 +272,76 @@ class ManifestWorker(Worker):
                         message_history or []
                     )
 
-            # Step 3.1: Execute agent with tracing
-            with tracer.start_as_current_span("agent.execute") as agent_span:
-                start_time = time.time()
-
-                # Set agent-specific attributes
-                agent_span.set_attributes(
-                    {
-                        "bindu.agent.name": self.manifest.name,
-                        "bindu.agent.did": str(self.manifest.did_extension.did),
-                        "bindu.agent.message_count": len(message_history or []),
-                        "bindu.component": "agent_execution",
-                    }
-                )
-
-                try:
-                    # Pass message history as structured list of dicts
-                    raw_results = self.manifest.run(message_history or [])
-
-                    # Handle generator/async generator responses
-                    collected_results = await ResultProcessor.collect_results(
-                        raw_results
-                    )
-
-                    # Normalize result to extract final response (intelligent extraction)
-                    results = ResultProcessor.normalize_result(collected_results)
-
-                    # Record successful execution
-                    execution_time = time.time() - start_time
-                    agent_span.set_attribute(
-                        "bindu.agent.execution_time", execution_time
-                    )
-                    agent_span.set_status(Status(StatusCode.OK))
-
-                except Exception as agent_error:
-                    # Record agent execution failure
-                    execution_time = time.time() - start_time
-                    agent_span.set_attributes(
-                        {
-                            "bindu.agent.execution_time": execution_time,
-                            "bindu.agent.error_type": type(agent_error).__name__,
-                            "bindu.agent.error_message": str(agent_error),
-                        }
-                    )
-                    agent_span.set_status(Status(StatusCode.ERROR, str(agent_error)))
-                    raise
+            # Step 3.1: Reuse the response to an identical conversation
+            cache_key = self._response_cache_key(message_history or [])
+            results = await self._cached_response(cache_key)
+            cache_hit = results is not None
+
+            if not cache_hit:
+                # Step 3.2: Execute agent with tracing; a cancel aborts this block.
+                # Never retried: this is the expensive call the checkpoint protects.
+                async with self._cancellable(task["id"], timeout) as running:
+                    with (
+                        anyio.fail_after(timeout) as deadline_scope,
+                        tracer.start_as_current_span("agent.execute") as agent_span,
+                    ):
+                        start_time = time.time()
+
+                        # Set agent-specific attributes
+                        agent_span.set_attributes(
+                            {
+                                "bindu.agent.name": self.manifest.name,
+                                "bindu.agent.did": str(self.manifest.did_extension.did),
+                                "bindu.agent.message_count": len(message_history or []),
+                                "bindu.component": "agent_execution",
+                            }
+                        )
+
+                        try:
+                            # Pass message history as structured list of dicts
+                            raw_results = self._execute(message_history or [])
+                            running.results = raw_results
+
+                            # Handle generator/async generator responses
+                            collected_results = await ResultProcessor.collect_results(
+                                raw_results,
+                                on_chunk=self._chunk_publisher(task)
+                                if (params.get("metadata") or {}).get("stream")
+                                else None,
+                            )
+
+                            # Normalize result to extract final response (intelligent extraction)
+                            results = ResultProcessor.normalize_result(
+                                collected_results
+                            )
+
+                            # Record successful execution
+                            execution_time = time.time() - start_time
+                            agent_span.set_attribute(
+                                "bindu.agent.execution_time", execution_time
+                            )
+                            agent_span.set_status(Status(StatusCode.OK))
+
+                        except Exception as agent_error:
+                            # Record agent execution failure
+                            execution_time = time.time() - start_time
+                            agent_span.set_attributes(
+                                {
+                                    "bindu.agent.execution_time": execution_time,
+                                    "bindu.agent.error_type": type(
+                                        agent_error
+                                    ).__name__,
+                                    "bindu.agent.error_message": str(agent_error),
+                                }
+                            )
+                            agent_span.set_status(
+                                Status(StatusCode.ERROR, str(agent_error))
+                            )
+                            raise
+
+                if running.cancelled:
+                    logger.info(f"Task {task['id']} aborted by cancellation")
+                    return
 
             # Step 4: Parse response and detect state
             structured_response = ResponseDetector.parse_structured_response(results)
@@ -203,30 +351,51 @@ class ManifestWorker(Worker):
                 results, structured_response
             )
 
-            if state in ("input-required", "auth-required"):
-                # Hybrid Pattern: Return Message only, keep task open
-                # Add span event for state transition
-                current_span = get_current_span()
-                if current_span.is_recording():
-                    current_span.add_event(
-                        "task.state_changed",
-                        attributes={"from_state": "working", "to_state": state},
-                    )
-                await self._handle_intermediate_state(task, state, message_content)
-            else:
-                # Hybrid Pattern: Task complete - generate Message + Artifacts
-                # Add span event for state transition
-                current_span = get_current_span()
-                if current_span.is_recording():
-                    current_span.add_event(
-                        "task.state_changed",
-                        attributes={"from_state": "working", "to_state": state},
-                    )
-                await self._handle_terminal_state(
-                    task, results, state, payment_context=payment_context
+            # Step 5: Record the result before anything else can fail. The
+            # write needs a working task, so a cancel that landed after
+            # execution is not overwritten.
+            checkpoint = {
+                "state": state,
+                "results": results,
+                "message_content": message_content,
+            }
+            if not await self._save_checkpoint(task["id"], checkpoint):
+                logger.info(f"Task {task['id']} was canceled; dropping its result")
+                return
+
+            if cache_key is not None and not cache_hit and state == "completed":
+                await self._cache_response(cache_key, results)
+
+            # Add span event for state transition
+            current_span = get_current_span()
+            if current_span.is_recording():
+                current_span.add_event(
+                    "task.state_changed",
+                    attributes={"from_state": "working", "to_state": state},
                 )
 
+            # Steps 6-7: Settle, persist and notify
+            await self._finish_task(task, checkpoint, payment_context)
+
         except Exception as e:
+            if running is not None and running.cancelled:
+                logger.info(f"Task {task['id']} stopped after cancellation: {e}")
+                return
+
+            # Whatever the handler raised once its time ran out (TimeoutError
+            # from fail_after, TaskCancelledError from a token poll) is a
+            # timeout. Not retried: the deadline stays expired.
+            if (
+                deadline_scope is not None
+                and anyio.current_time() >= deadline_scope.deadline
+            ):
+                logger.warning(f"Task {task['id']} exceeded its deadline")
+                deadline_exceeded.add(1, {"stage": "running"})
+                await self._handle_task_failure(
+                    task, "Task exceeded its deadline", reason="deadline_exceeded"
+                )
+                return
+
             # Handle task failure with error message
             # Add span event for failure
             current_span = get_current_span()
@@ -239,18 +408,19 @@ class ManifestWorker(Worker):
                         "error": str(e),
                     },
                 )
-            await self._handle_task_failure(task, str(e))
+            # The failure write skips tasks canceled meanwhile
+            if not await self._handle_task_failure(task, str(e)):
+                logger.info(f"Task {task['id']} stopped after cancellation: {e}")
+                return
             raise
-        return
 
-    @retry_worker_operation(max_attempts=2)
     async def cancel_task(self, params: TaskIdParams) -> None:
         """Cancel a running task.
 
         Args:
             params: Task identification parameters containing task_id
         """
-        task = await self.storage.load_task(params["task_id"])
+        task = await self._load_task(params["task_id"])
         if task:
             # Add span event for cancellation
             from opentelemetry.trace import get_current_span
@@ -264,11 +434,199 @@ class ManifestWorker(Worker):
                         "to_state": "canceled",
                     },
                 )
-            await self.storage.update_task(params["task_id"], state="canceled")
+            # Stop the execution (here or on the owning worker) before the
+            # canceled state is written, so a late result cannot replace it
+            await self._abort_task(params["task_id"])
+            if not await self._write_task(
+                params["task_id"],
+                "canceled",
+                expected_states=app_settings.agent.non_terminal_states,
+            ):
+                return
+            await self._remember_turn(task)
             await self._notify_lifecycle(
                 params["task_id"], task["context_id"], "canceled", True
             )
 
+    def _execute(self, message_history: list[dict[str, str]]) -> Any:
+        """Start the agent on one task's history.
+
+        Batch handlers (``manifest.run_batch``) are called through the
+        micro-batcher so concurrently running tasks share one handler call;
+        the task's own result comes back as a one-item async generator.
+        Without a running batcher (outside ``run()``) each task calls the
+        handler on its own.
+        """
+        batcher = self._batcher
+        if batcher is None or not batcher.running:
+            return self.manifest.run(message_history)
+
+        async def batched_result():
+            yield await batcher.submit(message_history)
+
+        return batched_result()
+
+    def _response_cache_key(self, message_history: list[dict[str, str]]) -> str | None:
+        """Return the response cache key of a history (None without a cache)."""
+        if self.response_cache is None:
+            return None
+        return response_cache_key(
+            message_history,
+            str(self.manifest.version),
+            str(self.manifest.did_extension.did),
+        )
+
+    async def _cached_response(self, key: str | None) -> Any | None:
+        """Look up a cached result (best effort: backend errors count as a miss)."""
+        if key is None or self.response_cache is None:
+            return None
+        try:
+            results = await self.response_cache.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+            return None
+        response_cache_lookups.add(1, {"result": "miss" if results is None else "hit"})
+        if results is not None:
+            from opentelemetry.trace import get_current_span
+
+            current_span = get_current_span()
+            if current_span.is_recording():
+                current_span.add_event("response_cache.hit")
+        return results
+
+    async def _cache_response(self, key: str, results: Any) -> None:
+        """Store a completed result (best effort)."""
+        if self.response_cache is None or results is None:
+            return
+        try:
+            await self.response_cache.set(key, results)
+        except Exception as e:
+            logger.warning(f"Could not cache response: {e}")
+
+    # -------------------------------------------------------------------------
+    # Checkpointed Phases
+    # -------------------------------------------------------------------------
+
+    @retry_storage_operation()
+    async def _load_task(self, task_id: UUID) -> Task | None:
+        """Load a task, retrying transient storage errors."""
+        return await self.storage.load_task(task_id)
+
+    @retry_worker_operation()
+    async def _write_task(
+        self,
+        task_id: UUID,
+        state: TaskState,
+        expected_states: Collection[str],
+        **changes: Any,
+    ) -> bool:
+        """Apply a conditional task update, retrying transient errors.
+
+        Only this write is retried, never the notifications that follow it.
+        Retrying is idempotent: once a write with new content lands, the task
+        has left ``expected_states`` and a repeat matches nothing. When
+        nothing matched, the stored state tells an earlier attempt that
+        landed before its error apart from a task that moved on (canceled).
+
+        Args:
+            task_id: Task to update
+            state: New task state
+            expected_states: States the task must be in for the update
+            **changes: new_artifacts, new_messages and metadata for update_task
+
+        Returns:
+            Whether the task is now in ``state`` through this update
+        """
+        updated = await self.storage.update_task(
+            task_id, state=state, expected_states=expected_states, **changes
+        )
+        if updated is not None:
+            return True
+        current = await self.storage.load_task(task_id)
+        return current is not None and current["status"]["state"] == state
+
+    async def _start_working(self, task: Task) -> bool:
+        """Move a task to working and notify subscribers.
+
+        Returns:
+            False if the task already reached a terminal state (canceled)
+        """
+        if not await self._write_task(
+            task["id"],
+            "working",
+            expected_states=app_settings.agent.non_terminal_states,
+        ):
+            return False
+        await self._notify_lifecycle(task["id"], task["context_id"], "working", False)
+        return True
+
+    @retry_storage_operation()
+    async def _load_checkpoint(self, task_id: UUID) -> dict[str, Any] | None:
+        """Load a task's checkpoint, retrying transient storage errors."""
+        return await self.storage.load_checkpoint(task_id)
+
+    @retry_worker_operation()
+    async def _write_checkpoint(
+        self, task_id: UUID, checkpoint: dict[str, Any]
+    ) -> bool:
+        """Store a checkpoint on a working task, retrying transient errors."""
+        return await self.storage.save_checkpoint(task_id, checkpoint)
+
+    async def _save_checkpoint(self, task_id: UUID, checkpoint: dict[str, Any]) -> bool:
+        """Record a checkpoint in storage (best effort).
+
+        A result the storage cannot serialize is still persisted by the
+        current run; it just cannot be resumed after a crash.
+
+        Returns:
+            False if the task is no longer working (it was canceled)
+        """
+        try:
+            return await self._write_checkpoint(task_id, checkpoint)
+        except Exception as e:
+            logger.warning(f"Could not checkpoint task {task_id}: {e}")
+            return True
+
+    async def _finish_task(
+        self,
+        task: Task,
+        checkpoint: dict[str, Any],
+        payment_context: dict[str, Any] | None = None,
+    ) -> None:
+        """Settle, persist and notify a checkpointed agent result.
+
+        Settlement runs at most once per checkpoint: its receipt is saved
+        before the final write, which also drops the checkpoint.
+        """
+        state = checkpoint["state"]
+        if state in ("input-required", "auth-required"):
+            await self._handle_intermediate_state(
+                task, state, checkpoint["message_content"]
+            )
+            return
+
+        if state == "completed" and payment_context and "settlement" not in checkpoint:
+            checkpoint["settlement"] = await self._settle_payment(payment_context)
+            await self._save_checkpoint(task["id"], checkpoint)
+
+        await self._handle_terminal_state(
+            task,
+            checkpoint["results"],
+            state,
+            additional_metadata=checkpoint.get("settlement"),
+        )
+
+    def _execution_timeout(self, params: TaskSendParams) -> float | None:
+        """Return the seconds left to execute a task, or None if unlimited.
+
+        Uses the deadline stamped at submission; runs scheduled without one
+        get the agent's ``task_timeout`` from now.
+        """
+        deadline = params.get("deadline")
+        if deadline is not None:
+            return deadline - time.time()
+        return self.manifest.task_timeout
+
     def build_message_history(self, history: list[Message]) -> list[dict[str, str]]:
         """Convert A2A protocol messages to chat format for manifest execution.
 
@@ -280,11 +638,14 @@ class ManifestWorker(Worker):
         """
         return MessageConverter.to_chat_format(history)
 
-    def build_artifacts(self, result: Any) -> list[Artifact]:
+    def build_artifacts(
+        self, result: Any, artifact_id: UUID | None = None
+    ) -> list[Artifact]:
         """Convert manifest execution result to A2A protocol artifacts.
 
         Args:
             result: Agent execution result (any format)
+            artifact_id: Optional artifact ID (random by default)
 
         Returns:
             List of Artifact objects with DID signature
@@ -293,7 +654,9 @@ class ManifestWorker(Worker):
             Only called when task completes (hybrid pattern)
         """
         did_extension = self.manifest.did_extension
-        return ArtifactBuilder.from_result(result, did_extension=did_extension)
+        return ArtifactBuilder.from_result(
+            result, did_extension=did_extension, artifact_id=artifact_id
+        )
 
     async def _build_complete_message_history(self, task: Task) -> list[dict[str, str]]:
         """Build complete conversation history following A2A Protocol.
@@ -302,6 +665,10 @@ class ManifestWorker(Worker):
         1. If referenceTaskIds present: Build from referenced tasks (explicit)
         2. Otherwise: Build from all tasks in context (implicit)
 
+        With a history_cache, strategy 2 reuses the converted history of
+        the context's finished tasks instead of reloading every task; tasks
+        join it when they reach a terminal state.
+
         This enables:
         - Task refinements with explicit references
         - Parallel task execution within same context
@@ -320,49 +687,150 @@ class ManifestWorker(Worker):
         if current_message and "reference_task_ids" in current_message:
             reference_task_ids = current_message["reference_task_ids"]
 
-        if reference_task_ids:
-            # Strategy 1: Explicit references (A2A refinement pattern)
-            from uuid import UUID
+        budget = self._history_budget()
+        current = self.build_message_history(task.get("history", []))
 
-            referenced_messages: list[Message] = []
-            for task_id in reference_task_ids:
-                # Ensure task_id is UUID object
-                task_id_uuid = UUID(task_id) if isinstance(task_id, str) else task_id
-                ref_task = await self.storage.load_task(task_id_uuid)
-                if ref_task and ref_task.get("history"):
-                    referenced_messages.extend(ref_task["history"])
-
-            current_messages = task.get("history", [])
-            all_messages = referenced_messages + current_messages
+        if reference_task_ids:
+            # Strategy 1: Explicit references (A2A refinement pattern),
+            # loaded in one storage call
+            ref_tasks = await self.storage.load_tasks(
+                [UUID(t) if isinstance(t, str) else t for t in reference_task_ids],
+                fields=("history",),
+            )
+            referenced_messages: list[Message] = [
+                message
+                for ref_task in ref_tasks
+                for message in ref_task.get("history", [])
+            ]
+            previous = self.build_message_history(referenced_messages)
+
+        elif (
+            self.manifest.enable_context_based_history
+            and self.history_cache is not None
+        ):
+            # Strategy 2: Context-based history from the cache; only the
+            # current task's messages need converting
+            entry = await self._load_context_history(task["context_id"], budget)
+            previous = entry.tail(budget.max_tasks)
 
         elif self.manifest.enable_context_based_history:
             # Strategy 2: Context-based history (implicit continuation)
-            # Only enabled if configured in manifest
+            # Only enabled if configured in manifest. The budget is applied in
+            # the query: newest tasks only, each with its history tail.
             tasks_by_context = await self.storage.list_tasks_by_context(
-                task["context_id"]
+                task["context_id"],
+                length=budget.max_tasks + 1 if budget.max_tasks else None,
+                history_length=budget.max_messages,
             )
             previous_tasks = [t for t in tasks_by_context if t["id"] != task["id"]]
+            if budget.max_tasks:
+                previous_tasks = previous_tasks[-budget.max_tasks :]
 
             all_previous_messages: list[Message] = []
             for prev_task in previous_tasks:
                 history = prev_task.get("history", [])
                 if history:
                     all_previous_messages.extend(history)
-
-            current_messages = task.get("history", [])
-            all_messages = all_previous_messages + current_messages
+            previous = self.build_message_history(all_previous_messages)
         else:
             # No context-based history - only use current task messages
-            all_messages = task.get("history", [])
+            return current
+
+        return budget.trim(previous) + current
+
+    def _history_budget(self) -> HistoryBudget:
+        """Return the limits on prior history sent to the agent."""
+        return HistoryBudget(
+            max_tasks=self.manifest.num_history_sessions,
+            max_messages=app_settings.agent.history_max_messages,
+            max_tokens=app_settings.agent.history_max_tokens,
+        )
+
+    async def _load_context_history(
+        self, context_id: UUID, budget: HistoryBudget | None = None
+    ) -> ContextHistory:
+        """Return the cached history of finished tasks in a context.
+
+        On a miss the history is read from storage in one call when the
+        backend persists it, fetching only what the budget can use. Otherwise
+        it is rebuilt from the context's terminal tasks. A backend that
+        persists history but has none for the context (it predates the
+        feature) gets the full rebuilt history written back, so the stored
+        copy is never truncated to one agent's budget.
+        """
+        cache = self.history_cache
+        if cache is None:
+            raise RuntimeError("Context history cache is not configured")
+
+        entry = cache.get(context_id)
+        if entry is not None:
+            return entry
+
+        budget = budget or self._history_budget()
+        persisted = await self.storage.load_context_history(
+            context_id, history_length=budget.max_messages
+        )
+        if persisted:
+            messages = persisted
+        else:
+            backfill = persisted is not None
+            tasks = await self.storage.list_tasks_by_context(
+                context_id,
+                length=None if backfill else budget.max_tasks,
+                history_length=None if backfill else budget.max_messages,
+            )
+            messages = [
+                message
+                for t in tasks
+                if t["status"]["state"] in app_settings.agent.terminal_states
+                for message in t.get("history", [])
+            ]
+            # Backfill contexts that predate persisted history
+            if backfill and messages:
+                await self.storage.append_to_contexts(context_id, messages)
+
+        entry = ContextHistory()
+        for task_id, group in groupby(messages, key=lambda m: m.get("task_id")):
+            entry.add(task_id, self.build_message_history(list(group)))
+        return cache.put(context_id, entry)
+
+    async def _remember_turn(
+        self, task: Task, new_messages: list[Message] | None = None
+    ) -> None:
+        """Append a task that reached a terminal state to its context history.
+
+        Best effort: a failure only costs a rebuild on the next cache miss.
 
-        return self.build_message_history(all_messages) if all_messages else []
+        Args:
+            task: Task loaded before it was finalized
+            new_messages: Messages appended by the terminal update
+        """
+        cache = self.history_cache
+        if cache is None or not self.manifest.enable_context_based_history:
+            return
+
+        context_id = task["context_id"]
+        messages = list(task.get("history", [])) + list(new_messages or [])
+        try:
+            entry = await self._load_context_history(context_id)
+            if str(task["id"]) in entry.task_ids:
+                return
+            await self.storage.append_to_contexts(context_id, messages)
+            cache.append(context_id, task["id"], self.build_message_history(messages))
+        except Exception as e:
+            cache.invalidate(context_id)
+            logger.warning(f"Could not record history of task {task['id']}: {e}")
 
     # -------------------------------------------------------------------------
     # Message Normalization
     # -------------------------------------------------------------------------
 
     async def _handle_intermediate_state(
-        self, task: dict[str, Any], state: TaskState, message_content: Any
+        self,
+        task: Task,
+        state: TaskState,
+        message_content: Any,
+        additional_metadata: dict[str, Any] | None = None,
     ) -> None:
         """Handle intermediate task states (input-required, auth-required).
 
@@ -375,6 +843,7 @@ class ManifestWorker(Worker):
             task: Current task
             state: Task state to set
             message_content: Content for agent message (any type: str, dict, list, etc.)
+            additional_metadata: Optional metadata to merge into the task
         """
         # Render message content for user; for structured, prefer 'prompt' field
         content = (
@@ -386,17 +855,22 @@ class ManifestWorker(Worker):
             content, task["id"], task["context_id"]
         )
 
-        metadata: dict[str, Any] | None = None
-
-        # Update task with state and append agent messages to history
-        await self.storage.update_task(
-            task["id"], state=state, new_messages=agent_messages, metadata=metadata
-        )
+        # Update task with state and append agent messages to history,
+        # unless it was canceled meanwhile
+        if not await self._write_task(
+            task["id"],
+            state,
+            expected_states=("working",),
+            new_messages=agent_messages,
+            metadata=additional_metadata,
+        ):
+            logger.info(f"Task {task['id']} was canceled; dropping its result")
+            return
         await self._notify_lifecycle(task["id"], task["context_id"], state, False)
 
     async def _handle_terminal_state(
         self,
-        task: dict[str, Any],
+        task: Task,
         results: Any,
         state: TaskState = "completed",
         additional_metadata: dict[str, Any] | None = None,
@@ -440,23 +914,36 @@ class ManifestWorker(Worker):
             agent_messages = MessageConverter.to_protocol_messages(
                 results, task["id"], task["context_id"]
             )
-            artifacts = self.build_artifacts(results)
+            artifacts = self.build_artifacts(
+                results, artifact_id=ArtifactBuilder.result_artifact_id(task["id"])
+            )
 
             # Handle payment settlement if payment context is available
             if payment_context:
                 settlement_metadata = await self._settle_payment(payment_context)
                 if additional_metadata:
-                    additional_metadata.update(settlement_metadata)
+                    additional_metadata = {**additional_metadata, **settlement_metadata}
                 else:
                     additional_metadata = settlement_metadata
 
-            await self.storage.update_task(
+            if not await self._write_task(
                 task["id"],
-                state=state,
+                state,
+                expected_states=("working",),
                 new_artifacts=artifacts,
                 new_messages=agent_messages,
                 metadata=additional_metadata,
-            )
+            ):
+                logger.info(f"Task {task['id']} was canceled; dropping its result")
+                return
+            await self._remember_turn(task, agent_messages)
+            for artifact in artifacts:
+                await self._publish_event(
+                    task["id"],
+                    artifact_update_event(
+                        task["id"], task["context_id"], artifact, last_chunk=True
+                    ),
+                )
             await self._notify_lifecycle(task["id"], task["context_id"], state, True)
 
         elif state in ("failed", "rejected"):
@@ -464,20 +951,32 @@ class ManifestWorker(Worker):
             error_message = MessageConverter.to_protocol_messages(
                 results, task["id"], task["context_id"]
             )
-            await self.storage.update_task(
+            if not await self._write_task(
                 task["id"],
-                state=state,
+                state,
+                expected_states=("working",),
                 new_messages=error_message,
                 metadata=additional_metadata,
-            )
+            ):
+                logger.info(f"Task {task['id']} was canceled; dropping its result")
+                return
+            await self._remember_turn(task, error_message)
             await self._notify_lifecycle(task["id"], task["context_id"], state, True)
 
         elif state == "canceled":
             # Canceled: State change only, NO new content
-            await self.storage.update_task(task["id"], state=state)
+            if not await self._write_task(
+                task["id"],
+                state,
+                expected_states=app_settings.agent.non_terminal_states,
+            ):
+                return
+            await self._remember_turn(task)
             await self._notify_lifecycle(task["id"], task["context_id"], state, True)
 
-    async def _handle_task_failure(self, task: dict[str, Any], error: str) -> None:
+    async def _handle_task_failure(
+        self, task: Task, error: str, reason: str | None = None
+    ) -> bool:
         """Handle task execution failure.
 
         Creates an error message and marks task as failed without artifacts.
@@ -489,14 +988,25 @@ class ManifestWorker(Worker):
         Args:
             task: Task that failed
             error: Error description
+            reason: Optional machine-readable reason stored as metadata["failure_reason"]
+
+        Returns:
+            False if the task already reached a terminal state (canceled)
         """
         error_message = MessageConverter.to_protocol_messages(
             f"Task execution failed: {error}", task["id"], task["context_id"]
         )
-        await self.storage.update_task(
-            task["id"], state="failed", new_messages=error_message
-        )
+        if not await self._write_task(
+            task["id"],
+            "failed",
+            expected_states=app_settings.agent.non_terminal_states,
+            new_messages=error_message,
+            metadata={"failure_reason": reason} if reason else None,
+        ):
+            return False
+        await self._remember_turn(task, error_message)
         await self._notify_lifecycle(task["id"], task["context_id"], "failed", True)
+        return True
 
     async def _settle_payment(self, payment_context: dict[str, Any]) -> dict[str, Any]:
         """Settle payment after successful task completion.
@@ -551,10 +1061,57 @@ class ManifestWorker(Worker):
                 app_settings.x402.meta_error_key: str(e),
             }
 
+    def _chunk_publisher(self, task: Task) -> Callable[[Any], Awaitable[None]] | None:
+        """Return a callback publishing a task's result chunks, if streamed.
+
+        Chunks extend the task's result artifact: the first replaces it,
+        later ones append. Empty chunks are skipped.
+        """
+        if self.event_bus is None:
+            return None
+        artifact_id = ArtifactBuilder.result_artifact_id(task["id"])
+        published = 0
+
+        async def publish_chunk(chunk: Any) -> None:
+            nonlocal published
+            if not chunk:
+                return
+            artifact = {
+                "artifact_id": artifact_id,
+                "name": "result",
+                "parts": [chunk_part(chunk)],
+            }
+            await self._publish_event(
+                task["id"],
+                artifact_update_event(
+                    task["id"], task["context_id"], artifact, append=published > 0
+                ),
+            )
+            published += 1
+
+        return publish_chunk
+
+    async def _publish_event(self, task_id: UUID, event: dict[str, Any]) -> None:
+        """Publish a task event to streaming subscribers (best effort)."""
+        if self.event_bus is None:
+            return
+        try:
+            await self.event_bus.publish(task_id, event)
+        except Exception as e:
+            logger.warning(
+                "Task event publish failed",
+                task_id=str(task_id),
+                kind=event.get("kind"),
+                error=str(e),
+            )
+
     async def _notify_lifecycle(
         self, task_id: UUID, context_id: UUID, state: str, final: bool
     ) -> None:
-        """Notify lifecycle changes if notifier is configured.
+        """Notify lifecycle changes to streams and the notifier, if configured.
+
+        The status-update event for streams is final whenever the state ends
+        the turn (including input-required), independent of ``final``.
 
         Args:
             task_id: Task identifier
@@ -562,6 +1119,9 @@ class ManifestWorker(Worker):
             state: New task state
             final: Whether this is a terminal state
         """
+        await self._publish_event(
+            task_id, status_update_event(task_id, context_id, state)
+        )
         if self.lifecycle_notifier:
             try:
                 result = self.lifecycle_notifier(task_id, context_id, state, final)
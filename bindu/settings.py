@@ -275,7 +275,7 @@ class X402Settings(BaseSettings):
     # Similar to auth's public_endpoints, this defines which JSON-RPC methods need payment
     protected_methods: list[str] = [
         "message/send",  # Creating new tasks requires payment
-        # "message/stream",  # Uncomment if streaming should require payment
+        "message/stream",  # Runs the agent through the scheduler like message/send
     ]
 
     # Metadata keys
@@ -331,7 +331,9 @@ class AgentSettings(BaseSettings):
     # Maps JSON-RPC method names to task_manager handler method names
     method_handlers: dict[str, str] = {
         "message/send": "send_message",
+        "message/stream": "stream_message",
         "tasks/get": "get_task",
+        "tasks/resubscribe": "resubscribe_task",
         "tasks/cancel": "cancel_task",
         "tasks/list": "list_tasks",
         "contexts/list": "list_contexts",
@@ -446,6 +448,12 @@ CRITICAL
     # Enable/disable structured response system
     enable_structured_responses: bool = True
 
+    # Prior conversation history sent to the agent. The number of prior
+    # tasks is the manifest's num_history_sessions; these cap messages and
+    # estimated tokens on top of it (None: unlimited).
+    history_max_messages: int | None = None
+    history_max_tokens: int | None = None
+
 
 class AuthSettings(BaseSettings):
     """Authentication and authorization configuration settings.
@@ -508,7 +516,9 @@ class AuthSettings(BaseSettings):
     require_permissions: bool = False
     permissions: dict[str, list[str]] = {
         "message/send": ["agent:write"],
+        "message/stream": ["agent:write"],
         "tasks/get": ["agent:read"],
+        "tasks/resubscribe": ["agent:read"],
         "tasks/cancel": ["agent:write"],
         "tasks/list": ["agent:read"],
         "contexts/list": ["agent:read"],
@@ -548,10 +558,12 @@ class SchedulerSettings(BaseSettings):
     Supports multiple scheduler backends:
     - memory: In-memory scheduler (default, single-process)
     - redis: Redis scheduler (distributed, multi-process)
+    - redis_streams: Redis Streams scheduler (distributed, at-least-once)
+    - postgres: PostgreSQL queue table (requires postgres storage, at-least-once)
     """
 
     # Scheduler backend selection
-    backend: Literal["memory", "redis"] = "memory"
+    backend: Literal["memory", "redis", "redis_streams", "postgres"] = "memory"
 
     # Redis Configuration - passed from user config
     redis_url: str | None = None
@@ -563,6 +575,187 @@ class SchedulerSettings(BaseSettings):
     max_connections: int = 10
     retry_on_timeout: bool = True
 
+    # Task operation payload codec for Redis backends. "orjson" writes
+    # version-prefixed payloads; "json" writes unprefixed JSON that releases
+    # without codec support can still read (use it during rolling upgrades).
+    codec: Literal["json", "orjson"] = "orjson"
+
+    # Priority lanes and fairness (every backend). Control operations (cancel,
+    # pause, resume) always go first. Runs use the lane named by
+    # message.metadata["priority"] ("interactive" or "batch"), else
+    # default_priority. Within a lane, work is round-robined across fairness
+    # keys: "client:<sub>" for authenticated requests, else
+    # "context:<context_id>". A key's weight is how many operations it takes
+    # per turn (default 1), e.g. SCHEDULER__FAIRNESS_WEIGHTS='{"client:acme": 3}'.
+    default_priority: Literal["interactive", "batch"] = "interactive"
+    fairness_weights: dict[str, int] = {}
+
+    # In-memory queue admission control
+    # overflow_policy: block (wait up to block_timeout), reject, or shed_oldest
+    queue_capacity: int = 1000
+    overflow_policy: Literal["block", "reject", "shed_oldest"] = "block"
+    block_timeout: float = 5.0  # seconds
+    retry_after: float = 1.0  # seconds, sent as Retry-After on rejection
+
+    # Redis Streams backend (consumer group shared by all pods of a deployment)
+    stream_consumer_group: str = "bindu-workers"
+    # seconds before a stalled entry is reclaimed
+    stream_visibility_timeout: float = 300.0
+    stream_max_deliveries: int = 5  # deliveries before dead-lettering
+    stream_claim_interval: float = 30.0  # seconds between reclaim sweeps/heartbeats
+
+    # PostgreSQL backend (shares the PostgresStorage engine and pool)
+    postgres_notify_channel: str = "bindu_task_queue"
+    postgres_lease_timeout: float = 300.0  # seconds before a claimed row is reclaimable
+    postgres_heartbeat_interval: float = 30.0  # seconds between lease extensions
+    postgres_poll_interval: float = 5.0  # idle wake-up when no NOTIFY arrives
+    postgres_max_deliveries: int = 5  # claims before an operation is dropped
+    # oldest claimable rows per lane that take part in a claim's round-robin
+    postgres_fairness_window: int = 1000
+
+
+class WorkerSettings(BaseSettings):
+    """Worker execution configuration settings.
+
+    Controls how many task operations a single worker process executes
+    at once. Agents spend most of their time waiting on network I/O (LLM
+    calls, tools), so running several tasks concurrently keeps one slow
+    call from stalling every task queued behind it. Blocking synchronous
+    handlers are moved off the event loop for the same reason.
+    """
+
+    # Maximum number of task operations executed concurrently per worker.
+    # 1 restores strictly sequential processing.
+    max_concurrent_tasks: int = 10
+
+    # Maximum task operations fetched from the scheduler per round trip.
+    # Batches are also capped by the number of free concurrency slots.
+    receive_batch_size: int = 10
+
+    # Run synchronous handlers (plain functions and sync generators) in a
+    # thread pool instead of on the event loop. Generators are advanced one
+    # step per thread hop.
+    offload_sync_handlers: bool = True
+    sync_max_threads: int = 40
+
+    # Handler execution mode. "process" runs the handler in a pool of warm
+    # worker processes so CPU-bound handlers can use every core.
+    execution_mode: Literal["thread", "process"] = "thread"
+    process_pool_size: int | None = None  # defaults to os.cpu_count()
+    process_max_tasks_per_worker: int = 100  # recycle workers (0 = never)
+    # None = forkserver where available, else spawn (never forks the server);
+    # fork for handlers defined in __main__, which the other methods re-run
+    process_start_method: Literal["fork", "forkserver", "spawn"] | None = None
+
+    # Micro-batching for batch handlers (``messages_batch``): tasks that
+    # start within batch_max_wait seconds of each other share one handler
+    # call of up to batch_max_size histories.
+    batch_max_size: int = 16
+    batch_max_wait: float = 0.01
+
+    # Contexts whose converted chat history is cached for context-based
+    # history (LRU). 0 disables the cache and rebuilds history every turn.
+    # The cache is per process, so it is only used with the memory scheduler.
+    history_cache_size: int = 1000
+
+    # Exact-match response cache (opt-in) for deterministic agents. Completed
+    # results are keyed by the chat history and agent version and reused for
+    # response_cache_ttl seconds (0 = until evicted). The redis backend is
+    # shared by every pod; without response_cache_redis_url it uses the
+    # scheduler's Redis settings.
+    response_cache_backend: Literal["none", "memory", "redis"] = "none"
+    response_cache_ttl: float = 300.0
+    response_cache_max_entries: int = 1000
+    response_cache_redis_url: str | None = None
+    response_cache_prefix: str = "bindu:response_cache"
+
+
+class NotificationSettings(BaseSettings):
+    """Push notification delivery configuration settings.
+
+    Lifecycle events are queued and delivered by background tasks so that
+    workers never wait on subscriber webhooks. Events of one task are
+    delivered in order; different tasks are delivered concurrently.
+    """
+
+    # Events waiting for delivery before new ones are rejected (overflow).
+    # Without the outbox, 0 delivers inline on the caller.
+    delivery_queue_size: int = 1000
+    delivery_concurrency: int = 4  # background delivery tasks
+    # Delivery tasks posting to one webhook host at once (0 = no limit), so
+    # a slow subscriber cannot occupy every delivery task
+    delivery_concurrency_per_host: int = 2
+    delivery_shutdown_timeout: float = 5.0  # seconds to flush on shutdown
+
+    # Durable outbox: events are written through Storage and claimed with a
+    # lease by any pod's dispatcher, so webhooks keep working with several
+    # replicas (use postgres storage to share it). Failed deliveries are
+    # retried with exponential backoff. delivery_queue_size then caps the
+    # events each pod claims at once; outbox_enabled=False uses a
+    # process-local queue instead.
+    outbox_enabled: bool = True
+    outbox_poll_interval: float = 1.0  # seconds between claims when idle
+    outbox_lease_timeout: float = 60.0  # seconds; must exceed a delivery
+    outbox_max_attempts: int = 8  # deliveries before an event is abandoned
+    outbox_base_backoff: float = 1.0  # seconds, doubled per failed attempt
+    outbox_max_backoff: float = 300.0  # seconds
+
+    # Webhook HTTP client: one pooled httpx client with keep-alive, HTTP/2
+    # when the h2 package is installed, and a cap on concurrent requests
+    # per destination host.
+    http_timeout: float = 5.0  # seconds
+    max_retries: int = 2
+    base_backoff: float = 0.5  # seconds, doubled per retry
+    max_connections: int = 100
+    max_connections_per_host: int = 10
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0  # seconds
+    http2: bool = True
+
+    # Per-host circuit breaker: after circuit_failure_threshold consecutive
+    # failures (connection errors, 5xx, 429) a host is skipped for
+    # circuit_recovery_timeout seconds, then trial requests decide whether
+    # it is healthy again.
+    circuit_failure_threshold: int = 5
+    circuit_recovery_timeout: float = 30.0  # seconds
+    circuit_half_open_max_calls: int = 1
+
+    # Batching: with batch_window > 0, events for the same webhook are
+    # collected for that many seconds and posted as one JSON array, ordered
+    # by task and sequence. Subscribers must accept arrays. With
+    # batch_collapse_intermediate, a task that finished within the window
+    # only sends its final event.
+    batch_window: float = 0.0  # seconds; 0 posts one event per request
+    batch_max_events: int = 100
+    batch_collapse_intermediate: bool = False
+
+
+class StreamingSettings(BaseSettings):
+    """Streaming (message/stream) configuration settings.
+
+    Workers publish status and artifact events of each task to an event
+    bus; streaming endpoints subscribe to it and relay the events as SSE.
+    The Redis bus lets the endpoint and the worker run on different pods.
+    """
+
+    # "auto" uses redis with the redis/redis_streams schedulers, and with the
+    # postgres scheduler when a Redis URL is configured; else memory.
+    event_bus_backend: Literal["auto", "memory", "redis"] = "auto"
+    event_bus_redis_url: str | None = None  # defaults to the scheduler's Redis
+    event_bus_prefix: str = "bindu:task_events"
+    subscriber_queue_size: int = 1000  # events a slow client may fall behind
+
+    # Per-task event logs for replay: tasks/resubscribe with a Last-Event-ID
+    # resends the logged events after it. A log keeps the last
+    # event_log_size events and is dropped event_log_ttl seconds after the
+    # task's final event (event_log_max_age after its last event otherwise).
+    event_log_size: int = 200
+    event_log_ttl: float = 300.0  # seconds
+    event_log_max_age: float = 86400.0  # seconds
+    # Seconds between SSE keep-alive comments; a quiet stream also checks
+    # the stored task then, in case its final event was missed
+    heartbeat_interval: float = 15.0
+
 
 class RetrySettings(BaseSettings):
     """Retry mechanism configuration settings using Tenacity.
@@ -738,6 +931,9 @@ class Settings(BaseSettings):
     auth: AuthSettings = AuthSettings()
     storage: StorageSettings = StorageSettings()
     scheduler: SchedulerSettings = SchedulerSettings()
+    worker: WorkerSettings = WorkerSettings()
+    notifications: NotificationSettings = NotificationSettings()
+    streaming: StreamingSettings = StreamingSettings()
     retry: RetrySettings = RetrySettings()
     negotiation: NegotiationSettings = NegotiationSettings()
     sentry: SentrySettings = SentrySettings()
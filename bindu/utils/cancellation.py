@@ -0,0 +1,84 @@
+"""Cooperative cancellation for agent handlers.
+
+The worker aborts async handlers by cancelling their anyio scope, but a
+synchronous handler running in the thread pool cannot be interrupted: the
+worker stops waiting for it, and the thread keeps going until the handler
+returns. Long-running sync handlers should poll the token of the task they
+are executing and return early once it is cancelled:
+
+    from bindu.utils.cancellation import current_cancellation_token
+
+    def handler(messages):
+        token = current_cancellation_token()
+        for step in plan(messages):
+            if token is not None and token.cancelled:
+                return "stopped"
+            run(step)
+
+The token also reports cancelled once the task's deadline passes, which is
+the only way a blocked thread learns that the worker gave up on it.
+
+The token is published through a context variable, which the sync executor
+copies into its threads, so it is visible to both async and threaded code.
+"""
+
+from __future__ import annotations as _annotations
+
+import threading
+import time
+from contextvars import ContextVar, Token
+
+_current_token: ContextVar[CancellationToken | None] = ContextVar(
+    "bindu_cancellation_token", default=None
+)
+
+
+class TaskCancelledError(Exception):
+    """Raised by handler code that stops because its task was cancelled."""
+
+
+class CancellationToken:
+    """A thread-safe flag set when the task being executed is cancelled."""
+
+    def __init__(self, deadline: float | None = None) -> None:
+        """Create an unset token.
+
+        Args:
+            deadline: ``time.monotonic()`` value after which the token reports
+                cancelled on its own
+        """
+        self._event = threading.Event()
+        self.deadline = deadline
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested or the deadline passed."""
+        if self._event.is_set():
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def cancel(self) -> None:
+        """Request cancellation (idempotent)."""
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise ``TaskCancelledError`` if cancellation was requested."""
+        if self.cancelled:
+            raise TaskCancelledError("Task was cancelled")
+
+
+def current_cancellation_token() -> CancellationToken | None:
+    """Return the token of the task executing in this context, if any."""
+    return _current_token.get()
+
+
+def set_cancellation_token(
+    token: CancellationToken | None,
+) -> Token[CancellationToken | None]:
+    """Publish ``token`` to the current context; pass the result to ``reset``."""
+    return _current_token.set(token)
+
+
+def reset_cancellation_token(reset: Token[CancellationToken | None]) -> None:
+    """Restore the token published before ``set_cancellation_token``."""
+    _current_token.reset(reset)
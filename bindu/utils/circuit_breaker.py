@@ -0,0 +1,110 @@
+"""Circuit breaker for calls to external endpoints.
+
+A breaker stops calling a destination that keeps failing, so callers fail
+fast instead of spending timeouts and retries on it:
+
+    closed ──failure_threshold consecutive failures──▶ open
+    open ──recovery_timeout elapsed──▶ half_open (trial calls allowed)
+    half_open ──trial succeeds──▶ closed
+    half_open ──trial fails──▶ open (cool-down starts again)
+
+Breakers are not thread-safe; use them from one event loop.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Literal
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+@dataclass
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one destination.
+
+    Callers ask ``allow()`` before a call and report the outcome with
+    ``record_success()`` or ``record_failure()``; a call that ends without
+    an outcome (e.g. cancelled) must call ``release()``.
+    """
+
+    name: str
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    half_open_max_calls: int = 1
+    trial_wait: float = 1.0
+    on_state_change: (
+        Callable[[CircuitBreaker, CircuitState, CircuitState], None] | None
+    ) = None
+    clock: Callable[[], float] = time.monotonic
+
+    state: CircuitState = field(default="closed", init=False)
+    consecutive_failures: int = field(default=0, init=False)
+    opened_at: float | None = field(default=None, init=False)
+    _half_open_calls: int = field(default=0, init=False, repr=False)
+
+    def retry_after(self) -> float:
+        """Return seconds until the breaker may allow another call.
+
+        While half-open with every trial slot taken, the trial's outcome is
+        not known yet, so callers are told to wait ``trial_wait`` seconds.
+        """
+        if self.state == "half_open":
+            if self._half_open_calls >= max(1, self.half_open_max_calls):
+                return self.trial_wait
+            return 0.0
+        if self.state != "open" or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_timeout - self.clock())
+
+    def allow(self) -> bool:
+        """Return whether a call may be made now (and reserve a trial slot)."""
+        if self.state == "open":
+            if self.retry_after() > 0:
+                return False
+            self._transition("half_open")
+
+        if self.state == "half_open":
+            if self._half_open_calls >= max(1, self.half_open_max_calls):
+                return False
+            self._half_open_calls += 1
+        return True
+
+    def record_success(self) -> None:
+        """Report a successful call."""
+        self.consecutive_failures = 0
+        if self.state == "half_open":
+            self._transition("closed")
+
+    def record_failure(self) -> None:
+        """Report a failed call."""
+        self.consecutive_failures += 1
+        if self.state == "half_open" or (
+            self.state == "closed"
+            and self.consecutive_failures >= max(1, self.failure_threshold)
+        ):
+            self._transition("open")
+
+    def release(self) -> None:
+        """Return a trial slot of a call that ended without an outcome."""
+        if self.state == "half_open" and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_after": round(self.retry_after(), 3),
+        }
+
+    def _transition(self, state: CircuitState) -> None:
+        previous = self.state
+        self.state = state
+        self._half_open_calls = 0
+        self.opened_at = self.clock() if state == "open" else None
+        if state == "closed":
+            self.consecutive_failures = 0
+        if self.on_state_change is not None:
+            self.on_state_change(self, previous, state)
@@ -0,0 +1,81 @@
+"""Conversation history budget for agent execution.
+
+Long-lived contexts would otherwise send their entire conversation to the
+agent on every turn. A HistoryBudget caps the prior history by number of
+tasks, number of messages and an estimated token count, keeping the most
+recent part of the conversation.
+
+Token counts use a local estimate (about four UTF-8 bytes per token plus a
+small per-message overhead) so budgeting never needs a tokenizer or a
+network call. It overestimates for plain English, which errs on the side of
+a smaller prompt.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+# Approximate tokens a chat message costs beyond its content (role, framing)
+MESSAGE_TOKEN_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Approximate token count (0 for empty text)
+    """
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+@dataclass
+class HistoryBudget:
+    """Limits applied to prior conversation history.
+
+    Each limit is optional; None (or a value below 1) means unlimited.
+    """
+
+    max_tasks: int | None = None
+    """Most recent prior tasks to include."""
+
+    max_messages: int | None = None
+    """Most recent prior messages to include."""
+
+    max_tokens: int | None = None
+    """Estimated tokens the included prior messages may use."""
+
+    def __post_init__(self) -> None:
+        """Normalize non-positive limits to None (unlimited)."""
+        for name in ("max_tasks", "max_messages", "max_tokens"):
+            value = getattr(self, name)
+            if value is not None and value < 1:
+                setattr(self, name, None)
+
+    def trim(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return the newest chat messages that fit the message and token limits.
+
+        Args:
+            messages: Chat messages ({"role", "content"}), oldest first
+
+        Returns:
+            The longest suffix of messages within the budget
+        """
+        if self.max_messages is not None:
+            messages = messages[-self.max_messages :]
+
+        if self.max_tokens is not None:
+            used = 0
+            start = len(messages)
+            while start > 0:
+                content = messages[start - 1].get("content") or ""
+                used += estimate_tokens(str(content)) + MESSAGE_TOKEN_OVERHEAD
+                if used > self.max_tokens:
+                    break
+                start -= 1
+            messages = messages[start:]
+
+        return messages
@@ -3,16 +3,46 @@
 from __future__ import annotations
 
 import asyncio
+import importlib.util
 import json
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from typing import Any
-from urllib import error, request
 from urllib.parse import urlparse
 
+import httpx
+from opentelemetry import metrics
+
 from bindu.common.protocol.types import PushNotificationConfig
+from bindu.utils.circuit_breaker import CircuitBreaker, CircuitState
 from bindu.utils.logging import get_logger
 
 logger = get_logger("bindu.server.notifications")
+meter = metrics.get_meter("bindu.server.notifications")
+
+delivery_duration = meter.create_histogram(
+    "bindu_push_notification_delivery_duration_seconds",
+    description="Duration of push notification POST attempts by host and outcome",
+    unit="s",
+)
+delivery_attempts = meter.create_counter(
+    "bindu_push_notification_attempts_total",
+    description="Push notification POST attempts by host and outcome",
+    unit="1",
+)
+circuit_hosts = meter.create_up_down_counter(
+    "bindu_push_notification_circuit_hosts",
+    description="Webhook hosts by circuit breaker state",
+    unit="1",
+)
+circuit_transitions = meter.create_counter(
+    "bindu_push_notification_circuit_transitions_total",
+    description="Webhook circuit breaker state changes by host and new state",
+    unit="1",
+)
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 class NotificationDeliveryError(Exception):
@@ -29,13 +59,159 @@ class NotificationDeliveryError(Exception):
         self.status = status
 
 
+class NotificationCircuitOpenError(NotificationDeliveryError):
+    """Raised without contacting a webhook whose host's circuit is open."""
+
+    def __init__(self, host: str, retry_after: float):
+        """Initialize circuit open error.
+
+        Args:
+            host: Webhook host whose circuit is open
+            retry_after: Seconds until a trial request is allowed
+        """
+        super().__init__(None, f"Circuit open for {host}")
+        self.host = host
+        self.retry_after = retry_after
+
+
+def _is_endpoint_failure(exc: NotificationDeliveryError) -> bool:
+    """Whether an error means the endpoint is unhealthy (not a rejected event)."""
+    status = exc.status
+    return status is None or not 400 <= status < 500 or status == 429
+
+
+def _on_circuit_change(
+    breaker: CircuitBreaker, previous: CircuitState, state: CircuitState
+) -> None:
+    circuit_hosts.add(-1, {"host": breaker.name, "state": previous})
+    circuit_hosts.add(1, {"host": breaker.name, "state": state})
+    circuit_transitions.add(1, {"host": breaker.name, "state": state})
+    log = logger.warning if state == "open" else logger.info
+    log(
+        "Push notification circuit changed state",
+        host=breaker.name,
+        previous=previous,
+        state=state,
+        consecutive_failures=breaker.consecutive_failures,
+    )
+
+
+def coalesce_events(
+    events: list[dict[str, Any]], collapse_intermediate: bool = False
+) -> list[dict[str, Any]]:
+    """Order a batch of events by task and sequence, optionally collapsing.
+
+    Tasks keep the position of their first event in the batch; within a
+    task, events are sorted by ``sequence``. With ``collapse_intermediate``,
+    a task whose final event is in the batch keeps only that event (its
+    ``working`` and other intermediate states are superseded).
+
+    Args:
+        events: Lifecycle events, in the order they were produced
+        collapse_intermediate: Drop non-final events of finished tasks
+
+    Returns:
+        Events to send, in delivery order
+    """
+    by_task: dict[Any, list[dict[str, Any]]] = {}
+    for event in events:
+        by_task.setdefault(event.get("task_id"), []).append(event)
+
+    ordered: list[dict[str, Any]] = []
+    for task_events in by_task.values():
+        task_events.sort(key=lambda event: event.get("sequence", 0))
+        if collapse_intermediate and any(event.get("final") for event in task_events):
+            task_events = [event for event in task_events if event.get("final")]
+        ordered.extend(task_events)
+    return ordered
+
+
 @dataclass
 class NotificationService:
-    """Deliver push notification events to configured HTTP endpoints."""
+    """Deliver push notification events to configured HTTP endpoints.
+
+    Events are posted through one shared httpx.AsyncClient, so connections
+    to a subscriber are kept alive and reused (over HTTP/2 when h2 is
+    installed). ``max_connections_per_host`` caps concurrent requests to a
+    single host, so one busy subscriber cannot take the whole pool.
+
+    Each host has a circuit breaker: after ``circuit_failure_threshold``
+    consecutive connection errors, 5xx or 429 responses, requests to the
+    host fail immediately with NotificationCircuitOpenError for
+    ``circuit_recovery_timeout`` seconds, then ``circuit_half_open_max_calls``
+    trial requests decide whether it closes again. A dead subscriber thus
+    costs one fast failure per event instead of timeouts and retries.
+
+    ``send_events`` posts several events of one subscriber as a single JSON
+    array (see ``coalesce_events``); the delivery queue uses it when
+    batching is enabled.
+    """
 
     timeout: float = 5.0
     max_retries: int = 2
     base_backoff: float = 0.5
+    max_connections: int = 100
+    max_connections_per_host: int = 10
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+    circuit_failure_threshold: int = 5
+    circuit_recovery_timeout: float = 30.0
+    circuit_half_open_max_calls: int = 1
+    collapse_intermediate: bool = False
+
+    _client: httpx.AsyncClient | None = field(default=None, init=False, repr=False)
+    _host_limits: dict[str, asyncio.Semaphore] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _breakers: dict[str, CircuitBreaker] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    @classmethod
+    def from_settings(cls) -> NotificationService:
+        """Create a service configured by app_settings.notifications."""
+        from bindu.settings import app_settings
+
+        settings = app_settings.notifications
+        return cls(
+            timeout=settings.http_timeout,
+            max_retries=settings.max_retries,
+            base_backoff=settings.base_backoff,
+            max_connections=settings.max_connections,
+            max_connections_per_host=settings.max_connections_per_host,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+            http2=settings.http2,
+            circuit_failure_threshold=settings.circuit_failure_threshold,
+            circuit_recovery_timeout=settings.circuit_recovery_timeout,
+            circuit_half_open_max_calls=settings.circuit_half_open_max_calls,
+            collapse_intermediate=settings.batch_collapse_intermediate,
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the shared HTTP client."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                http2=self.http2 and HTTP2_AVAILABLE,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def circuit_states(self) -> dict[str, dict[str, Any]]:
+        """Return the circuit breaker state of every host contacted so far."""
+        return {host: breaker.snapshot() for host, breaker in self._breakers.items()}
 
     async def send_event(
         self, config: PushNotificationConfig, event: dict[str, Any]
@@ -48,6 +224,29 @@ class NotificationService:
 
         await self._post_with_retries(config["url"], headers, payload, event)
 
+    async def send_events(
+        self, config: PushNotificationConfig, events: list[dict[str, Any]]
+    ) -> None:
+        """Send several events to one webhook as a single JSON array.
+
+        Events are ordered by task and sequence, and intermediate states
+        are collapsed when ``collapse_intermediate`` is set. The batch is
+        delivered (or fails) as a whole.
+        """
+        self.validate_config(config)
+        batch = coalesce_events(events, self.collapse_intermediate)
+        if not batch:
+            return
+
+        payload = json.dumps(batch, separators=(",", ":")).encode("utf-8")
+        headers = self._build_headers(config)
+        summary = {
+            "event_id": [event.get("event_id") for event in batch],
+            "task_id": sorted({str(event.get("task_id")) for event in batch}),
+        }
+
+        await self._post_with_retries(config["url"], headers, payload, summary)
+
     def validate_config(self, config: PushNotificationConfig) -> None:
         """Validate push notification configuration before use."""
         parsed = urlparse(config["url"])
@@ -65,7 +264,7 @@ class NotificationService:
 
         while attempt <= self.max_retries:
             try:
-                status = await asyncio.to_thread(self._post_once, url, headers, payload)
+                status = await self._post_once(url, headers, payload)
                 logger.debug(
                     "Delivered push notification",
                     event_id=event.get("event_id"),
@@ -73,13 +272,18 @@ class NotificationService:
                     status=status,
                 )
                 return
+            except NotificationCircuitOpenError as exc:
+                logger.debug(
+                    "Skipping push notification while circuit is open",
+                    event_id=event.get("event_id"),
+                    task_id=event.get("task_id"),
+                    host=exc.host,
+                    retry_after=exc.retry_after,
+                )
+                raise
             except NotificationDeliveryError as exc:
                 last_error = exc
-                if (
-                    exc.status is not None
-                    and 400 <= exc.status < 500
-                    and exc.status != 429
-                ):
+                if not _is_endpoint_failure(exc):
                     logger.warning(
                         "Dropping push notification due to client error",
                         event_id=event.get("event_id"),
@@ -114,35 +318,80 @@ class NotificationService:
         )
         raise last_error
 
-    def _post_once(self, url: str, headers: dict[str, str], payload: bytes) -> int:
-        req = request.Request(url, data=payload, method="POST")
-        for key, value in headers.items():
-            req.add_header(key, value)
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        """Return the semaphore bounding concurrent requests to a host."""
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(max(1, self.max_connections_per_host))
+            self._host_limits[host] = limit
+        return limit
 
+    def _breaker(self, host: str) -> CircuitBreaker:
+        """Return the circuit breaker of a host."""
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                host,
+                failure_threshold=self.circuit_failure_threshold,
+                recovery_timeout=self.circuit_recovery_timeout,
+                half_open_max_calls=self.circuit_half_open_max_calls,
+                on_state_change=_on_circuit_change,
+            )
+            self._breakers[host] = breaker
+            circuit_hosts.add(1, {"host": host, "state": breaker.state})
+        return breaker
+
+    async def _post_once(
+        self, url: str, headers: dict[str, str], payload: bytes
+    ) -> int:
+        host = urlparse(url).netloc
+        breaker = self._breaker(host)
+        if not breaker.allow():
+            delivery_attempts.add(1, {"host": host, "outcome": "circuit_open"})
+            raise NotificationCircuitOpenError(host, breaker.retry_after())
+        try:
+            status = await self._post_attempt(host, url, headers, payload)
+        except NotificationDeliveryError as exc:
+            if _is_endpoint_failure(exc):
+                breaker.record_failure()
+            else:
+                breaker.record_success()  # reachable; the event was rejected
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
+        return status
+
+    async def _post_attempt(
+        self, host: str, url: str, headers: dict[str, str], payload: bytes
+    ) -> int:
+        outcome = "connection_error"
+        start = time.perf_counter()
         try:
-            # URL scheme is validated in validate_config() to only allow http/https
-            with request.urlopen(req, timeout=self.timeout) as response:  # nosec B310
-                status = response.getcode()
-                if 200 <= status < 300:
-                    return status
+            async with self._host_limit(host):
+                start = time.perf_counter()
+                # URL scheme is validated in validate_config() to only allow http/https
+                response = await self._get_client().post(
+                    url, content=payload, headers=headers
+                )
+            status = response.status_code
+            if 200 <= status < 300:
+                outcome = "success"
+                return status
+            outcome = "client_error" if 400 <= status < 500 else "server_error"
+            if status < 400:
                 raise NotificationDeliveryError(
                     status, f"Unexpected status code: {status}"
                 )
-        except error.HTTPError as exc:
-            status = exc.code
-            body = b""
-            try:
-                body = exc.read() or b""
-            except Exception:
-                body = b""
-            message = body.decode("utf-8", errors="ignore").strip()
-            raise NotificationDeliveryError(
-                status, message or f"HTTP error {status}"
-            ) from exc
-        except error.URLError as exc:
-            raise NotificationDeliveryError(
-                None, f"Connection error: {exc.reason}"
-            ) from exc
+            message = response.text.strip()
+            raise NotificationDeliveryError(status, message or f"HTTP error {status}")
+        except httpx.TransportError as exc:
+            raise NotificationDeliveryError(None, f"Connection error: {exc}") from exc
+        finally:
+            attributes = {"host": host, "outcome": outcome}
+            delivery_duration.record(time.perf_counter() - start, attributes)
+            delivery_attempts.add(1, attributes)
 
     def _build_headers(self, config: PushNotificationConfig) -> dict[str, str]:
         headers = {"Content-Type": "application/json"}
@@ -0,0 +1,358 @@
+"""Process-isolated execution of CPU-bound agent handlers.
+
+Threads do not help handlers that burn CPU (parsing, embedding, PDF
+processing) because of the GIL. ``ProcessPool`` keeps a set of warm worker
+processes, each running the agent handler in a loop:
+
+    parent                                   worker process
+    ------                                   --------------
+    send(params)  ───────────────────────▶   result = handler(*params)
+    recv() ◀── ("chunk", item) ───────────   for item in result: send(item)
+    recv() ◀── ("done", None) ────────────
+           ◀── ("error", exc) ────────────   (on exception)
+
+Results are streamed back chunk by chunk, so generator handlers keep their
+streaming behaviour. Coroutine and async generator handlers are driven by a
+private event loop inside the worker.
+
+Lifecycle:
+- Workers are started eagerly (warm) when the pool starts
+- A worker is recycled after ``max_tasks_per_worker`` tasks (0 = never)
+- A worker that dies mid-task is replaced and the task fails with
+  ``ProcessWorkerCrashedError``
+- If a replacement fails to start, the next task starts one on demand
+- A task abandoned by its caller (cancellation, early close) terminates its
+  worker, since the worker may still be producing output
+
+The handler is handed to workers as the ``Process`` target argument. The
+default start method is ``forkserver`` (``spawn`` where it is unavailable), so
+workers never fork the multi-threaded server process. Both re-import
+``__main__`` in each worker, which re-runs a script that calls ``bindufy`` at
+module level, so a handler defined in ``__main__`` defaults to ``fork``. Where
+``fork`` is unavailable, such a script must guard its entry point with
+``if __name__ == "__main__":``.
+
+Stopping and starting workers blocks (``join``, process startup), so the pool
+does it in a thread and never on the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import inspect
+import multiprocessing
+import os
+import signal
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, AsyncIterator, Callable, Iterator
+
+import anyio
+import anyio.to_thread
+
+from bindu.utils.logging import get_logger
+
+logger = get_logger("bindu.utils.process_pool")
+
+
+class ProcessWorkerCrashedError(RuntimeError):
+    """Raised when a worker process exits while executing a task."""
+
+
+def default_start_method(handler: Callable[..., Any] | None = None) -> str:
+    """Return the start method used when none is configured.
+
+    ``forkserver`` where the platform supports it, else ``spawn``; ``fork``
+    for a handler defined in ``__main__``, which the other two re-run.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if getattr(handler, "__module__", None) == "__main__":
+        if "fork" in methods:
+            return "fork"
+        logger.warning(
+            "Agent handler is defined in __main__ and fork is unavailable: "
+            "worker processes re-run the script, so it must guard its entry "
+            'point with if __name__ == "__main__":'
+        )
+    if "forkserver" in methods:
+        return "forkserver"
+    return "spawn"
+
+
+# -----------------------------------------------------------------------------
+# Worker process side
+# -----------------------------------------------------------------------------
+
+
+def _iterate_result(
+    result: Any, loop: asyncio.AbstractEventLoop | None
+) -> Iterator[Any]:
+    """Yield the chunks of a handler result, driving async results on ``loop``."""
+    if inspect.iscoroutine(result):
+        assert loop is not None
+        result = loop.run_until_complete(result)
+
+    if inspect.isasyncgen(result):
+        assert loop is not None
+        while True:
+            try:
+                yield loop.run_until_complete(result.__anext__())
+            except StopAsyncIteration:
+                return
+    elif inspect.isgenerator(result):
+        yield from result
+    else:
+        yield result
+
+
+def _picklable_error(exc: BaseException) -> BaseException:
+    """Return ``exc`` if it survives pickling, else a RuntimeError describing it."""
+    try:
+        from multiprocessing.reduction import ForkingPickler
+
+        ForkingPickler.dumps(exc)
+        return exc
+    except Exception:
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+
+
+def _worker_main(conn: Connection, handler: Callable[..., Any]) -> None:
+    """Serve tasks sent over ``conn`` until the pipe closes or ``None`` arrives."""
+    # Ctrl-C is handled by the parent, which terminates the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    needs_loop = inspect.iscoroutinefunction(handler) or inspect.isasyncgenfunction(
+        handler
+    )
+    loop = asyncio.new_event_loop() if needs_loop else None
+
+    while True:
+        try:
+            params = conn.recv()
+        except (EOFError, OSError):
+            return
+        if params is None:
+            return
+
+        try:
+            for chunk in _iterate_result(handler(*params), loop):
+                conn.send(("chunk", chunk))
+            conn.send(("done", None))
+        except Exception as exc:
+            conn.send(("error", _picklable_error(exc)))
+
+
+# -----------------------------------------------------------------------------
+# Parent side
+# -----------------------------------------------------------------------------
+
+
+@dataclass
+class _WorkerHandle:
+    """Parent-side handle on one worker process."""
+
+    process: BaseProcess
+    conn: Connection
+    tasks_completed: int = 0
+
+
+class ProcessPool:
+    """Pool of warm worker processes executing a single agent handler.
+
+    At most ``max_workers`` tasks run at once; further callers wait for a
+    free worker.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[..., Any],
+        max_workers: int | None = None,
+        max_tasks_per_worker: int = 100,
+        start_method: str | None = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            handler: Agent handler executed in the worker processes
+            max_workers: Number of worker processes (defaults to CPU count)
+            max_tasks_per_worker: Recycle a worker after this many tasks (0 = never)
+            start_method: multiprocessing start method (fork, forkserver,
+                spawn); defaults to default_start_method(handler)
+        """
+        self.handler = handler
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._context = multiprocessing.get_context(
+            start_method or default_start_method(handler)
+        )
+        self._idle: list[_WorkerHandle] = []
+        self._limiter: anyio.CapacityLimiter | None = None
+        self._start_lock: anyio.Lock | None = None
+        self._started = False
+        self._closed = False
+
+    @property
+    def limiter(self) -> anyio.CapacityLimiter:
+        """Capacity limiter admitting one task per worker (created on first use)."""
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.max_workers)
+        return self._limiter
+
+    # -------------------------------------------------------------------------
+    # Pool Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start all worker processes so the first tasks do not pay startup cost."""
+        if self._started:
+            return
+        self._started = True
+        for _ in range(self.max_workers):
+            self._idle.append(self._spawn())
+        atexit.register(self.shutdown)
+        logger.info(f"Started process pool with {self.max_workers} workers")
+
+    async def _ensure_started(self) -> None:
+        """Start the workers in a thread if start() has not been called yet."""
+        if self._started:
+            return
+        if self._start_lock is None:
+            self._start_lock = anyio.Lock()
+        async with self._start_lock:
+            if not self._started:
+                await anyio.to_thread.run_sync(self.start)
+
+    def shutdown(self) -> None:
+        """Stop idle workers and refuse new tasks."""
+        if self._closed:
+            return
+        self._closed = True
+        for worker in self._idle:
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            worker.conn.close()
+        for worker in self._idle:
+            worker.process.join(timeout=1)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        self._idle.clear()
+
+    def _spawn(self) -> _WorkerHandle:
+        """Start one worker process."""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(  # type: ignore  # not in BaseContext stubs
+            target=_worker_main,
+            args=(child_conn, self.handler),
+            name="bindu-handler-worker",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return _WorkerHandle(process=process, conn=parent_conn)
+
+    def _discard(self, worker: _WorkerHandle) -> None:
+        """Terminate a worker that must not be reused."""
+        worker.conn.close()
+        if worker.process.is_alive():
+            worker.process.terminate()
+        worker.process.join(timeout=1)
+
+    def _replace(self, worker: _WorkerHandle) -> _WorkerHandle | None:
+        """Terminate a spent or broken worker and start its successor (blocking)."""
+        self._discard(worker)
+        if self._closed:
+            return None
+        return self._spawn()
+
+    async def _release(self, worker: _WorkerHandle, reusable: bool) -> None:
+        """Return a worker to the pool, or replace it if spent or broken."""
+        if reusable and not self._closed:
+            worker.tasks_completed += 1
+            if not (
+                self.max_tasks_per_worker
+                and worker.tasks_completed >= self.max_tasks_per_worker
+            ):
+                self._idle.append(worker)
+                return
+            logger.debug(
+                f"Recycling worker pid={worker.process.pid} after "
+                f"{worker.tasks_completed} tasks"
+            )
+
+        try:
+            replacement = await anyio.to_thread.run_sync(self._replace, worker)
+        except Exception as e:
+            # The freed slot starts a worker on demand (see stream())
+            logger.error(f"Failed to start a replacement worker: {e}")
+            return
+        if replacement is None:
+            return
+        if self._closed:
+            # Shut down while the replacement was starting
+            await anyio.to_thread.run_sync(self._discard, replacement)
+        else:
+            self._idle.append(replacement)
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+
+    async def stream(self, *params: Any) -> AsyncIterator[Any]:
+        """Run the handler in a worker process and stream its output.
+
+        Args:
+            *params: Positional arguments for the handler (e.g. message history)
+
+        Yields:
+            Each chunk produced by the handler
+
+        Raises:
+            ProcessWorkerCrashedError: If the worker dies while running the task
+            Exception: Any exception raised by the handler, re-raised here
+        """
+        if self._closed:
+            raise RuntimeError("Process pool is shut down")
+        await self._ensure_started()
+
+        error: BaseException | None = None
+        async with self.limiter:
+            if self._idle:
+                worker = self._idle.pop()
+            else:
+                # A replacement failed to start; fill the slot now
+                worker = await anyio.to_thread.run_sync(self._spawn)
+            reusable = False
+            try:
+                await anyio.to_thread.run_sync(worker.conn.send, params)
+                while True:
+                    kind, payload = await anyio.to_thread.run_sync(
+                        worker.conn.recv, abandon_on_cancel=True
+                    )
+                    if kind == "chunk":
+                        yield payload
+                        continue
+                    # The worker finished the task cleanly and can be reused
+                    reusable = True
+                    if kind == "error":
+                        error = payload
+                    break
+            except (EOFError, OSError) as e:
+                exitcode = worker.process.exitcode
+                logger.error(
+                    f"Worker pid={worker.process.pid} crashed (exitcode={exitcode})"
+                )
+                raise ProcessWorkerCrashedError(
+                    f"Handler worker process exited unexpectedly (exitcode={exitcode})"
+                ) from e
+            finally:
+                # Keep the slot until the worker is back or replaced, even
+                # when the caller is cancelled
+                with anyio.CancelScope(shield=True):
+                    await self._release(worker, reusable)
+
+        if error is not None:
+            raise error
@@ -0,0 +1,274 @@
+"""Thread-pool execution of synchronous agent handlers.
+
+Plain functions and sync generators registered through ``bindufy`` would
+otherwise run directly on the event loop, so a blocking ``agent.run()`` call
+freezes every HTTP request, health check and SSE stream in the process.
+``SyncExecutor`` runs that code in a bounded pool of worker threads instead.
+
+Generators are driven one step at a time: every ``next()`` call is pulled
+through the pool, so a long-running stream never pins a thread between chunks
+and concurrent streams interleave fairly.
+
+Each call (or each generator) runs inside a copy of the caller's
+``contextvars`` context. The OpenTelemetry current span lives in a context
+variable, so spans started by the handler nest under the worker's span.
+
+Cancelling a caller (task cancel, execution deadline) abandons its thread:
+the caller returns at once while the thread runs to completion in the
+background. The thread keeps its pool slot until it actually returns, so
+hung handlers still count against ``max_threads``.
+
+Metrics (meter ``bindu.utils.sync_executor``):
+- bindu_sync_executor_queue_depth: calls waiting for a free thread
+- bindu_sync_executor_busy_threads: threads currently running handler code
+- bindu_sync_executor_saturation: busy threads / pool size (0.0 - 1.0)
+"""
+
+from __future__ import annotations
+
+import contextvars
+import math
+import threading
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Callable, Iterable, Iterator
+
+import anyio
+import anyio.from_thread
+import anyio.to_thread
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from bindu.settings import app_settings
+from bindu.utils.logging import get_logger
+
+logger = get_logger("bindu.utils.sync_executor")
+meter = metrics.get_meter("bindu.utils.sync_executor")
+
+_EXHAUSTED = object()
+
+
+def _next_or_exhausted(iterator: Iterator[Any]) -> Any:
+    """Advance an iterator without letting StopIteration cross an await."""
+    try:
+        return next(iterator)
+    except StopIteration:
+        return _EXHAUSTED
+
+
+class SyncExecutor:
+    """Bounded thread pool for synchronous agent code.
+
+    The pool size is enforced with an ``anyio.CapacityLimiter`` shared by all
+    calls, so its statistics double as the queue depth and saturation metrics.
+    """
+
+    def __init__(self, max_threads: int) -> None:
+        """Initialize the executor.
+
+        Args:
+            max_threads: Maximum number of threads running handler code at once
+        """
+        if max_threads < 1:
+            raise ValueError("max_threads must be at least 1")
+        self.max_threads = max_threads
+        self._limiter: anyio.CapacityLimiter | None = None
+        self._threads: anyio.CapacityLimiter | None = None
+
+    @property
+    def limiter(self) -> anyio.CapacityLimiter:
+        """Capacity limiter bounding the pool (created on first use)."""
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.max_threads)
+        return self._limiter
+
+    @property
+    def _thread_limiter(self) -> anyio.CapacityLimiter:
+        """Limiter handed to anyio; the pool bound is enforced by ``limiter``."""
+        if self._threads is None:
+            self._threads = anyio.CapacityLimiter(math.inf)
+        return self._threads
+
+    # -------------------------------------------------------------------------
+    # Statistics
+    # -------------------------------------------------------------------------
+
+    def queue_depth(self) -> int:
+        """Return the number of calls waiting for a free thread."""
+        if self._limiter is None:
+            return 0
+        return self._limiter.statistics().tasks_waiting
+
+    def busy_threads(self) -> int:
+        """Return the number of threads currently running handler code."""
+        if self._limiter is None:
+            return 0
+        return int(self._limiter.borrowed_tokens)
+
+    def saturation(self) -> float:
+        """Return the fraction of the pool currently in use."""
+        return self.busy_threads() / self.max_threads
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a synchronous callable in the pool and return its result.
+
+        Args:
+            func: Callable to execute
+            *args: Positional arguments for the callable
+
+        Returns:
+            The callable's return value
+        """
+        return await self._call(contextvars.copy_context(), func, *args)
+
+    async def iterate(
+        self, func: Callable[..., Iterable[Any]], *args: Any
+    ) -> AsyncGenerator[Any, None]:
+        """Drive a synchronous iterable through the pool, one step per thread hop.
+
+        The iterable is created and every ``next()`` call executes in the pool
+        under a single copied context, so context variables set by the
+        generator persist across its own steps just as they would in-line.
+
+        Args:
+            func: Callable returning an iterable (e.g. a generator function)
+            *args: Positional arguments for the callable
+
+        Yields:
+            Each item produced by the iterable
+        """
+        context = contextvars.copy_context()
+        iterable = await self._call(context, func, *args)
+        async with aclosing(self._drive(iter(iterable), context)) as items:
+            async for item in items:
+                yield item
+
+    async def iterate_over(self, iterator: Iterator[Any]) -> AsyncGenerator[Any, None]:
+        """Drive an already-created iterator through the pool.
+
+        Args:
+            iterator: Iterator returned by synchronous handler code
+
+        Yields:
+            Each item produced by the iterator
+        """
+        async with aclosing(self._drive(iterator, contextvars.copy_context())) as items:
+            async for item in items:
+                yield item
+
+    async def _drive(
+        self, iterator: Iterator[Any], context: contextvars.Context
+    ) -> AsyncGenerator[Any, None]:
+        """Pull items from ``iterator`` in the pool until it is exhausted."""
+        abandoned = False
+        try:
+            while True:
+                try:
+                    item = await self._call(context, _next_or_exhausted, iterator)
+                except anyio.get_cancelled_exc_class():
+                    # The step may still be running in its thread, where the
+                    # generator cannot be closed; it is finalized once released
+                    abandoned = True
+                    raise
+                if item is _EXHAUSTED:
+                    return
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None and not abandoned:
+                # Closing runs the generator's finally blocks; do it in the pool
+                # too, and shield it so cancellation cannot leak the generator.
+                with anyio.CancelScope(shield=True):
+                    await self._call(context, close)
+
+    async def _call(
+        self, context: contextvars.Context, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        """Run ``func`` in a pool thread, abandoning the thread on cancellation.
+
+        The pool slot is released by the thread when ``func`` returns, or
+        here if the call is cancelled before the thread starts it.
+        """
+        borrower = object()
+        await self.limiter.acquire_on_behalf_of(borrower)
+        lock = threading.Lock()
+        state = {"started": False, "abandoned": False}
+
+        def release() -> None:
+            self.limiter.release_on_behalf_of(borrower)
+
+        def call() -> Any:
+            with lock:
+                if state["abandoned"]:
+                    return None
+                state["started"] = True
+            try:
+                return context.run(func, *args)
+            finally:
+                try:
+                    anyio.from_thread.run_sync(release)
+                except RuntimeError:
+                    pass  # the event loop has shut down
+
+        try:
+            return await anyio.to_thread.run_sync(
+                call, abandon_on_cancel=True, limiter=self._thread_limiter
+            )
+        except BaseException:
+            with lock:
+                if not state["started"]:
+                    state["abandoned"] = True
+                    release()
+            raise
+
+
+_default_executor: SyncExecutor | None = None
+
+
+def get_sync_executor() -> SyncExecutor:
+    """Return the process-wide executor, sized from ``app_settings.worker``."""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = SyncExecutor(app_settings.worker.sync_max_threads)
+        logger.debug(
+            f"Created sync handler executor with {_default_executor.max_threads} threads"
+        )
+    return _default_executor
+
+
+def _observe(
+    reading: Callable[[SyncExecutor], float],
+) -> Callable[[CallbackOptions], Iterable[Observation]]:
+    """Build an observable-gauge callback reading the default executor."""
+
+    def callback(options: CallbackOptions) -> Iterable[Observation]:
+        if _default_executor is None:
+            return []
+        return [Observation(reading(_default_executor))]
+
+    return callback
+
+
+meter.create_observable_gauge(
+    "bindu_sync_executor_queue_depth",
+    callbacks=[_observe(SyncExecutor.queue_depth)],
+    description="Synchronous handler calls waiting for a free thread",
+    unit="1",
+)
+
+meter.create_observable_gauge(
+    "bindu_sync_executor_busy_threads",
+    callbacks=[_observe(SyncExecutor.busy_threads)],
+    description="Threads currently running synchronous handler code",
+    unit="1",
+)
+
+meter.create_observable_gauge(
+    "bindu_sync_executor_saturation",
+    callbacks=[_observe(SyncExecutor.saturation)],
+    description="Fraction of the synchronous handler thread pool in use",
+    unit="1",
+)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from typing import Any, Optional, Union
-from uuid import UUID, uuid4
+from uuid import UUID, uuid4, uuid5
 
 from bindu.common.protocol.types import (
     Artifact,
@@ -157,11 +157,21 @@ class PartConverter:
 class ArtifactBuilder:
     """Optimized builder for creating artifacts from results."""
 
+    @staticmethod
+    def result_artifact_id(task_id: UUID) -> UUID:
+        """Return the stable ID of a task's result artifact.
+
+        Streamed chunks and the final artifact share it, so clients can
+        assemble them into one artifact.
+        """
+        return uuid5(task_id, "result")
+
     @staticmethod
     def from_result(
         results: Any,
         artifact_name: str = "result",
         did_extension: Optional["DIDAgentExtension"] = None,
+        artifact_id: UUID | None = None,
     ) -> list[Artifact]:
         """Convert execution result to protocol artifacts.
 
@@ -169,6 +179,7 @@ class ArtifactBuilder:
             results: Result from manifest execution
             artifact_name: Name for the artifact
             did_extension: Optional DID extension for signing
+            artifact_id: Optional artifact ID (random by default)
 
         Returns:
             List of protocol artifacts
@@ -196,7 +207,13 @@ class ArtifactBuilder:
                         did_extension.sign_text(part["text"])
                     )
 
-        return [Artifact(artifact_id=uuid4(), name=artifact_name, parts=parts)]
+        return [
+            Artifact(
+                artifact_id=artifact_id or uuid4(),
+                name=artifact_name,
+                parts=parts,
+            )
+        ]
 
 
 class TaskStateManager:
@@ -8,10 +8,18 @@ from types import ModuleType
 ot_trace = ModuleType("opentelemetry.trace")
 
 
+class _SpanContext:
+    is_valid = False
+    is_remote = False
+
+
 class _Span:
     def is_recording(self):
         return True
 
+    def get_span_context(self):  # noqa: D401
+        return _SpanContext()
+
     def add_event(self, *args, **kwargs):  # noqa: D401
         return None
 
@@ -25,7 +33,7 @@ class _Span:
         return None
 
 
-def get_current_span():  # noqa: D401
+def get_current_span(context=None):  # noqa: D401, ARG001
     """Return a mock span for testing without OpenTelemetry."""
     return _Span()
 
@@ -39,13 +47,19 @@ class _SpanCtx:
 
 
 class _Tracer:
-    def start_as_current_span(self, name: str):  # noqa: ARG002
+    def start_as_current_span(self, name: str, **kwargs):  # noqa: ARG002
         return _SpanCtx()
 
-    def start_span(self, name: str):  # noqa: ARG002
+    def start_span(self, name: str, **kwargs):  # noqa: ARG002
         return _Span()
 
 
+class _Link:
+    def __init__(self, context, attributes=None):  # noqa: D401
+        self.context = context
+        self.attributes = attributes
+
+
 class _StatusCode:
     OK = "OK"
     ERROR = "ERROR"
@@ -62,6 +76,13 @@ ot_trace.Status = _Status  # type: ignore[attr-defined]
 ot_trace.StatusCode = _StatusCode  # type: ignore[attr-defined]
 ot_trace.Span = _Span  # type: ignore[attr-defined]
 ot_trace.use_span = lambda span: _SpanCtx()  # type: ignore[attr-defined]
+ot_trace.Link = _Link  # type: ignore[attr-defined]
+ot_trace.set_span_in_context = lambda span, context=None: {}  # type: ignore[attr-defined]
+
+# --- OpenTelemetry propagate stub (no-op W3C trace context) ---
+propagate_mod = ModuleType("opentelemetry.propagate")
+propagate_mod.inject = lambda carrier, context=None: None  # type: ignore[attr-defined]
+propagate_mod.extract = lambda carrier, context=None: {}  # type: ignore[attr-defined]
 
 # Build minimal opentelemetry root and metrics stub
 op_root = ModuleType("opentelemetry")
@@ -94,6 +115,19 @@ class _Meter:
     def create_up_down_counter(self, *_args, **_kwargs):  # noqa: D401
         return _UpDownCounter()
 
+    def create_observable_gauge(self, *_args, **_kwargs):  # noqa: D401
+        return None
+
+
+class _Observation:
+    def __init__(self, value, attributes=None):  # noqa: D401
+        self.value = value
+        self.attributes = attributes
+
+
+class _CallbackOptions:
+    pass
+
 
 def get_meter(name: str):  # noqa: D401, ARG001
     """Return a mock meter for testing without OpenTelemetry."""
@@ -101,13 +135,17 @@ def get_meter(name: str):  # noqa: D401, ARG001
 
 
 metrics_mod.get_meter = get_meter  # type: ignore[attr-defined]
+metrics_mod.Observation = _Observation  # type: ignore[attr-defined]
+metrics_mod.CallbackOptions = _CallbackOptions  # type: ignore[attr-defined]
 
 op_root.metrics = metrics_mod  # type: ignore[attr-defined]
 op_root.trace = ot_trace  # type: ignore[attr-defined]
+op_root.propagate = propagate_mod  # type: ignore[attr-defined]
 
 sys.modules["opentelemetry"] = op_root
 sys.modules["opentelemetry.trace"] = ot_trace
 sys.modules["opentelemetry.metrics"] = metrics_mod
+sys.modules["opentelemetry.propagate"] = propagate_mod
 
 
 # --- x402 package stub ---
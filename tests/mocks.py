@@ -86,6 +86,7 @@ class MockManifest:
         # Manifest configuration attributes
         self.enable_system_message = True
         self.enable_context_based_history = False
+        self.task_timeout = None
 
     def run(self, message_history: list):
         """Run the agent synchronously.
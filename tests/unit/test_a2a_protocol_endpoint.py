@@ -0,0 +1,99 @@
+"""Unit tests for the A2A protocol endpoint admission control."""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+from starlette.responses import StreamingResponse
+from starlette.testclient import TestClient
+
+from bindu.server.applications import BinduApplication
+from bindu.server.scheduler.base import SchedulerQueueFullError
+
+
+def _manifest():
+    return SimpleNamespace(
+        capabilities={"extensions": []},
+        url="http://localhost:3773",
+        name="test_agent",
+    )
+
+
+def _task_manager(**handlers):
+    return SimpleNamespace(is_running=True, **handlers)
+
+
+def _send_message_payload() -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": str(uuid4()),
+        "method": "message/send",
+        "params": {
+            "message": {
+                "messageId": str(uuid4()),
+                "contextId": str(uuid4()),
+                "taskId": str(uuid4()),
+                "kind": "message",
+                "role": "user",
+                "parts": [{"kind": "text", "text": "hello"}],
+            },
+            "configuration": {"acceptedOutputModes": ["application/json"]},
+        },
+    }
+
+
+def test_queue_full_returns_429_with_retry_after():
+    """Test that a full task queue maps to HTTP 429 and a JSON-RPC error."""
+    app = BinduApplication(manifest=_manifest(), debug=True)
+
+    async def send_message(request):
+        raise SchedulerQueueFullError("Task queue is full", retry_after=2.5)
+
+    app.task_manager = _task_manager(send_message=send_message)
+
+    client = TestClient(app)
+    resp = client.post("/", json=_send_message_payload())
+
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "3"
+    body = resp.json()
+    assert body["error"]["code"] == -32040
+    assert "Task queue is full" in body["error"]["data"]
+
+
+def test_client_supplied_identity_is_dropped():
+    """Test that unauthenticated requests cannot claim a client identity."""
+    app = BinduApplication(manifest=_manifest(), debug=True)
+    received = []
+
+    async def send_message(request):
+        received.append(request["params"]["message"])
+        raise SchedulerQueueFullError("Task queue is full")
+
+    app.task_manager = _task_manager(send_message=send_message)
+    payload = _send_message_payload()
+    payload["params"]["message"]["metadata"] = {"_client_id": "someone-else"}
+
+    TestClient(app).post("/", json=payload)
+
+    assert received[0]["metadata"] == {}
+
+
+def test_stream_handler_response_is_returned_as_is():
+    """Test that message/stream reaches its handler and returns its SSE response."""
+    app = BinduApplication(manifest=_manifest(), debug=True)
+
+    async def stream_message(request):
+        async def events():
+            yield "data: {}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    app.task_manager = _task_manager(stream_message=stream_message)
+    payload = _send_message_payload()
+    payload["method"] = "message/stream"
+
+    resp = TestClient(app).post("/", json=payload)
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert resp.text == "data: {}\n\n"
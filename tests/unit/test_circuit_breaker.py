@@ -0,0 +1,110 @@
+"""Unit tests for the circuit breaker."""
+
+from bindu.utils.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock, **kwargs) -> CircuitBreaker:
+    return CircuitBreaker(
+        "hooks.test", failure_threshold=3, recovery_timeout=10.0, clock=clock, **kwargs
+    )
+
+
+class TestCircuitBreaker:
+    """Test closed, open and half-open transitions."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test the failure threshold."""
+        breaker = _breaker(FakeClock())
+
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+    def test_half_open_trial_closes_on_success(self):
+        """Test recovery after the cool-down."""
+        clock = FakeClock()
+        breaker = _breaker(clock)
+        for _ in range(3):
+            breaker.record_failure()
+
+        clock.now = 4.0
+        assert breaker.retry_after() == 6.0
+        assert not breaker.allow()
+
+        clock.now = 10.0
+        assert breaker.allow()
+        assert breaker.state == "half_open"
+        assert not breaker.allow()  # one trial at a time
+        assert breaker.retry_after() == breaker.trial_wait
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.allow()
+
+    def test_failed_trial_reopens(self):
+        """Test that the cool-down restarts after a failed trial."""
+        clock = FakeClock()
+        breaker = _breaker(clock)
+        for _ in range(3):
+            breaker.record_failure()
+
+        clock.now = 10.0
+        assert breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        assert breaker.retry_after() == 10.0
+
+    def test_release_returns_trial_slot(self):
+        """Test that an abandoned trial does not wedge the breaker."""
+        clock = FakeClock()
+        breaker = _breaker(clock)
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 10.0
+
+        assert breaker.allow()
+        breaker.release()
+
+        assert breaker.allow()
+
+    def test_state_changes_are_reported(self):
+        """Test the on_state_change callback."""
+        clock = FakeClock()
+        changes: list[tuple[str, str]] = []
+        breaker = _breaker(
+            clock, on_state_change=lambda b, old, new: changes.append((old, new))
+        )
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 10.0
+        breaker.allow()
+        breaker.record_success()
+
+        assert changes == [
+            ("closed", "open"),
+            ("open", "half_open"),
+            ("half_open", "closed"),
+        ]
+        assert breaker.snapshot() == {
+            "state": "closed",
+            "consecutive_failures": 0,
+            "retry_after": 0.0,
+        }
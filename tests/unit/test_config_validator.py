@@ -213,6 +213,29 @@ class TestConfigValidator:
             result = ConfigValidator.validate_and_process(minimal_config)
             assert result["kind"] == kind
 
+    def test_validate_execution_mode_invalid(self, minimal_config):
+        """Test validation of execution_mode field."""
+        minimal_config["execution_mode"] = "gpu"
+
+        with pytest.raises(
+            ValueError, match="Field 'execution_mode' must be one of: thread, process"
+        ):
+            ConfigValidator.validate_and_process(minimal_config)
+
+    def test_validate_task_timeout(self, minimal_config):
+        """Test that task_timeout must be a positive number."""
+        minimal_config["task_timeout"] = 30
+        assert (
+            ConfigValidator.validate_and_process(minimal_config)["task_timeout"] == 30
+        )
+
+        for invalid in (0, -5, "30", True):
+            minimal_config["task_timeout"] = invalid
+            with pytest.raises(
+                ValueError, match="Field 'task_timeout' must be a positive number"
+            ):
+                ConfigValidator.validate_and_process(minimal_config)
+
     def test_auth_disabled(self, minimal_config):
         """Test auth configuration when disabled."""
         minimal_config["auth"] = {
@@ -0,0 +1,226 @@
+"""Unit tests for the task event bus and stream events."""
+
+from unittest.mock import patch
+from uuid import uuid4
+
+import orjson
+import pytest
+
+from bindu.server.streaming import (
+    InMemoryTaskEventBus,
+    RedisTaskEventBus,
+    artifact_update_event,
+    chunk_part,
+    create_event_bus,
+    decode_event,
+    status_update_event,
+)
+from bindu.settings import app_settings
+
+
+class TestStreamEvents:
+    """Test the event builders."""
+
+    def test_turn_ending_states_are_final(self):
+        """Test that input-required ends a stream like terminal states."""
+        task_id, context_id = uuid4(), uuid4()
+
+        assert not status_update_event(task_id, context_id, "working")["final"]
+        assert status_update_event(task_id, context_id, "input-required")["final"]
+        assert status_update_event(task_id, context_id, "completed")["final"]
+
+    def test_chunk_parts(self):
+        """Test that structured chunks become data parts."""
+        assert chunk_part("hi") == {"kind": "text", "text": "hi"}
+        assert chunk_part({"a": 1}) == {"kind": "data", "data": {"result": {"a": 1}}}
+
+    def test_decode_restores_ids(self):
+        """Test the JSON round trip used by the Redis bus."""
+        artifact = {"artifact_id": uuid4(), "parts": [chunk_part("x")]}
+        event = artifact_update_event(uuid4(), uuid4(), artifact, append=True)
+
+        assert decode_event(orjson.loads(orjson.dumps(event))) == event
+
+
+class TestInMemoryTaskEventBus:
+    """Test in-process fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_events_fan_out_to_task_subscribers(self):
+        """Test that every subscriber of a task receives its events in order."""
+        bus = InMemoryTaskEventBus()
+        task_id, other_id, context_id = uuid4(), uuid4(), uuid4()
+        first = await bus.subscribe(task_id)
+        second = await bus.subscribe(task_id)
+        other = await bus.subscribe(other_id)
+
+        working = status_update_event(task_id, context_id, "working")
+        completed = status_update_event(task_id, context_id, "completed")
+        await bus.publish(task_id, working)
+        await bus.publish(task_id, completed)
+
+        for subscription in (first, second):
+            assert await subscription.get(timeout=1) == working
+            assert await subscription.get(timeout=1) == completed
+        assert await other.get(timeout=0.01) is None
+
+    @pytest.mark.asyncio
+    async def test_final_event_detaches_subscribers(self):
+        """Test that subscribers are dropped once their task's stream ends."""
+        idle: list = []
+        bus = InMemoryTaskEventBus(on_idle=idle.append)
+        task_id, context_id = uuid4(), uuid4()
+        await bus.subscribe(task_id)
+
+        await bus.publish(task_id, status_update_event(task_id, context_id, "failed"))
+
+        assert bus.subscriber_count(task_id) == 0
+        assert idle == [task_id]
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_marked_lagged(self):
+        """Test that a full subscriber queue stops delivery instead of blocking."""
+        bus = InMemoryTaskEventBus(subscriber_queue_size=2)
+        task_id, context_id = uuid4(), uuid4()
+        subscription = await bus.subscribe(task_id)
+
+        for _ in range(3):
+            await bus.publish(
+                task_id, status_update_event(task_id, context_id, "working")
+            )
+
+        assert subscription.lagged
+        assert await subscription.get(timeout=1) is not None
+        assert await subscription.get(timeout=1) is not None
+        assert await subscription.get(timeout=0.01) is None
+
+    @pytest.mark.asyncio
+    async def test_closed_subscription_stops_receiving(self):
+        """Test unsubscribing through the context manager."""
+        idle: list = []
+        bus = InMemoryTaskEventBus(on_idle=idle.append)
+        task_id = uuid4()
+
+        async with await bus.subscribe(task_id):
+            assert bus.subscriber_count(task_id) == 1
+
+        assert bus.subscriber_count(task_id) == 0
+        assert idle == [task_id]
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTaskEventLog:
+    """Test sequence numbers and replay from the event log."""
+
+    @staticmethod
+    async def _publish_states(bus, task_id, context_id, *states) -> list[int]:
+        return [
+            await bus.publish(task_id, status_update_event(task_id, context_id, state))
+            for state in states
+        ]
+
+    @staticmethod
+    async def _drain(subscription) -> list[tuple[int, str]]:
+        received = []
+        while (event := await subscription.get(timeout=0.01)) is not None:
+            received.append((subscription.last_seq, event["status"]["state"]))
+        return received
+
+    @pytest.mark.asyncio
+    async def test_replay_then_live_without_repeats(self):
+        """Test resuming after a sequence number."""
+        bus = InMemoryTaskEventBus()
+        task_id, context_id = uuid4(), uuid4()
+        seqs = await self._publish_states(
+            bus, task_id, context_id, "submitted", "working"
+        )
+        assert seqs == [1, 2]
+
+        subscription = await bus.subscribe(task_id, after_seq=1)
+        await self._publish_states(bus, task_id, context_id, "completed")
+
+        assert not subscription.missed
+        assert await self._drain(subscription) == [(2, "working"), (3, "completed")]
+
+    @pytest.mark.asyncio
+    async def test_trimmed_events_are_reported_missed(self):
+        """Test that a resume point older than the ring buffer is detected."""
+        bus = InMemoryTaskEventBus(log_size=2)
+        task_id, context_id = uuid4(), uuid4()
+        await self._publish_states(bus, task_id, context_id, *["working"] * 4)
+
+        assert bus.replay(task_id, 1) is None
+        replayed = bus.replay(task_id, 2)
+        assert replayed is not None
+        assert [seq for seq, _ in replayed] == [3, 4]
+        assert bus.replay(task_id, 4) == []
+        assert bus.replay(task_id, 9) is None
+        assert (await bus.subscribe(task_id, after_seq=1)).missed
+
+    @pytest.mark.asyncio
+    async def test_log_expires_after_final_event(self):
+        """Test that logs are dropped a TTL after the task finishes."""
+        clock = FakeClock()
+        bus = InMemoryTaskEventBus(log_ttl=10.0, log_max_age=100.0, clock=clock)
+        done, running, context_id = uuid4(), uuid4(), uuid4()
+        await self._publish_states(bus, done, context_id, "working", "completed")
+        await self._publish_states(bus, running, context_id, "working")
+
+        clock.now = 9.0
+        assert bus.replay(done, 0) is not None
+        clock.now = 10.0
+        assert bus.replay(done, 0) is None
+        assert bus.replay(running, 0) is not None
+
+        # A task that never finishes keeps its log while it publishes
+        clock.now = 90.0
+        await self._publish_states(bus, running, context_id, "working")
+        clock.now = 150.0
+        assert bus.replay(running, 0) is not None
+        clock.now = 190.0
+        assert bus.replay(running, 0) is None
+
+
+class TestCreateEventBus:
+    """Test the backend chosen by the "auto" event bus setting."""
+
+    @pytest.mark.parametrize(
+        ("scheduler", "redis_url", "expected"),
+        [
+            ("memory", None, InMemoryTaskEventBus),
+            ("redis", None, RedisTaskEventBus),
+            ("postgres", "redis://cache:6379/0", RedisTaskEventBus),
+            ("postgres", None, InMemoryTaskEventBus),
+        ],
+    )
+    def test_auto_backend(self, scheduler, redis_url, expected):
+        """Test that multi-pod schedulers get the Redis bus when they can."""
+        with (
+            patch.object(app_settings.streaming, "event_bus_backend", "auto"),
+            patch.object(app_settings.streaming, "event_bus_redis_url", redis_url),
+            patch.object(app_settings.scheduler, "backend", scheduler),
+            patch.object(app_settings.scheduler, "redis_url", None),
+        ):
+            assert isinstance(create_event_bus(), expected)
+
+    def test_postgres_without_redis_warns(self):
+        """Test that a postgres deployment without Redis is flagged."""
+        with (
+            patch.object(app_settings.streaming, "event_bus_backend", "auto"),
+            patch.object(app_settings.streaming, "event_bus_redis_url", None),
+            patch.object(app_settings.scheduler, "backend", "postgres"),
+            patch.object(app_settings.scheduler, "redis_url", None),
+            patch("bindu.server.streaming.event_bus.logger") as logger,
+        ):
+            create_event_bus()
+
+        logger.warning.assert_called_once()
@@ -40,3 +40,48 @@ def test_health_endpoint_ok():
     assert isinstance(body["uptime_seconds"], (int, float))
     assert "version" in body
     assert body["ready"] is True
+
+
+class CountingScheduler:
+    """Scheduler stub recording get_queue_stats calls."""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+
+    async def get_queue_stats(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return {"backend": "stub", "queued": 3}
+
+
+def make_app_with_scheduler(scheduler):
+    app = BinduApplication(manifest=make_minimal_manifest(), debug=True)
+    task_manager = make_dummy_task_manager()
+    task_manager.scheduler = scheduler
+    app.task_manager = task_manager
+    return app
+
+
+def test_health_reports_queue_stats_and_reuses_them():
+    scheduler = CountingScheduler()
+    client = TestClient(make_app_with_scheduler(scheduler))
+
+    first = client.get("/health").json()
+    second = client.get("/health").json()
+
+    assert first["queue"] == {"backend": "stub", "queued": 3}
+    assert second["queue"] == first["queue"]
+    assert scheduler.calls == 1
+
+
+def test_health_survives_queue_stats_failure():
+    scheduler = CountingScheduler(error=ConnectionError("database down"))
+    client = TestClient(make_app_with_scheduler(scheduler))
+
+    resp = client.get("/health")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["status"] == "ok"
+    assert body["queue"] == {"available": False}
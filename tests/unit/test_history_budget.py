@@ -0,0 +1,63 @@
+"""Unit tests for the conversation history budget."""
+
+from bindu.utils.history_budget import (
+    MESSAGE_TOKEN_OVERHEAD,
+    HistoryBudget,
+    estimate_tokens,
+)
+
+
+def _messages(*contents: str) -> list[dict[str, str]]:
+    return [{"role": "user", "content": content} for content in contents]
+
+
+class TestEstimateTokens:
+    """Test the local token estimator."""
+
+    def test_empty_text(self):
+        """Test that empty text costs nothing."""
+        assert estimate_tokens("") == 0
+
+    def test_roughly_four_bytes_per_token(self):
+        """Test the bytes-per-token heuristic."""
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+        assert estimate_tokens("a" * 400) == 100
+
+    def test_multibyte_text_counts_bytes(self):
+        """Test that non-ASCII text is not underestimated."""
+        assert estimate_tokens("日本語") == 3
+
+
+class TestHistoryBudget:
+    """Test trimming history to a budget."""
+
+    def test_non_positive_limits_mean_unlimited(self):
+        """Test that 0 and negative limits are normalized to None."""
+        budget = HistoryBudget(max_tasks=0, max_messages=-1, max_tokens=None)
+
+        assert budget.max_tasks is None
+        assert budget.max_messages is None
+        history = _messages("a", "b", "c")
+        assert budget.trim(history) == history
+
+    def test_trim_keeps_newest_messages(self):
+        """Test the message limit keeps the tail."""
+        budget = HistoryBudget(max_messages=2)
+
+        assert budget.trim(_messages("a", "b", "c")) == _messages("b", "c")
+
+    def test_trim_by_tokens(self):
+        """Test the token limit drops the oldest messages that do not fit."""
+        per_message = estimate_tokens("x" * 40) + MESSAGE_TOKEN_OVERHEAD
+        budget = HistoryBudget(max_tokens=per_message * 2 + 1)
+
+        trimmed = budget.trim(_messages("1" * 40, "2" * 40, "3" * 40))
+
+        assert trimmed == _messages("2" * 40, "3" * 40)
+
+    def test_trim_drops_message_larger_than_budget(self):
+        """Test that a newest message over budget leaves nothing."""
+        budget = HistoryBudget(max_tokens=5)
+
+        assert budget.trim(_messages("x" * 400)) == []
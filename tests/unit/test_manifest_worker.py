@@ -1,15 +1,32 @@
 """Unit tests for ManifestWorker and hybrid agent pattern."""
 
+import asyncio
+import threading
+import time
 from typing import cast
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+import anyio
 import pytest
 
 from bindu.common.models import AgentManifest
-from bindu.common.protocol.types import TaskSendParams
+from bindu.common.protocol.types import Task, TaskSendParams
+from bindu.server.scheduler.base import TaskOperation
 from bindu.server.scheduler.memory_scheduler import InMemoryScheduler
 from bindu.server.storage.memory_storage import InMemoryStorage
+from bindu.server.streaming import InMemoryTaskEventBus
+from bindu.server.workers.helpers import (
+    ContextHistory,
+    ContextHistoryCache,
+    InMemoryResponseCache,
+    MicroBatcher,
+    RedisResponseCache,
+    response_cache_key,
+)
+from bindu.server.workers.helpers.response_cache import _SET_SCRIPT
 from bindu.server.workers.manifest_worker import ManifestWorker
+from bindu.settings import app_settings
 from tests.mocks import MockAgent, MockManifest
 from tests.utils import assert_task_state, create_test_message
 
@@ -504,3 +521,1641 @@ class TestLifecycleNotifications:
 
         # Should have received notifications
         assert len(notifications) > 0
+
+
+class TestConcurrentExecution:
+    """Test bounded concurrent execution in the worker loop."""
+
+    @staticmethod
+    def _run_operation() -> TaskOperation:
+        return cast(
+            TaskOperation,
+            {
+                "operation": "run",
+                "params": {"task_id": uuid4(), "context_id": uuid4()},
+                "_current_span": None,
+            },
+        )
+
+    @pytest.mark.asyncio
+    async def test_operations_run_concurrently_up_to_limit(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test that at most max_concurrent_tasks operations run at once."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+            max_concurrent_tasks=2,
+        )
+
+        active = 0
+        peak = 0
+        handled = []
+        release = anyio.Event()
+
+        async def slow_handle(task_operation):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await release.wait()
+            active -= 1
+            handled.append(task_operation)
+
+        worker._handle_task_operation = slow_handle  # type: ignore
+
+        with anyio.fail_after(5):
+            async with worker.run():
+                async with anyio.create_task_group() as tg:
+                    for _ in range(4):
+                        tg.start_soon(scheduler._enqueue, self._run_operation())
+                    while active < 2:
+                        await anyio.sleep(0.01)
+                    await anyio.sleep(0.05)
+                    assert active == 2
+                    release.set()
+                while len(handled) < 4:
+                    await anyio.sleep(0.01)
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_batches_are_capped_by_free_slots(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test that the worker fetches batches no larger than its free slots."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+            max_concurrent_tasks=3,
+        )
+
+        batch_sizes = []
+        receive_batches = scheduler.receive_task_operation_batches
+
+        async def recording_batches(max_batch_size):
+            async for batch in receive_batches(max_batch_size):
+                batch_sizes.append(len(batch))
+                yield batch
+
+        scheduler.receive_task_operation_batches = recording_batches  # type: ignore
+
+        started = 0
+        release = anyio.Event()
+
+        async def hold(task_operation):
+            nonlocal started
+            started += 1
+            await release.wait()
+
+        worker._handle_task_operation = hold  # type: ignore
+
+        await scheduler.run_tasks(
+            [cast(TaskSendParams, self._run_operation()["params"]) for _ in range(5)]
+        )
+
+        with anyio.fail_after(5):
+            async with worker.run():
+                while started < 3:
+                    await anyio.sleep(0.01)
+                await anyio.sleep(0.05)
+                assert batch_sizes == [3]
+                assert (await scheduler.get_queue_stats())["queued_runs"] == 2
+                release.set()
+                while started < 5:
+                    await anyio.sleep(0.01)
+
+    @pytest.mark.asyncio
+    async def test_sequential_when_limit_is_one(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test that a limit of 1 keeps strictly sequential processing."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+            max_concurrent_tasks=1,
+        )
+
+        active = 0
+        peak = 0
+        handled = []
+
+        async def handle(task_operation):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await anyio.sleep(0.01)
+            active -= 1
+            handled.append(task_operation)
+
+        worker._handle_task_operation = handle  # type: ignore
+
+        with anyio.fail_after(5):
+            async with worker.run():
+                for _ in range(3):
+                    await scheduler._enqueue(self._run_operation())
+                while len(handled) < 3:
+                    await anyio.sleep(0.01)
+
+        assert peak == 1
+
+    @pytest.mark.asyncio
+    async def test_in_flight_operations_cancelled_on_exit(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test that leaving run() cancels operations still executing."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+            max_concurrent_tasks=3,
+        )
+
+        started = anyio.Event()
+        cancelled = []
+
+        async def hang(task_operation):
+            started.set()
+            try:
+                await anyio.sleep_forever()
+            except anyio.get_cancelled_exc_class():
+                cancelled.append(task_operation)
+                raise
+
+        worker._handle_task_operation = hang  # type: ignore
+
+        with anyio.fail_after(5):
+            async with worker.run():
+                await scheduler._enqueue(self._run_operation())
+                await started.wait()
+
+        assert len(cancelled) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_status_write_does_not_stop_other_tasks(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test that a failing 'failed' write stays inside its own operation."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+            max_concurrent_tasks=2,
+        )
+
+        slow = self._run_operation()
+        broken = self._run_operation()
+        started = anyio.Event()
+        release = anyio.Event()
+        finished = []
+
+        async def run_task(params):
+            if params is broken["params"]:
+                raise RuntimeError("agent crashed")
+            started.set()
+            await release.wait()
+            finished.append(params)
+
+        worker.run_task = run_task  # type: ignore
+        # The broken task was never stored, so marking it failed raises KeyError
+        with anyio.fail_after(5):
+            async with worker.run():
+                await scheduler._enqueue(slow)
+                await started.wait()
+                await scheduler._enqueue(broken)
+                while (await scheduler.get_queue_stats())["queued_runs"]:
+                    await anyio.sleep(0.01)
+                await anyio.sleep(0.05)
+                release.set()
+                while not finished:
+                    await anyio.sleep(0.01)
+
+        assert finished == [slow["params"]]
+
+
+class TestOperationAcknowledgement:
+    """Test that handled operations are acknowledged to the scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_operation_acked_after_handling(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test that ack_task_operation runs once the operation finishes."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+        )
+        acked = []
+        handled = []
+
+        async def ack(task_operation):
+            acked.append((task_operation, list(handled)))
+
+        async def run_task(params):
+            handled.append(params)
+
+        scheduler.ack_task_operation = ack  # type: ignore
+        worker.run_task = run_task  # type: ignore
+
+        operation = TestConcurrentExecution._run_operation()
+        await worker._handle_task_operation(operation)
+
+        assert acked == [(operation, [operation["params"]])]
+
+    @pytest.mark.asyncio
+    async def test_failed_ack_does_not_raise(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test that an acknowledgement failure is logged, not propagated."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+        )
+
+        async def ack(task_operation):
+            raise ConnectionError("redis down")
+
+        async def run_task(params):
+            return None
+
+        scheduler.ack_task_operation = ack  # type: ignore
+        worker.run_task = run_task  # type: ignore
+
+        await worker._handle_task_operation(TestConcurrentExecution._run_operation())
+
+
+class TestTracePropagation:
+    """Test that worker spans continue the producer's trace."""
+
+    @staticmethod
+    def _remote_span(is_remote: bool = True):
+        span = MagicMock()
+        span.get_span_context.return_value = MagicMock(
+            is_valid=True, is_remote=is_remote
+        )
+        return span
+
+    @pytest.mark.asyncio
+    async def test_run_span_links_remote_producer_and_records_wait(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test the producer link and queue-wait attribute on the task span."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+        )
+        worker.run_task = AsyncMock()
+        producer = self._remote_span()
+        operation = TestConcurrentExecution._run_operation()
+        operation["_current_span"] = producer
+        operation["_enqueued_at"] = time.time() - 2
+
+        with patch("bindu.server.workers.base.tracer") as tracer:
+            await worker._handle_task_operation(operation)
+
+        kwargs = tracer.start_as_current_span.call_args.kwargs
+        assert [link.context for link in kwargs["links"]] == [
+            producer.get_span_context.return_value
+        ]
+        assert kwargs["attributes"]["bindu.queue.wait_ms"] >= 2000
+
+    @pytest.mark.asyncio
+    async def test_local_producer_is_not_linked(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test that in-process producers are parents only, not links."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+        )
+        worker.run_task = AsyncMock()
+        operation = TestConcurrentExecution._run_operation()
+        operation["_current_span"] = self._remote_span(is_remote=False)
+
+        with patch("bindu.server.workers.base.tracer") as tracer:
+            await worker._handle_task_operation(operation)
+
+        kwargs = tracer.start_as_current_span.call_args.kwargs
+        assert kwargs["links"] == []
+        assert "bindu.queue.wait_ms" not in kwargs["attributes"]
+
+
+class TestCooperativeCancellation:
+    """Test that cancelling a task stops its in-flight execution."""
+
+    @staticmethod
+    async def _submit(storage: InMemoryStorage) -> tuple[Task, TaskSendParams]:
+        message = create_test_message(text="Long job")
+        task = await storage.submit_task(message["context_id"], message)
+        params = cast(
+            TaskSendParams,
+            {
+                "task_id": task["id"],
+                "context_id": task["context_id"],
+                "message": message,
+            },
+        )
+        return task, params
+
+    @staticmethod
+    async def _wait_until_canceled(worker: ManifestWorker, storage, task_id) -> None:
+        while task_id in worker._running:
+            await anyio.sleep(0.01)
+        while (await storage.load_task(task_id))["status"]["state"] != "canceled":
+            await anyio.sleep(0.01)
+
+    @pytest.mark.asyncio
+    async def test_cancel_aborts_async_generator_handler(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a cancel aborts the scope and closes the handler's generator."""
+        started = anyio.Event()
+        closed = []
+
+        async def run(message_history):
+            try:
+                started.set()
+                yield "partial"
+                await anyio.sleep_forever()
+                yield "never"
+            finally:
+                closed.append(True)
+
+        manifest = MockManifest()
+        manifest.run = run  # type: ignore
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, manifest),
+            max_concurrent_tasks=2,
+        )
+        task, params = await self._submit(storage)
+
+        with anyio.fail_after(5):
+            async with worker.run():
+                await scheduler.run_task(params)
+                await started.wait()
+                await scheduler.cancel_task({"task_id": task["id"]})
+                await self._wait_until_canceled(worker, storage, task["id"])
+
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert_task_state(final, "canceled")
+        assert not final.get("artifacts")
+        assert closed == [True]
+
+    @pytest.mark.asyncio
+    async def test_threaded_handler_sees_cancellation_token(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a handler running in the thread pool can stop cooperatively."""
+        from bindu.utils.cancellation import current_cancellation_token
+        from bindu.utils.sync_executor import SyncExecutor
+
+        executor = SyncExecutor(max_threads=2)
+        started = anyio.Event()
+        stopped = []
+
+        def blocking_handler():
+            token = current_cancellation_token()
+            assert token is not None
+            anyio.from_thread.run_sync(started.set)
+            while not token.cancelled:
+                time.sleep(0.01)
+            stopped.append(True)
+            return "stopped early"
+
+        async def run(message_history):
+            yield await executor.run(blocking_handler)
+
+        manifest = MockManifest()
+        manifest.run = run  # type: ignore
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, manifest),
+            max_concurrent_tasks=2,
+        )
+        task, params = await self._submit(storage)
+
+        with anyio.fail_after(5):
+            async with worker.run():
+                await scheduler.run_task(params)
+                await started.wait()
+                await scheduler.cancel_task({"task_id": task["id"]})
+                await self._wait_until_canceled(worker, storage, task["id"])
+            # The abandoned thread notices the token on its next check
+            while not stopped:
+                await anyio.sleep(0.01)
+
+        assert stopped == [True]
+        assert_task_state(await storage.load_task(task["id"]), "canceled")
+
+    @pytest.mark.asyncio
+    async def test_result_is_not_written_over_canceled_state(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a task canceled elsewhere keeps its canceled state."""
+        task, params = await self._submit(storage)
+
+        async def run(message_history):
+            # Another pod handles the cancel while this one is still executing
+            await storage.update_task(task["id"], state="canceled")
+            yield "late result"
+
+        manifest = MockManifest()
+        manifest.run = run  # type: ignore
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, manifest),
+        )
+
+        await worker.run_task(params)
+
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert_task_state(final, "canceled")
+        assert not final.get("artifacts")
+
+    @pytest.mark.asyncio
+    async def test_cancel_before_final_write_is_kept(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that the final write itself skips a task canceled after the checkpoint."""
+        task, params = await self._submit(storage)
+        notifier = AsyncMock()
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, MockManifest(agent_fn=MockAgent())),
+            lifecycle_notifier=notifier,
+        )
+        save_checkpoint = storage.save_checkpoint
+
+        async def save_then_cancel(task_id, checkpoint):
+            saved = await save_checkpoint(task_id, checkpoint)
+            await storage.update_task(task_id, state="canceled")
+            return saved
+
+        with patch.object(storage, "save_checkpoint", side_effect=save_then_cancel):
+            await worker.run_task(params)
+
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert_task_state(final, "canceled")
+        assert not final.get("artifacts")
+        assert [c.args[2] for c in notifier.call_args_list] == ["working"]
+
+    @pytest.mark.asyncio
+    async def test_task_canceled_while_queued_is_skipped(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a run dequeued after its cancel neither executes nor fails."""
+        agent = MockAgent()
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, MockManifest(agent_fn=agent)),
+        )
+        task, params = await self._submit(storage)
+        await storage.update_task(task["id"], state="canceled")
+
+        await worker.run_task(params)
+
+        assert agent.call_count == 0
+        assert_task_state(await storage.load_task(task["id"]), "canceled")
+
+    @pytest.mark.asyncio
+    async def test_cancel_for_remote_task_is_broadcast(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test that a cancel for a task not running here reaches other workers."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+        )
+        task, _ = await self._submit(storage)
+        scheduler.broadcast_cancel = AsyncMock()
+
+        await worker.cancel_task({"task_id": task["id"]})
+
+        scheduler.broadcast_cancel.assert_awaited_once_with(task["id"])
+        assert_task_state(await storage.load_task(task["id"]), "canceled")
+
+    @pytest.mark.asyncio
+    async def test_broadcast_cancellation_aborts_local_task(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that the listener aborts a local task canceled by another worker."""
+        started = anyio.Event()
+        task, params = await self._submit(storage)
+
+        async def run(message_history):
+            started.set()
+            await anyio.sleep_forever()
+            yield "never"
+
+        async def receive_cancellations():
+            await started.wait()
+            yield task["id"]
+
+        manifest = MockManifest()
+        manifest.run = run  # type: ignore
+        scheduler.receive_cancellations = receive_cancellations  # type: ignore
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, manifest),
+            max_concurrent_tasks=2,
+        )
+
+        with anyio.fail_after(5):
+            async with worker.run():
+                await scheduler.run_task(params)
+                await started.wait()
+                while task["id"] in worker._running:
+                    await anyio.sleep(0.01)
+
+        # The owning worker only aborts; the canceling worker writes the state
+        assert_task_state(await storage.load_task(task["id"]), "working")
+
+
+def _manifest_worker(
+    storage: InMemoryStorage,
+    scheduler: InMemoryScheduler,
+    *,
+    agent: MockAgent | None = None,
+    run=None,
+    task_timeout: float | None = None,
+    history_cache: ContextHistoryCache | None = None,
+    context_history: bool = False,
+) -> ManifestWorker:
+    """Create a ManifestWorker around a MockManifest.
+
+    ``run`` replaces the manifest's handler; ``context_history`` turns on
+    context-based history, the path that consults ``history_cache``.
+    """
+    manifest = MockManifest(agent_fn=agent)
+    manifest.task_timeout = task_timeout
+    manifest.enable_context_based_history = context_history
+    if run is not None:
+        manifest.run = run
+    return ManifestWorker(
+        scheduler=scheduler,
+        storage=storage,
+        manifest=cast(AgentManifest, manifest),
+        history_cache=history_cache,
+    )
+
+
+class TestDeadlines:
+    """Test per-task execution deadlines."""
+
+    @staticmethod
+    async def _hang(message_history):
+        await anyio.sleep_forever()
+        yield "never"
+
+    @pytest.mark.asyncio
+    async def test_execution_past_deadline_fails(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a hung handler is stopped and the task failed with a reason."""
+        worker = _manifest_worker(storage, scheduler, run=self._hang)
+        task, params = await TestCooperativeCancellation._submit(storage)
+        params["deadline"] = time.time() + 0.05
+
+        with patch("bindu.server.workers.manifest_worker.deadline_exceeded") as counter:
+            with anyio.fail_after(5):
+                await worker.run_task(params)
+
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert_task_state(final, "failed")
+        assert final["metadata"]["failure_reason"] == "deadline_exceeded"
+        counter.add.assert_called_once_with(1, {"stage": "running"})
+
+    @pytest.mark.asyncio
+    async def test_expired_in_queue_is_dropped_before_start(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a task whose deadline passed while queued never runs."""
+        agent = MockAgent()
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, MockManifest(agent_fn=agent)),
+        )
+        task, params = await TestCooperativeCancellation._submit(storage)
+        params["deadline"] = time.time() - 1
+
+        with patch("bindu.server.workers.manifest_worker.deadline_exceeded") as counter:
+            await worker.run_task(params)
+
+        assert agent.call_count == 0
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert_task_state(final, "failed")
+        assert final["metadata"]["failure_reason"] == "deadline_exceeded"
+        counter.add.assert_called_once_with(1, {"stage": "queued"})
+
+    @pytest.mark.asyncio
+    async def test_agent_timeout_applies_without_deadline(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that the manifest task_timeout bounds runs scheduled without one."""
+        worker = _manifest_worker(storage, scheduler, run=self._hang, task_timeout=0.05)
+        task, params = await TestCooperativeCancellation._submit(storage)
+
+        with anyio.fail_after(5):
+            await worker.run_task(params)
+
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert final["metadata"]["failure_reason"] == "deadline_exceeded"
+
+    @pytest.mark.asyncio
+    async def test_threaded_handler_token_reports_deadline(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a blocked thread can see its deadline pass and stop."""
+        from bindu.utils.cancellation import current_cancellation_token
+        from bindu.utils.sync_executor import SyncExecutor
+
+        executor = SyncExecutor(max_threads=1)
+
+        def blocking_handler():
+            token = current_cancellation_token()
+            assert token is not None
+            token.raise_if_cancelled()
+            while not token.cancelled:
+                time.sleep(0.01)
+            token.raise_if_cancelled()
+
+        async def run(message_history):
+            yield await executor.run(blocking_handler)
+
+        worker = _manifest_worker(storage, scheduler, run=run, task_timeout=0.05)
+        task, params = await TestCooperativeCancellation._submit(storage)
+
+        with anyio.fail_after(5):
+            await worker.run_task(params)
+
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert final["metadata"]["failure_reason"] == "deadline_exceeded"
+
+    @pytest.mark.asyncio
+    async def test_blocking_sync_handler_hits_deadline(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a sync handler ignoring cancellation cannot outlive its deadline."""
+        from bindu.utils.sync_executor import SyncExecutor
+
+        executor = SyncExecutor(max_threads=1)
+        upstream = threading.Event()
+
+        async def run(message_history):
+            yield await executor.run(upstream.wait, 5)
+
+        worker = _manifest_worker(storage, scheduler, run=run, task_timeout=0.05)
+        task, params = await TestCooperativeCancellation._submit(storage)
+
+        try:
+            with anyio.fail_after(2):
+                await worker.run_task(params)
+
+            final = await storage.load_task(task["id"])
+            assert final is not None
+            assert final["metadata"]["failure_reason"] == "deadline_exceeded"
+            # The hung thread still holds its pool slot until it returns
+            assert executor.busy_threads() == 1
+        finally:
+            upstream.set()
+        with anyio.fail_after(2):
+            while executor.busy_threads():
+                await anyio.sleep(0.01)
+
+
+class TestCheckpointedPhases:
+    """Test that retries and redeliveries never re-run the agent."""
+
+    @pytest.fixture(autouse=True)
+    def fast_retries(self):
+        """Shrink worker retry backoff so retried phases run instantly."""
+        with (
+            patch.object(app_settings.retry, "worker_min_wait", 0.001),
+            patch.object(app_settings.retry, "worker_max_wait", 0.001),
+        ):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_persist_retry_does_not_rerun_agent(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a transient error writing the result retries only the write."""
+        agent = MockAgent(response="Done")
+        worker = _manifest_worker(storage, scheduler, agent=agent)
+        task, params = await TestCooperativeCancellation._submit(storage)
+        update_task = storage.update_task
+        failures = []
+
+        async def flaky_update(task_id, state, *args, **kwargs):
+            if state == "completed" and not failures:
+                failures.append(state)
+                raise ConnectionError("storage unavailable")
+            return await update_task(task_id, state, *args, **kwargs)
+
+        with patch.object(storage, "update_task", side_effect=flaky_update):
+            await worker.run_task(params)
+
+        assert agent.call_count == 1
+        assert failures == ["completed"]
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert_task_state(final, "completed")
+        assert await storage.load_checkpoint(task["id"]) is None
+
+    @pytest.mark.asyncio
+    async def test_landed_write_is_not_repeated_or_renotified(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that retrying a write whose error hid its success appends nothing."""
+        notifier = AsyncMock()
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, MockManifest(agent_fn=MockAgent("Done"))),
+            lifecycle_notifier=notifier,
+        )
+        task, params = await TestCooperativeCancellation._submit(storage)
+        update_task = storage.update_task
+        failures = []
+
+        async def lost_ack(task_id, state, *args, **kwargs):
+            updated = await update_task(task_id, state, *args, **kwargs)
+            if state == "completed" and not failures:
+                failures.append(state)
+                raise ConnectionError("connection lost after commit")
+            return updated
+
+        with (
+            patch.object(storage, "update_task", side_effect=lost_ack),
+            patch.object(storage, "load_task", wraps=storage.load_task) as load_task,
+        ):
+            await worker.run_task(params)
+
+        assert failures == ["completed"]
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert_task_state(final, "completed")
+        assert len(final["history"]) == 2
+        assert len(final["artifacts"]) == 1
+        states = [c.args[2] for c in notifier.call_args_list]
+        assert states == ["working", "completed"]
+        # Start of the run plus the check after the retried write matched nothing
+        assert load_task.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_result_write_needs_no_extra_load(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a run loads its task once; the writes check the state."""
+        worker = _manifest_worker(storage, scheduler, agent=MockAgent(response="Done"))
+        task, params = await TestCooperativeCancellation._submit(storage)
+
+        with patch.object(storage, "load_task", wraps=storage.load_task) as load_task:
+            await worker.run_task(params)
+
+        assert load_task.await_count == 1
+        assert_task_state(await storage.load_task(task["id"]), "completed")
+
+    @pytest.mark.asyncio
+    async def test_redelivery_resumes_from_checkpoint(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a working task with a checkpoint is persisted without execution."""
+        agent = MockAgent(response="Fresh")
+        worker = _manifest_worker(storage, scheduler, agent=agent)
+        task, params = await TestCooperativeCancellation._submit(storage)
+        checkpoint = {
+            "state": "completed",
+            "results": "Recorded",
+            "message_content": None,
+        }
+        await storage.update_task(task["id"], state="working")
+        assert await storage.save_checkpoint(task["id"], checkpoint)
+
+        await worker.run_task(params)
+
+        assert agent.call_count == 0
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert_task_state(final, "completed")
+        assert final["history"][-1]["parts"][0]["text"] == "Recorded"
+        assert await storage.load_checkpoint(task["id"]) is None
+
+    @pytest.mark.asyncio
+    async def test_settlement_is_not_repeated_on_resume(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a checkpointed settlement receipt is reused."""
+        worker = _manifest_worker(storage, scheduler, agent=MockAgent())
+        task, params = await TestCooperativeCancellation._submit(storage)
+        params["payment_context"] = {"payment_payload": {}, "payment_requirements": {}}  # type: ignore
+        receipt = {"x402.payment.status": "payment-completed"}
+        checkpoint = {
+            "state": "completed",
+            "results": "Paid",
+            "message_content": None,
+            "settlement": receipt,
+        }
+        await storage.update_task(task["id"], state="working")
+        assert await storage.save_checkpoint(task["id"], checkpoint)
+
+        with patch.object(worker, "_settle_payment", AsyncMock()) as settle:
+            await worker.run_task(params)
+
+        settle.assert_not_awaited()
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert final["metadata"] == receipt
+
+    @pytest.mark.asyncio
+    async def test_settlement_receipt_is_checkpointed_before_persisting(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that settlement runs once even when the final write fails."""
+        worker = _manifest_worker(storage, scheduler, agent=MockAgent(response="Paid"))
+        task, params = await TestCooperativeCancellation._submit(storage)
+        params["payment_context"] = {"payment_payload": {}, "payment_requirements": {}}  # type: ignore
+        receipt = {"x402.payment.status": "payment-completed"}
+
+        with (
+            patch.object(worker, "_settle_payment", AsyncMock(return_value=receipt)),
+            patch.object(
+                worker, "_handle_terminal_state", AsyncMock(side_effect=RuntimeError)
+            ),
+            patch.object(worker, "_handle_task_failure", AsyncMock()),
+            pytest.raises(RuntimeError),
+        ):
+            await worker.run_task(params)
+
+        stored = await storage.load_checkpoint(task["id"])
+        assert stored is not None
+        assert stored["settlement"] == receipt
+        assert stored["results"] == "Paid"
+        # The checkpoint never shows up in the task returned to clients
+        final = await storage.load_task(task["id"])
+        assert final is not None
+        assert "metadata" not in final
+
+
+class TestContextHistoryCache:
+    """Test the per-context conversation history cache."""
+
+    @staticmethod
+    def _recording_run(seen: list):
+        run = MockManifest(agent_fn=MockAgent(response="Reply")).run
+
+        def recording_run(message_history: list):
+            seen.append(list(message_history))
+            return run(message_history)
+
+        return recording_run
+
+    @staticmethod
+    async def _turn(storage: InMemoryStorage, worker: ManifestWorker, context_id, text):
+        message = create_test_message(text=text, context_id=context_id)
+        task = await storage.submit_task(context_id, message)
+        params = cast(
+            TaskSendParams,
+            {"task_id": task["id"], "context_id": context_id, "message": message},
+        )
+        await worker.run_task(params)
+        return task
+
+    @pytest.mark.asyncio
+    async def test_later_turns_reuse_cached_history(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that finished turns are served from the cache."""
+        cache = ContextHistoryCache(max_contexts=10)
+        seen: list = []
+        worker = _manifest_worker(
+            storage,
+            scheduler,
+            run=self._recording_run(seen),
+            history_cache=cache,
+            context_history=True,
+        )
+        context_id = uuid4()
+
+        with patch.object(
+            storage, "list_tasks_by_context", wraps=storage.list_tasks_by_context
+        ) as list_tasks:
+            await self._turn(storage, worker, context_id, "First")
+            await self._turn(storage, worker, context_id, "Second")
+            await self._turn(storage, worker, context_id, "Third")
+
+        assert list_tasks.await_count == 1
+        contents = [m["content"] for m in seen[-1] if m["role"] != "system"]
+        assert contents == ["First", "Reply", "Second", "Reply", "Third"]
+        entry = cache.get(context_id)
+        assert entry is not None
+        assert len(entry.task_ids) == 3
+
+    @pytest.mark.asyncio
+    async def test_cold_cache_rebuilds_from_finished_tasks(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that a miss rebuilds history once and excludes open tasks."""
+        context_id = uuid4()
+        done = create_test_message(text="Done", context_id=context_id)
+        done_task = await storage.submit_task(context_id, done)
+        await storage.update_task(done_task["id"], state="completed")
+        pending = create_test_message(text="Pending", context_id=context_id)
+        await storage.submit_task(context_id, pending)
+
+        cache = ContextHistoryCache(max_contexts=10)
+        seen: list = []
+        worker = _manifest_worker(
+            storage,
+            scheduler,
+            run=self._recording_run(seen),
+            history_cache=cache,
+            context_history=True,
+        )
+        await self._turn(storage, worker, context_id, "Now")
+
+        contents = [m["content"] for m in seen[-1] if m["role"] != "system"]
+        assert contents == ["Done", "Now"]
+
+    @pytest.mark.asyncio
+    async def test_backfill_writes_the_full_context_history(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that backfilling is not truncated to the agent's history budget."""
+        context_id = uuid4()
+        for text in ("One", "Two", "Three"):
+            message = create_test_message(text=text, context_id=context_id)
+            task = await storage.submit_task(context_id, message)
+            await storage.update_task(task["id"], state="completed")
+
+        worker = _manifest_worker(
+            storage,
+            scheduler,
+            history_cache=ContextHistoryCache(max_contexts=10),
+            context_history=True,
+        )
+        worker.manifest.num_history_sessions = 1
+
+        with (
+            patch.object(storage, "load_context_history", AsyncMock(return_value=[])),
+            patch.object(storage, "append_to_contexts", AsyncMock()) as append,
+            patch.object(app_settings.agent, "history_max_messages", 1),
+        ):
+            entry = await worker._load_context_history(context_id)
+
+        assert append.await_args is not None
+        backfilled = append.await_args.args[1]
+        assert [m["parts"][0]["text"] for m in backfilled] == ["One", "Two", "Three"]
+        assert len(entry.task_ids) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_turn_is_recorded(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that tasks ending in failure join the context history."""
+        cache = ContextHistoryCache(max_contexts=10)
+        worker = _manifest_worker(
+            storage,
+            scheduler,
+            run=self._recording_run([]),
+            history_cache=cache,
+            context_history=True,
+        )
+        context_id = uuid4()
+        message = create_test_message(text="Boom", context_id=context_id)
+        submitted = await storage.submit_task(context_id, message)
+        task = await storage.load_task(submitted["id"])
+        assert task is not None
+        cache.put(context_id, ContextHistory())
+
+        await worker._handle_task_failure(task, "agent crashed")
+
+        entry = cache.get(context_id)
+        assert entry is not None
+        assert str(task["id"]) in entry.task_ids
+        assert entry.messages[0]["content"] == "Boom"
+        assert "agent crashed" in entry.messages[-1]["content"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("cached", [True, False])
+    async def test_history_is_limited_to_recent_sessions(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        cached: bool,
+    ):
+        """Test that num_history_sessions caps the prior tasks sent."""
+        cache = ContextHistoryCache(max_contexts=10) if cached else None
+        seen: list = []
+        worker = _manifest_worker(
+            storage,
+            scheduler,
+            run=self._recording_run(seen),
+            history_cache=cache,
+            context_history=True,
+        )
+        worker.manifest.num_history_sessions = 1
+        context_id = uuid4()
+
+        await self._turn(storage, worker, context_id, "First")
+        await self._turn(storage, worker, context_id, "Second")
+        await self._turn(storage, worker, context_id, "Third")
+
+        contents = [m["content"] for m in seen[-1] if m["role"] != "system"]
+        assert contents == ["Second", "Reply", "Third"]
+
+    @pytest.mark.asyncio
+    async def test_history_is_limited_by_messages(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that history_max_messages trims prior messages only."""
+        seen: list = []
+        worker = _manifest_worker(
+            storage,
+            scheduler,
+            run=self._recording_run(seen),
+            history_cache=ContextHistoryCache(),
+            context_history=True,
+        )
+        context_id = uuid4()
+
+        with patch.object(app_settings.agent, "history_max_messages", 1):
+            await self._turn(storage, worker, context_id, "First")
+            await self._turn(storage, worker, context_id, "Second")
+
+        contents = [m["content"] for m in seen[-1] if m["role"] != "system"]
+        assert contents == ["Reply", "Second"]
+
+    def test_tail_returns_recent_tasks(self):
+        """Test that ContextHistory.tail cuts at task boundaries."""
+        entry = ContextHistory()
+        entry.add(uuid4(), [{"role": "user", "content": "a"}])
+        entry.add(
+            uuid4(),
+            [{"role": "user", "content": "b"}, {"role": "assistant", "content": "c"}],
+        )
+
+        assert [m["content"] for m in entry.tail(1)] == ["b", "c"]
+        assert len(entry.tail(5)) == 3
+        assert len(entry.tail()) == 3
+
+    def test_cache_evicts_least_recently_used_context(self):
+        """Test LRU eviction over contexts."""
+        cache = ContextHistoryCache(max_contexts=2)
+        first, second, third = uuid4(), uuid4(), uuid4()
+        cache.put(first, ContextHistory())
+        cache.put(second, ContextHistory())
+        cache.get(first)
+        cache.put(third, ContextHistory())
+
+        assert cache.get(second) is None
+        assert cache.get(first) is not None
+        assert len(cache) == 2
+
+    def test_append_skips_uncached_and_duplicate_tasks(self):
+        """Test that append only extends cached contexts, once per task."""
+        cache = ContextHistoryCache(max_contexts=2)
+        context_id, task_id = uuid4(), uuid4()
+        reply = [{"role": "assistant", "content": "Hi"}]
+
+        assert not cache.append(context_id, task_id, reply)
+        cache.put(context_id, ContextHistory())
+        assert cache.append(context_id, task_id, reply)
+        assert not cache.append(context_id, task_id, reply)
+        entry = cache.get(context_id)
+        assert entry is not None
+        assert entry.messages == reply
+
+        cache.invalidate(context_id)
+        assert cache.get(context_id) is None
+
+
+async def _gather_batched(batcher, items):
+    """Submit items concurrently while the batcher runs in a task group."""
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(batcher.run)
+        await anyio.sleep(0)
+        results = await asyncio.gather(
+            *(batcher.submit(item) for item in items), return_exceptions=True
+        )
+        tg.cancel_scope.cancel()
+    return results
+
+
+async def _task_state(storage, task_id):
+    """Reload a task and return its current state."""
+    task = await storage.load_task(task_id)
+    assert task is not None
+    return task["status"]["state"]
+
+
+class TestMicroBatching:
+    """Test micro-batched execution for batch handlers."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submissions_share_one_call(self):
+        """Test that inputs arriving together are sent in one batch."""
+        calls: list = []
+
+        async def run_batch(items):
+            calls.append(list(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(run_batch, max_batch_size=8, max_wait=0.05)
+        results = await _gather_batched(batcher, range(3))
+
+        assert results == [0, 2, 4]
+        assert calls == [[0, 1, 2]]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_is_sent_without_waiting(self):
+        """Test that reaching max_batch_size flushes immediately."""
+        calls: list = []
+
+        async def run_batch(items):
+            calls.append(list(items))
+            return items
+
+        batcher = MicroBatcher(run_batch, max_batch_size=2, max_wait=60)
+        with anyio.fail_after(1):
+            results = await _gather_batched(batcher, range(4))
+
+        assert results == [0, 1, 2, 3]
+        assert calls == [[0, 1], [2, 3]]
+
+    @pytest.mark.asyncio
+    async def test_returned_exception_fails_only_its_input(self):
+        """Test per-input failures."""
+
+        async def run_batch(items):
+            return [ValueError("bad") if item == "bad" else item for item in items]
+
+        batcher = MicroBatcher(run_batch, max_batch_size=8, max_wait=0.01)
+        results = await _gather_batched(batcher, ["ok", "bad"])
+
+        assert results[0] == "ok"
+        assert isinstance(results[1], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_submit_requires_running_batcher(self):
+        """Test that submissions fail fast when run() is not running."""
+
+        async def run_batch(items):
+            return items
+
+        batcher = MicroBatcher(run_batch)
+        with pytest.raises(RuntimeError, match="not running"):
+            await batcher.submit("x")
+
+    @pytest.mark.asyncio
+    async def test_worker_fans_batch_results_out_to_tasks(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test one handler call serving several tasks with their own states."""
+        calls: list = []
+
+        async def run_batch(histories):
+            calls.append(len(histories))
+            replies = []
+            for history in histories:
+                text = history[-1]["content"]
+                if text == "vague":
+                    replies.append({"state": "input-required", "prompt": "Which?"})
+                else:
+                    replies.append(f"done: {text}")
+            return replies
+
+        manifest = MockManifest()
+        manifest.run_batch = run_batch  # type: ignore
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, manifest),
+        )
+
+        tasks = []
+        for text in ("first", "vague", "second"):
+            message = create_test_message(text=text)
+            tasks.append(await storage.submit_task(message["context_id"], message))
+
+        with patch.object(app_settings.worker, "batch_max_wait", 0.05):
+            async with worker.run():
+                await scheduler.run_tasks(
+                    [
+                        {"task_id": task["id"], "context_id": task["context_id"]}
+                        for task in tasks
+                    ]
+                )
+                with anyio.fail_after(5):
+                    while True:
+                        states = [
+                            await _task_state(storage, task["id"]) for task in tasks
+                        ]
+                        if not {"submitted", "working"} & set(states):
+                            break
+                        await anyio.sleep(0.01)
+
+        assert calls == [3]
+        states = [await _task_state(storage, task["id"]) for task in tasks]
+        assert states == ["completed", "input-required", "completed"]
+        done = await storage.load_task(tasks[2]["id"])
+        assert done is not None
+        assert done["history"][-1]["parts"][0]["text"] == "done: second"
+
+    @pytest.mark.asyncio
+    async def test_create_manifest_accepts_batch_handler(self):
+        """Test run_batch and the single-history run fallback."""
+        from bindu.penguin.manifest import create_manifest, validate_agent_function
+
+        async def handler(messages_batch):
+            return [f"n={len(messages)}" for messages in messages_batch]
+
+        validate_agent_function(handler)
+        manifest = create_manifest(
+            agent_function=handler,
+            id=uuid4(),
+            did_extension=MagicMock(),
+            name="batch-agent",
+            description=None,
+            skills=None,
+            capabilities=None,
+            agent_trust=None,
+            version="1.0.0",
+            url="http://localhost:3773",
+        )
+
+        assert manifest.run_batch is not None
+        assert await manifest.run_batch([[{}], [{}, {}]]) == ["n=1", "n=2"]
+        assert manifest.run is not None
+        assert [c async for c in manifest.run([{}, {}, {}])] == ["n=3"]
+
+    def test_streaming_batch_handler_is_rejected(self):
+        """Test that batch handlers must return a list."""
+        from bindu.penguin.manifest import validate_agent_function
+
+        def handler(messages_batch):
+            yield from messages_batch
+
+        with pytest.raises(ValueError, match="must return a list"):
+            validate_agent_function(handler)
+
+
+async def _run_text(worker, storage, text):
+    """Submit a one-message task with the given text, run it and reload it."""
+    message = create_test_message(text=text)
+    task = await storage.submit_task(message["context_id"], message)
+    await worker.run_task(
+        cast(
+            TaskSendParams,
+            {"task_id": task["id"], "context_id": task["context_id"]},
+        )
+    )
+    return await storage.load_task(task["id"])
+
+
+class TestResponseCache:
+    """Test the exact-match response cache."""
+
+    def test_key_depends_on_content_agent_and_version(self):
+        """Test that keys are stable, normalized, versioned and per agent."""
+        history = [{"role": "user", "content": "hello"}]
+        did = "did:bindu:alice:agent"
+
+        key = response_cache_key(history, "1.0.0", did)
+
+        assert key == response_cache_key(
+            [{"content": " hello\n", "role": "user", "extra": 1}], "1.0.0", did
+        )
+        assert key != response_cache_key(history, "1.0.1", did)
+        assert key != response_cache_key(history, "1.0.0", "did:bindu:bob:agent")
+        assert key != response_cache_key(
+            [{"role": "user", "content": "hi"}], "1.0.0", did
+        )
+
+    @pytest.mark.asyncio
+    async def test_memory_cache_evicts_least_recently_used(self):
+        """Test LRU eviction once max_entries is exceeded."""
+        cache = InMemoryResponseCache(max_entries=2, ttl=None)
+        await cache.set("a", "A")
+        await cache.set("b", "B")
+        await cache.get("a")
+        await cache.set("c", "C")
+
+        assert await cache.get("a") == "A"
+        assert await cache.get("b") is None
+        assert await cache.get("c") == "C"
+
+    @pytest.mark.asyncio
+    async def test_memory_cache_expires_entries(self):
+        """Test that entries are dropped after their TTL."""
+        cache = InMemoryResponseCache(max_entries=10, ttl=5)
+        await cache.set("a", {"answer": 42})
+
+        with patch("time.monotonic", return_value=time.monotonic() + 10):
+            assert await cache.get("a") is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_hit_completes_task_without_calling_agent(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that an identical conversation reuses the completed result."""
+        agent = MockAgent(response="cached answer")
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, MockManifest(agent_fn=agent)),
+            response_cache=InMemoryResponseCache(),
+        )
+
+        first = await _run_text(worker, storage, "What is 2 + 2?")
+        second = await _run_text(worker, storage, "What is 2 + 2?")
+        third = await _run_text(worker, storage, "What is 3 + 3?")
+
+        assert agent.call_count == 2
+        for task in (first, second, third):
+            assert_task_state(task, "completed")
+        assert second["artifacts"][0]["parts"] == first["artifacts"][0]["parts"]
+        assert (
+            second["artifacts"][0]["artifact_id"]
+            != first["artifacts"][0]["artifact_id"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_only_completed_results_are_cached(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that input-required responses are not reused."""
+        agent = MockAgent(response="Which one?", response_type="input-required")
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, MockManifest(agent_fn=agent)),
+            response_cache=InMemoryResponseCache(),
+        )
+
+        await _run_text(worker, storage, "Book a flight")
+        await _run_text(worker, storage, "Book a flight")
+
+        assert agent.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_backend_errors_fall_back_to_agent(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that an unavailable cache never fails the task."""
+        cache = MagicMock()
+        cache.get = AsyncMock(side_effect=ConnectionError("down"))
+        cache.set = AsyncMock(side_effect=ConnectionError("down"))
+        agent = MockAgent(response="fresh")
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, MockManifest(agent_fn=agent)),
+            response_cache=cache,
+        )
+
+        task = await _run_text(worker, storage, "hello")
+
+        assert_task_state(task, "completed")
+        assert agent.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_cache_round_trip(self):
+        """Test JSON storage, TTL and LRU bookkeeping in the Redis backend."""
+        set_script = AsyncMock(return_value=[])
+        client = AsyncMock()
+        client.register_script = MagicMock(return_value=set_script)
+        client.get = AsyncMock(return_value=b'{"answer":42}')
+
+        cache = RedisResponseCache(
+            "redis://localhost:6379/0", max_entries=50, ttl=60, prefix="test:rc"
+        )
+        with patch("redis.asyncio.from_url", return_value=client):
+            async with cache:
+                await cache.set("k", {"answer": 42})
+                assert await cache.get("k") == {"answer": 42}
+
+        kwargs = set_script.call_args.kwargs
+        assert kwargs["keys"] == ["test:rc:k", "test:rc:lru"]
+        assert kwargs["args"][0] == b'{"answer":42}'
+        assert kwargs["args"][1] == 60000
+        assert kwargs["args"][3] == 50
+        client.get.assert_awaited_once_with("test:rc:k")
+        client.zadd.assert_awaited_once()
+        client.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_redis_cache_deletes_evicted_values_outside_the_script(self):
+        """Test that values evicted from the LRU index are deleted client-side."""
+        set_script = AsyncMock(return_value=[b"test:rc:old1", b"test:rc:old2"])
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=None)
+        client = AsyncMock()
+        client.register_script = MagicMock(return_value=set_script)
+        client.pipeline = MagicMock(return_value=pipe)
+
+        cache = RedisResponseCache(
+            "redis://localhost:6379/0", max_entries=1, ttl=60, prefix="test:rc"
+        )
+        with patch("redis.asyncio.from_url", return_value=client):
+            async with cache:
+                await cache.set("k", {"answer": 42})
+
+        assert "DEL" not in _SET_SCRIPT
+        assert [c.args for c in pipe.delete.call_args_list] == [
+            ("test:rc:old1",),
+            ("test:rc:old2",),
+        ]
+        pipe.execute.assert_awaited_once()
+
+
+class TestStreamingEvents:
+    """Test the events a worker publishes for streaming clients."""
+
+    @staticmethod
+    async def _run_streamed(storage, scheduler, stream: bool) -> list[dict]:
+        async def run(message_history):
+            yield "Hel"
+            yield ""
+            yield "Hello"
+
+        manifest = MockManifest()
+        manifest.run = run  # type: ignore
+        bus = InMemoryTaskEventBus()
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, manifest),
+            event_bus=bus,
+        )
+        message = create_test_message(text="Say hello")
+        task = await storage.submit_task(message["context_id"], message)
+        subscription = await bus.subscribe(task["id"])
+
+        await worker.run_task(
+            {
+                "task_id": task["id"],
+                "context_id": task["context_id"],
+                "metadata": {"stream": stream},
+            }
+        )
+
+        events = []
+        while (event := await subscription.get(timeout=0.01)) is not None:
+            events.append(event)
+        return events
+
+    @pytest.mark.asyncio
+    async def test_chunks_share_the_result_artifact_id(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test chunk events, then the final artifact and status."""
+        events = await self._run_streamed(storage, scheduler, stream=True)
+
+        assert [e["kind"] for e in events] == [
+            "status-update",
+            "artifact-update",
+            "artifact-update",
+            "artifact-update",
+            "status-update",
+        ]
+        working, first, second, final_artifact, completed = events
+        assert working["status"]["state"] == "working"
+        assert not working["final"]
+        assert first["artifact"]["parts"] == [{"kind": "text", "text": "Hel"}]
+        assert (first["append"], second["append"]) == (False, True)
+        assert final_artifact["last_chunk"]
+        assert completed["status"]["state"] == "completed"
+        assert completed["final"]
+        assert len({e["artifact"]["artifact_id"] for e in events[1:4]}) == 1
+
+        stored = await storage.load_task(working["task_id"])
+        assert stored is not None
+        assert (
+            stored["artifacts"][0]["artifact_id"]
+            == final_artifact["artifact"]["artifact_id"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_unstreamed_task_publishes_status_and_result(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test that chunks are only published for streamed tasks."""
+        events = await self._run_streamed(storage, scheduler, stream=False)
+
+        assert [(e["kind"], e.get("last_chunk")) for e in events] == [
+            ("status-update", None),
+            ("artifact-update", True),
+            ("status-update", None),
+        ]
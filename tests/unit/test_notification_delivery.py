@@ -0,0 +1,640 @@
+"""Unit tests for background push notification delivery."""
+
+import asyncio
+from typing import cast
+from unittest.mock import AsyncMock, patch
+from urllib.parse import urlparse
+from uuid import uuid4
+
+import anyio
+import httpx
+import pytest
+
+from bindu.common.models import AgentManifest
+from bindu.common.protocol.types import PushNotificationConfig
+from bindu.server.notifications import (
+    NotificationDeliveryQueue,
+    OutboxDispatcher,
+    PushNotificationManager,
+)
+from bindu.server.storage.memory_storage import InMemoryStorage
+from bindu.settings import app_settings
+from bindu.utils.notifications import (
+    NotificationCircuitOpenError,
+    NotificationDeliveryError,
+    NotificationService,
+    coalesce_events,
+)
+from tests.mocks import MockManifest
+
+CONFIG = cast(
+    PushNotificationConfig, {"id": str(uuid4()), "url": "http://hooks.test/a"}
+)
+
+
+async def _wait_for(condition, timeout: float = 1.0) -> None:
+    """Poll until condition() is true."""
+    with anyio.fail_after(timeout):
+        while not condition():
+            await asyncio.sleep(0.005)
+
+
+def _push_manifest() -> AgentManifest:
+    return cast(AgentManifest, MockManifest(capabilities={"push_notifications": True}))
+
+
+class TestNotificationDeliveryQueue:
+    """Test ordering, concurrency and accounting of the delivery queue."""
+
+    @pytest.mark.asyncio
+    async def test_events_of_a_task_are_delivered_in_order(self):
+        """Test per-task FIFO delivery with several delivery tasks."""
+        delivered: list[int] = []
+
+        async def deliver(config, event):
+            await asyncio.sleep(0.001 * (5 - event["sequence"]))
+            delivered.append(event["sequence"])
+            return True
+
+        task_id = uuid4()
+        async with NotificationDeliveryQueue(deliver, concurrency=4) as queue:
+            for sequence in range(1, 6):
+                queue.enqueue(task_id, CONFIG, {"sequence": sequence})
+
+        assert delivered == [1, 2, 3, 4, 5]
+        assert queue.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_task_does_not_block_other_tasks(self):
+        """Test that tasks are delivered concurrently."""
+        release = asyncio.Event()
+        delivered: list[str] = []
+
+        async def deliver(config, event):
+            if event["name"] == "slow":
+                await release.wait()
+            delivered.append(event["name"])
+            return True
+
+        async with NotificationDeliveryQueue(deliver, concurrency=2) as queue:
+            queue.enqueue(uuid4(), CONFIG, {"name": "slow"})
+            queue.enqueue(uuid4(), CONFIG, {"name": "fast"})
+            for _ in range(10):
+                await asyncio.sleep(0)
+            assert delivered == ["fast"]
+            release.set()
+
+        assert delivered == ["fast", "slow"]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_and_counts_overflow(self):
+        """Test the bound on pending events."""
+        queue = NotificationDeliveryQueue(AsyncMock(return_value=True), max_pending=2)
+        task_id = uuid4()
+
+        assert queue.enqueue(task_id, CONFIG, {"sequence": 1})
+        assert queue.enqueue(task_id, CONFIG, {"sequence": 2})
+        assert not queue.enqueue(task_id, CONFIG, {"sequence": 3})
+        assert queue.overflow_count == 1
+        assert queue.pending == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_deliveries_are_counted_as_dropped(self):
+        """Test that failures do not stop the queue."""
+        deliver = AsyncMock(side_effect=[False, RuntimeError("boom"), True])
+
+        async with NotificationDeliveryQueue(deliver, concurrency=1) as queue:
+            for sequence in range(3):
+                queue.enqueue(uuid4(), CONFIG, {"sequence": sequence})
+
+        assert deliver.await_count == 3
+        assert queue.dropped_count == 2
+
+    @pytest.mark.asyncio
+    async def test_shutdown_gives_up_after_timeout(self):
+        """Test that a hung endpoint cannot block shutdown."""
+
+        async def deliver(config, event):
+            await asyncio.sleep(60)
+            return True
+
+        queue = NotificationDeliveryQueue(deliver, shutdown_timeout=0.05)
+        async with queue:
+            queue.enqueue(uuid4(), CONFIG, {"sequence": 1})
+
+        assert not queue.running
+
+    @pytest.mark.asyncio
+    async def test_slow_host_is_capped_per_host(self):
+        """Test that one host cannot occupy every delivery task."""
+        release = asyncio.Event()
+        in_flight: dict[str, int] = {}
+        peak: dict[str, int] = {}
+        other = cast(PushNotificationConfig, {**CONFIG, "url": "http://other.test/"})
+
+        async def deliver(config, event):
+            host = config["url"]
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+            if host == CONFIG["url"]:
+                await release.wait()
+            in_flight[host] -= 1
+            return True
+
+        async with NotificationDeliveryQueue(
+            deliver, concurrency=4, max_per_host=2
+        ) as queue:
+            for _ in range(4):
+                queue.enqueue(uuid4(), CONFIG, {"name": "slow"})
+            queue.enqueue(uuid4(), other, {"name": "fast"})
+            await _wait_for(lambda: peak.get(other["url"]) == 1)
+            assert queue.stats()["in_flight_by_host"] == {"hooks.test": 2}
+            assert queue.stats()["waiting_by_host"] == {"hooks.test": 2}
+            release.set()
+
+        assert peak[CONFIG["url"]] == 2
+        assert queue.pending == 0
+
+
+class TestBatchedDelivery:
+    """Test coalescing events of one subscriber into a single request."""
+
+    @pytest.mark.asyncio
+    async def test_events_within_the_window_share_a_request(self):
+        """Test that a fast task's burst and other tasks are batched."""
+        batches: list[list[dict]] = []
+
+        async def deliver_many(config, events):
+            batches.append(events)
+            return True
+
+        first, second = uuid4(), uuid4()
+        async with NotificationDeliveryQueue(
+            AsyncMock(return_value=True),
+            deliver_many=deliver_many,
+            batch_window=0.05,
+        ) as queue:
+            queue.enqueue(first, CONFIG, {"task_id": "a", "sequence": 1})
+            await asyncio.sleep(0.01)
+            queue.enqueue(second, CONFIG, {"task_id": "b", "sequence": 1})
+            queue.enqueue(first, CONFIG, {"task_id": "a", "sequence": 2})
+
+        assert batches == [
+            [
+                {"task_id": "a", "sequence": 1},
+                {"task_id": "a", "sequence": 2},
+                {"task_id": "b", "sequence": 1},
+            ]
+        ]
+        assert queue.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_subscribers_get_separate_batches(self):
+        """Test grouping by webhook URL."""
+        batches: dict[str, int] = {}
+
+        async def deliver_many(config, events):
+            batches[config["url"]] = len(events)
+            return False
+
+        other = cast(PushNotificationConfig, {**CONFIG, "url": "http://other.test/"})
+        async with NotificationDeliveryQueue(
+            AsyncMock(return_value=True),
+            deliver_many=deliver_many,
+            batch_window=0.01,
+        ) as queue:
+            queue.enqueue(uuid4(), CONFIG, {"sequence": 1})
+            queue.enqueue(uuid4(), CONFIG, {"sequence": 1})
+            queue.enqueue(uuid4(), other, {"sequence": 1})
+
+        assert batches == {"http://hooks.test/a": 2, "http://other.test/": 1}
+        assert queue.dropped_count == 3
+
+    @pytest.mark.asyncio
+    async def test_batches_respect_max_per_host(self):
+        """Test that each batch request takes a slot of its webhook host."""
+        release = asyncio.Event()
+        in_flight: dict[str, int] = {}
+        peak: dict[str, int] = {}
+        delivered: list[str] = []
+        second = cast(PushNotificationConfig, {**CONFIG, "url": "http://hooks.test/b"})
+        other = cast(PushNotificationConfig, {**CONFIG, "url": "http://other.test/"})
+
+        async def deliver_many(config, events):
+            host = urlparse(config["url"]).netloc
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+            if host == "hooks.test":
+                await release.wait()
+            in_flight[host] -= 1
+            delivered.append(config["url"])
+            return True
+
+        async with NotificationDeliveryQueue(
+            AsyncMock(return_value=True),
+            concurrency=4,
+            max_per_host=1,
+            deliver_many=deliver_many,
+            batch_window=0.01,
+        ) as queue:
+            queue.enqueue(uuid4(), CONFIG, {"sequence": 1})
+            queue.enqueue(uuid4(), second, {"sequence": 1})
+            queue.enqueue(uuid4(), other, {"sequence": 1})
+            await _wait_for(lambda: other["url"] in delivered)
+            assert queue.stats()["in_flight_by_host"] == {"hooks.test": 1}
+            assert queue.stats()["waiting_by_host"] == {"hooks.test": 1}
+            release.set()
+
+        assert peak["hooks.test"] == 1
+        assert sorted(delivered) == sorted([CONFIG["url"], second["url"], other["url"]])
+        assert queue.pending == 0
+
+    def test_coalesce_orders_by_task_and_sequence(self):
+        """Test ordering and collapsing of intermediate states."""
+        events = [
+            {"task_id": "a", "sequence": 2, "final": False},
+            {"task_id": "b", "sequence": 1, "final": False},
+            {"task_id": "a", "sequence": 1, "final": False},
+            {"task_id": "a", "sequence": 3, "final": True},
+        ]
+
+        assert [(e["task_id"], e["sequence"]) for e in coalesce_events(events)] == [
+            ("a", 1),
+            ("a", 2),
+            ("a", 3),
+            ("b", 1),
+        ]
+        assert [
+            (e["task_id"], e["sequence"])
+            for e in coalesce_events(events, collapse_intermediate=True)
+        ] == [("a", 3), ("b", 1)]
+
+    @pytest.mark.asyncio
+    async def test_outbox_acknowledges_a_batch_together(self):
+        """Test that a batched outbox delivery settles every event."""
+        storage = InMemoryStorage()
+        service = NotificationService()
+        service.send_events = AsyncMock()
+        for task in ("a", "b"):
+            await storage.enqueue_notification(
+                uuid4(), CONFIG, {"event_id": task, "task_id": task, "sequence": 1}
+            )
+
+        dispatcher = OutboxDispatcher(
+            storage, service, poll_interval=0.01, batch_window=0.02
+        )
+        async with dispatcher:
+            await _wait_for(lambda: not storage.outbox)
+
+        service.send_events.assert_awaited_once()
+        assert service.send_events.await_args is not None
+        assert len(service.send_events.await_args.args[1]) == 2
+
+
+class TestPushNotificationManagerDelivery:
+    """Test that lifecycle notifications only enqueue."""
+
+    @pytest.mark.asyncio
+    async def test_notify_lifecycle_does_not_wait_for_delivery(self):
+        """Test that a slow webhook does not block the notifier."""
+        release = asyncio.Event()
+        sent: list[dict] = []
+
+        async def send_event(config, event):
+            await release.wait()
+            sent.append(event)
+
+        manager = PushNotificationManager(
+            manifest=cast(
+                AgentManifest, MockManifest(capabilities={"push_notifications": True})
+            )
+        )
+        manager.notification_service.send_event = send_event  # type: ignore
+        task_id = uuid4()
+        await manager.register_push_config(task_id, CONFIG)
+
+        async with manager:
+            await asyncio.wait_for(
+                manager.notify_lifecycle(task_id, uuid4(), "working", False), 0.1
+            )
+            await manager.notify_lifecycle(task_id, uuid4(), "completed", True)
+            assert sent == []
+            release.set()
+            await _wait_for(lambda: len(sent) == 2)
+
+        assert [event["status"]["state"] for event in sent] == ["working", "completed"]
+        assert [event["sequence"] for event in sent] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_inline_delivery_when_queue_disabled(self):
+        """Test that a queue size of 0 keeps inline delivery."""
+        manager = PushNotificationManager(
+            manifest=cast(
+                AgentManifest, MockManifest(capabilities={"push_notifications": True})
+            )
+        )
+        manager.notification_service.send_event = AsyncMock(
+            side_effect=NotificationDeliveryError(503, "unavailable")
+        )
+        task_id = uuid4()
+        await manager.register_push_config(task_id, CONFIG)
+
+        with (
+            patch.object(app_settings.notifications, "outbox_enabled", False),
+            patch.object(app_settings.notifications, "delivery_queue_size", 0),
+        ):
+            async with manager:
+                assert manager.delivery_queue is None
+                await manager.notify_lifecycle(task_id, uuid4(), "failed", True)
+
+        manager.notification_service.send_event.assert_awaited_once()
+
+
+class TestOutboxDelivery:
+    """Test durable delivery through the storage outbox."""
+
+    @pytest.mark.asyncio
+    async def test_any_replica_delivers_for_a_config_registered_elsewhere(self):
+        """Test that configs and events are shared through storage."""
+        storage = InMemoryStorage()
+        sent: list[dict] = []
+
+        async def send_event(config, event):
+            sent.append(event)
+
+        registering = PushNotificationManager(
+            manifest=_push_manifest(), storage=storage
+        )
+        running = PushNotificationManager(manifest=_push_manifest(), storage=storage)
+        running.notification_service.send_event = send_event  # type: ignore
+        task_id = uuid4()
+        await registering.register_push_config(task_id, CONFIG)
+
+        async with running:
+            assert running.dispatcher is not None
+            await running.notify_lifecycle(task_id, uuid4(), "working", False)
+            await running.notify_lifecycle(task_id, uuid4(), "completed", True)
+            await _wait_for(lambda: len(sent) == 2)
+
+        assert [event["sequence"] for event in sent] == [1, 2]
+        assert storage.outbox == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_delivery_is_retried_in_order(self):
+        """Test backoff retries that hold back the task's later events."""
+        storage = InMemoryStorage()
+        service = NotificationService()
+        attempts: list[int] = []
+
+        async def send_event(config, event):
+            attempts.append(event["sequence"])
+            if len(attempts) == 1:
+                raise NotificationDeliveryError(503, "busy")
+
+        service.send_event = send_event  # type: ignore
+        task_id = uuid4()
+        for sequence in (1, 2):
+            await storage.enqueue_notification(
+                task_id, CONFIG, {"event_id": f"e{sequence}", "sequence": sequence}
+            )
+
+        dispatcher = OutboxDispatcher(
+            storage, service, poll_interval=0.01, base_backoff=0.01
+        )
+        async with dispatcher:
+            await _wait_for(lambda: not storage.outbox)
+
+        assert attempts == [1, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_abandoned(self):
+        """Test that a rejected event is removed without retrying."""
+        storage = InMemoryStorage()
+        service = NotificationService()
+        service.send_event = AsyncMock(
+            side_effect=NotificationDeliveryError(410, "gone")
+        )
+        await storage.enqueue_notification(uuid4(), CONFIG, {"event_id": "e1"})
+
+        dispatcher = OutboxDispatcher(storage, service, poll_interval=0.01)
+        async with dispatcher:
+            await _wait_for(lambda: not storage.outbox)
+
+        service.send_event.assert_awaited_once()
+
+    def test_retry_delay_is_exponential_and_capped(self):
+        """Test the backoff schedule."""
+        dispatcher = OutboxDispatcher(
+            InMemoryStorage(), NotificationService(), base_backoff=1, max_backoff=5
+        )
+
+        assert [dispatcher.retry_delay(n) for n in (1, 2, 3, 4)] == [1, 2, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_defers_retry_until_cool_down(self):
+        """Test that events for an open circuit wait out the cool-down."""
+        storage = InMemoryStorage()
+        service = NotificationService()
+        service.send_event = AsyncMock(
+            side_effect=NotificationCircuitOpenError("hooks.test", 30.0)
+        )
+        await storage.enqueue_notification(uuid4(), CONFIG, {"event_id": "e1"})
+        dispatcher = OutboxDispatcher(storage, service, poll_interval=0.01)
+
+        with patch.object(storage, "retry_notification") as retry:
+            async with dispatcher:
+                await _wait_for(lambda: retry.await_count == 1)
+
+        retry.assert_awaited_once_with("e1", 30.0, count_attempt=False)
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_never_abandons_events(self):
+        """Test that circuit-open deferrals do not use up delivery attempts."""
+        storage = InMemoryStorage()
+        service = NotificationService()
+        send_event = AsyncMock(
+            side_effect=NotificationCircuitOpenError("hooks.test", 0.02)
+        )
+        service.send_event = send_event
+        await storage.enqueue_notification(uuid4(), CONFIG, {"event_id": "e1"})
+        dispatcher = OutboxDispatcher(
+            storage, service, poll_interval=0.01, base_backoff=0.01, max_attempts=2
+        )
+
+        async with dispatcher:
+            await _wait_for(lambda: send_event.await_count >= 3)
+
+        assert storage.outbox["e1"]["attempts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_zero_circuit_retry_after_does_not_spin(self):
+        """Test that a zero cool-down hint is still deferred by base_backoff."""
+        storage = InMemoryStorage()
+        service = NotificationService()
+        service.send_event = AsyncMock(
+            side_effect=NotificationCircuitOpenError("hooks.test", 0.0)
+        )
+        await storage.enqueue_notification(uuid4(), CONFIG, {"event_id": "e1"})
+        dispatcher = OutboxDispatcher(
+            storage, service, poll_interval=0.01, base_backoff=0.05
+        )
+
+        async with dispatcher:
+            await asyncio.sleep(0.12)
+
+        assert 1 <= service.send_event.await_count <= 4
+
+
+def _service_with(handler, **kwargs) -> NotificationService:
+    """Create a NotificationService whose client uses a mock transport."""
+    service = NotificationService(base_backoff=0, **kwargs)
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+class TestNotificationService:
+    """Test webhook delivery over the pooled HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_posts_json_with_bearer_token(self):
+        """Test the request sent to the subscriber."""
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(204)
+
+        service = _service_with(handler)
+        config = cast(PushNotificationConfig, {**CONFIG, "token": "secret"})
+        await service.send_event(config, {"event_id": "e1", "final": True})
+        await service.aclose()
+
+        assert len(requests) == 1
+        assert requests[0].url == "http://hooks.test/a"
+        assert requests[0].headers["authorization"] == "Bearer secret"
+        assert requests[0].content == b'{"event_id":"e1","final":true}'
+
+    @pytest.mark.asyncio
+    async def test_retries_server_errors_then_raises(self):
+        """Test that 5xx responses are retried up to max_retries."""
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(503, text="busy")
+
+        service = _service_with(handler, max_retries=2)
+        with pytest.raises(NotificationDeliveryError) as exc_info:
+            await service.send_event(CONFIG, {"event_id": "e1"})
+
+        assert calls == 3
+        assert exc_info.value.status == 503
+        assert str(exc_info.value) == "busy"
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        """Test that 4xx responses (other than 429) fail immediately."""
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(404)
+
+        service = _service_with(handler, max_retries=2)
+        with pytest.raises(NotificationDeliveryError) as exc_info:
+            await service.send_event(CONFIG, {"event_id": "e1"})
+
+        assert calls == 1
+        assert str(exc_info.value) == "HTTP error 404"
+
+    @pytest.mark.asyncio
+    async def test_connection_errors_have_no_status(self):
+        """Test that transport failures surface as delivery errors."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        service = _service_with(handler, max_retries=0)
+        with pytest.raises(NotificationDeliveryError) as exc_info:
+            await service.send_event(CONFIG, {"event_id": "e1"})
+
+        assert exc_info.value.status is None
+        assert "Connection error" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_limited_per_host(self):
+        """Test that max_connections_per_host caps in-flight requests."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        service = _service_with(handler, max_connections_per_host=2)
+        await asyncio.gather(
+            *(service.send_event(CONFIG, {"event_id": str(i)}) for i in range(6))
+        )
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_send_events_posts_a_json_array(self):
+        """Test the batched request body."""
+        bodies: list[bytes] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(request.content)
+            return httpx.Response(200)
+
+        service = _service_with(handler, collapse_intermediate=True)
+        await service.send_events(
+            CONFIG,
+            [
+                {"task_id": "a", "sequence": 1, "final": False},
+                {"task_id": "a", "sequence": 2, "final": True},
+            ],
+        )
+
+        assert bodies == [b'[{"task_id":"a","sequence":2,"final":true}]']
+
+    @pytest.mark.asyncio
+    async def test_circuit_opens_and_fails_fast(self):
+        """Test that a failing host is skipped once its circuit opens."""
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(503)
+
+        service = _service_with(handler, max_retries=5, circuit_failure_threshold=2)
+        with pytest.raises(NotificationCircuitOpenError) as exc_info:
+            await service.send_event(CONFIG, {"event_id": "e1"})
+        with pytest.raises(NotificationCircuitOpenError):
+            await service.send_event(CONFIG, {"event_id": "e2"})
+
+        assert calls == 2
+        assert exc_info.value.retry_after > 0
+        assert service.circuit_states()["hooks.test"]["state"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_open_the_circuit(self):
+        """Test that rejected events count as a reachable host."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(400)
+
+        service = _service_with(handler, circuit_failure_threshold=1)
+        for _ in range(3):
+            with pytest.raises(NotificationDeliveryError) as exc_info:
+                await service.send_event(CONFIG, {"event_id": "e1"})
+            assert exc_info.value.status == 400
+
+        assert service.circuit_states()["hooks.test"]["state"] == "closed"
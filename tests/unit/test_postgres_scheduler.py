@@ -0,0 +1,288 @@
+"""Unit tests for PostgresScheduler."""
+
+from types import SimpleNamespace
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import anyio
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from bindu.common.models import SchedulerConfig
+from bindu.server.scheduler.base import TaskOperation
+from bindu.server.scheduler.codec import OrjsonCodec, decode_document
+from bindu.server.scheduler.factory import create_scheduler
+from bindu.server.scheduler.postgres_scheduler import PostgresScheduler
+from bindu.server.storage.memory_storage import InMemoryStorage
+from bindu.server.storage.postgres_storage import PostgresStorage
+
+
+def _payload(operation: str = "run") -> str:
+    return OrjsonCodec().encode(
+        cast(
+            TaskOperation,
+            {
+                "operation": operation,
+                "params": {"task_id": uuid4(), "context_id": uuid4()},
+                "_current_span": None,
+            },
+        )
+    )
+
+
+def _row(
+    row_id: int, payload: str, attempts: int = 1, priority: int = 1, turn: int = 0
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=row_id, payload=payload, attempts=attempts, priority=priority, turn=turn
+    )
+
+
+@pytest.fixture
+def connection():
+    """Mock AsyncConnection recording executed statements."""
+    conn = AsyncMock()
+    conn.execute = AsyncMock(return_value=MagicMock())
+    return conn
+
+
+@pytest.fixture
+def engine(connection):
+    """Mock AsyncEngine whose begin() yields the mock connection."""
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock(return_value=connection)
+    transaction.__aexit__ = AsyncMock(return_value=False)
+    mock_engine = MagicMock()
+    mock_engine.begin = MagicMock(return_value=transaction)
+    return mock_engine
+
+
+@pytest.fixture
+def scheduler(engine):
+    """Create a PostgresScheduler on the mock engine (no listener or heartbeat)."""
+    return PostgresScheduler(engine=engine, consumer_name="pod-a", poll_interval=0.01)
+
+
+def _statements(connection) -> list[str]:
+    return [
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in connection.execute.call_args_list
+    ]
+
+
+class TestPostgresSchedulerProducing:
+    """Test inserting task operations."""
+
+    @pytest.mark.asyncio
+    async def test_run_task_inserts_and_notifies(self, scheduler, connection):
+        """Test that a row is inserted and listeners are notified in one transaction."""
+        await scheduler.run_task({"task_id": uuid4(), "context_id": uuid4()})
+
+        insert_call, notify_call = connection.execute.call_args_list
+        assert str(insert_call.args[0]).startswith("INSERT INTO task_queue")
+        rows = insert_call.args[1]
+        assert rows[0]["operation"] == "run"
+        assert rows[0]["priority"] == 1
+        assert rows[0]["fairness_key"].startswith("context:")
+        assert decode_document(rows[0]["payload"])["operation"] == "run"
+        assert "pg_notify" in str(notify_call.args[0])
+
+    @pytest.mark.asyncio
+    async def test_run_tasks_inserts_all_rows(self, scheduler, connection, engine):
+        """Test that run_tasks inserts every operation in a single transaction."""
+        await scheduler.run_tasks(
+            [{"task_id": uuid4(), "context_id": uuid4()} for _ in range(3)]
+        )
+
+        engine.begin.assert_called_once()
+        assert len(connection.execute.call_args_list[0].args[1]) == 3
+
+
+class TestPostgresSchedulerConsuming:
+    """Test claiming, acknowledging and dropping rows."""
+
+    @pytest.mark.asyncio
+    async def test_claim_uses_skip_locked_and_tags_rows(self, scheduler, connection):
+        """Test that claimed rows are yielded by lane and turn with a delivery tag."""
+        connection.execute.return_value.all.return_value = [
+            _row(2, _payload(), turn=1),
+            _row(8, _payload()),
+            _row(9, _payload("cancel"), priority=0),
+        ]
+
+        batches = scheduler.receive_task_operation_batches(4)
+        batch = await batches.__anext__()
+        await batches.aclose()
+
+        assert [op["_delivery_tag"] for op in batch] == ["9", "8", "2"]
+        assert [op["operation"] for op in batch] == ["cancel", "run", "run"]
+        assert scheduler._in_flight == {2, 8, 9}
+        claim = _statements(connection)[0]
+        assert "FOR UPDATE OF task_queue SKIP LOCKED" in claim
+        assert "PARTITION BY candidates.priority, candidates.fairness_key" in claim
+        assert "RETURNING" in claim
+
+    @pytest.mark.asyncio
+    async def test_claim_ranks_a_bounded_window_per_lane(self, engine, connection):
+        """Test that only the oldest fairness_window claimable rows per lane are ranked."""
+        scheduler = PostgresScheduler(engine=engine, fairness_window=50)
+        connection.execute.return_value.all.return_value = []
+
+        assert await scheduler._claim(4) == []
+
+        statement = connection.execute.call_args.args[0]
+        claim = str(statement.compile(dialect=postgresql.dialect()))
+        params = statement.compile(dialect=postgresql.dialect()).params
+        assert claim.count("WHERE task_queue.priority = ") == 3
+        assert claim.count("ORDER BY task_queue.id") == 3
+        assert sorted(v for k, v in params.items() if k.startswith("priority_")) == [
+            0,
+            1,
+            2,
+        ]
+        assert list(params.values()).count(50) == 3
+
+    @pytest.mark.asyncio
+    async def test_idle_receiver_wakes_on_notify(self, scheduler, connection):
+        """Test that a notification triggers an immediate claim."""
+        result = connection.execute.return_value
+        result.all.side_effect = [[], [_row(1, _payload())]]
+        scheduler.poll_interval = 60
+
+        operations = scheduler.receive_task_operations()
+        receive = operations.__anext__()
+        async with anyio.create_task_group() as tg:
+
+            async def notify():
+                while result.all.call_count < 1:
+                    await anyio.sleep(0)
+                scheduler._on_notify(None, 0, "bindu_task_queue", "")
+
+            tg.start_soon(notify)
+            with anyio.fail_after(5):
+                task_operation = await receive
+        await operations.aclose()
+
+        assert task_operation["_delivery_tag"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_ack_deletes_own_row(self, scheduler, connection):
+        """Test that acknowledging deletes the row only under this consumer's lease."""
+        scheduler._in_flight.add(5)
+
+        await scheduler.ack_task_operation(
+            {"operation": "run", "params": {}, "_delivery_tag": "5"}
+        )
+
+        statement = connection.execute.call_args.args[0]
+        assert str(statement).startswith("DELETE FROM task_queue")
+        assert "locked_by" in str(statement)
+        assert 5 not in scheduler._in_flight
+
+    @pytest.mark.asyncio
+    async def test_ack_without_tag_is_noop(self, scheduler, connection):
+        """Test that operations from other backends are ignored."""
+        await scheduler.ack_task_operation({"operation": "run", "params": {}})
+
+        connection.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_poison_row_is_dropped(self, scheduler, connection):
+        """Test that rows claimed more than max_deliveries times fail the task."""
+        dropped = []
+
+        async def on_task_dropped(params, reason):
+            dropped.append(reason)
+
+        scheduler.on_task_dropped = on_task_dropped
+        connection.execute.return_value.all.return_value = [
+            _row(9, _payload(), attempts=6)
+        ]
+
+        assert await scheduler._claim(1) == []
+
+        assert _statements(connection)[-1].startswith("DELETE FROM task_queue")
+        assert dropped == ["max_deliveries_exceeded"]
+        assert 9 not in scheduler._in_flight
+
+    @pytest.mark.asyncio
+    async def test_undecodable_row_is_deleted(self, scheduler, connection):
+        """Test that rows that cannot be deserialized are not retried."""
+        connection.execute.return_value.all.return_value = [
+            _row(2, "{not json"),
+            _row(4, _payload()),
+        ]
+
+        batch = await scheduler._claim(2)
+
+        assert [op["_delivery_tag"] for op in batch] == ["4"]
+        assert any(
+            s.startswith("DELETE FROM task_queue") for s in _statements(connection)
+        )
+
+
+class TestPostgresSchedulerCancelBroadcast:
+    """Test cancellations fanned out over NOTIFY."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_cancel_notifies_cancel_channel(
+        self, scheduler, connection
+    ):
+        """Test that the task ID is sent on the cancel channel."""
+        task_id = uuid4()
+
+        await scheduler.broadcast_cancel(task_id)
+
+        statement = connection.execute.call_args.args[0]
+        assert "pg_notify" in str(statement)
+        assert list(statement.compile().params.values()) == [
+            "bindu_task_queue_cancel",
+            str(task_id),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_notifications_are_yielded(self, scheduler):
+        """Test that cancel notifications reach receive_cancellations."""
+        task_id = uuid4()
+        scheduler._cancellations = anyio.create_memory_object_stream(10)
+
+        scheduler._on_cancel(None, 0, "bindu_task_queue_cancel", "not-a-uuid")
+        scheduler._on_cancel(None, 0, "bindu_task_queue_cancel", str(task_id))
+        cancellations = scheduler.receive_cancellations()
+        received = await cancellations.__anext__()
+        await cancellations.aclose()
+
+        assert received == task_id
+
+
+class TestPostgresSchedulerFactory:
+    """Test creating the scheduler through the factory."""
+
+    @pytest.mark.asyncio
+    async def test_factory_shares_storage_engine(self, engine):
+        """Test that the scheduler reuses the PostgresStorage engine."""
+        storage = MagicMock(spec=PostgresStorage)
+        storage.engine = engine
+
+        scheduler = await create_scheduler(
+            SchedulerConfig(type="postgres"), storage=storage
+        )
+
+        assert isinstance(scheduler, PostgresScheduler)
+        assert scheduler.engine is engine
+
+    @pytest.mark.asyncio
+    async def test_factory_requires_postgres_storage(self):
+        """Test that other storage backends are rejected."""
+        with pytest.raises(TypeError, match="STORAGE__BACKEND=postgres"):
+            await create_scheduler(
+                SchedulerConfig(type="postgres"), storage=InMemoryStorage()
+            )
+
+    @pytest.mark.asyncio
+    async def test_factory_requires_sqlalchemy(self):
+        """Test the error when SQLAlchemy is not installed."""
+        with patch("bindu.server.scheduler.factory.POSTGRES_AVAILABLE", False):
+            with pytest.raises(ValueError, match="requires SQLAlchemy"):
+                await create_scheduler(SchedulerConfig(type="postgres"))
@@ -13,7 +13,11 @@ from datetime import datetime, timezone
 from uuid import uuid4
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from bindu.server.storage.postgres_storage import PostgresStorage, _serialize_for_jsonb
+from bindu.server.storage.postgres_storage import (
+    PostgresStorage,
+    _serialize_for_jsonb,
+    _task_columns,
+)
 from tests.utils import create_test_message
 
 
@@ -220,6 +224,45 @@ class TestPostgresStorageTaskOperations:
         assert isinstance(task["history"], list)
         assert isinstance(task["artifacts"], list)
 
+    def test_task_columns_leave_out_checkpoint(self):
+        """Test that tasks are loaded without the worker checkpoint."""
+        names = {column.name for column in _task_columns(history_length=5)}
+
+        assert "checkpoint" not in names
+        assert {"id", "history", "metadata"} <= names
+
+    @pytest.mark.asyncio
+    async def test_load_tasks_runs_one_query_in_request_order(self):
+        """Test that load_tasks issues a single query and keeps request order."""
+        storage = PostgresStorage()
+        first, second, missing = uuid4(), uuid4(), uuid4()
+
+        def row(task_id):
+            mock_row = MagicMock()
+            mock_row.id = task_id
+            mock_row.history = [{"text": str(task_id)}]
+            return mock_row
+
+        session = AsyncMock()
+        session.execute.return_value = [row(first), row(second)]
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = session
+        storage._engine = MagicMock()
+        storage._session_factory = session_factory
+
+        tasks = await storage.load_tasks([second, missing, first], fields=("history",))
+
+        assert session.execute.await_count == 1
+        assert [t["id"] for t in tasks] == [second, first]
+        assert set(tasks[0]) == {"id", "history"}
+
+    @pytest.mark.asyncio
+    async def test_load_tasks_empty_skips_query(self):
+        """Test that no IDs means no connection is needed."""
+        storage = PostgresStorage()
+
+        assert await storage.load_tasks([]) == []
+
 
 class TestPostgresStorageRetryLogic:
     """Test PostgresStorage retry logic."""
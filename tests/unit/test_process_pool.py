@@ -0,0 +1,262 @@
+"""Tests for process-isolated handler execution."""
+
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import anyio
+import pytest
+
+from bindu.penguin.manifest import create_manifest
+from bindu.utils.process_pool import (
+    ProcessPool,
+    ProcessWorkerCrashedError,
+    default_start_method,
+)
+
+
+def pid_handler(messages):
+    return os.getpid()
+
+
+def streaming_handler(messages):
+    for message in messages:
+        yield message["content"].upper()
+
+
+async def async_handler(messages):
+    return f"async:{len(messages)}"
+
+
+def failing_handler(messages):
+    raise ValueError("bad input")
+
+
+def crashing_handler(messages):
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def slow_handler(messages):
+    import time
+
+    time.sleep(30)
+
+
+async def collect(pool, *params):
+    return [chunk async for chunk in pool.stream(*params)]
+
+
+class TestProcessPool:
+    """Test ProcessPool execution and worker lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_runs_handler_in_worker_process(self):
+        """Test that the handler executes outside the parent process."""
+        pool = ProcessPool(pid_handler, max_workers=1)
+        try:
+            assert await collect(pool, []) != [os.getpid()]
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_streams_generator_chunks(self):
+        """Test that generator output is streamed back chunk by chunk."""
+        pool = ProcessPool(streaming_handler, max_workers=1)
+        history = [{"role": "user", "content": "a"}, {"role": "user", "content": "b"}]
+        try:
+            assert await collect(pool, history) == ["A", "B"]
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_runs_async_handler(self):
+        """Test that coroutine handlers are driven inside the worker."""
+        pool = ProcessPool(async_handler, max_workers=1)
+        try:
+            assert await collect(pool, [{}, {}]) == ["async:2"]
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_handler_error_is_reraised_and_worker_reused(self):
+        """Test that handler exceptions propagate without losing the worker."""
+        pool = ProcessPool(failing_handler, max_workers=1)
+        try:
+            with pytest.raises(ValueError, match="bad input"):
+                await collect(pool, [])
+            worker_pid = pool._idle[0].process.pid
+            with pytest.raises(ValueError):
+                await collect(pool, [])
+            assert pool._idle[0].process.pid == worker_pid
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_workers_recycled_after_max_tasks(self):
+        """Test that a worker is replaced after max_tasks_per_worker tasks."""
+        pool = ProcessPool(pid_handler, max_workers=1, max_tasks_per_worker=2)
+        try:
+            pids = [(await collect(pool, []))[0] for _ in range(3)]
+            assert pids[0] == pids[1]
+            assert pids[2] != pids[1]
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_recycling_runs_off_the_event_loop(self):
+        """Test that spent workers are stopped and replaced in a thread."""
+        pool = ProcessPool(pid_handler, max_workers=1, max_tasks_per_worker=1)
+        pool.start()
+        spawn = pool._spawn
+        spawn_threads = []
+
+        def recording_spawn():
+            spawn_threads.append(threading.current_thread())
+            return spawn()
+
+        pool._spawn = recording_spawn  # type: ignore
+        try:
+            await collect(pool, [])
+            assert spawn_threads
+            assert threading.main_thread() not in spawn_threads
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failed_replacement_is_started_on_demand(self):
+        """Test that a failing respawn does not leave a slot without a worker."""
+        pool = ProcessPool(pid_handler, max_workers=1, max_tasks_per_worker=1)
+        pool.start()
+        spawn = pool._spawn
+        failures = []
+
+        def failing_once_spawn():
+            if not failures:
+                failures.append(True)
+                raise OSError("too many open files")
+            return spawn()
+
+        pool._spawn = failing_once_spawn  # type: ignore
+        try:
+            first = await collect(pool, [])
+            assert pool._idle == []
+            second = await collect(pool, [])
+            assert second != first
+            assert len(pool._idle) == 1
+        finally:
+            pool.shutdown()
+
+    def test_default_start_method_does_not_fork(self):
+        """Test that workers are not forked from the server by default."""
+        pool = ProcessPool(pid_handler, max_workers=1)
+        assert pool._context.get_start_method() in ("forkserver", "spawn")
+
+    def test_main_module_handler_defaults_to_fork(self):
+        """Test that handlers from an unguarded script are not re-run by spawn."""
+        handler = MagicMock(__module__="__main__")
+
+        assert default_start_method(handler) == "fork"
+
+    def test_unguarded_script_runs_in_process_mode(self, tmp_path):
+        """Test a script that starts the pool at module level, like examples/."""
+        script = tmp_path / "unguarded_agent.py"
+        script.write_text(
+            textwrap.dedent(
+                """
+                import os
+
+                import anyio
+
+                from bindu.utils.process_pool import ProcessPool
+
+
+                def handler(messages):
+                    return os.getpid() != int(messages)
+
+
+                async def main():
+                    pool = ProcessPool(handler, max_workers=1)
+                    try:
+                        print([c async for c in pool.stream(os.getpid())])
+                    finally:
+                        pool.shutdown()
+
+
+                anyio.run(main)
+                """
+            )
+        )
+        root = Path(__file__).resolve().parents[2]
+
+        result = subprocess.run(
+            [sys.executable, str(script)],
+            cwd=root,
+            env={**os.environ, "PYTHONPATH": str(root)},
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "[True]"
+
+    @pytest.mark.asyncio
+    async def test_crashed_worker_is_replaced(self):
+        """Test that a crash fails the task and a fresh worker takes over."""
+        pool = ProcessPool(crashing_handler, max_workers=1)
+        try:
+            with anyio.fail_after(10):
+                with pytest.raises(ProcessWorkerCrashedError):
+                    await collect(pool, [])
+            assert len(pool._idle) == 1
+            assert pool._idle[0].process.is_alive()
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_task_terminates_worker(self):
+        """Test that cancelling a task replaces its busy worker."""
+        pool = ProcessPool(slow_handler, max_workers=1)
+        pool.start()
+        busy_pid = pool._idle[0].process.pid
+        try:
+            with anyio.move_on_after(0.5):
+                await collect(pool, [])
+            assert len(pool._idle) == 1
+            assert pool._idle[0].process.pid != busy_pid
+        finally:
+            pool.shutdown()
+
+
+class TestManifestProcessMode:
+    """Test create_manifest wiring for execution_mode='process'."""
+
+    @pytest.mark.asyncio
+    async def test_process_mode_streams_from_pool(self):
+        """Test that the manifest run method executes through the pool."""
+        manifest = create_manifest(
+            agent_function=streaming_handler,
+            id=uuid4(),
+            did_extension=MagicMock(),
+            name="cpu-agent",
+            description=None,
+            skills=None,
+            capabilities=None,
+            agent_trust=None,
+            version="1.0.0",
+            url="http://localhost:3773",
+            execution_mode="process",
+        )
+        assert manifest.run is not None
+        assert manifest.process_pool is not None
+        try:
+            chunks = [c async for c in manifest.run([{"content": "hi"}])]
+            assert chunks == ["HI"]
+        finally:
+            manifest.process_pool.shutdown()
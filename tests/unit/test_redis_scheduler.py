@@ -1,12 +1,21 @@
 """Unit tests for RedisScheduler."""
 
 import json
+from typing import cast
 from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
 
 import pytest
 
 from bindu.common.protocol.types import TaskIdParams, TaskSendParams
-from bindu.server.scheduler.redis_scheduler import RedisScheduler
+from bindu.server.scheduler.base import PRIORITIES
+from bindu.server.scheduler.codec import decode_document
+from bindu.server.scheduler.redis_scheduler import (
+    _LENGTHS_SCRIPT,
+    _POP_SCRIPT,
+    _PUSH_SCRIPT,
+    RedisScheduler,
+)
 
 
 @pytest.fixture
@@ -15,10 +24,45 @@ def redis_url():
     return "redis://localhost:6379/0"
 
 
+# Legacy list, wake-up list, then ring and credit hash per lane
+SCRIPT_KEYS = [
+    "bindu:tasks",
+    "{bindu:tasks}:wakeup",
+    "{bindu:tasks}:lane:control",
+    "{bindu:tasks}:lane:control:credit",
+    "{bindu:tasks}:lane:interactive",
+    "{bindu:tasks}:lane:interactive:credit",
+    "{bindu:tasks}:lane:batch",
+    "{bindu:tasks}:lane:batch:credit",
+]
+
+
 @pytest.fixture
-def mock_redis_client():
+def scripts():
+    """Mock Lua scripts keyed by their source."""
+    return {
+        _PUSH_SCRIPT: AsyncMock(),
+        _POP_SCRIPT: AsyncMock(return_value=[]),
+        _LENGTHS_SCRIPT: AsyncMock(return_value=[0, 0, 0, 0]),
+    }
+
+
+def _pushed(scripts) -> list[tuple[str, str, dict]]:
+    """Return (lane, fairness key, document) for every pushed operation."""
+    call = scripts[_PUSH_SCRIPT].call_args.kwargs
+    assert call["keys"] == SCRIPT_KEYS
+    args = call["args"]
+    return [
+        (PRIORITIES[args[i] - 1], args[i + 1], decode_document(args[i + 2]))
+        for i in range(0, len(args), 3)
+    ]
+
+
+@pytest.fixture
+def mock_redis_client(scripts):
     """Mock Redis client."""
     client = AsyncMock()
+    client.register_script = MagicMock(side_effect=scripts.__getitem__)
     client.ping = AsyncMock()
     client.rpush = AsyncMock()
     client.blpop = AsyncMock()
@@ -62,6 +106,20 @@ class TestRedisSchedulerInit:
         assert scheduler.max_connections == 20
         assert scheduler.retry_on_timeout is False
 
+    def test_script_keys_share_the_queue_slot(self):
+        """Test that every script key hashes to the legacy list's cluster slot."""
+        scheduler = RedisScheduler(redis_url="redis://localhost", queue_name="q")
+        assert scheduler._script_keys[0] == "q"
+        assert all(key.startswith("{q}:") for key in scheduler._script_keys[1:])
+
+    def test_existing_hash_tag_is_kept(self):
+        """Test that a queue name with a hash tag is not wrapped again."""
+        scheduler = RedisScheduler(
+            redis_url="redis://localhost", queue_name="{bindu}:tasks"
+        )
+        assert scheduler.wakeup_key == "{bindu}:tasks:wakeup"
+        assert scheduler._script_keys[2] == "{bindu}:tasks:lane:control"
+
 
 class TestRedisSchedulerConnection:
     """Test RedisScheduler connection management."""
@@ -99,7 +157,7 @@ class TestRedisSchedulerTaskOperations:
     """Test RedisScheduler task operations."""
 
     @pytest.mark.asyncio
-    async def test_run_task(self, scheduler, mock_redis_client):
+    async def test_run_task(self, scheduler, scripts):
         """Test scheduling a run task."""
         params = TaskSendParams(
             task_id="test-task-123",
@@ -109,57 +167,192 @@ class TestRedisSchedulerTaskOperations:
 
         await scheduler.run_task(params)
 
-        # Verify rpush was called
-        mock_redis_client.rpush.assert_called_once()
-        call_args = mock_redis_client.rpush.call_args
-        assert call_args[0][0] == "bindu:tasks"
-
-        # Verify serialized data
-        serialized = call_args[0][1]
-        data = json.loads(serialized)
+        scripts[_PUSH_SCRIPT].assert_awaited_once()
+        [(lane, fairness_key, data)] = _pushed(scripts)
+        assert lane == "interactive"
+        assert fairness_key == "context:test-context-456"
         assert data["operation"] == "run"
         assert data["params"]["task_id"] == "test-task-123"
 
     @pytest.mark.asyncio
-    async def test_cancel_task(self, scheduler, mock_redis_client):
+    async def test_cancel_task(self, scheduler, scripts):
         """Test scheduling a cancel task."""
         params = TaskIdParams(task_id="test-task-123")
 
         await scheduler.cancel_task(params)
 
-        mock_redis_client.rpush.assert_called_once()
-        call_args = mock_redis_client.rpush.call_args
-        serialized = call_args[0][1]
-        data = json.loads(serialized)
+        [(lane, _, data)] = _pushed(scripts)
+        assert lane == "control"
         assert data["operation"] == "cancel"
         assert data["params"]["task_id"] == "test-task-123"
 
     @pytest.mark.asyncio
-    async def test_pause_task(self, scheduler, mock_redis_client):
+    async def test_pause_task(self, scheduler, scripts):
         """Test scheduling a pause task."""
         params = TaskIdParams(task_id="test-task-123")
 
         await scheduler.pause_task(params)
 
-        mock_redis_client.rpush.assert_called_once()
-        call_args = mock_redis_client.rpush.call_args
-        serialized = call_args[0][1]
-        data = json.loads(serialized)
+        [(lane, _, data)] = _pushed(scripts)
+        assert lane == "control"
         assert data["operation"] == "pause"
 
     @pytest.mark.asyncio
-    async def test_resume_task(self, scheduler, mock_redis_client):
+    async def test_resume_task(self, scheduler, scripts):
         """Test scheduling a resume task."""
         params = TaskIdParams(task_id="test-task-123")
 
         await scheduler.resume_task(params)
 
-        mock_redis_client.rpush.assert_called_once()
-        call_args = mock_redis_client.rpush.call_args
-        serialized = call_args[0][1]
-        data = json.loads(serialized)
+        [(lane, _, data)] = _pushed(scripts)
+        assert lane == "control"
         assert data["operation"] == "resume"
 
+    @pytest.mark.asyncio
+    async def test_priority_and_client_from_metadata(self, scheduler, scripts):
+        """Test that message priority and client identity select lane and key."""
+        params = cast(
+            TaskSendParams,
+            {
+                "task_id": "test-task-123",
+                "context_id": "ctx",
+                "message": {"metadata": {"priority": "batch"}},
+                "metadata": {"client_id": "acme"},
+            },
+        )
+
+        await scheduler.run_task(params)
+
+        [(lane, fairness_key, _)] = _pushed(scripts)
+        assert (lane, fairness_key) == ("batch", "client:acme")
+
+
+class TestRedisSchedulerBatching:
+    """Test batched enqueue and dequeue."""
+
+    @pytest.mark.asyncio
+    async def test_run_tasks_single_round_trip(self, scheduler, scripts):
+        """Test that run_tasks pushes every operation in one script call."""
+        params = [
+            cast(TaskSendParams, {"task_id": f"task-{i}", "context_id": "ctx"})
+            for i in range(3)
+        ]
+
+        await scheduler.run_tasks(params)
+
+        scripts[_PUSH_SCRIPT].assert_awaited_once()
+        assert [data["params"]["task_id"] for _, _, data in _pushed(scripts)] == [
+            "task-0",
+            "task-1",
+            "task-2",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_receive_pops_lanes_in_one_call(
+        self, scheduler, scripts, mock_redis_client
+    ):
+        """Test that queued operations are drained in one script round trip."""
+        payloads = [
+            scheduler.codec.encode(
+                {"operation": "run", "params": {"task_id": f"task-{i}"}}
+            )
+            for i in range(3)
+        ]
+        scripts[_POP_SCRIPT].return_value = payloads
+        scheduler.fairness_weights = {"client:acme": 3}
+
+        batches = scheduler.receive_task_operation_batches(5)
+        batch = await batches.__anext__()
+        await batches.aclose()
+
+        scripts[_POP_SCRIPT].assert_awaited_once_with(
+            keys=SCRIPT_KEYS, args=[5, '{"client:acme":3}']
+        )
+        mock_redis_client.blpop.assert_not_awaited()
+        assert [op["params"]["task_id"] for op in batch] == [
+            "task-0",
+            "task-1",
+            "task-2",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_receive_blocks_when_empty(
+        self, scheduler, scripts, mock_redis_client
+    ):
+        """Test that empty lanes block on the wake-up list, then pop again."""
+        payload = scheduler.codec.encode(
+            {"operation": "cancel", "params": {"task_id": "task-1"}}
+        )
+        scripts[_POP_SCRIPT].side_effect = [[], [payload]]
+        mock_redis_client.blpop.return_value = ("{bindu:tasks}:wakeup", "1")
+
+        batches = scheduler.receive_task_operation_batches(5)
+        batch = await batches.__anext__()
+        await batches.aclose()
+
+        mock_redis_client.blpop.assert_awaited_once_with(
+            ["{bindu:tasks}:wakeup", "bindu:tasks"], timeout=1
+        )
+        assert [op["operation"] for op in batch] == ["cancel"]
+
+    @pytest.mark.asyncio
+    async def test_legacy_queue_is_still_consumed(
+        self, scheduler, scripts, mock_redis_client
+    ):
+        """Test that operations pushed by releases without lanes are received."""
+        payload = scheduler.codec.encode(
+            {"operation": "run", "params": {"task_id": "legacy"}}
+        )
+        mock_redis_client.blpop.return_value = ("bindu:tasks", payload)
+
+        batches = scheduler.receive_task_operation_batches(5)
+        batch = await batches.__anext__()
+        await batches.aclose()
+
+        assert [op["params"]["task_id"] for op in batch] == ["legacy"]
+
+
+class TestRedisSchedulerCancelBroadcast:
+    """Test cancellations fanned out over pub/sub."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_cancel_publishes_task_id(
+        self, scheduler, mock_redis_client
+    ):
+        """Test that the task ID is published on the cancel channel."""
+        task_id = uuid4()
+
+        await scheduler.broadcast_cancel(task_id)
+
+        mock_redis_client.publish.assert_awaited_once_with(
+            "bindu:tasks:cancel", str(task_id)
+        )
+
+    @pytest.mark.asyncio
+    async def test_receive_cancellations_yields_task_ids(
+        self, scheduler, mock_redis_client
+    ):
+        """Test that published IDs are yielded and malformed ones skipped."""
+        task_id = uuid4()
+
+        async def listen():
+            yield {"type": "message", "data": "not-a-uuid"}
+            yield {"type": "message", "data": str(task_id)}
+
+        pubsub = MagicMock()
+        pubsub.subscribe = AsyncMock()
+        pubsub.aclose = AsyncMock()
+        pubsub.listen = listen
+        mock_redis_client.pubsub = MagicMock(return_value=pubsub)
+
+        cancellations = scheduler.receive_cancellations()
+        received = await cancellations.__anext__()
+        await cancellations.aclose()
+
+        assert received == task_id
+        pubsub.subscribe.assert_awaited_once_with("bindu:tasks:cancel")
+        pubsub.aclose.assert_awaited_once()
+
 
 class TestRedisSchedulerSerialization:
     """Test RedisScheduler serialization and deserialization."""
@@ -183,7 +376,7 @@ class TestRedisSchedulerSerialization:
         }
 
         serialized = scheduler._serialize_task_operation(task_op)
-        data = json.loads(serialized)
+        data = decode_document(serialized)
 
         assert data["operation"] == "run"
         assert data["params"]["task_id"] == "test-123"
@@ -251,24 +444,39 @@ class TestRedisSchedulerUtilities:
     """Test RedisScheduler utility methods."""
 
     @pytest.mark.asyncio
-    async def test_get_queue_length(self, scheduler, mock_redis_client):
+    async def test_get_queue_length(self, scheduler, scripts):
         """Test getting queue length."""
-        mock_redis_client.llen.return_value = 5
+        scripts[_LENGTHS_SCRIPT].return_value = [1, 3, 0, 1]
 
         length = await scheduler.get_queue_length()
 
         assert length == 5
-        mock_redis_client.llen.assert_called_once_with("bindu:tasks")
+        scripts[_LENGTHS_SCRIPT].assert_awaited_once_with(keys=SCRIPT_KEYS, args=[0])
+
+    @pytest.mark.asyncio
+    async def test_queue_stats_per_lane(self, scheduler, scripts):
+        """Test that stats break the queue down by lane."""
+        scripts[_LENGTHS_SCRIPT].return_value = [1, 3, 2, 0]
+
+        stats = await scheduler.get_queue_stats()
+
+        assert stats["queued"] == 6
+        assert stats["lanes"] == {
+            "control": 1,
+            "interactive": 3,
+            "batch": 2,
+            "legacy": 0,
+        }
 
     @pytest.mark.asyncio
-    async def test_clear_queue(self, scheduler, mock_redis_client):
+    async def test_clear_queue(self, scheduler, scripts):
         """Test clearing the queue."""
-        mock_redis_client.delete.return_value = 3
+        scripts[_LENGTHS_SCRIPT].return_value = [0, 2, 1, 0]
 
         removed = await scheduler.clear_queue()
 
         assert removed == 3
-        mock_redis_client.delete.assert_called_once_with("bindu:tasks")
+        scripts[_LENGTHS_SCRIPT].assert_awaited_once_with(keys=SCRIPT_KEYS, args=[1])
 
     @pytest.mark.asyncio
     async def test_health_check_success(self, scheduler, mock_redis_client):
@@ -0,0 +1,358 @@
+"""Unit tests for RedisStreamScheduler."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+import redis.asyncio as redis_lib
+
+from bindu.server.scheduler.codec import decode_document
+from bindu.server.scheduler.redis_stream_scheduler import RedisStreamScheduler
+
+STREAM = "bindu:tasks:stream"
+CONTROL = "bindu:tasks:stream:control"
+BATCH = "bindu:tasks:stream:batch"
+DEAD = "bindu:tasks:dead"
+GROUP = "bindu-workers"
+
+
+def _payload(operation: str = "run") -> dict:
+    return {
+        "payload": json.dumps(
+            {
+                "operation": operation,
+                "params": {"task_id": str(uuid4()), "context_id": str(uuid4())},
+                "span_id": None,
+                "trace_id": None,
+            }
+        )
+    }
+
+
+def _reads(entries_by_stream: dict) -> AsyncMock:
+    """XREADGROUP mock that delivers each stream's entries once."""
+
+    async def xreadgroup(group, consumer, streams, **kwargs):
+        return [
+            [stream, entries_by_stream.pop(stream)]
+            for stream in streams
+            if stream in entries_by_stream
+        ]
+
+    return AsyncMock(side_effect=xreadgroup)
+
+
+def _claims(entries_by_stream: dict) -> AsyncMock:
+    """XAUTOCLAIM mock returning the given stalled entries per stream."""
+
+    async def xautoclaim(stream, *args, **kwargs):
+        return ["0-0", entries_by_stream.get(stream, []), []]
+
+    return AsyncMock(side_effect=xautoclaim)
+
+
+@pytest.fixture
+def pipeline():
+    """Mock Redis pipeline usable as an async context manager."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    return pipe
+
+
+@pytest.fixture
+def mock_redis_client(pipeline):
+    """Mock Redis client with stream commands."""
+    client = AsyncMock()
+    client.xreadgroup = AsyncMock(return_value=[])
+    client.xautoclaim = AsyncMock(return_value=["0-0", [], []])
+    client.xpending_range = AsyncMock(return_value=[])
+    client.xlen = AsyncMock(return_value=0)
+    client.xpending = AsyncMock(return_value={"pending": 0})
+    client.pipeline = MagicMock(return_value=pipeline)
+    return client
+
+
+@pytest.fixture
+def scheduler(mock_redis_client):
+    """Create a RedisStreamScheduler with a mocked client (no heartbeat)."""
+    sched = RedisStreamScheduler(
+        redis_url="redis://localhost:6379/0", consumer_name="pod-a"
+    )
+    sched._redis_client = mock_redis_client
+    return sched
+
+
+class TestRedisStreamSchedulerLifecycle:
+    """Test connection and consumer group setup."""
+
+    @pytest.mark.asyncio
+    async def test_enter_creates_consumer_group(self, mock_redis_client):
+        """Test that entering creates the group on every lane with MKSTREAM."""
+        with patch("redis.asyncio.from_url", return_value=mock_redis_client):
+            async with RedisStreamScheduler(redis_url="redis://localhost:6379/0"):
+                streams = [
+                    call.args[0]
+                    for call in mock_redis_client.xgroup_create.call_args_list
+                ]
+                assert streams == [CONTROL, STREAM, BATCH]
+                mock_redis_client.xgroup_create.assert_awaited_with(
+                    BATCH, GROUP, id="0", mkstream=True
+                )
+
+    @pytest.mark.asyncio
+    async def test_existing_group_is_tolerated(self, mock_redis_client):
+        """Test that BUSYGROUP from an existing group is ignored."""
+        mock_redis_client.xgroup_create.side_effect = redis_lib.ResponseError(
+            "BUSYGROUP Consumer Group name already exists"
+        )
+        with patch("redis.asyncio.from_url", return_value=mock_redis_client):
+            async with RedisStreamScheduler(redis_url="redis://localhost:6379/0"):
+                pass
+
+
+class TestRedisStreamSchedulerDelivery:
+    """Test producing, consuming and acknowledging entries."""
+
+    @pytest.mark.asyncio
+    async def test_run_task_adds_to_stream(self, scheduler, mock_redis_client):
+        """Test that operations are appended with XADD."""
+        await scheduler.run_task({"task_id": uuid4(), "context_id": uuid4()})
+
+        args = mock_redis_client.xadd.call_args[0]
+        assert args[0] == STREAM
+        assert decode_document(args[1]["payload"])["operation"] == "run"
+
+    @pytest.mark.asyncio
+    async def test_receive_reads_group_and_tags_entry(
+        self, scheduler, mock_redis_client
+    ):
+        """Test that XREADGROUP entries are yielded with their delivery tag."""
+        mock_redis_client.xreadgroup = _reads({STREAM: [("1-0", _payload())]})
+
+        operations = scheduler.receive_task_operations()
+        task_operation = await operations.__anext__()
+        await operations.aclose()
+
+        assert task_operation["operation"] == "run"
+        assert task_operation["_delivery_tag"] == "interactive/1-0"
+        assert "interactive/1-0" in scheduler._in_flight
+        calls = mock_redis_client.xreadgroup.call_args_list
+        assert [call[0][:3] for call in calls] == [
+            (GROUP, "pod-a", {CONTROL: ">"}),
+            (GROUP, "pod-a", {STREAM: ">"}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_receive_reads_count_entries(
+        self, scheduler, mock_redis_client
+    ):
+        """Test that XREADGROUP fetches up to the batch size across lanes."""
+        mock_redis_client.xreadgroup = _reads(
+            {
+                CONTROL: [("5-0", _payload("cancel"))],
+                STREAM: [("1-0", _payload()), ("2-0", _payload())],
+            }
+        )
+
+        batches = scheduler.receive_task_operation_batches(4)
+        batch = await batches.__anext__()
+        await batches.aclose()
+
+        assert [op["_delivery_tag"] for op in batch] == [
+            "control/5-0",
+            "interactive/1-0",
+            "interactive/2-0",
+        ]
+        counts = [
+            c.kwargs["count"] for c in mock_redis_client.xreadgroup.call_args_list
+        ]
+        assert counts == [4, 3, 1]
+        assert mock_redis_client.xautoclaim.call_args_list[0].kwargs["count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_idle_lanes_block_on_every_stream(self, scheduler, mock_redis_client):
+        """Test that a consumer with nothing to read blocks on all lanes at once."""
+        batches = scheduler.receive_task_operation_batches(4)
+        mock_redis_client.xreadgroup.side_effect = [
+            [],
+            [],
+            [],
+            [[BATCH, [("3-0", _payload())]]],
+        ]
+
+        batch = await batches.__anext__()
+        await batches.aclose()
+
+        assert [op["_delivery_tag"] for op in batch] == ["batch/3-0"]
+        blocking = mock_redis_client.xreadgroup.call_args
+        assert blocking[0][2] == {CONTROL: ">", STREAM: ">", BATCH: ">"}
+        assert blocking.kwargs["block"] == 1000
+
+    @pytest.mark.asyncio
+    async def test_batch_is_round_robined_across_contexts(
+        self, scheduler, mock_redis_client
+    ):
+        """Test that a fetched batch interleaves entries from different contexts."""
+
+        def payload(context_id):
+            return {
+                "payload": json.dumps(
+                    {
+                        "operation": "run",
+                        "params": {"task_id": str(uuid4()), "context_id": context_id},
+                    }
+                )
+            }
+
+        noisy, quiet = str(uuid4()), str(uuid4())
+        mock_redis_client.xreadgroup = _reads(
+            {
+                STREAM: [
+                    ("1-0", payload(noisy)),
+                    ("2-0", payload(noisy)),
+                    ("3-0", payload(quiet)),
+                ]
+            }
+        )
+
+        batches = scheduler.receive_task_operation_batches(3)
+        batch = await batches.__anext__()
+        await batches.aclose()
+
+        assert [op["_delivery_tag"] for op in batch] == [
+            "interactive/1-0",
+            "interactive/3-0",
+            "interactive/2-0",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_operations_are_added_to_their_lane(
+        self, scheduler, mock_redis_client
+    ):
+        """Test that cancels and batch runs go to their own streams."""
+        await scheduler.cancel_task({"task_id": uuid4()})
+        await scheduler.run_task(
+            {
+                "task_id": uuid4(),
+                "context_id": uuid4(),
+                "message": {"metadata": {"priority": "batch"}},
+            }
+        )
+
+        streams = [call.args[0] for call in mock_redis_client.xadd.call_args_list]
+        assert streams == [CONTROL, BATCH]
+
+    @pytest.mark.asyncio
+    async def test_run_tasks_pipelines_xadd(self, scheduler, pipeline):
+        """Test that run_tasks appends every operation in one pipeline."""
+        await scheduler.run_tasks(
+            [{"task_id": uuid4(), "context_id": uuid4()} for _ in range(3)]
+        )
+
+        assert pipeline.xadd.call_count == 3
+        assert pipeline.xadd.call_args[0][0] == STREAM
+        pipeline.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_ack_acknowledges_and_deletes(self, scheduler, pipeline):
+        """Test that acknowledging runs XACK and XDEL atomically on the lane."""
+        scheduler._in_flight.add("control/1-0")
+
+        await scheduler.ack_task_operation(
+            {"operation": "cancel", "params": {}, "_delivery_tag": "control/1-0"}
+        )
+
+        pipeline.xack.assert_called_once_with(CONTROL, GROUP, "1-0")
+        pipeline.xdel.assert_called_once_with(CONTROL, "1-0")
+        pipeline.execute.assert_awaited_once()
+        assert "control/1-0" not in scheduler._in_flight
+
+    @pytest.mark.asyncio
+    async def test_ack_without_tag_is_noop(self, scheduler, pipeline):
+        """Test that operations from other backends are ignored."""
+        await scheduler.ack_task_operation({"operation": "run", "params": {}})
+
+        pipeline.execute.assert_not_awaited()
+
+
+class TestRedisStreamSchedulerRecovery:
+    """Test reclaiming stalled entries and dead-lettering."""
+
+    @pytest.mark.asyncio
+    async def test_stalled_entry_is_reclaimed(self, scheduler, mock_redis_client):
+        """Test that entries idle past the visibility timeout are redelivered."""
+        mock_redis_client.xautoclaim = _claims({STREAM: [("7-0", _payload())]})
+        mock_redis_client.xpending_range.return_value = [
+            {"message_id": "7-0", "times_delivered": 2}
+        ]
+
+        operations = scheduler.receive_task_operations()
+        task_operation = await operations.__anext__()
+        await operations.aclose()
+
+        assert task_operation["_delivery_tag"] == "interactive/7-0"
+        kwargs = mock_redis_client.xautoclaim.call_args.kwargs
+        assert kwargs["min_idle_time"] == 300_000
+        mock_redis_client.xreadgroup.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_poison_entry_is_dead_lettered(
+        self, scheduler, mock_redis_client, pipeline
+    ):
+        """Test that entries over max_deliveries move to the dead-letter stream."""
+        dropped = []
+
+        async def on_task_dropped(params, reason):
+            dropped.append(reason)
+
+        scheduler.on_task_dropped = on_task_dropped
+        mock_redis_client.xautoclaim = _claims({STREAM: [("9-0", _payload())]})
+        mock_redis_client.xpending_range.return_value = [
+            {"message_id": "9-0", "times_delivered": 6}
+        ]
+
+        assert await scheduler._reclaim_stalled() == []
+
+        dead_args = pipeline.xadd.call_args
+        assert dead_args[0][0] == DEAD
+        assert dead_args[0][1]["original_id"] == "9-0"
+        pipeline.xack.assert_called_once_with(STREAM, GROUP, "9-0")
+        pipeline.xdel.assert_called_once_with(STREAM, "9-0")
+        assert dropped == ["dead_lettered"]
+
+    @pytest.mark.asyncio
+    async def test_undecodable_entry_is_dead_lettered(
+        self, scheduler, mock_redis_client, pipeline
+    ):
+        """Test that entries that cannot be deserialized are not retried."""
+        mock_redis_client.xreadgroup.side_effect = [
+            [[CONTROL, [("3-0", {"payload": "{not json"})]]],
+            [[CONTROL, [("4-0", _payload("cancel"))]]],
+        ]
+
+        operations = scheduler.receive_task_operations()
+        task_operation = await operations.__anext__()
+        await operations.aclose()
+
+        assert task_operation["_delivery_tag"] == "control/4-0"
+        assert pipeline.xadd.call_args[0][1]["original_stream"] == CONTROL
+        assert pipeline.xadd.call_args[0][0] == DEAD
+        assert pipeline.xadd.call_args[0][1]["original_id"] == "3-0"
+
+    @pytest.mark.asyncio
+    async def test_queue_stats(self, scheduler, mock_redis_client, pipeline):
+        """Test that stats report queued, in-flight and dead-lettered counts."""
+        pipeline.execute.return_value = [1, 4, 0]
+        mock_redis_client.xlen.return_value = 1
+        mock_redis_client.xpending.return_value = {"pending": 2}
+
+        stats = await scheduler.get_queue_stats()
+
+        assert stats["backend"] == "redis_streams"
+        assert stats["queued"] == 5
+        assert stats["lanes"] == {"control": 1, "interactive": 4, "batch": 0}
+        assert stats["in_flight"] == 6
+        assert stats["dead_lettered"] == 1
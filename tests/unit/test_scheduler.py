@@ -1,10 +1,12 @@
 """Unit tests for task scheduler (InMemoryScheduler)."""
 
 import asyncio
+import time
 from uuid import uuid4
 
 import pytest
 
+from bindu.server.scheduler.base import SchedulerQueueFullError
 from bindu.server.scheduler.memory_scheduler import InMemoryScheduler
 
 
@@ -68,7 +70,247 @@ async def test_scheduler_operations():
         await asyncio.wait_for(consumer_task, timeout=1.0)
 
         assert len(received) == 4
-        assert received[0]["operation"] == "run"
-        assert received[1]["operation"] == "cancel"
-        assert received[2]["operation"] == "pause"
-        assert received[3]["operation"] == "resume"
+        assert sorted(op["operation"] for op in received) == [
+            "cancel",
+            "pause",
+            "resume",
+            "run",
+        ]
+
+
+def _run_params() -> dict:
+    return {"task_id": uuid4(), "context_id": uuid4()}
+
+
+@pytest.mark.asyncio
+async def test_run_task_is_buffered_without_consumer():
+    """Test that run_task returns immediately while the queue has space."""
+    async with InMemoryScheduler(queue_capacity=2) as scheduler:
+        await asyncio.wait_for(scheduler.run_task(_run_params()), timeout=0.5)
+        await asyncio.wait_for(scheduler.run_task(_run_params()), timeout=0.5)
+
+        stats = await scheduler.get_queue_stats()
+        assert stats["queued_runs"] == 2
+        assert stats["capacity"] == 2
+        assert stats["utilization"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_reject_policy_raises_when_full():
+    """Test that the reject policy fails fast with a retry hint."""
+    async with InMemoryScheduler(
+        queue_capacity=1, overflow_policy="reject", retry_after=3
+    ) as scheduler:
+        await scheduler.run_task(_run_params())
+
+        with pytest.raises(SchedulerQueueFullError) as exc_info:
+            await scheduler.run_task(_run_params())
+
+        assert exc_info.value.retry_after == 3
+        assert (await scheduler.get_queue_stats())["rejected_total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_block_policy_times_out():
+    """Test that the block policy rejects after block_timeout."""
+    async with InMemoryScheduler(
+        queue_capacity=1, overflow_policy="block", block_timeout=0.05
+    ) as scheduler:
+        await scheduler.run_task(_run_params())
+
+        with pytest.raises(SchedulerQueueFullError):
+            await scheduler.run_task(_run_params())
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_space():
+    """Test that a blocked producer proceeds once a consumer frees a slot."""
+    async with InMemoryScheduler(
+        queue_capacity=1, overflow_policy="block", block_timeout=2
+    ) as scheduler:
+        first, second = _run_params(), _run_params()
+        await scheduler.run_task(first)
+        producer = asyncio.create_task(scheduler.run_task(second))
+        await asyncio.sleep(0.01)
+        assert not producer.done()
+
+        operations = scheduler.receive_task_operations()
+        received = await operations.__anext__()
+        await asyncio.wait_for(producer, timeout=1.0)
+
+        assert received["params"] is first
+        assert (await operations.__anext__())["params"] is second
+
+
+@pytest.mark.asyncio
+async def test_shed_oldest_drops_oldest_run_and_notifies():
+    """Test that shed_oldest evicts the oldest run and reports it."""
+    dropped = []
+
+    async def on_task_dropped(params, reason):
+        dropped.append((params, reason))
+
+    async with InMemoryScheduler(
+        queue_capacity=2, overflow_policy="shed_oldest"
+    ) as scheduler:
+        scheduler.on_task_dropped = on_task_dropped
+        oldest, middle, newest = _run_params(), _run_params(), _run_params()
+        await scheduler.run_task(oldest)
+        await scheduler.run_task(middle)
+        await scheduler.run_task(newest)
+
+        operations = scheduler.receive_task_operations()
+        remaining = [await operations.__anext__() for _ in range(2)]
+
+        assert dropped == [(oldest, "queue_overflow")]
+        assert [op["params"] for op in remaining] == [middle, newest]
+        assert (await scheduler.get_queue_stats())["shed_total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_control_operations_bypass_capacity():
+    """Test that cancel is accepted even when the run queue is full."""
+    async with InMemoryScheduler(
+        queue_capacity=1, overflow_policy="reject"
+    ) as scheduler:
+        params = _run_params()
+        await scheduler.run_task(params)
+        await scheduler.cancel_task({"task_id": params["task_id"]})
+
+        stats = await scheduler.get_queue_stats()
+        assert stats["queued"] == 2
+        assert stats["queued_runs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batches_drain_up_to_batch_size():
+    """Test that batch receive returns every queued operation up to the limit."""
+    async with InMemoryScheduler() as scheduler:
+        params = [_run_params() for _ in range(5)]
+        await scheduler.run_tasks(params)
+
+        batches = scheduler.receive_task_operation_batches(3)
+        first = await batches.__anext__()
+        second = await batches.__anext__()
+
+        assert [op["params"] for op in first] == params[:3]
+        assert [op["params"] for op in second] == params[3:]
+        assert (await scheduler.get_queue_stats())["queued_runs"] == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_size_callable_is_evaluated_per_fetch():
+    """Test that a callable batch size is re-read before every fetch."""
+    async with InMemoryScheduler() as scheduler:
+        await scheduler.run_tasks([_run_params() for _ in range(4)])
+        sizes = iter([1, 2])
+
+        batches = scheduler.receive_task_operation_batches(lambda: next(sizes))
+
+        assert len(await batches.__anext__()) == 1
+        assert len(await batches.__anext__()) == 2
+
+
+@pytest.mark.asyncio
+async def test_enqueue_stamps_enqueue_time():
+    """Test that queued operations record when they were enqueued."""
+    async with InMemoryScheduler() as scheduler:
+        await scheduler.run_task(_run_params())
+
+        operation = await scheduler.receive_task_operations().__anext__()
+
+        assert operation["_enqueued_at"] <= time.time()
+
+
+def _context_run(context_id, priority: str | None = None) -> dict:
+    message = {"metadata": {"priority": priority}} if priority else {}
+    return {"task_id": uuid4(), "context_id": context_id, "message": message}
+
+
+async def _drain(scheduler: InMemoryScheduler, n: int) -> list:
+    batches = scheduler.receive_task_operation_batches(n)
+    batch = await batches.__anext__()
+    await batches.aclose()
+    return batch
+
+
+@pytest.mark.asyncio
+async def test_control_operations_jump_queued_runs():
+    """Test that cancels are delivered before runs queued earlier."""
+    async with InMemoryScheduler() as scheduler:
+        task_id = uuid4()
+        await scheduler.run_task(_run_params())
+        await scheduler.run_task(_run_params())
+        await scheduler.cancel_task({"task_id": task_id})
+
+        batch = await _drain(scheduler, 3)
+
+        assert [op["operation"] for op in batch] == ["cancel", "run", "run"]
+
+
+@pytest.mark.asyncio
+async def test_batch_priority_runs_after_interactive():
+    """Test that metadata priority "batch" queues behind interactive work."""
+    async with InMemoryScheduler() as scheduler:
+        context_id = uuid4()
+        await scheduler.run_task(_context_run(context_id, "batch"))
+        await scheduler.run_task(_context_run(context_id))
+
+        batch = await _drain(scheduler, 2)
+
+        assert [scheduler.priority_of(op) for op in batch] == ["interactive", "batch"]
+
+
+@pytest.mark.asyncio
+async def test_round_robin_across_contexts():
+    """Test that a flood from one context does not starve another."""
+    async with InMemoryScheduler() as scheduler:
+        noisy, quiet = uuid4(), uuid4()
+        for _ in range(5):
+            await scheduler.run_task(_context_run(noisy))
+        await scheduler.run_task(_context_run(quiet))
+
+        batch = await _drain(scheduler, 3)
+
+        contexts = [op["params"]["context_id"] for op in batch]
+        assert contexts == [noisy, quiet, noisy]
+
+
+@pytest.mark.asyncio
+async def test_fairness_weights_and_client_identity():
+    """Test that weighted client keys take several turns in a row."""
+    weights = {"client:acme": 2}
+    async with InMemoryScheduler(fairness_weights=weights) as scheduler:
+        for client_id in ("acme", "acme", "acme", "other"):
+            params = _run_params()
+            params["metadata"] = {"client_id": client_id}
+            await scheduler.run_task(params)
+
+        batch = await _drain(scheduler, 4)
+
+        clients = [op["params"]["metadata"]["client_id"] for op in batch]
+        assert clients == ["acme", "acme", "other", "acme"]
+
+
+@pytest.mark.asyncio
+async def test_shed_oldest_prefers_batch_lane():
+    """Test that shedding drops batch work before interactive work."""
+    dropped = []
+
+    async def on_task_dropped(params, reason):
+        dropped.append(params["task_id"])
+
+    async with InMemoryScheduler(
+        queue_capacity=2, overflow_policy="shed_oldest"
+    ) as scheduler:
+        scheduler.on_task_dropped = on_task_dropped
+        interactive = _context_run(uuid4())
+        background = _context_run(uuid4(), "batch")
+        await scheduler.run_task(interactive)
+        await scheduler.run_task(background)
+        await scheduler.run_task(_context_run(uuid4()))
+
+        stats = await scheduler.get_queue_stats()
+
+    assert dropped == [background["task_id"]]
+    assert stats["lanes"] == {"control": 0, "interactive": 2, "batch": 0}
@@ -8,6 +8,7 @@ from bindu.common.models import SchedulerConfig
 from bindu.server.scheduler.factory import create_scheduler
 from bindu.server.scheduler.memory_scheduler import InMemoryScheduler
 from bindu.server.scheduler.redis_scheduler import RedisScheduler
+from bindu.server.scheduler.redis_stream_scheduler import RedisStreamScheduler
 
 
 class TestSchedulerFactory:
@@ -59,6 +60,21 @@ class TestSchedulerFactory:
         assert "6380" in scheduler.redis_url
         assert scheduler.queue_name == "custom:queue"
 
+    @pytest.mark.asyncio
+    async def test_create_scheduler_redis_streams(self):
+        """Test creating Redis Streams scheduler."""
+        config = SchedulerConfig(
+            type="redis_streams",
+            redis_url="redis://localhost:6379/0",
+            queue_name="custom:queue",
+        )
+
+        scheduler = await create_scheduler(config)
+
+        assert isinstance(scheduler, RedisStreamScheduler)
+        assert scheduler.stream_name == "custom:queue:stream"
+        assert scheduler.consumer_group == "bindu-workers"
+
     @pytest.mark.asyncio
     async def test_create_scheduler_redis_connection_failure(self):
         """Test Redis scheduler connection failure when entering context."""
@@ -1,9 +1,12 @@
 """Unit tests for storage layer (InMemoryStorage)."""
 
+import time
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
 
+from bindu.common.protocol.types import PushNotificationConfig
 from bindu.server.storage.memory_storage import InMemoryStorage
 from tests.utils import assert_task_state, create_test_message
 
@@ -51,6 +54,43 @@ class TestTaskStorage:
         loaded_task = await storage.load_task(task_id)
         assert_task_state(loaded_task, "working")
 
+    @pytest.mark.asyncio
+    async def test_removing_last_metadata_key_keeps_empty_dict(
+        self, storage: InMemoryStorage
+    ):
+        """Test that metadata removal matches Postgres, which leaves {}."""
+        message = create_test_message(text="Test task")
+        task = await storage.submit_task(message["context_id"], message)
+
+        await storage.update_task(task["id"], "working", metadata={"step": 1})
+        await storage.update_task(task["id"], "working", metadata={"step": None})
+
+        loaded = await storage.load_task(task["id"])
+        assert loaded is not None
+        assert loaded["metadata"] == {}
+
+    @pytest.mark.asyncio
+    async def test_update_skipped_outside_expected_states(
+        self, storage: InMemoryStorage
+    ):
+        """Test that a conditional update leaves a canceled task alone."""
+        message = create_test_message(text="Test task")
+        task = await storage.submit_task(message["context_id"], message)
+        await storage.update_task(task["id"], "canceled")
+
+        updated = await storage.update_task(
+            task["id"],
+            "completed",
+            new_messages=[create_test_message(text="late")],
+            expected_states=("working",),
+        )
+
+        assert updated is None
+        loaded = await storage.load_task(task["id"])
+        assert loaded is not None
+        assert_task_state(loaded, "canceled")
+        assert len(loaded["history"]) == 1
+
     @pytest.mark.asyncio
     async def test_list_tasks_empty(self, storage: InMemoryStorage):
         """Test listing tasks when storage is empty."""
@@ -121,6 +161,173 @@ class TestTaskStorage:
         assert len(loaded_task["history"]) == 2
 
 
+class TestBulkTaskLoading:
+    """Test loading several tasks with load_tasks()."""
+
+    @pytest.mark.asyncio
+    async def test_load_tasks_preserves_order_and_skips_missing(
+        self, storage: InMemoryStorage
+    ):
+        """Test that tasks come back in request order without missing IDs."""
+        ids = []
+        for text in ("one", "two", "three"):
+            message = create_test_message(text=text)
+            task = await storage.submit_task(message["context_id"], message)
+            ids.append(task["id"])
+
+        requested = [ids[2], uuid4(), ids[0], ids[1]]
+        tasks = await storage.load_tasks(requested)
+
+        assert [t["id"] for t in tasks] == [ids[2], ids[0], ids[1]]
+
+    @pytest.mark.asyncio
+    async def test_load_tasks_returns_requested_fields(self, storage: InMemoryStorage):
+        """Test that fields limits the keys returned."""
+        message = create_test_message(text="Only history")
+        task = await storage.submit_task(message["context_id"], message)
+
+        (loaded,) = await storage.load_tasks([task["id"]], fields=("history",))
+
+        assert set(loaded) == {"id", "history"}
+        loaded["history"].clear()
+        stored = await storage.load_task(task["id"])
+        assert stored is not None
+        assert stored["history"]
+
+    @pytest.mark.asyncio
+    async def test_load_tasks_rejects_non_uuid(self, storage: InMemoryStorage):
+        """Test that string IDs are rejected like load_task()."""
+        with pytest.raises(TypeError, match="task_id must be UUID"):
+            await storage.load_tasks(["not-a-uuid"])  # type: ignore
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_by_context_limits_history(self, storage: InMemoryStorage):
+        """Test that history_length returns history tails without mutating tasks."""
+        message = create_test_message(text="first")
+        context_id = message["context_id"]
+        task = await storage.submit_task(context_id, message)
+        await storage.update_task(
+            task["id"],
+            state="input-required",
+            new_messages=[create_test_message(text="second", context_id=context_id)],
+        )
+
+        (listed,) = await storage.list_tasks_by_context(context_id, history_length=1)
+
+        assert [m["parts"][0]["text"] for m in listed["history"]] == ["second"]
+        stored = await storage.load_task(task["id"])
+        assert stored is not None
+        assert len(stored["history"]) == 2
+
+
+class TestCheckpoints:
+    """Test worker checkpoints kept apart from tasks."""
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_lives_while_task_is_working(
+        self, storage: InMemoryStorage
+    ):
+        """Test that checkpoints need a working task and leave with it."""
+        message = create_test_message(text="Work")
+        task = await storage.submit_task(message["context_id"], message)
+        checkpoint = {"state": "completed", "results": "Done"}
+
+        assert not await storage.save_checkpoint(task["id"], checkpoint)
+
+        await storage.update_task(task["id"], state="working")
+        assert await storage.save_checkpoint(task["id"], checkpoint)
+        assert await storage.load_checkpoint(task["id"]) == checkpoint
+        stored = await storage.load_task(task["id"])
+        assert stored is not None
+        assert "metadata" not in stored
+
+        await storage.update_task(task["id"], state="completed")
+        assert await storage.load_checkpoint(task["id"]) is None
+
+
+class TestNotificationOutbox:
+    """Test push configs and the notification outbox."""
+
+    CONFIG = PushNotificationConfig(id=uuid4(), url="http://hooks.test/a")
+
+    @pytest.mark.asyncio
+    async def test_push_sequence_advances_per_task(self, storage: InMemoryStorage):
+        """Test that sequences start at 1 and survive config updates."""
+        task_id = uuid4()
+        assert await storage.next_push_sequence(task_id) is None
+
+        await storage.save_push_config(task_id, self.CONFIG)
+        assert await storage.next_push_sequence(task_id) == (self.CONFIG, 1)
+        await storage.save_push_config(task_id, {**self.CONFIG, "token": "t"})
+        next_push = await storage.next_push_sequence(task_id)
+        assert next_push is not None
+        config, sequence = next_push
+
+        assert sequence == 2
+        assert config["token"] == "t"
+        assert await storage.delete_push_config(task_id) == config
+        assert await storage.load_push_config(task_id) is None
+
+    @pytest.mark.asyncio
+    async def test_claim_returns_only_the_head_of_each_task(
+        self, storage: InMemoryStorage
+    ):
+        """Test per-task ordering, leases and deduplication."""
+        first_task, second_task = uuid4(), uuid4()
+        for task_id, event_id in (
+            (first_task, "a1"),
+            (first_task, "a2"),
+            (second_task, "b1"),
+            (first_task, "a1"),  # duplicate
+        ):
+            await storage.enqueue_notification(
+                task_id, self.CONFIG, {"event_id": event_id}
+            )
+
+        claimed = await storage.claim_notifications(10, lease_timeout=60)
+        assert [entry["event_id"] for entry in claimed] == ["a1", "b1"]
+        assert await storage.claim_notifications(10, lease_timeout=60) == []
+
+        await storage.ack_notification("a1")
+        (entry,) = await storage.claim_notifications(10, lease_timeout=60)
+        assert entry["event_id"] == "a2"
+        assert entry["attempts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_retry_delays_and_counts_attempts(self, storage: InMemoryStorage):
+        """Test that a retried event is due again only after its delay."""
+        task_id = uuid4()
+        await storage.enqueue_notification(task_id, self.CONFIG, {"event_id": "e1"})
+        await storage.claim_notifications(1, lease_timeout=60)
+
+        await storage.retry_notification("e1", delay=30)
+        assert await storage.claim_notifications(1, lease_timeout=60) == []
+
+        with patch("time.monotonic", return_value=time.monotonic() + 31):
+            (entry,) = await storage.claim_notifications(1, lease_timeout=60)
+        assert entry["attempts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_without_counting_an_attempt(self, storage: InMemoryStorage):
+        """Test that a deferral can reschedule an event without counting it."""
+        await storage.enqueue_notification(uuid4(), self.CONFIG, {"event_id": "e1"})
+        await storage.claim_notifications(1, lease_timeout=60)
+
+        await storage.retry_notification("e1", delay=0, count_attempt=False)
+
+        (entry,) = await storage.claim_notifications(1, lease_timeout=60)
+        assert entry["attempts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, storage: InMemoryStorage):
+        """Test at-least-once delivery when a claimer disappears."""
+        await storage.enqueue_notification(uuid4(), self.CONFIG, {"event_id": "e1"})
+        await storage.claim_notifications(1, lease_timeout=0)
+
+        (entry,) = await storage.claim_notifications(1, lease_timeout=60)
+        assert entry["event_id"] == "e1"
+
+
 class TestContextStorage:
     """Test context CRUD operations."""
 
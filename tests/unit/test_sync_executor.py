@@ -0,0 +1,171 @@
+"""Tests for thread-pool execution of synchronous agent handlers."""
+
+import contextvars
+import threading
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import anyio
+import pytest
+
+from bindu.penguin.manifest import create_manifest
+from bindu.utils.sync_executor import SyncExecutor
+
+request_var: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "request_var", default="unset"
+)
+
+
+class TestSyncExecutor:
+    """Test SyncExecutor call and generator execution."""
+
+    @pytest.mark.asyncio
+    async def test_run_executes_off_event_loop_thread(self):
+        """Test that calls run in a worker thread, not the loop thread."""
+        executor = SyncExecutor(max_threads=2)
+
+        thread_id = await executor.run(threading.get_ident)
+
+        assert thread_id != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_run_carries_context_variables(self):
+        """Test that the caller's contextvars (and so the OTel span) reach the thread."""
+        executor = SyncExecutor(max_threads=2)
+        request_var.set("req-1")
+
+        assert await executor.run(request_var.get) == "req-1"
+
+    @pytest.mark.asyncio
+    async def test_iterate_pulls_each_step_through_pool(self):
+        """Test that every generator step executes in a worker thread."""
+        executor = SyncExecutor(max_threads=2)
+        loop_thread = threading.get_ident()
+
+        def gen(n):
+            for i in range(n):
+                yield i, threading.get_ident()
+
+        items = [item async for item in executor.iterate(gen, 3)]
+
+        assert [i for i, _ in items] == [0, 1, 2]
+        assert all(tid != loop_thread for _, tid in items)
+
+    @pytest.mark.asyncio
+    async def test_iterate_closes_generator_when_abandoned(self):
+        """Test that breaking out of iteration runs the generator's cleanup."""
+        executor = SyncExecutor(max_threads=2)
+        closed = threading.Event()
+
+        def gen():
+            try:
+                yield 1
+                yield 2
+            finally:
+                closed.set()
+
+        stream = executor.iterate(gen)
+        async for _ in stream:
+            break
+        await stream.aclose()
+
+        assert closed.is_set()
+
+    @pytest.mark.asyncio
+    async def test_limit_bounds_threads_and_reports_queue(self):
+        """Test that the pool size caps concurrency and exposes queue depth."""
+        executor = SyncExecutor(max_threads=1)
+        gate = threading.Event()
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(executor.run, gate.wait)
+            tg.start_soon(executor.run, gate.wait)
+            with anyio.fail_after(5):
+                while executor.queue_depth() < 1:
+                    await anyio.sleep(0.01)
+
+            assert executor.busy_threads() == 1
+            assert executor.saturation() == 1.0
+            gate.set()
+
+        assert executor.queue_depth() == 0
+        assert executor.saturation() == 0.0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_call_returns_but_keeps_its_slot(self):
+        """Test that cancellation abandons a blocked thread without freeing its slot."""
+        executor = SyncExecutor(max_threads=1)
+        gate = threading.Event()
+
+        with anyio.fail_after(2):
+            with anyio.move_on_after(0.05):
+                await executor.run(gate.wait, 5)
+
+        assert executor.busy_threads() == 1
+        gate.set()
+        with anyio.fail_after(2):
+            while executor.busy_threads():
+                await anyio.sleep(0.01)
+        assert await executor.run(lambda: "free") == "free"
+
+    def test_rejects_empty_pool(self):
+        """Test that a pool needs at least one thread."""
+        with pytest.raises(ValueError):
+            SyncExecutor(max_threads=0)
+
+
+class TestManifestSyncHandlers:
+    """Test that create_manifest routes sync handlers through the pool."""
+
+    @staticmethod
+    def _manifest(handler):
+        return create_manifest(
+            agent_function=handler,
+            id=uuid4(),
+            did_extension=MagicMock(),
+            name="sync-agent",
+            description=None,
+            skills=None,
+            capabilities=None,
+            agent_trust=None,
+            version="1.0.0",
+            url="http://localhost:3773",
+        )
+
+    @pytest.mark.asyncio
+    async def test_sync_function_runs_in_thread(self):
+        """Test that a plain sync handler does not run on the loop thread."""
+
+        def handler(messages):
+            return threading.get_ident()
+
+        manifest = self._manifest(handler)
+        results = [chunk async for chunk in manifest.run([])]
+
+        assert len(results) == 1
+        assert results[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_sync_generator_streams_through_pool(self):
+        """Test that a sync generator handler yields every chunk."""
+
+        def handler(messages):
+            yield "a"
+            yield "b"
+
+        manifest = self._manifest(handler)
+
+        assert [chunk async for chunk in manifest.run([])] == ["a", "b"]
+
+    def test_offload_can_be_disabled(self):
+        """Test that disabling offload keeps the in-line sync wrapper."""
+
+        def handler(messages):
+            return "inline"
+
+        with patch(
+            "bindu.penguin.manifest.app_settings.worker.offload_sync_handlers", False
+        ):
+            manifest = self._manifest(handler)
+
+        assert manifest.run([]) == "inline"
@@ -0,0 +1,262 @@
+"""Unit tests for task operation wire codecs."""
+
+import json
+import time
+from collections.abc import Mapping
+from typing import Any, cast
+from unittest.mock import patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from bindu.server.scheduler.base import _RunTask
+from bindu.server.scheduler.codec import (
+    JsonCodec,
+    OrjsonCodec,
+    decode_document,
+    get_codec,
+)
+
+
+def _run_operation(text: str = "hello", parts: int = 1) -> _RunTask:
+    task_id = uuid4()
+    context_id = uuid4()
+    return cast(
+        _RunTask,
+        {
+            "operation": "run",
+            "params": {
+                "task_id": task_id,
+                "context_id": context_id,
+                "message": {
+                    "message_id": uuid4(),
+                    "task_id": task_id,
+                    "context_id": context_id,
+                    "reference_task_ids": [uuid4()],
+                    "kind": "message",
+                    "role": "user",
+                    "parts": [{"kind": "text", "text": text} for _ in range(parts)],
+                },
+            },
+            "_current_span": None,
+        },
+    )
+
+
+class TestTaskOperationCodec:
+    """Test encoding and decoding task operations."""
+
+    @pytest.mark.parametrize("codec", [JsonCodec(), OrjsonCodec()])
+    def test_round_trip_restores_id_fields(self, codec):
+        """Test that schema ID fields come back as UUID objects."""
+        operation = _run_operation()
+
+        decoded = codec.decode(codec.encode(operation))
+
+        params = decoded["params"]
+        assert decoded["operation"] == "run"
+        assert params["task_id"] == operation["params"]["task_id"]
+        assert isinstance(params["context_id"], UUID)
+        assert isinstance(params["message"]["message_id"], UUID)
+        reference_task_ids = operation["params"]["message"]["reference_task_ids"]
+        assert params["message"]["reference_task_ids"] == reference_task_ids
+
+    def test_uuid_like_user_text_is_preserved(self):
+        """Test that user text shaped like a UUID stays a string."""
+        text = str(uuid4())
+        codec = OrjsonCodec()
+
+        decoded = codec.decode(codec.encode(_run_operation(text=text)))
+
+        assert decoded["operation"] == "run"
+        part = decoded["params"]["message"]["parts"][0]
+        assert part["text"] == text
+        assert isinstance(part["text"], str)
+
+    def test_orjson_payload_is_version_prefixed(self):
+        """Test that v1 payloads start with the version byte."""
+        payload = OrjsonCodec().encode(_run_operation())
+
+        assert payload[0] == "\x01"
+        assert decode_document(payload)["operation"] == "run"
+
+    def test_json_payload_is_readable_by_legacy_consumers(self):
+        """Test that v0 payloads are plain JSON."""
+        payload = JsonCodec().encode(_run_operation())
+
+        assert json.loads(payload)["operation"] == "run"
+
+    def test_any_codec_decodes_every_version(self):
+        """Test that decoding dispatches on the payload version."""
+        operation = _run_operation()
+        legacy = JsonCodec().encode(operation)
+        current = OrjsonCodec().encode(operation)
+
+        task_id = operation["params"]["task_id"]
+        assert OrjsonCodec().decode(legacy)["params"]["task_id"] == task_id
+        assert JsonCodec().decode(current)["params"]["task_id"] == task_id
+
+    def test_unknown_version_is_rejected(self):
+        """Test that payloads from a newer, unknown version fail loudly."""
+        with pytest.raises(ValueError, match="Unsupported task operation payload"):
+            decode_document("\x07{}")
+
+    def test_get_codec(self):
+        """Test codec lookup by name."""
+        codec = OrjsonCodec()
+
+        assert isinstance(get_codec("json"), JsonCodec)
+        assert get_codec(codec) is codec
+        with pytest.raises(ValueError, match="Unknown task operation codec"):
+            get_codec("pickle")  # type: ignore
+
+
+class TestTraceContextPropagation:
+    """Test W3C trace context and enqueue time carried in payloads."""
+
+    TRACEPARENT = "00-0123456789abcdef0123456789abcdef-0123456789abcdef-01"
+
+    def test_trace_context_injected_and_extracted(self):
+        """Test that the producer context is injected and restored on decode."""
+        codec = OrjsonCodec()
+
+        def inject(carrier, context=None):
+            carrier["traceparent"] = self.TRACEPARENT
+
+        with patch("bindu.server.scheduler.codec.propagate") as propagate:
+            propagate.inject.side_effect = inject
+            propagate.extract.return_value = {"remote": True}
+            operation = _run_operation()
+            operation["_current_span"] = object()  # type: ignore
+            payload = codec.encode(operation)
+            with patch(
+                "bindu.server.scheduler.codec.get_current_span"
+            ) as get_current_span:
+                decoded = codec.decode(payload)
+
+        assert decode_document(payload)["trace_context"] == {
+            "traceparent": self.TRACEPARENT
+        }
+        propagate.extract.assert_called_once_with({"traceparent": self.TRACEPARENT})
+        get_current_span.assert_called_once_with({"remote": True})
+        assert decoded["_current_span"] is get_current_span.return_value
+
+    def test_enqueue_time_round_trips(self):
+        """Test that the enqueue timestamp is carried to the consumer."""
+        codec = OrjsonCodec()
+        operation = _run_operation()
+        operation["_enqueued_at"] = 1700000000.5
+
+        decoded = codec.decode(codec.encode(operation))
+
+        assert decoded["_enqueued_at"] == 1700000000.5
+
+    def test_encode_stamps_enqueue_time(self):
+        """Test that operations without a timestamp are stamped at encode time."""
+        codec = OrjsonCodec()
+        before = time.time()
+
+        decoded = codec.decode(codec.encode(_run_operation()))
+
+        assert before <= decoded["_enqueued_at"] <= time.time()
+
+    def test_legacy_payload_without_trace_context(self):
+        """Test that payloads from older producers decode without extraction."""
+        payload = json.dumps(
+            {
+                "operation": "cancel",
+                "params": {"task_id": str(uuid4())},
+                "span_id": None,
+                "trace_id": None,
+            }
+        )
+
+        with patch("bindu.server.scheduler.codec.propagate") as propagate:
+            decoded = JsonCodec().decode(payload)
+
+        propagate.extract.assert_not_called()
+        assert "_enqueued_at" not in decoded
+
+
+def _legacy_encode(task_operation: Mapping[str, Any]) -> str:
+    """Pre-codec RedisScheduler serialization (recursive UUID pass + json)."""
+
+    def convert_uuids(obj):
+        if isinstance(obj, UUID):
+            return str(obj)
+        elif isinstance(obj, dict):
+            return {k: convert_uuids(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [convert_uuids(item) for item in obj]
+        return obj
+
+    return json.dumps(
+        {
+            "operation": task_operation["operation"],
+            "params": convert_uuids(task_operation["params"]),
+            "span_id": None,
+            "trace_id": None,
+        }
+    )
+
+
+def _legacy_decode(task_data: str) -> dict:
+    """Pre-codec RedisScheduler deserialization (UUID() on every string)."""
+
+    def convert_strings_to_uuids(obj):
+        if isinstance(obj, str):
+            try:
+                return UUID(obj)
+            except (ValueError, AttributeError):
+                return obj
+        elif isinstance(obj, dict):
+            return {k: convert_strings_to_uuids(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [convert_strings_to_uuids(item) for item in obj]
+        return obj
+
+    data = json.loads(task_data)
+    return {
+        "operation": data["operation"],
+        "params": convert_strings_to_uuids(data["params"]),
+    }
+
+
+def test_large_multipart_message_matches_legacy_round_trip():
+    """Test that a 200-part message decodes as the legacy codec decoded it."""
+    operation = _run_operation(text="word " * 40, parts=200)
+    codec = OrjsonCodec()
+
+    decoded = codec.decode(codec.encode(operation))
+
+    assert decoded["params"] == _legacy_decode(_legacy_encode(operation))["params"]
+    assert decoded["params"] == operation["params"]
+
+
+def _best_of(func, rounds: int = 5, iterations: int = 200) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.slow
+def test_benchmark_large_multipart_message(capsys):
+    """Micro-benchmark: round-trip a 200-part message, legacy vs orjson codec.
+
+    Reports the timings only; run with ``pytest -m slow``.
+    """
+    operation = _run_operation(text="word " * 40, parts=200)
+    codec = OrjsonCodec()
+
+    legacy = _best_of(lambda: _legacy_decode(_legacy_encode(operation)))
+    current = _best_of(lambda: codec.decode(codec.encode(operation)))
+
+    with capsys.disabled():
+        print(
+            f"\nround trip x200: legacy {legacy * 1000:.1f}ms, "
+            f"orjson {current * 1000:.1f}ms ({legacy / current:.1f}x)"
+        )
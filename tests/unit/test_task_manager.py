@@ -1,5 +1,8 @@
 """Unit tests for TaskManager."""
 
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
@@ -12,9 +15,12 @@ from bindu.common.protocol.types import (
     ListTasksRequest,
     TaskFeedbackRequest,
 )
+from bindu.server.scheduler.base import Scheduler, SchedulerQueueFullError
 from bindu.server.scheduler.memory_scheduler import InMemoryScheduler
 from bindu.server.storage.memory_storage import InMemoryStorage
+from bindu.server.streaming import status_update_event
 from bindu.server.task_manager import TaskManager
+from bindu.settings import app_settings
 from tests.utils import (
     assert_jsonrpc_error,
     assert_jsonrpc_success,
@@ -362,3 +368,323 @@ async def test_push_not_supported():
             # Should return PushNotificationNotSupportedError (-32005)
             if not tm._push_manager.is_push_supported():
                 assert_jsonrpc_error(response, -32005)
+
+
+@pytest.mark.asyncio
+async def test_send_message_rejects_task_when_queue_full():
+    """Test that a task refused by a full queue is marked rejected."""
+    storage = InMemoryStorage()
+    scheduler = InMemoryScheduler(queue_capacity=1, overflow_policy="reject")
+    async with TaskManager(scheduler=scheduler, storage=storage, manifest=None) as tm:
+        first = create_test_message(text="first")
+        second = create_test_message(text="second")
+
+        await tm.send_message(
+            {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "message/send",
+                "params": {"message": first, "configuration": {}},
+            }
+        )
+        with pytest.raises(SchedulerQueueFullError):
+            await tm.send_message(
+                {
+                    "jsonrpc": "2.0",
+                    "id": uuid4(),
+                    "method": "message/send",
+                    "params": {"message": second, "configuration": {}},
+                }
+            )
+
+        rejected = await storage.load_task(second["task_id"])
+        assert rejected is not None
+        assert rejected["status"]["state"] == "rejected"
+        assert rejected["metadata"]["failure_reason"] == "queue_full"
+
+
+@pytest.mark.asyncio
+async def test_shed_task_is_marked_failed():
+    """Test that a task shed from the queue is failed with its reason."""
+    storage = InMemoryStorage()
+    scheduler = InMemoryScheduler(queue_capacity=1, overflow_policy="shed_oldest")
+    async with TaskManager(scheduler=scheduler, storage=storage, manifest=None):
+        message = create_test_message(text="shed me")
+        task = await storage.submit_task(message["context_id"], message)
+
+        await scheduler.run_task(
+            {"task_id": task["id"], "context_id": task["context_id"]}
+        )
+        await scheduler.run_task({"task_id": uuid4(), "context_id": uuid4()})
+
+        shed = await storage.load_task(task["id"])
+        assert shed is not None
+        assert shed["status"]["state"] == "failed"
+        assert shed["metadata"]["failure_reason"] == "queue_overflow"
+
+
+@pytest.mark.asyncio
+async def test_shed_task_keeps_state_reached_meanwhile():
+    """Test that shedding a task canceled while queued does not fail it."""
+    storage = InMemoryStorage()
+    scheduler = InMemoryScheduler(queue_capacity=1, overflow_policy="shed_oldest")
+    async with TaskManager(scheduler=scheduler, storage=storage, manifest=None):
+        message = create_test_message(text="cancel me")
+        task = await storage.submit_task(message["context_id"], message)
+        await scheduler.run_task(
+            {"task_id": task["id"], "context_id": task["context_id"]}
+        )
+        await storage.update_task(task["id"], state="canceled")
+
+        await scheduler.run_task({"task_id": uuid4(), "context_id": uuid4()})
+
+        kept = await storage.load_task(task["id"])
+        assert kept is not None
+        assert kept["status"]["state"] == "canceled"
+        assert "failure_reason" not in (kept.get("metadata") or {})
+
+
+def test_history_cache_only_with_in_memory_scheduler():
+    """Test that the process-local history cache is off for shared schedulers."""
+    storage = InMemoryStorage()
+
+    local = TaskManager(scheduler=InMemoryScheduler(), storage=storage)
+    shared = TaskManager(scheduler=MagicMock(spec=Scheduler), storage=storage)
+
+    assert local._history_cache is not None
+    assert shared._history_cache is None
+
+
+@pytest.mark.asyncio
+async def test_send_message_passes_client_identity_to_scheduler():
+    """Test that the endpoint-injected client identity reaches the scheduler only."""
+    storage = InMemoryStorage()
+    scheduler = InMemoryScheduler()
+    async with TaskManager(scheduler=scheduler, storage=storage, manifest=None) as tm:
+        message = create_test_message(text="fair share")
+        message["metadata"] = {"_client_id": "acme@clients", "priority": "batch"}
+        scheduler.run_task = AsyncMock()
+
+        await tm.send_message(
+            {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "message/send",
+                "params": {"message": message, "configuration": {}},
+            }
+        )
+
+        params = scheduler.run_task.call_args.args[0]
+        assert params["metadata"] == {"client_id": "acme@clients"}
+        task = await storage.load_task(message["task_id"])
+        assert task is not None
+        assert task["history"][0]["metadata"] == {"priority": "batch"}
+
+
+@pytest.mark.asyncio
+async def test_send_message_stamps_deadline_capped_by_agent_timeout():
+    """Test that the client timeout applies, capped by the agent's task_timeout."""
+    storage = InMemoryStorage()
+    scheduler = InMemoryScheduler()
+    manifest = MagicMock(task_timeout=10.0)
+    async with TaskManager(
+        scheduler=scheduler, storage=storage, manifest=manifest
+    ) as tm:
+        scheduler.run_task = AsyncMock()
+
+        for timeout_seconds, expected in ((2.0, 2.0), (60.0, 10.0)):
+            before = time.time()
+            await tm.send_message(
+                {
+                    "jsonrpc": "2.0",
+                    "id": uuid4(),
+                    "method": "message/send",
+                    "params": {
+                        "message": create_test_message(text="hurry"),
+                        "configuration": {"timeout_seconds": timeout_seconds},
+                    },
+                }
+            )
+
+            deadline = scheduler.run_task.call_args.args[0]["deadline"]
+            assert before + expected <= deadline <= time.time() + expected
+
+
+async def _read_sse(response) -> list:
+    """Collect the JSON-RPC results and comments of an SSE response."""
+    items = []
+    async for chunk in response.body_iterator:
+        data = [line for line in chunk.splitlines() if line.startswith("data: ")]
+        if data:
+            items.append(json.loads(data[0][len("data: ") :])["result"])
+        else:
+            items.append(chunk.strip())
+    return items
+
+
+@pytest.mark.asyncio
+async def test_stream_message_relays_worker_events():
+    """Test that message/stream schedules the task and relays its events."""
+    storage = InMemoryStorage()
+    scheduler = InMemoryScheduler()
+    async with TaskManager(scheduler=scheduler, storage=storage, manifest=None) as tm:
+        scheduler.run_task = AsyncMock()
+        message = create_test_message(text="stream me")
+
+        response = await tm.stream_message(
+            {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "message/stream",
+                "params": {"message": message, "configuration": {}},
+            }
+        )
+
+        params = scheduler.run_task.call_args.args[0]
+        assert params["metadata"] == {"stream": True}
+        task_id, context_id = params["task_id"], params["context_id"]
+        assert tm._event_bus is not None
+        for state in ("working", "completed"):
+            await tm._event_bus.publish(
+                task_id, status_update_event(task_id, context_id, state)
+            )
+
+        results = await _read_sse(response)
+
+        assert response.media_type == "text/event-stream"
+        assert [r["kind"] for r in results] == [
+            "task",
+            "status-update",
+            "status-update",
+        ]
+        assert results[0]["status"]["state"] == "submitted"
+        assert results[2]["final"] is True
+
+
+@pytest.mark.asyncio
+async def test_stream_message_finishes_from_storage(monkeypatch):
+    """Test that a stream whose final event was missed ends from the stored task."""
+    monkeypatch.setattr(app_settings.streaming, "heartbeat_interval", 0.01)
+    storage = InMemoryStorage()
+    scheduler = InMemoryScheduler()
+    async with TaskManager(scheduler=scheduler, storage=storage, manifest=None) as tm:
+        scheduler.run_task = AsyncMock()
+        message = create_test_message(text="stream me")
+
+        response = await tm.stream_message(
+            {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "message/stream",
+                "params": {"message": message, "configuration": {}},
+            }
+        )
+        stream = response.body_iterator
+        await stream.__anext__()  # submitted task
+        assert await stream.__anext__() == ": keep-alive\n\n"
+
+        await storage.update_task(message["task_id"], state="failed")
+        results = await _read_sse(response)
+
+        assert results[-1]["kind"] == "status-update"
+        assert results[-1]["status"]["state"] == "failed"
+        assert results[-1]["final"] is True
+
+
+@pytest.mark.asyncio
+async def test_stream_message_rejects_task_when_subscribe_fails():
+    """Test that a task whose event subscription fails is not left submitted."""
+    storage = InMemoryStorage()
+    scheduler = InMemoryScheduler()
+    async with TaskManager(scheduler=scheduler, storage=storage, manifest=None) as tm:
+        scheduler.run_task = AsyncMock()
+        tm._message_handlers.event_bus.subscribe = AsyncMock(  # type: ignore
+            side_effect=ConnectionError("redis down")
+        )
+        message = create_test_message(text="stream me")
+
+        with pytest.raises(ConnectionError):
+            await tm.stream_message(
+                {
+                    "jsonrpc": "2.0",
+                    "id": uuid4(),
+                    "method": "message/stream",
+                    "params": {"message": message, "configuration": {}},
+                }
+            )
+
+        scheduler.run_task.assert_not_called()
+        task = await storage.load_task(message["task_id"])
+        assert task is not None
+        assert task["status"]["state"] == "rejected"
+        assert task["metadata"]["failure_reason"] == "event_bus_unavailable"
+
+
+@pytest.mark.asyncio
+async def test_resubscribe_replays_events_after_last_event_id():
+    """Test that tasks/resubscribe resends logged events, then live ones."""
+    storage = InMemoryStorage()
+    scheduler = InMemoryScheduler()
+    async with TaskManager(scheduler=scheduler, storage=storage, manifest=None) as tm:
+        message = create_test_message(text="resume me")
+        task = await storage.submit_task(message["context_id"], message)
+        task_id, context_id = task["id"], task["context_id"]
+        assert tm._event_bus is not None
+        for state in ("working", "working"):
+            await tm._event_bus.publish(
+                task_id, status_update_event(task_id, context_id, state)
+            )
+
+        response = await tm.resubscribe_task(
+            {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "tasks/resubscribe",
+                "params": {"task_id": task_id, "metadata": {"last_event_id": "1"}},
+            }
+        )
+        stream = response.body_iterator
+        replayed = await stream.__anext__()
+        await tm._event_bus.publish(
+            task_id, status_update_event(task_id, context_id, "completed")
+        )
+        live = await stream.__anext__()
+        await stream.aclose()
+
+        assert replayed.startswith("id: 2\n")
+        assert live.startswith("id: 3\n")
+        assert json.loads(live.split("data: ", 1)[1])["result"]["final"] is True
+
+
+@pytest.mark.asyncio
+async def test_resubscribe_without_history_sends_current_task():
+    """Test resubscribing to a finished task with no usable event ID."""
+    storage = InMemoryStorage()
+    scheduler = InMemoryScheduler()
+    async with TaskManager(scheduler=scheduler, storage=storage, manifest=None) as tm:
+        message = create_test_message(text="already done")
+        task = await storage.submit_task(message["context_id"], message)
+        await storage.update_task(task["id"], state="completed")
+
+        response = await tm.resubscribe_task(
+            {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "tasks/resubscribe",
+                "params": {"task_id": task["id"], "metadata": {"last_event_id": "7"}},
+            }
+        )
+        results = await _read_sse(response)
+
+        assert [r["kind"] for r in results] == ["task"]
+        assert results[0]["status"]["state"] == "completed"
+
+        missing = await tm.resubscribe_task(
+            {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "tasks/resubscribe",
+                "params": {"task_id": uuid4()},
+            }
+        )
+        assert_jsonrpc_error(missing, -32001)
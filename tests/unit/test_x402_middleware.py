@@ -162,6 +162,19 @@ class TestX402Middleware:
         # Should return 402 for missing payment
         assert isinstance(response, JSONResponse)
 
+    @pytest.mark.asyncio
+    async def test_dispatch_stream_without_payment_is_rejected(self, middleware):
+        """Test that message/stream cannot run a paid agent without payment."""
+        body = json.dumps({"method": "message/stream", "params": {}}).encode()
+        request = _make_request(body=body)
+        call_next = AsyncMock(return_value=Response(content=b"ok"))
+
+        response = await middleware.dispatch(request, call_next)
+
+        call_next.assert_not_called()
+        assert isinstance(response, JSONResponse)
+        assert response.status_code == 402
+
     @pytest.mark.asyncio
     async def test_dispatch_invalid_payment_header(self, middleware):
         """Test dispatch with invalid X-PAYMENT header."""
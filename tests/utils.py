@@ -167,8 +167,9 @@ def create_test_context(
     return context
 
 
-def assert_task_state(task: Task, expected_state: TaskState) -> None:
+def assert_task_state(task: Task | None, expected_state: TaskState) -> None:
     """Assert that a task is in the expected state."""
+    assert task is not None, "Task not found"
     actual_state = task["status"]["state"]
     assert actual_state == expected_state, (
         f"Expected task state '{expected_state}', got '{actual_state}'"